@@ -0,0 +1,441 @@
+"""
+Benchmark suite for BHResist.
+
+Times borehole construction and calc_bh_resist for every borehole type, boundary condition, flow regime, and
+fluid, along with the import time of bhr.borehole, peak memory per 10k boreholes, and batch throughput.
+Results are written as JSON so they can be compared between releases.
+
+Run from the repository root::
+
+    python -m benchmarks.run_benchmarks -o results.json
+    python -m benchmarks.run_benchmarks -o new.json --compare results.json
+    python -m benchmarks.run_benchmarks --filter import --import-budget 0.1
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from math import sqrt
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+from bhr.batch import evaluate
+from bhr.borehole import Borehole
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# schema version of the results file
+RESULTS_VERSION = 1
+
+FLUIDS = {
+    "WATER": 0.0,
+    "ETHYLALCOHOL": 0.2,
+    "ETHYLENEGLYCOL": 0.2,
+    "METHYLALCOHOL": 0.2,
+    "PROPYLENEGLYCOL": 0.2,
+}
+
+BOUNDARY_CONDITIONS = ("UNIFORM_HEAT_FLUX", "UNIFORM_BOREHOLE_WALL_TEMP")
+
+REGIMES = ("laminar", "transitional", "turbulent")
+
+BASE = {
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 200,
+    "borehole_diameter": 0.14,
+}
+
+BOREHOLES = {
+    "single_u": {
+        "borehole_type": "single_u_tube",
+        "single_u_tube": {
+            "pipe_outer_diameter": 0.032,
+            "pipe_dimension_ratio": 11,
+            "pipe_conductivity": 0.4,
+            "shank_space": 0.032,
+        },
+    },
+    "double_u_adjacent": {
+        "borehole_type": "double_u_tube",
+        "double_u_tube": {
+            "pipe_outer_diameter": 0.032,
+            "pipe_dimension_ratio": 11,
+            "pipe_conductivity": 0.4,
+            "shank_space": 0.032,
+            "pipe_inlet_arrangement": "ADJACENT",
+        },
+    },
+    "double_u_diagonal": {
+        "borehole_type": "double_u_tube",
+        "double_u_tube": {
+            "pipe_outer_diameter": 0.032,
+            "pipe_dimension_ratio": 11,
+            "pipe_conductivity": 0.4,
+            "shank_space": 0.032,
+            "pipe_inlet_arrangement": "DIAGONAL",
+        },
+    },
+    "coaxial": {
+        "borehole_type": "coaxial",
+        "coaxial": {
+            "outer_pipe_outer_diameter": 0.1,
+            "outer_pipe_dimension_ratio": 11,
+            "outer_pipe_conductivity": 0.4,
+            "inner_pipe_outer_diameter": 0.05,
+            "inner_pipe_dimension_ratio": 11,
+            "inner_pipe_conductivity": 0.4,
+        },
+    },
+}
+
+TEMPERATURE = 20.0
+
+
+def make_config(bh_name: str, fluid: str, boundary_condition: str = "UNIFORM_HEAT_FLUX") -> dict:
+    """
+    Builds an init_from_dict input for one of the benchmark boreholes.
+
+    :param bh_name: key of BOREHOLES
+    :param fluid: key of FLUIDS
+    :param boundary_condition: borehole wall boundary condition
+    :return: init_from_dict input
+    """
+
+    return {
+        **BASE,
+        **BOREHOLES[bh_name],
+        "fluid_type": fluid,
+        "fluid_concentration": FLUIDS[fluid],
+        "boundary_condition": boundary_condition,
+    }
+
+
+def regime_mass_flow_rate(bh: Borehole, regime: str, temp: float = TEMPERATURE) -> float:
+    """
+    Mass flow rate placing a borehole in a flow regime.
+
+    Laminar and turbulent points sit a factor of two outside all transition bands. Transitional points sit in the
+    middle of the last band, which for coaxial boreholes is the annulus.
+
+    :param bh: initialized Borehole
+    :param regime: "laminar", "transitional", or "turbulent"
+    :param temp: average fluid temperature, in C
+    :return: total borehole mass flow rate, in kg/s
+    """
+
+    evaluator = bh.compile()
+    bands = evaluator.transition_bands()
+    mu = evaluator.mu(temp)
+
+    if regime == "laminar":
+        return mu * min(lo for lo, _ in bands) / 2
+    if regime == "transitional":
+        lo, hi = bands[-1]
+        return mu * sqrt(lo * hi)
+    if regime == "turbulent":
+        return mu * max(hi for _, hi in bands) * 2
+    raise ValueError(f'Unsupported flow regime "{regime}"')
+
+
+def time_call(func, min_time: float, repeat: int) -> dict:
+    """
+    Times a callable with timeit, taking the best of several repeats.
+
+    :param func: callable taking no arguments
+    :param min_time: minimum duration of each repeat, in s
+    :param repeat: number of repeats
+    :return: timing results
+    """
+
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.1))
+
+    times = [elapsed / number] + [t / number for t in timer.repeat(repeat - 1, number)]
+    return {
+        "seconds": min(times),
+        "median_seconds": float(np.median(times)),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def bench_construction(min_time: float, repeat: int, selected) -> dict:
+    results = {}
+    for bh_name in BOREHOLES:
+        for fluid in FLUIDS:
+            name = f"construct/{bh_name}/{fluid}"
+            if not selected(name):
+                continue
+            config = make_config(bh_name, fluid)
+
+            def construct(config=config):
+                Borehole().init_from_dict(config)
+
+            results[name] = time_call(construct, min_time, repeat)
+    return results
+
+
+def bench_calc_bh_resist(min_time: float, repeat: int, selected) -> dict:
+    results = {}
+    for bh_name in BOREHOLES:
+        for bc in BOUNDARY_CONDITIONS:
+            for fluid in FLUIDS:
+                bh = Borehole()
+                bh.init_from_dict(make_config(bh_name, fluid, bc))
+                for regime in REGIMES:
+                    name = f"calc_bh_resist/{bh_name}/{bc}/{regime}/{fluid}"
+                    if not selected(name):
+                        continue
+                    m_dot = regime_mass_flow_rate(bh, regime)
+                    result = time_call(
+                        lambda bh=bh, m_dot=m_dot: bh.calc_bh_resist(m_dot, TEMPERATURE), min_time, repeat
+                    )
+                    result["m_dot"] = m_dot
+                    result["temp"] = TEMPERATURE
+                    results[name] = result
+    return results
+
+
+def bench_series(min_time: float, repeat: int, selected, num_points: int = 8760) -> dict:
+    """
+    Times calc_bh_resist_array over a year of hourly operating points, against a loop of scalar calls.
+
+    :param min_time: minimum duration of each timing repeat, in s
+    :param repeat: number of repeats
+    :param selected: benchmark name filter
+    :param num_points: number of operating points
+    :return: timing results, with the speedup of the array call over the loop
+    """
+
+    m_dot = np.full(num_points, 0.5)
+    temp = 15 + 5 * np.sin(np.linspace(0, 2 * np.pi, num_points))
+    results = {}
+    for bh_name in BOREHOLES:
+        for fluid in FLUIDS:
+            name = f"series/{bh_name}/{fluid}"
+            if not selected(name):
+                continue
+            bh = Borehole()
+            bh.init_from_dict(make_config(bh_name, fluid))
+            result = time_call(lambda bh=bh: bh.calc_bh_resist_array(m_dot, temp), min_time, repeat)
+            loop = time_call(
+                lambda bh=bh: [bh.calc_bh_resist(m, t) for m, t in zip(m_dot.tolist(), temp.tolist())], min_time, 1
+            )
+            result["points"] = num_points
+            result["loop_seconds"] = loop["seconds"]
+            result["speedup"] = loop["seconds"] / result["seconds"]
+            results[name] = result
+    return results
+
+
+def bench_import_time(repeat: int) -> dict:
+    """
+    Times a fresh import of bhr.borehole in a new interpreter.
+
+    :param repeat: number of interpreters to start
+    :return: timing results
+    """
+
+    code = "from time import perf_counter; t = perf_counter(); import bhr.borehole; print(perf_counter() - t)"
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        times.append(float(out.stdout))
+    return {"seconds": min(times), "median_seconds": float(np.median(times)), "repeat": repeat}
+
+
+def bench_memory(num: int = 10_000) -> dict:
+    """
+    Peak memory allocated while constructing and holding boreholes, traced with tracemalloc.
+
+    :param num: number of boreholes of each type
+    :return: memory results, per borehole type
+    """
+
+    results = {}
+    for bh_name in BOREHOLES:
+        config = make_config(bh_name, "WATER")
+        # build once so shared fluid objects are not charged to the instances
+        Borehole().init_from_dict(config)
+
+        tracemalloc.start()
+        boreholes = []
+        for _ in range(num):
+            bh = Borehole()
+            bh.init_from_dict(config)
+            boreholes.append(bh)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del boreholes
+
+        results[f"memory/{bh_name}"] = {
+            "instances": num,
+            "peak_bytes": peak,
+            "retained_bytes": current,
+            "bytes_per_instance": current / num,
+        }
+    return results
+
+
+def bench_batch(num_configs: int, num_points: int, workers_list) -> dict:
+    """
+    Throughput of bhr.batch.evaluate over a mix of borehole types and fluids.
+
+    :param num_configs: number of configurations
+    :param num_points: number of operating points per configuration
+    :param workers_list: worker counts to run
+    :return: throughput results, per worker count
+    """
+
+    names = [(bh_name, fluid) for bh_name in BOREHOLES for fluid in FLUIDS]
+    configs = [make_config(*names[i % len(names)]) for i in range(num_configs)]
+    m_dot = np.geomspace(0.05, 3.0, num_points)
+    temp = np.linspace(0, 30, num_points)
+
+    results = {}
+    for workers in workers_list:
+        start = perf_counter()
+        batch = evaluate(configs, m_dot, temp, workers=workers)
+        elapsed = perf_counter() - start
+        failed = sum(result.error is not None for result in batch)
+        results[f"batch/workers_{workers}"] = {
+            "seconds": elapsed,
+            "configs": num_configs,
+            "points": num_points,
+            "failed": failed,
+            "configs_per_second": num_configs / elapsed,
+            "evaluations_per_second": num_configs * num_points / elapsed,
+        }
+    return results
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],  # noqa: S607
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    try:
+        bhr_version = version("BHResist")
+    except PackageNotFoundError:
+        bhr_version = None
+
+    return {
+        "results_version": RESULTS_VERSION,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "bhr_version": bhr_version,
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Compares the timings and per-instance memory of two results files.
+
+    :param results: new results
+    :param baseline: baseline results
+    :param threshold: ratio of new to baseline time, or memory, above which a benchmark counts as a regression
+    :return: names of the regressed benchmarks
+    """
+
+    regressions = []
+    print(f"{'benchmark':<80} {'baseline':>12} {'new':>12} {'ratio':>8}")
+    for name, result in results["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if base is None:
+            continue
+        for metric in ("seconds", "bytes_per_instance"):
+            if metric in result and metric in base:
+                break
+        else:
+            continue
+        ratio = result[metric] / base[metric]
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<80} {base[metric]:12.4g} {result[metric]:12.4g} {ratio:8.3f}{flag}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="JSON results file")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum duration of each timing repeat, s")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timing repeats")
+    parser.add_argument("--instances", type=int, default=10_000, help="boreholes per type for the memory benchmark")
+    parser.add_argument("--batch-configs", type=int, default=200, help="configurations in the batch benchmark")
+    parser.add_argument("--batch-points", type=int, default=200, help="operating points in the batch benchmark")
+    parser.add_argument("--compare", default=None, help="baseline JSON results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="time ratio counted as a regression")
+    parser.add_argument(
+        "--import-budget", type=float, default=None, help="fail if importing bhr.borehole takes longer than this, s"
+    )
+    args = parser.parse_args(argv)
+
+    def selected(name: str) -> bool:
+        return args.filter in name
+
+    benchmarks = {}
+    if selected("import"):
+        benchmarks["import/bhr.borehole"] = bench_import_time(args.repeat)
+    benchmarks.update(bench_construction(args.min_time, args.repeat, selected))
+    benchmarks.update(bench_calc_bh_resist(args.min_time, args.repeat, selected))
+    benchmarks.update(bench_series(args.min_time, args.repeat, selected))
+    if selected("memory"):
+        benchmarks.update(bench_memory(args.instances))
+    if selected("batch"):
+        workers = sorted({1, os.cpu_count() or 1})
+        benchmarks.update(bench_batch(args.batch_configs, args.batch_points, workers))
+
+    results = {"metadata": metadata(), "benchmarks": benchmarks}
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"{len(benchmarks)} benchmarks written to {args.output}")
+
+    status = 0
+    import_time = benchmarks.get("import/bhr.borehole")
+    if args.import_budget is not None and import_time is not None and import_time["seconds"] > args.import_budget:
+        print(f"import/bhr.borehole took {import_time['seconds']:.3f} s, over the {args.import_budget:.3f} s budget")
+        status = 1
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            status = 1
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from math import ceil
+
+import numpy as np
+
+from bhr.borehole import Borehole
+from bhr.config_hash import config_hash
+from bhr.disk_cache import DiskCache
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """
+    Result for one borehole configuration of a batch.
+
+    :param resist: effective borehole resistance, K/(W/m). float for scalar inputs, array otherwise.
+                   None if the configuration failed.
+    :param error: error message if the configuration failed, otherwise None
+    """
+
+    resist: float | np.ndarray | None
+    error: str | None = None
+
+
+def _build(config: dict) -> Borehole:
+    bh = Borehole()
+    bh.init_from_dict(config)
+    return bh
+
+
+def _evaluate_one(config: dict, m_dot, temp, cache: DiskCache | None = None) -> BatchResult:
+    try:
+        if cache is not None:
+            # the borehole is only built if some of the points are not cached
+            resist = cache.get_or_compute(
+                config_hash(config), m_dot, temp, lambda m, t: _build(config).calc_bh_resist_array(m, t)
+            )
+            return BatchResult(float(resist) if resist.ndim == 0 else resist)
+
+        bh = _build(config)
+        if np.ndim(m_dot) == 0 and np.ndim(temp) == 0:
+            return BatchResult(bh.calc_bh_resist(m_dot, temp))
+        return BatchResult(bh.calc_bh_resist_array(m_dot, temp))
+    except Exception as e:  # noqa: BLE001
+        return BatchResult(None, f"{type(e).__name__}: {e}")
+
+
+def _evaluate_chunk(configs: list[dict], m_dot, temp, cache: DiskCache | None = None) -> list[BatchResult]:
+    return [_evaluate_one(config, m_dot, temp, cache) for config in configs]
+
+
+def evaluate(
+    configs: list[dict],
+    m_dot,
+    temp,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    cache: DiskCache | None = None,
+) -> list[BatchResult]:
+    """
+    Builds and evaluates many boreholes from init_from_dict inputs across a process pool.
+
+    Every configuration is evaluated at the same mass flow rates and temperatures. A configuration that fails to
+    build or evaluate produces a result with the error message, without affecting the rest of the batch.
+
+    With a cache, only the points that are not already stored for a configuration are evaluated, and the new
+    results are stored. Each worker process opens its own connection to the cache.
+
+    :param configs: list of Borehole.init_from_dict inputs
+    :param m_dot: total borehole mass flow rate, in kg/s. scalar or array_like
+    :param temp: average fluid temperature, in Celsius. scalar or array_like
+    :param workers: number of worker processes. defaults to the number of CPUs. 1 evaluates in this process
+    :param chunk_size: number of configurations sent to a worker at a time. defaults to spreading the
+                       configurations over four chunks per worker
+    :param cache: persistent result cache, or None
+    :return: one result per configuration, in input order
+    """
+
+    configs = list(configs)
+    if not configs:
+        return []
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"Invalid number of workers {workers}. Must be >= 1")
+
+    if chunk_size is None:
+        chunk_size = ceil(len(configs) / (4 * workers))
+    if chunk_size < 1:
+        raise ValueError(f"Invalid chunk size {chunk_size}. Must be >= 1")
+
+    chunks = [configs[i : i + chunk_size] for i in range(0, len(configs), chunk_size)]
+
+    if workers == 1 or len(chunks) == 1:
+        return _evaluate_chunk(configs, m_dot, temp, cache)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        for chunk_results in executor.map(
+            _evaluate_chunk, chunks, [m_dot] * len(chunks), [temp] * len(chunks), [cache] * len(chunks)
+        ):
+            results.extend(chunk_results)
+
+    return results
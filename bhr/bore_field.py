@@ -0,0 +1,111 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from bhr.borehole import Borehole
+from bhr.config_hash import config_hash
+from bhr.utilities import broadcast_inputs
+
+
+@dataclass(frozen=True)
+class BoreFieldResistance:
+    """
+    Effective borehole resistances of a bore field.
+
+    :param per_borehole: effective resistance of each borehole, K/(W/m), shape (number of boreholes, *timesteps)
+    :param field_average: length-weighted average effective resistance of the field, K/(W/m), shape (*timesteps)
+    """
+
+    per_borehole: np.ndarray
+    field_average: np.ndarray
+
+
+class BoreField:
+    """
+    Field of boreholes connected in parallel.
+
+    Boreholes with equivalent init_from_dict inputs, see config_hash, are grouped, and each group shares one
+    Borehole, so a field of many boreholes with a handful of distinct designs only evaluates each design once per
+    timestep. The total field flow is split evenly across the boreholes, which all see the same average fluid
+    temperature.
+    """
+
+    def __init__(self, configs: list[dict] | dict[str, dict]):
+        """
+        :param configs: list of Borehole.init_from_dict inputs, one per borehole, or a dict mapping borehole ids
+                        to inputs
+        """
+
+        # borehole ids, or list indices when configs is a list
+        self.ids: list[str] | list[int]
+        if isinstance(configs, dict):
+            self.ids = [str(bh_id) for bh_id in configs]
+            configs = list(configs.values())
+        else:
+            configs = list(configs)
+            self.ids = list(range(len(configs)))
+
+        if not configs:
+            raise ValueError("A bore field needs at least one borehole")
+
+        groups: dict[str, int] = {}
+        self.boreholes: list[Borehole] = []
+        group_index = []
+        lengths = []
+        for config in configs:
+            key = config_hash(config)
+            index = groups.get(key)
+            if index is None:
+                bh = Borehole()
+                bh.init_from_dict(config)
+                index = groups[key] = len(self.boreholes)
+                self.boreholes.append(bh)
+            group_index.append(index)
+            lengths.append(float(config["length"]))
+
+        self.group_index = np.array(group_index)
+        self.lengths = np.array(lengths)
+
+        # total length of each group, for the field average
+        self._group_lengths = np.bincount(self.group_index, weights=self.lengths, minlength=len(self.boreholes))
+        self._total_length = float(self.lengths.sum())
+
+    @property
+    def num_boreholes(self) -> int:
+        """
+        :return: number of boreholes in the field
+        """
+
+        return self.group_index.size
+
+    @property
+    def num_groups(self) -> int:
+        """
+        :return: number of distinct borehole definitions, each evaluated once per timestep
+        """
+
+        return len(self.boreholes)
+
+    def calc_bh_resist(self, field_mass_flow_rate, temperature) -> BoreFieldResistance:
+        """
+        Computes the effective resistance of every borehole, and of the field, for a series of timesteps.
+
+        Each group is evaluated in a single vectorized call. The field average is the length-weighted harmonic
+        mean of the borehole resistances, which is the resistance of a single borehole of the total field length
+        that transfers the same heat for the same fluid and borehole wall temperatures.
+
+        :param field_mass_flow_rate: total field mass flow rate, in kg/s. scalar or array_like
+        :param temperature: average fluid temperature, in Celsius. scalar or array_like
+        :return: per-borehole and field-average effective resistances
+        """
+
+        field_m_dot, temp = broadcast_inputs(field_mass_flow_rate, temperature)
+        m_dot = field_m_dot / self.num_boreholes
+
+        group_resist = np.stack([bh.calc_bh_resist_array(m_dot, temp) for bh in self.boreholes])
+        per_borehole = group_resist[self.group_index]
+
+        group_lengths = self._group_lengths.reshape((-1,) + (1,) * field_m_dot.ndim)
+        field_average = self._total_length / (group_lengths / group_resist).sum(axis=0)
+
+        return BoreFieldResistance(per_borehole, field_average)
@@ -1,20 +1,49 @@
-from typing import cast
+from typing import TYPE_CHECKING, cast
+
+import numpy as np
 
-from bhr.coaxial_borehole import Coaxial
-from bhr.double_u_borehole import DoubleUTube
 from bhr.enums import BoreholeType, BoundaryCondition
-from bhr.single_u_borehole import SingleUBorehole
+from bhr.resistance_breakdown import ResistanceBreakdown
+from bhr.result_cache import CacheInfo, ResultCache
 from bhr.utilities import set_boundary_condition_enum
 
-AnyBHType = Coaxial | DoubleUTube | SingleUBorehole | None
+# the borehole implementations, and the modules built on them, are imported on first use, so only the borehole
+# types that are actually constructed are loaded
+if TYPE_CHECKING:
+    from bhr.coaxial_borehole import Coaxial
+    from bhr.compiled_borehole import CompiledCoaxial, CompiledDoubleU, CompiledSingleU
+    from bhr.double_u_borehole import DoubleUTube
+    from bhr.kernels import KernelEvaluator
+    from bhr.multipole import MultipoleBorehole
+    from bhr.simulation import GFunction
+    from bhr.single_u_borehole import SingleUBorehole
+    from bhr.surrogate import BoreholeSurrogate
+
+    AnyBHType = Coaxial | DoubleUTube | SingleUBorehole | None
+    AnyCompiledBHType = CompiledCoaxial | CompiledDoubleU | CompiledSingleU
 
 
 class Borehole:
+    """
+    Borehole thermal resistance model. Call one of the init methods before computing resistances.
+
+    Thread safety: once initialized, a Borehole is not modified by any of its calc methods. Intermediate values
+    are passed between the calculation steps rather than stored on the object, so a single instance may be shared
+    by any number of threads, and concurrent calls return the same results as serial calls. Re-initializing an
+    instance while other threads are using it is not safe. The optional result cache, see enable_cache, and the
+    compiled evaluator kept by calc_bh_resist_with_grad are the only state a calc method changes. The result cache
+    is locked, and the evaluator is immutable, so a thread that compiles it again gets an identical one.
+    """
+
+    __slots__ = ("_bh", "_bh_type", "_boundary_condition", "_cache", "_compiled", "length")
+
     def __init__(self):
         self._bh_type = None
         self._boundary_condition = None
         self._bh: AnyBHType = None
-        self.length = None
+        self._cache: ResultCache | None = None
+        self._compiled: AnyCompiledBHType | None = None
+        self.length: float | None = None
 
     def init_single_u_borehole(
         self,
@@ -46,6 +75,8 @@ class Borehole:
         :param boundary_condition: borehole wall boundary condition. "UNIFORM_HEAT_FLUX" or "UNIFORM_BOREHOLE_WALL_TEMP"
         """
 
+        from bhr.single_u_borehole import SingleUBorehole  # noqa: PLC0415
+
         self._bh_type = BoreholeType.SINGLE_U_TUBE
         self._boundary_condition = set_boundary_condition_enum(boundary_condition)
         self._bh = SingleUBorehole(
@@ -60,6 +91,8 @@ class Borehole:
             fluid_type,
             fluid_concentration,
         )
+        self.length = length
+        self._clear_cache()
 
     def init_double_u_borehole(
         self,
@@ -93,6 +126,8 @@ class Borehole:
         :param boundary_condition: borehole wall boundary condition. "UNIFORM_HEAT_FLUX" or "UNIFORM_BOREHOLE_WALL_TEMP"
         """
 
+        from bhr.double_u_borehole import DoubleUTube  # noqa: PLC0415
+
         self._bh_type = BoreholeType.DOUBLE_U_TUBE
         self._boundary_condition = set_boundary_condition_enum(boundary_condition)
         self._bh = DoubleUTube(
@@ -108,6 +143,8 @@ class Borehole:
             fluid_type,
             fluid_concentration,
         )
+        self.length = length
+        self._clear_cache()
 
     def init_coaxial_borehole(
         self,
@@ -143,6 +180,8 @@ class Borehole:
         :param boundary_condition: borehole wall boundary condition. "UNIFORM_HEAT_FLUX" or "UNIFORM_BOREHOLE_WALL_TEMP"
         """
 
+        from bhr.coaxial_borehole import Coaxial  # noqa: PLC0415
+
         self._bh_type = BoreholeType.COAXIAL
         self._boundary_condition = set_boundary_condition_enum(boundary_condition)
         self._bh = Coaxial(
@@ -159,6 +198,8 @@ class Borehole:
             fluid_type,
             fluid_concentration,
         )
+        self.length = length
+        self._clear_cache()
 
     def init_from_dict(self, inputs: dict):
         """
@@ -261,6 +302,40 @@ class Borehole:
         else:
             raise NotImplementedError(f'bh_type "{self._bh_type.name}" not implemented')
 
+    def enable_cache(self, maxsize: int = 1024, m_dot_resolution: float = 1e-6, temp_resolution: float = 0.01) -> None:
+        """
+        Caches the results of calc_bh_resist, for callers that evaluate the same operating points repeatedly.
+
+        The inputs are rounded to the given resolutions, and results are computed at the rounded inputs, so calls
+        within half a resolution of each other return the same value. The cache is emptied whenever the borehole
+        is re-initialized. Calling this again replaces the cache with an empty one.
+
+        :param maxsize: maximum number of cached results. the least recently used result is evicted when full
+        :param m_dot_resolution: mass flow rates are rounded to a multiple of this, in kg/s
+        :param temp_resolution: temperatures are rounded to a multiple of this, in Celsius
+        """
+
+        self._cache = ResultCache(maxsize, m_dot_resolution, temp_resolution)
+
+    def disable_cache(self) -> None:
+        """
+        Stops caching the results of calc_bh_resist, and discards the cached results.
+        """
+
+        self._cache = None
+
+    def cache_info(self) -> CacheInfo | None:
+        """
+        :return: hit and miss counts and the size of the result cache, or None if caching is not enabled
+        """
+
+        return None if self._cache is None else self._cache.info()
+
+    def _clear_cache(self) -> None:
+        self._compiled = None
+        if self._cache is not None:
+            self._cache.clear()
+
     def calc_bh_resist(self, mass_flow_rate: float, temperature: float) -> float:
         """
         Computes the effective borehole thermal resistance.
@@ -270,6 +345,15 @@ class Borehole:
         :return: effective borehole resistance, in K/W-m
         """
 
+        if self._bh is None:
+            raise TypeError("Borehole not initialized")
+
+        if self._cache is not None:
+            return self._cache.get(mass_flow_rate, temperature, self._calc_bh_resist)
+
+        return self._calc_bh_resist(mass_flow_rate, temperature)
+
+    def _calc_bh_resist(self, mass_flow_rate: float, temperature: float) -> float:
         if self._bh is None:
             raise TypeError("Borehole not initialized")
 
@@ -281,6 +365,268 @@ class Borehole:
 
         raise NotImplementedError(f'Boundary Condition: "{self._boundary_condition}" implemented.')
 
+    def calc_bh_resist_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Computes the effective borehole thermal resistance for a series of flow rates and temperatures.
+
+        Vectorized version of calc_bh_resist. Inputs are broadcast against each other, so either may be a scalar.
+
+        :param m_dot: total borehole mass flow rate, in kg/s. scalar or array_like
+        :param temp: average fluid temperature, in Celsius. scalar or array_like
+        :return: effective borehole resistance, in K/W-m
+        """
+
+        if self._bh is None:
+            raise TypeError("Borehole not initialized")
+
+        if self._boundary_condition == BoundaryCondition.UNIFORM_HEAT_FLUX:
+            return self._bh.calc_effective_bh_resistance_uhf_array(m_dot, temp)
+
+        if self._boundary_condition == BoundaryCondition.UNIFORM_BOREHOLE_WALL_TEMP:
+            return self._bh.calc_effective_bh_resistance_ubwt_array(m_dot, temp)
+
+        raise NotImplementedError(f'Boundary Condition: "{self._boundary_condition}" implemented.')
+
+    def calc_bh_resist_with_grad(self, mass_flow_rate: float, temperature: float) -> tuple[float, float, float]:
+        """
+        Computes the effective borehole thermal resistance and its derivatives with respect to mass flow rate
+        and temperature.
+
+        The derivatives are exact, computed in forward mode through the fluid properties, the convection
+        correlations including the transition blend, and the boundary condition terms. Within the transition
+        bands the correlations are smooth, but the derivatives jump at the band limits, where the correlations
+        themselves are discontinuous.
+
+        :param mass_flow_rate: total borehole mass flow rate, in kg/s
+        :param temperature: average fluid temperature, in Celsius
+        :return: effective borehole resistance, in K/W-m, and its derivatives with respect to mass flow rate,
+                 in (K/W-m)/(kg/s), and temperature, in (K/W-m)/K
+        """
+
+        if self._compiled is None:
+            self._compiled = self.compile()
+        return self._compiled.calc_bh_resist_with_grad(mass_flow_rate, temperature)
+
+    def compile(self) -> "AnyCompiledBHType":
+        """
+        Compiles the borehole into an immutable evaluator.
+
+        Everything that depends only on the geometry, conductivities, fluid, and boundary condition is
+        computed once, so each call to the evaluator's calc_bh_resist only does the flow and temperature
+        dependent work. Results match calc_bh_resist to round-off. Later changes to this borehole
+        are not reflected in the evaluator.
+
+        :return: compiled evaluator, with calc_bh_resist(m_dot, temp) and calc_bh_resist_with_grad(m_dot, temp)
+                 methods
+        """
+
+        if self._bh is None:
+            raise TypeError("Borehole not initialized")
+
+        if self._boundary_condition == BoundaryCondition.UNIFORM_HEAT_FLUX:
+            uniform_heat_flux = True
+        elif self._boundary_condition == BoundaryCondition.UNIFORM_BOREHOLE_WALL_TEMP:
+            uniform_heat_flux = False
+        else:
+            raise NotImplementedError(f'Boundary Condition: "{self._boundary_condition}" implemented.')
+
+        from bhr.compiled_borehole import CompiledCoaxial, CompiledDoubleU, CompiledSingleU  # noqa: PLC0415
+
+        match self._bh_type:
+            case BoreholeType.SINGLE_U_TUBE:
+                return CompiledSingleU.from_borehole(cast("SingleUBorehole", self._bh), uniform_heat_flux)
+            case BoreholeType.DOUBLE_U_TUBE:
+                return CompiledDoubleU.from_borehole(cast("DoubleUTube", self._bh), uniform_heat_flux)
+            case BoreholeType.COAXIAL:
+                return CompiledCoaxial.from_borehole(cast("Coaxial", self._bh), uniform_heat_flux)
+            case _:
+                raise NotImplementedError(f"{self._bh_type} not implemented.")
+
+    def compile_kernel(self, backend: str | None = None) -> "KernelEvaluator":
+        """
+        Compiles the borehole into an evaluator that runs on a selectable compute backend.
+
+        The evaluator runs the closed-form calculation of compile() with fluid properties interpolated from a
+        table. A tabulated fluid, see bhr.fluid.enable_tabulated_fluids, keeps its grid and interpolation method,
+        so results match calc_bh_resist. Other fluids are tabulated with the TabulatedFluid defaults. With the
+        "numba" backend, once the kernels have been compiled, a scalar call costs about 0.8 us, mostly Python call
+        overhead, and calc_bh_resist_array about 0.2 us per point.
+
+        :param backend: "python" or "numba". defaults to the backend selected with bhr.kernels.set_backend
+        :return: evaluator, with calc_bh_resist(m_dot, temp) and calc_bh_resist_array(m_dot, temp) methods
+        """
+
+        from bhr.kernels import KernelEvaluator  # noqa: PLC0415
+
+        return KernelEvaluator(self.compile(), backend)
+
+    def compile_multipole(self, order: int = 3) -> "MultipoleBorehole":
+        """
+        Compiles a single or double u-tube borehole into an evaluator whose local and internal resistances are
+        computed by the multipole method to the given order, rather than by the first-order closed forms.
+
+        The geometry dependent part of the multipole system is solved and projected once, so the local and internal
+        resistances at each point are short sums over the multipole modes, with no matrix inverse. Over arrays, at
+        order 3, the evaluator costs about 2 to 3 times the closed form of calc_bh_resist_array, about 0.3 to 0.45 us
+        per point against 0.12 to 0.19 us. A scalar call adds a few microseconds to the pipe resistance and fluid
+        properties, within about 1.5 times calc_bh_resist. At order 1 the results match calc_bh_resist.
+
+        :param order: highest multipole order, >= 1. 3 is within a fraction of a percent of the converged result
+                      for common geometries
+        :return: evaluator, with calc_bh_resist(m_dot, temp) and calc_bh_resist_array(m_dot, temp) methods
+        """
+
+        if self._bh is None:
+            raise TypeError("Borehole not initialized")
+
+        if self._boundary_condition == BoundaryCondition.UNIFORM_HEAT_FLUX:
+            uniform_heat_flux = True
+        elif self._boundary_condition == BoundaryCondition.UNIFORM_BOREHOLE_WALL_TEMP:
+            uniform_heat_flux = False
+        else:
+            raise NotImplementedError(f'Boundary Condition: "{self._boundary_condition}" implemented.')
+
+        from bhr.multipole import MultipoleBorehole  # noqa: PLC0415
+
+        match self._bh_type:
+            case BoreholeType.SINGLE_U_TUBE:
+                return MultipoleBorehole.from_single_u(self._bh, uniform_heat_flux, order)
+            case BoreholeType.DOUBLE_U_TUBE:
+                return MultipoleBorehole.from_double_u(self._bh, uniform_heat_flux, order)
+            case _:
+                raise NotImplementedError(f"Multipole resistances of {self._bh_type} not implemented.")
+
+    def build_surrogate(
+        self,
+        m_dot_range: tuple[float, float],
+        temp_range: tuple[float, float],
+        rtol: float = 1e-4,
+        out_of_range: str = "fallback",
+    ) -> "BoreholeSurrogate":
+        """
+        Builds an interpolation table of the effective borehole resistance over an operating envelope.
+
+        The table is refined until the relative error against calc_bh_resist is below rtol. The returned
+        surrogate has the same calc_bh_resist and calc_bh_resist_array methods as the borehole.
+
+        :param m_dot_range: (lower, upper) limits of the total borehole mass flow rate, in kg/s
+        :param temp_range: (lower, upper) limits of the average fluid temperature, in Celsius
+        :param rtol: relative error tolerance
+        :param out_of_range: behavior for queries outside the envelope. "fallback" or "raise"
+        :return: surrogate
+        """
+
+        if self._bh is None:
+            raise TypeError("Borehole not initialized")
+
+        from bhr.surrogate import BoreholeSurrogate  # noqa: PLC0415
+
+        return BoreholeSurrogate(self, m_dot_range, temp_range, rtol, out_of_range)
+
+    def calc_gfunction(
+        self,
+        coordinates,
+        burial_depth: float = 4.0,
+        lntts=None,
+        workers: int = 1,
+        cache_dir=None,
+    ) -> "GFunction":
+        """
+        Computes the finite line source g-function of a field of boreholes with the length and diameter of this
+        borehole, see bhr.gfunction.fls_gfunction.
+
+        :param coordinates: borehole (x, y) positions, in m. array_like of shape (number of boreholes, 2)
+        :param burial_depth: depth of the top of the boreholes, in m
+        :param lntts: ln(t/ts) at which to evaluate the g-function, increasing. defaults to DEFAULT_LNTTS
+        :param workers: number of worker processes. 1 evaluates in this process
+        :param cache_dir: directory of cached g-functions, or None
+        :return: g-function
+        """
+
+        if self._bh is None or self.length is None:
+            raise TypeError("Borehole not initialized")
+
+        from bhr.gfunction import fls_gfunction  # noqa: PLC0415
+
+        return fls_gfunction(
+            coordinates, self.length, self._bh.borehole_diameter / 2, burial_depth, lntts, workers, cache_dir
+        )
+
+    def solve_mass_flow_for_resist(
+        self,
+        target,
+        temperature,
+        m_dot_range: tuple[float, float] = (0.001, 10.0),
+        rtol: float = 1e-9,
+    ):
+        """
+        Finds the smallest mass flow rate at which the effective borehole resistance falls to a target.
+
+        :param target: target effective borehole resistance, in K/W-m. scalar or array_like
+        :param temperature: average fluid temperature, in Celsius. scalar or array_like
+        :param m_dot_range: (lower, upper) limits of the total borehole mass flow rate searched, in kg/s
+        :param rtol: relative tolerance on the mass flow rate
+        :return: total borehole mass flow rate, in kg/s, at which the resistance is at or below the target, to
+                 round-off. nan where the target is not crossed within m_dot_range. float for scalar inputs,
+                 otherwise an array
+        """
+
+        if self._bh is None:
+            raise TypeError("Borehole not initialized")
+
+        from bhr.solvers import mass_flow_for_resist  # noqa: PLC0415
+
+        return mass_flow_for_resist(self, target, temperature, m_dot_range, rtol)
+
+    def solve_mass_flow_for_reynolds(self, reynolds, temperature):
+        """
+        Finds the mass flow rate at which the lowest Reynolds number of the borehole's flow passages equals
+        a target, e.g. the smallest flow that keeps every pipe, or the pipe and annulus, turbulent.
+
+        :param reynolds: target Reynolds number. scalar or array_like
+        :param temperature: average fluid temperature, in Celsius. scalar or array_like
+        :return: total borehole mass flow rate, in kg/s. float for scalar inputs, otherwise an array
+        """
+
+        if self._bh is None:
+            raise TypeError("Borehole not initialized")
+
+        from bhr.solvers import mass_flow_for_reynolds  # noqa: PLC0415
+
+        return mass_flow_for_reynolds(self._bh, reynolds, temperature)
+
+    def calc_resistances(self, mass_flow_rate: float, temperature: float) -> ResistanceBreakdown:
+        """
+        Computes every resistance component of the borehole at once, evaluating the fluid properties
+        and pipe resistances a single time.
+
+        :param mass_flow_rate: total borehole mass flow rate, in kg/s
+        :param temperature: average fluid temperature, in Celsius
+        :return: resistance breakdown, including the effective resistance for both boundary conditions
+        """
+
+        if self._bh is None:
+            raise TypeError("Borehole not initialized")
+
+        return self._bh.calc_resistances(mass_flow_rate, temperature)
+
+    def calc_resistances_array(self, m_dot, temp) -> dict[str, np.ndarray]:
+        """
+        Computes every resistance component of the borehole for a series of flow rates and temperatures.
+
+        Vectorized version of calc_resistances. Inputs are broadcast against each other, so either may be a scalar.
+
+        :param m_dot: total borehole mass flow rate, in kg/s. scalar or array_like
+        :param temp: average fluid temperature, in Celsius. scalar or array_like
+        :return: dict mapping the ResistanceBreakdown field names to arrays. flow regimes are an object array of
+                 FlowRegime members
+        """
+
+        if self._bh is None:
+            raise TypeError("Borehole not initialized")
+
+        return self._bh.calc_resistances_array(m_dot, temp)
+
     def calc_pipe_cond_resist(self) -> float:
         """
         Computes the pipe conduction resistance.
@@ -292,11 +638,11 @@ class Borehole:
 
         match self._bh_type:
             case BoreholeType.SINGLE_U_TUBE:
-                return cast(SingleUBorehole, self._bh).calc_cond_resist()
+                return cast("SingleUBorehole", self._bh).calc_cond_resist()
             case BoreholeType.DOUBLE_U_TUBE:
-                return cast(DoubleUTube, self._bh).calc_cond_resist()
+                return cast("DoubleUTube", self._bh).calc_cond_resist()
             case BoreholeType.COAXIAL:
-                return cast(Coaxial, self._bh).calc_cond_resist()[1]
+                return cast("Coaxial", self._bh).calc_cond_resist()[1]
             case _:
                 raise NotImplementedError(f"{self._bh_type} not implemented.")
 
@@ -312,11 +658,35 @@ class Borehole:
 
         match self._bh_type:
             case BoreholeType.SINGLE_U_TUBE:
-                return cast(SingleUBorehole, self._bh).calc_conv_resist(mass_flow_rate, temperature)
+                return cast("SingleUBorehole", self._bh).calc_conv_resist(mass_flow_rate, temperature)
             case BoreholeType.DOUBLE_U_TUBE:
-                return cast(DoubleUTube, self._bh).calc_conv_resist(mass_flow_rate, temperature)
+                return cast("DoubleUTube", self._bh).calc_conv_resist(mass_flow_rate, temperature)
             case BoreholeType.COAXIAL:
-                return sum(cast(Coaxial, self._bh).calc_conv_resist_annulus(mass_flow_rate, temperature))
+                return sum(cast("Coaxial", self._bh).calc_conv_resist_annulus(mass_flow_rate, temperature))
+            case _:
+                raise NotImplementedError(f"{self._bh_type} not implemented.")
+
+    def calc_fluid_resist_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Computes the fluid convection resistance for a series of flow rates and temperatures.
+
+        Vectorized version of calc_fluid_resist.
+
+        :param m_dot: total borehole mass flow rate, in kg/s. scalar or array_like
+        :param temp: average fluid temperature, in Celsius. scalar or array_like
+        :return: fluid convection, K/(W/m)
+        """
+
+        match self._bh_type:
+            case BoreholeType.SINGLE_U_TUBE:
+                return cast("SingleUBorehole", self._bh).calc_conv_resist_array(m_dot, temp)
+            case BoreholeType.DOUBLE_U_TUBE:
+                return cast("DoubleUTube", self._bh).calc_conv_resist_array(m_dot, temp)
+            case BoreholeType.COAXIAL:
+                r_conv_outside_inner_pipe, r_conv_inside_outer_pipe = cast(
+                    "Coaxial", self._bh
+                ).calc_conv_resist_annulus_array(m_dot, temp)
+                return r_conv_outside_inner_pipe + r_conv_inside_outer_pipe
             case _:
                 raise NotImplementedError(f"{self._bh_type} not implemented.")
 
@@ -337,3 +707,61 @@ class Borehole:
             raise NotImplementedError(f"{self._bh_type} not implemented.")
 
         return self._bh.calc_fluid_pipe_resist(mass_flow_rate, temperature)
+
+    def calc_fluid_pipe_resist_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Computes the fluid convection + pipe conduction resistance for a series of flow rates and temperatures.
+
+        Vectorized version of calc_fluid_pipe_resist.
+
+        :param m_dot: total borehole mass flow rate, in kg/s. scalar or array_like
+        :param temp: average fluid temperature, in Celsius. scalar or array_like
+        :return: fluid convection + pipe conduction resistance, K/(W/m)
+        """
+
+        if self._bh is None:
+            raise TypeError("Borehole not initialized")
+
+        if self._bh_type is None:
+            raise NotImplementedError(f"{self._bh_type} not implemented.")
+
+        return self._bh.calc_fluid_pipe_resist_array(m_dot, temp)
+
+    def calc_pressure_loss(self, mass_flow_rate: float, temperature: float) -> float:
+        """
+        Computes the pressure loss of the flow through the borehole.
+
+        A double u-tube splits the flow evenly between its two u-tubes. A coaxial borehole includes the inner pipe
+        and the annulus.
+
+        :param mass_flow_rate: total borehole mass flow rate, in kg/s
+        :param temperature: average fluid temperature, in Celsius
+        :return: pressure loss, in Pa
+        """
+
+        if self._bh is None:
+            raise TypeError("Borehole not initialized")
+
+        if self._bh_type == BoreholeType.DOUBLE_U_TUBE:
+            return self._bh.pressure_loss(mass_flow_rate / 2, temperature)
+
+        return self._bh.pressure_loss(mass_flow_rate, temperature)
+
+    def calc_pressure_loss_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Computes the pressure loss of the flow through the borehole for a series of flow rates and temperatures.
+
+        Vectorized version of calc_pressure_loss.
+
+        :param m_dot: total borehole mass flow rate, in kg/s. scalar or array_like
+        :param temp: average fluid temperature, in Celsius. scalar or array_like
+        :return: pressure loss, in Pa
+        """
+
+        if self._bh is None:
+            raise TypeError("Borehole not initialized")
+
+        if self._bh_type == BoreholeType.DOUBLE_U_TUBE:
+            return self._bh.pressure_loss_array(np.asarray(m_dot, dtype=float) / 2, temp)
+
+        return self._bh.pressure_loss_array(m_dot, temp)
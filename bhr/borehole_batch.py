@@ -0,0 +1,357 @@
+"""
+Struct-of-arrays evaluation of many boreholes of one type.
+
+A batch holds the inputs of N boreholes as NumPy columns, one value per borehole, rather than N Borehole objects.
+The rows are compiled into the evaluators of bhr.compiled_borehole, with one value per borehole in each constant,
+one evaluator for each boundary condition, and for double u-tubes each inlet arrangement, present in the batch.
+Each call evaluates the formulas over every row at once. All boreholes of a batch share one fluid, so the fluid
+properties are evaluated once per temperature.
+"""
+
+from typing import Any
+
+import numpy as np
+
+from bhr.compiled_borehole import CompiledCoaxial, CompiledDoubleU, CompiledSingleU
+from bhr.double_u_borehole import double_u_shank_space_limits
+from bhr.enums import BoreholeType, BoundaryCondition, DoubleUPipeInletArrangement
+from bhr.fluid import eval_property_array, get_fluid
+
+# inputs that must be the same for every row of a batch
+_SHARED_INPUTS = ("fluid_type", "fluid_concentration")
+
+
+def _table_columns(table) -> dict:
+    """
+    :param table: mapping of column names to values, e.g. a dict of lists or arrays, or a DataFrame
+    :return: dict of column names to arrays
+    """
+
+    return {name: np.asarray(table[name]) for name in table.keys()}  # noqa: SIM118
+
+
+def _flatten_config(config: dict) -> dict:
+    """
+    Flattens a Borehole.init_from_dict input to one level, merging the pipe inputs into the borehole inputs.
+
+    :param config: Borehole.init_from_dict input
+    :return: flat dict of inputs
+    """
+
+    flat = {}
+    for key, value in config.items():
+        if isinstance(value, dict):
+            flat.update(value)
+        else:
+            flat[key] = value
+    return flat
+
+
+def _batch_class(borehole_type: str) -> type["BoreholeBatch"]:
+    """
+    :param borehole_type: "SINGLE_U_TUBE", "DOUBLE_U_TUBE", or "COAXIAL", in any case
+    :return: batch class for the borehole type
+    """
+
+    for cls in (SingleUBatch, DoubleUBatch, CoaxialBatch):
+        if cls.borehole_type.name == borehole_type.upper():
+            return cls
+    raise LookupError(f'borehole_type "{borehole_type.upper()}" not supported')
+
+
+def _single_value(name: str, values) -> Any:
+    """
+    :param name: input name, for the error message
+    :param values: scalar or array of values
+    :return: the value, if every element is the same
+    """
+
+    unique = np.unique(np.asarray(values))
+    if unique.size != 1:
+        raise ValueError(f"Every borehole of a batch must have the same {name}, got {unique.tolist()}")
+    return unique[0].item()
+
+
+class BoreholeBatch:
+    """
+    Inputs of many boreholes of one type, held as columns, and evaluated together.
+
+    Construct one of SingleUBatch, DoubleUBatch, or CoaxialBatch directly from columns, or any of them with
+    from_dicts or from_table, which pick the class from the borehole type.
+    """
+
+    borehole_type: BoreholeType
+
+    # numeric inputs, one value per borehole
+    numeric_columns: tuple[str, ...]
+
+    def __init__(
+        self,
+        fluid_type: str,
+        fluid_concentration: float = 0,
+        boundary_condition="UNIFORM_HEAT_FLUX",
+        **columns,
+    ):
+        """
+        :param fluid_type: fluid type, shared by every borehole. "ETHYLALCOHOL", "ETHYLENEGLYCOL", "METHYLALCOHOL",
+                           "PROPYLENEGLYCOL", or "WATER"
+        :param fluid_concentration: fractional concentration of antifreeze mixture, from 0-0.6.
+        :param boundary_condition: borehole wall boundary condition. "UNIFORM_HEAT_FLUX" or
+                                   "UNIFORM_BOREHOLE_WALL_TEMP". a single value or one per borehole
+        :param columns: the numeric_columns inputs of the batch class, each a single value or one per borehole,
+                        in the units of Borehole.init_from_dict
+        """
+
+        missing = sorted(set(self.numeric_columns) - set(columns))
+        if missing:
+            raise ValueError(f"Missing columns for a {type(self).__name__}: {missing}")
+
+        self.fluid = get_fluid(fluid_type, fluid_concentration)
+        self.fluid_type = fluid_type.upper()
+        self.fluid_concentration = fluid_concentration
+
+        arrays = np.broadcast_arrays(
+            np.asarray(boundary_condition, dtype=object),
+            *(np.asarray(columns[name], dtype=float) for name in self.numeric_columns),
+        )
+        if any(array.ndim != 1 for array in arrays):
+            raise ValueError("Batch columns must be one-dimensional, with one value per borehole")
+
+        self.columns = {name: array.copy() for name, array in zip(self.numeric_columns, arrays[1:])}
+        bc_names = {bc.name for bc in BoundaryCondition}
+        boundary_condition = np.array([str(bc).upper() for bc in arrays[0]])
+        invalid = sorted(set(boundary_condition.tolist()) - bc_names)
+        if invalid:
+            raise ValueError(f"Invalid boundary condition: {invalid}")
+        self.uniform_heat_flux = boundary_condition == BoundaryCondition.UNIFORM_HEAT_FLUX.name
+
+        self._compile()
+
+    def __len__(self) -> int:
+        return self.uniform_heat_flux.size
+
+    @classmethod
+    def from_table(cls, table) -> "BoreholeBatch":
+        """
+        Builds a batch from a table with one row per borehole.
+
+        The columns are named after the Borehole.init_from_dict inputs, with the pipe inputs at the same level as
+        the borehole inputs, e.g. "pipe_outer_diameter" rather than "single_u_tube" / "pipe_outer_diameter".
+        A dict may give single values for inputs that every borehole shares. The fluid must be the same on every
+        row. When called on BoreholeBatch, the table needs a "borehole_type" column, with one type throughout.
+
+        :param table: mapping of column names to values, e.g. a dict of lists or arrays, or a pandas DataFrame
+        :return: batch
+        """
+
+        columns = _table_columns(table)
+
+        if "borehole_type" in columns:
+            batch_cls = _batch_class(_single_value("borehole_type", columns.pop("borehole_type")))
+            if cls is not BoreholeBatch and batch_cls is not cls:
+                raise ValueError(f"A {cls.__name__} cannot hold {batch_cls.borehole_type.name} boreholes")
+        elif cls is BoreholeBatch:
+            raise ValueError('A table needs a "borehole_type" column to choose the batch type')
+        else:
+            batch_cls = cls
+
+        if "fluid_type" not in columns:
+            raise ValueError('A table needs a "fluid_type" column')
+        shared = {name: _single_value(name, columns.pop(name)) for name in _SHARED_INPUTS if name in columns}
+
+        return batch_cls(**shared, **columns)
+
+    @classmethod
+    def from_dicts(cls, configs: list[dict]) -> "BoreholeBatch":
+        """
+        Builds a batch from a list of Borehole.init_from_dict inputs, which must all have the same borehole type
+        and fluid.
+
+        :param configs: list of Borehole.init_from_dict inputs, one per borehole
+        :return: batch
+        """
+
+        rows = [_flatten_config(config) for config in configs]
+        if not rows:
+            raise ValueError("A batch needs at least one borehole")
+
+        names = {name for row in rows for name in row}
+        table = {}
+        for name in names:
+            if name == "boundary_condition":
+                table[name] = [row.get(name, BoundaryCondition.UNIFORM_HEAT_FLUX.name) for row in rows]
+            elif name == "fluid_concentration":
+                table[name] = [row.get(name, 0) for row in rows]
+            else:
+                try:
+                    table[name] = [row[name] for row in rows]
+                except KeyError:
+                    raise ValueError(f'Every borehole of a batch needs a "{name}" input') from None
+        return cls.from_table(table)
+
+    def calc_bh_resist(self, m_dot, temp) -> np.ndarray:
+        """
+        Computes the effective borehole thermal resistance of every borehole.
+
+        The inputs are broadcast against the boreholes, so scalars apply to every borehole, and arrays of length N
+        give one value per borehole. An array of shape (timesteps, 1) evaluates every borehole at each timestep.
+
+        :param m_dot: total borehole mass flow rate, in kg/s. scalar or array_like
+        :param temp: average fluid temperature, in Celsius. scalar or array_like
+        :return: effective borehole resistance, in K/W-m, with shape (..., N)
+        """
+
+        m_dot, temp, _ = np.broadcast_arrays(
+            np.asarray(m_dot, dtype=float), np.asarray(temp, dtype=float), self.uniform_heat_flux
+        )
+        mu = eval_property_array(self.fluid.mu, temp)
+        k = eval_property_array(self.fluid.k, temp)
+        cp = eval_property_array(self.fluid.cp, temp)
+
+        if len(self._evaluators) == 1:
+            return self._evaluators[0][1]._calc_bh_resist(m_dot, mu, k, cp)
+
+        resist = np.empty(m_dot.shape)
+        for rows, evaluator in self._evaluators:
+            resist[..., rows] = evaluator._calc_bh_resist(m_dot[..., rows], mu[..., rows], k[..., rows], cp[..., rows])
+        return resist
+
+    def _compile(self) -> None:
+        """
+        Compiles the rows into one evaluator for each combination of the _row_options present in the batch.
+        """
+
+        options = self._row_options()
+        keys = np.stack(list(options.values()), axis=-1)
+        unique_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+
+        self._evaluators: list[tuple[np.ndarray, CompiledSingleU | CompiledDoubleU | CompiledCoaxial]] = []
+        for i, key in enumerate(unique_keys):
+            rows = np.flatnonzero(inverse.ravel() == i)
+            columns = {name: column[rows] for name, column in self.columns.items()}
+            self._evaluators.append((rows, self._compile_rows(columns, dict(zip(options, key.tolist())))))
+
+    def _row_options(self) -> dict[str, np.ndarray]:
+        """
+        :return: options that may differ from row to row, but that a compiled evaluator takes as a single value
+        """
+
+        return {"uniform_heat_flux": self.uniform_heat_flux}
+
+    def _compile_rows(self, columns: dict, options: dict) -> CompiledSingleU | CompiledDoubleU | CompiledCoaxial:
+        """
+        :param columns: numeric columns of the rows
+        :param options: _row_options values shared by the rows
+        :return: compiled evaluator for the rows
+        """
+
+        raise NotImplementedError
+
+
+class SingleUBatch(BoreholeBatch):
+    """
+    Grouted single u-tube boreholes, see SingleUBorehole.
+    """
+
+    borehole_type = BoreholeType.SINGLE_U_TUBE
+    numeric_columns = (
+        "borehole_diameter",
+        "pipe_outer_diameter",
+        "pipe_dimension_ratio",
+        "length",
+        "shank_space",
+        "pipe_conductivity",
+        "grout_conductivity",
+        "soil_conductivity",
+    )
+
+    def _compile_rows(self, columns: dict, options: dict) -> CompiledSingleU:
+        return CompiledSingleU.from_geometry(**columns, fluid=self.fluid, **options)
+
+
+class DoubleUBatch(BoreholeBatch):
+    """
+    Grouted boreholes with parallel double u-tubes, see DoubleUTube.
+    """
+
+    borehole_type = BoreholeType.DOUBLE_U_TUBE
+    numeric_columns = SingleUBatch.numeric_columns
+
+    def __init__(
+        self,
+        fluid_type: str,
+        fluid_concentration: float = 0,
+        boundary_condition="UNIFORM_HEAT_FLUX",
+        pipe_inlet_arrangement="ADJACENT",
+        **columns,
+    ):
+        """
+        :param pipe_inlet_arrangement: arrangement of the pipe inlets. "ADJACENT", or "DIAGONAL". a single value
+                                       or one per borehole
+        :param columns: see BoreholeBatch
+        """
+
+        self._pipe_inlet_arrangement = pipe_inlet_arrangement
+        super().__init__(fluid_type, fluid_concentration, boundary_condition, **columns)
+
+    def _compile(self) -> None:
+        arrangement = np.array(
+            [str(x).upper() for x in np.broadcast_to(np.asarray(self._pipe_inlet_arrangement), (len(self),))]
+        )
+        invalid = sorted(set(arrangement.tolist()) - set(DoubleUPipeInletArrangement._member_names_))
+        if invalid:
+            raise ValueError(f"Invalid pipe_inlet_arrangement: {invalid}")
+        self.diagonal = arrangement == DoubleUPipeInletArrangement.DIAGONAL.name
+        del self._pipe_inlet_arrangement
+
+        c = self.columns
+        lower_limit, upper_limit = double_u_shank_space_limits(c["borehole_diameter"], c["pipe_outer_diameter"])
+        invalid_rows = np.flatnonzero((c["shank_space"] < lower_limit) | (c["shank_space"] > upper_limit))
+        if invalid_rows.size:
+            raise ValueError(
+                f"Invalid shank spacing in rows {invalid_rows.tolist()}. Must be between "
+                "the 2 pipe radii and the borehole radius minus the pipe radius"
+            )
+
+        super()._compile()
+
+    def _row_options(self) -> dict[str, np.ndarray]:
+        return {**super()._row_options(), "diagonal": self.diagonal}
+
+    def _compile_rows(self, columns: dict, options: dict) -> CompiledDoubleU:
+        return CompiledDoubleU.from_geometry(**columns, fluid=self.fluid, **options)
+
+
+class CoaxialBatch(BoreholeBatch):
+    """
+    Grouted coaxial boreholes, see Coaxial.
+    """
+
+    borehole_type = BoreholeType.COAXIAL
+    numeric_columns = (
+        "borehole_diameter",
+        "outer_pipe_outer_diameter",
+        "outer_pipe_dimension_ratio",
+        "outer_pipe_conductivity",
+        "inner_pipe_outer_diameter",
+        "inner_pipe_dimension_ratio",
+        "inner_pipe_conductivity",
+        "length",
+        "grout_conductivity",
+        "soil_conductivity",
+    )
+
+    def _compile_rows(self, columns: dict, options: dict) -> CompiledCoaxial:
+        return CompiledCoaxial.from_geometry(
+            borehole_diameter=columns["borehole_diameter"],
+            outer_pipe_outer_diameter=columns["outer_pipe_outer_diameter"],
+            outer_pipe_dimension_ratio=columns["outer_pipe_dimension_ratio"],
+            outer_pipe_conductivity=columns["outer_pipe_conductivity"],
+            inner_pipe_outer_diameter=columns["inner_pipe_outer_diameter"],
+            inner_pipe_dimension_ratio=columns["inner_pipe_dimension_ratio"],
+            inner_pipe_conductivity=columns["inner_pipe_conductivity"],
+            length=columns["length"],
+            grout_conductivity=columns["grout_conductivity"],
+            fluid=self.fluid,
+            **options,
+        )
@@ -0,0 +1,198 @@
+"""
+Command line interface for bulk borehole resistance calculations.
+
+Only the standard library is imported at module level, so startup stays fast. The calculation modules, and with
+them numpy and SecondaryCoolantProps, are imported once the arguments have been parsed.
+"""
+
+import argparse
+import json
+import sys
+from time import perf_counter
+
+
+class _Profile:
+    """
+    Accumulates the wall time spent in each stage of a run.
+    """
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.stages: dict[str, float] = {}
+
+    def add(self, stage: str, start: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + perf_counter() - start
+
+    def timed(self, stage: str, iterator):
+        """
+        Wraps an iterator, charging the time spent producing each item to a stage.
+        """
+
+        iterator = iter(iterator)
+        while True:
+            start = perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(stage, start)
+                return
+            self.add(stage, start)
+            yield item
+
+    def report(self) -> None:
+        if not self.enabled:
+            return
+        total = sum(self.stages.values())
+        for stage, seconds in self.stages.items():
+            print(f"{stage:<12} {seconds:10.4f} s", file=sys.stderr)
+        print(f"{'total':<12} {total:10.4f} s", file=sys.stderr)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="bhr",
+        description="Compute effective borehole thermal resistances for a file of operating points.",
+        epilog=(
+            "CONFIGS is a JSON file holding a single Borehole.init_from_dict input, a list of inputs, or an object "
+            "mapping borehole ids to inputs. A single input is evaluated at every operating point. A list of "
+            "inputs is evaluated at every operating point, config by config, across --workers processes. Inputs "
+            "keyed by borehole id are matched to each operating point through --id-column."
+        ),
+    )
+    parser.add_argument("configs", help="JSON file of borehole inputs")
+    parser.add_argument("operating_points", help="CSV, JSON, or Parquet file of mass flow rates and temperatures")
+    parser.add_argument("-o", "--output", required=True, help="CSV, JSON, or Parquet output file")
+    parser.add_argument("--m-dot-column", default="m_dot", help='mass flow rate column, kg/s. default: "m_dot"')
+    parser.add_argument("--temp-column", default="temp", help='temperature column, C. default: "temp"')
+    parser.add_argument("--id-column", default=None, help="borehole id column, for configs keyed by borehole id")
+    parser.add_argument("--breakdown", action="store_true", help="also write the resistance breakdown")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes. default: 1")
+    parser.add_argument(
+        "--chunk-size", type=int, default=100_000, help="operating points read at a time. default: 100000"
+    )
+    parser.add_argument("--cache", default=None, help="SQLite file of cached results, reused between runs")
+    parser.add_argument(
+        "--cache-max-entries",
+        type=int,
+        default=10_000_000,
+        help="results kept in the cache, least recently used evicted first. default: 10000000",
+    )
+    parser.add_argument("--profile", action="store_true", help="print the time spent in each stage to stderr")
+    return parser
+
+
+def _open_cache(args, profile: _Profile):
+    if args.cache is None:
+        return None
+
+    start = perf_counter()
+    from bhr.disk_cache import DiskCache  # noqa: PLC0415
+
+    cache = DiskCache(args.cache, max_entries=args.cache_max_entries)
+    profile.add("cache", start)
+    return cache
+
+
+def _run_streaming(args, configs, cache, profile: _Profile) -> int:
+    start = perf_counter()
+    from bhr.streaming import ChunkWriter, evaluate_chunks, read_chunks  # noqa: PLC0415
+
+    profile.add("import", start)
+
+    chunks = profile.timed("read", read_chunks(args.operating_points, args.chunk_size))
+    results = evaluate_chunks(
+        chunks,
+        configs,
+        args.m_dot_column,
+        args.temp_column,
+        args.id_column,
+        args.breakdown,
+        args.workers,
+        cache,
+    )
+
+    with ChunkWriter(args.output) as writer:
+        for chunk in profile.timed("evaluate", results):
+            start = perf_counter()
+            writer.write(chunk)
+            profile.add("write", start)
+
+    # reading happens while the evaluation stage pulls chunks, so it is not charged twice
+    profile.stages["evaluate"] -= profile.stages.get("read", 0.0)
+    return writer.rows_written
+
+
+def _run_config_list(args, configs: list, cache, profile: _Profile) -> int:
+    start = perf_counter()
+    import numpy as np  # noqa: PLC0415
+
+    from bhr.batch import evaluate  # noqa: PLC0415
+    from bhr.streaming import ChunkWriter, read_chunks  # noqa: PLC0415
+
+    profile.add("import", start)
+
+    with ChunkWriter(args.output) as writer:
+        for chunk in profile.timed("read", read_chunks(args.operating_points, args.chunk_size)):
+            start = perf_counter()
+            m_dot = np.asarray(chunk[args.m_dot_column], dtype=float)
+            temp = np.asarray(chunk[args.temp_column], dtype=float)
+            results = evaluate(configs, m_dot, temp, workers=args.workers, cache=cache)
+            profile.add("evaluate", start)
+
+            start = perf_counter()
+            for i, result in enumerate(results):
+                resist = np.full(m_dot.size, np.nan) if result.resist is None else result.resist
+                writer.write(
+                    {
+                        "config": [i] * m_dot.size,
+                        **chunk,
+                        "bh_resist": resist,
+                        "error": [result.error or ""] * m_dot.size,
+                    }
+                )
+            profile.add("write", start)
+
+    return writer.rows_written
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Entry point for the bhr command.
+
+    :param argv: command line arguments. defaults to sys.argv
+    :return: exit status
+    """
+
+    args = _parser().parse_args(argv)
+    profile = _Profile(args.profile)
+    cache = None
+
+    try:
+        start = perf_counter()
+        with open(args.configs) as f:
+            configs = json.load(f)
+        profile.add("configs", start)
+
+        if isinstance(configs, list) and (args.id_column is not None or args.breakdown):
+            raise ValueError("--id-column and --breakdown are not supported for a list of configs")
+
+        cache = _open_cache(args, profile)
+        if isinstance(configs, list):
+            rows = _run_config_list(args, configs, cache, profile)
+        else:
+            rows = _run_streaming(args, configs, cache, profile)
+    except (ImportError, LookupError, OSError, ValueError) as e:
+        print(f"bhr: error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if cache is not None:
+            cache.close()
+
+    profile.report()
+    if args.profile:
+        print(f"{rows} rows written to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,80 @@
 from math import log, pi
-
-from bhr.fluid import get_fluid
-from bhr.pipe import Pipe
-from bhr.utilities import coth, smoothing_function
+from typing import Any
+
+import numpy as np
+
+from bhr import dual
+from bhr.enums import FlowRegime
+from bhr.fluid import eval_property_array, get_fluid
+from bhr.pipe import PIPE_HIGH_REYNOLDS, PIPE_LOW_REYNOLDS, Pipe, pipe_friction_factor_array
+from bhr.resistance_breakdown import ResistanceBreakdown
+from bhr.utilities import broadcast_inputs, coth, coth_array, smoothing_function, smoothing_function_array
+
+# limits of the transitional region of the annulus Nusselt number correlations, see Coaxial.calc_nusselt_annulus
+ANNULUS_LOW_REYNOLDS = 2300
+ANNULUS_HIGH_REYNOLDS = 10000
+
+
+def coaxial_static_parameters(
+    borehole_diameter,
+    outer_pipe_outer_diameter,
+    outer_pipe_inner_diameter,
+    outer_pipe_conductivity,
+    inner_pipe_outer_diameter,
+    inner_pipe_inner_diameter,
+    inner_pipe_conductivity,
+    grout_conductivity,
+) -> dict[str, Any]:
+    """
+    Terms of the coaxial resistance formulas that depend only on the geometry and conductivities, shared by Coaxial
+    and its compiled and batch evaluators. Works on floats, or on arrays with one value per borehole.
+
+    :param borehole_diameter: borehole diameter, in m.
+    :param outer_pipe_outer_diameter: outer diameter of outer pipe, in m.
+    :param outer_pipe_inner_diameter: inner diameter of outer pipe, in m.
+    :param outer_pipe_conductivity: outer pipe thermal conductivity, in W/m-K.
+    :param inner_pipe_outer_diameter: outer diameter of inner pipe, in m.
+    :param inner_pipe_inner_diameter: inner diameter of inner pipe, in m.
+    :param inner_pipe_conductivity: inner pipe thermal conductivity, in W/m-K.
+    :param grout_conductivity: grout thermal conductivity, in W/m-K.
+    :return: terms, named after the Coaxial attributes
+    """
+
+    return {
+        "annular_hydraulic_diameter": outer_pipe_inner_diameter - inner_pipe_outer_diameter,
+        "annular_wetted_perimeter": pi * (outer_pipe_inner_diameter + inner_pipe_outer_diameter),
+        "r_cond_inner_pipe": Pipe.get_cond_resist(
+            inner_pipe_outer_diameter, inner_pipe_inner_diameter, inner_pipe_conductivity
+        ),
+        "r_cond_outer_pipe": Pipe.get_cond_resist(
+            outer_pipe_outer_diameter, outer_pipe_inner_diameter, outer_pipe_conductivity
+        ),
+        "r_cond_grout": dual.log(borehole_diameter / outer_pipe_outer_diameter) / (2 * pi * grout_conductivity),
+        "nu_ii_laminar": 3.66 + 1.2 * (inner_pipe_outer_diameter / outer_pipe_inner_diameter) ** -0.8,
+        "nu_oo_laminar": 3.66 + 1.2 * (inner_pipe_outer_diameter / outer_pipe_inner_diameter) ** 0.5,
+    }
 
 
 class Coaxial:
+    __slots__ = (
+        "annular_area",
+        "annular_hydraulic_diameter",
+        "annular_laminar_friction_ratio",
+        "annular_wetted_perimeter",
+        "borehole_diameter",
+        "fluid",
+        "grout_conductivity",
+        "inner_pipe",
+        "length",
+        "nu_ii_laminar",
+        "nu_oo_laminar",
+        "outer_pipe",
+        "r_cond_grout",
+        "r_cond_inner_pipe",
+        "r_cond_outer_pipe",
+        "soil_conductivity",
+    )
+
     def __init__(
         self,
         borehole_diameter: float,
@@ -61,8 +130,32 @@ class Coaxial:
             fluid_concentration,
         )
 
-        self.annular_hydraulic_diameter = self.outer_pipe.pipe_inner_diameter - self.inner_pipe.pipe_outer_diameter
-        self.annular_wetted_perimeter = pi * (self.outer_pipe.pipe_inner_diameter + self.inner_pipe.pipe_outer_diameter)
+        parameters = coaxial_static_parameters(
+            borehole_diameter,
+            self.outer_pipe.pipe_outer_diameter,
+            self.outer_pipe.pipe_inner_diameter,
+            outer_pipe_conductivity,
+            self.inner_pipe.pipe_outer_diameter,
+            self.inner_pipe.pipe_inner_diameter,
+            inner_pipe_conductivity,
+            grout_conductivity,
+        )
+        self.annular_hydraulic_diameter = parameters["annular_hydraulic_diameter"]
+        self.annular_wetted_perimeter = parameters["annular_wetted_perimeter"]
+        self.annular_area = self.outer_pipe.area_cr_inner - self.inner_pipe.area_cr_outer
+
+        # laminar friction factor of a concentric annulus relative to a pipe, 1 for a pipe and 1.5 for parallel plates
+        kappa = self.inner_pipe.pipe_outer_diameter / self.outer_pipe.pipe_inner_diameter
+        self.annular_laminar_friction_ratio = (1 - kappa) ** 2 / (1 + kappa**2 + (1 - kappa**2) / log(kappa))
+
+        # static conduction resistances
+        self.r_cond_inner_pipe = parameters["r_cond_inner_pipe"]
+        self.r_cond_outer_pipe = parameters["r_cond_outer_pipe"]
+        self.r_cond_grout = parameters["r_cond_grout"]
+
+        # laminar annulus Nusselt numbers
+        self.nu_ii_laminar = parameters["nu_ii_laminar"]
+        self.nu_oo_laminar = parameters["nu_oo_laminar"]
 
     def re_annulus(self, m_dot, temp):
         """
@@ -75,6 +168,18 @@ class Coaxial:
 
         return 4 * m_dot / (self.fluid.mu(temp) * self.annular_wetted_perimeter)
 
+    def re_annulus_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Vectorized version of re_annulus.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, C. scalar or array_like
+        :return: Reynolds number
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        return 4 * m_dot / (eval_property_array(self.fluid.mu, temp) * self.annular_wetted_perimeter)
+
     def laminar_nusselt_annulus(self):
         """
         Laminar Nusselt numbers for annulus flow
@@ -85,10 +190,8 @@ class Coaxial:
         :return: nu_ii: Laminar Nusselt number for inner surface of annulus pipe
         :return: nu_oo: Laminar Nusselt number for outer annulus pipe surface
         """
-        nu_ii = 3.66 + 1.2 * (self.inner_pipe.pipe_outer_diameter / self.outer_pipe.pipe_inner_diameter) ** -0.8
-        nu_oo = 3.66 + 1.2 * (self.inner_pipe.pipe_outer_diameter / self.outer_pipe.pipe_inner_diameter) ** 0.5
 
-        return nu_ii, nu_oo
+        return self.nu_ii_laminar, self.nu_oo_laminar
 
     def turbulent_nusselt_annulus(self, re, temp):
         """
@@ -112,17 +215,15 @@ class Coaxial:
 
         return nu_ii, nu_oo
 
-    def calc_conv_resist_annulus(self, m_dot, temp):
+    def calc_nusselt_annulus(self, re, temp):
         """
-        Grundmann, Rachel Marie. "Improved design methods for ground heat exchangers."
-        Master's thesis, Oklahoma State University, 2016.
-
-        Eqns 4.4 - 4.11
+        Nusselt numbers for annulus flow, blending the laminar and turbulent correlations
+        in the transitional region.
 
-        :param m_dot: mass flow rate, kg/s
+        :param re: Reynolds number
         :param temp: temperature, C
-        :return: r_conv_outside_inner_pipe: convective resistances along the outer wall of the inner pipe, K/(W/m)
-        :return: r_conv_inside_outer_pipe: convective resistance along the inside wall of the outer pipe, K/(W/m)
+        :return: nu_ii: Nusselt number for inner surface of annulus pipe
+        :return: nu_oo: Nusselt number for outer annulus pipe surface
         """
 
         # limit determined from Hellström, G. 1991. Ground Heat Storage: Thermal Analyses of
@@ -133,22 +234,51 @@ class Coaxial:
         # limit based on Dittus-Boelter equation
         high_reynolds = 10000
 
-        re = self.re_annulus(m_dot, temp)
-
         if re < low_reynolds:
             # use this Nusselt number when the flow is laminar
-            nu_ii, nu_oo = self.laminar_nusselt_annulus()
+            return self.laminar_nusselt_annulus()
 
-        elif low_reynolds <= re < high_reynolds:
+        if re < high_reynolds:
             # in between
             nu_ii_low, nu_oo_low = self.laminar_nusselt_annulus()
             nu_ii_high, nu_oo_high = self.turbulent_nusselt_annulus(high_reynolds, temp)
             nu_ii = smoothing_function(re, low_reynolds, high_reynolds, nu_ii_low, nu_ii_high)
             nu_oo = smoothing_function(re, low_reynolds, high_reynolds, nu_oo_low, nu_oo_high)
+            return nu_ii, nu_oo
+
+        # use this Nusselt number when the flow is fully turbulent
+        return self.turbulent_nusselt_annulus(re, temp)
+
+    @staticmethod
+    def flow_regime_annulus(re: float) -> FlowRegime:
+        """
+        Flow regime used by the annulus convection correlations
+
+        :param re: Reynolds number
+        :return: flow regime
+        """
 
-        else:
-            # use this Nusselt number when the flow is fully turbulent
-            nu_ii, nu_oo = self.turbulent_nusselt_annulus(re, temp)
+        if re < ANNULUS_LOW_REYNOLDS:
+            return FlowRegime.LAMINAR
+        if re < ANNULUS_HIGH_REYNOLDS:
+            return FlowRegime.TRANSITIONAL
+        return FlowRegime.TURBULENT
+
+    def calc_conv_resist_annulus(self, m_dot, temp):
+        """
+        Grundmann, Rachel Marie. "Improved design methods for ground heat exchangers."
+        Master's thesis, Oklahoma State University, 2016.
+
+        Eqns 4.4 - 4.11
+
+        :param m_dot: mass flow rate, kg/s
+        :param temp: temperature, C
+        :return: r_conv_outside_inner_pipe: convective resistances along the outer wall of the inner pipe, K/(W/m)
+        :return: r_conv_inside_outer_pipe: convective resistance along the inside wall of the outer pipe, K/(W/m)
+        """
+
+        re = self.re_annulus(m_dot, temp)
+        nu_ii, nu_oo = self.calc_nusselt_annulus(re, temp)
 
         r_conv_outside_inner_pipe = self.annular_hydraulic_diameter / (
             nu_ii * self.fluid.k(temp) * self.inner_pipe.pipe_outer_diameter * pi
@@ -160,6 +290,170 @@ class Coaxial:
 
         return r_conv_outside_inner_pipe, r_conv_inside_outer_pipe
 
+    @staticmethod
+    def flow_regime_annulus_array(re) -> np.ndarray:
+        """
+        Vectorized version of flow_regime_annulus.
+
+        :param re: Reynolds number, array_like
+        :return: flow regimes, as an object array
+        """
+
+        regimes = np.array([FlowRegime.LAMINAR, FlowRegime.TRANSITIONAL, FlowRegime.TURBULENT], dtype=object)
+        return regimes[np.searchsorted([ANNULUS_LOW_REYNOLDS, ANNULUS_HIGH_REYNOLDS], re, side="right")]
+
+    def calc_nusselt_annulus_array(self, re, temp) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized version of calc_nusselt_annulus.
+
+        :param re: Reynolds number, array_like
+        :param temp: temperature, C. array_like
+        :return: nu_ii: Nusselt number for inner surface of annulus pipe
+        :return: nu_oo: Nusselt number for outer annulus pipe surface
+        """
+
+        re, temp = broadcast_inputs(re, temp)
+        transitional = (re >= ANNULUS_LOW_REYNOLDS) & (re < ANNULUS_HIGH_REYNOLDS)
+        turbulent = re >= ANNULUS_HIGH_REYNOLDS
+
+        nu_ii_low, nu_oo_low = self.laminar_nusselt_annulus()
+        nu_ii = np.full_like(re, nu_ii_low)
+        nu_oo = np.full_like(re, nu_oo_low)
+
+        if transitional.any():
+            pr = eval_property_array(self.fluid.prandtl, temp[transitional])
+            nu_high = 0.023 * ANNULUS_HIGH_REYNOLDS**0.8 * pr**0.35
+            re_trans = re[transitional]
+            nu_ii[transitional] = smoothing_function_array(
+                re_trans, ANNULUS_LOW_REYNOLDS, ANNULUS_HIGH_REYNOLDS, nu_ii_low, nu_high
+            )
+            nu_oo[transitional] = smoothing_function_array(
+                re_trans, ANNULUS_LOW_REYNOLDS, ANNULUS_HIGH_REYNOLDS, nu_oo_low, nu_high
+            )
+
+        if turbulent.any():
+            pr = eval_property_array(self.fluid.prandtl, temp[turbulent])
+            nu_ii[turbulent] = 0.023 * re[turbulent] ** 0.8 * pr**0.35
+            nu_oo[turbulent] = nu_ii[turbulent]
+
+        return nu_ii, nu_oo
+
+    def calc_conv_resist_annulus_array(self, m_dot, temp) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized version of calc_conv_resist_annulus.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, C. scalar or array_like
+        :return: r_conv_outside_inner_pipe: convective resistances along the outer wall of the inner pipe, K/(W/m)
+        :return: r_conv_inside_outer_pipe: convective resistance along the inside wall of the outer pipe, K/(W/m)
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        nu_ii, nu_oo = self.calc_nusselt_annulus_array(self.re_annulus_array(m_dot, temp), temp)
+        k = eval_property_array(self.fluid.k, temp)
+
+        r_conv_outside_inner_pipe = self.annular_hydraulic_diameter / (
+            nu_ii * k * self.inner_pipe.pipe_outer_diameter * pi
+        )
+
+        r_conv_inside_outer_pipe = self.annular_hydraulic_diameter / (
+            nu_oo * k * self.outer_pipe.pipe_inner_diameter * pi
+        )
+
+        return r_conv_outside_inner_pipe, r_conv_inside_outer_pipe
+
+    def friction_factor_annulus(self, re: float) -> float:
+        """
+        Friction factor for annulus flow
+
+        The laminar friction factor is that of a concentric annulus, Shah, R.K. and A.L. London. 1978.
+        Laminar Flow Forced Convection in Ducts. Academic Press, New York. The turbulent friction factor is
+        Petukhov's, based on the hydraulic diameter. The two are blended over the same range as Pipe.friction_factor.
+
+        :param re: Reynolds number, based on the hydraulic diameter
+        :return: friction factor
+        """
+
+        if re < PIPE_LOW_REYNOLDS:
+            return self.annular_laminar_friction_ratio * Pipe.laminar_friction_factor(re)
+        if re > PIPE_HIGH_REYNOLDS:
+            return Pipe.turbulent_friction_factor(re)
+
+        f_low = self.annular_laminar_friction_ratio * Pipe.laminar_friction_factor(re)
+        f_high = Pipe.turbulent_friction_factor(re)
+        return smoothing_function(re, PIPE_LOW_REYNOLDS, PIPE_HIGH_REYNOLDS, f_low, f_high)
+
+    def friction_factor_annulus_array(self, re) -> np.ndarray:
+        """
+        Vectorized version of friction_factor_annulus.
+
+        :param re: Reynolds number, based on the hydraulic diameter. scalar or array_like
+        :return: friction factor
+        """
+
+        return pipe_friction_factor_array(re, self.annular_laminar_friction_ratio)
+
+    def pressure_loss_annulus(self, m_dot: float, temp: float) -> float:
+        """
+        Pressure loss of the flow through the annulus
+
+        :param m_dot: mass flow rate, kg/s
+        :param temp: temperature, C
+        :return: pressure loss, Pa
+        """
+
+        if m_dot <= 0:
+            return 0
+
+        rho = self.fluid.density(temp)
+        velocity = m_dot / (self.annular_area * rho)
+        f = self.friction_factor_annulus(self.re_annulus(m_dot, temp))
+        return f * self.length / self.annular_hydraulic_diameter * rho * velocity**2 / 2
+
+    def pressure_loss_annulus_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Vectorized version of pressure_loss_annulus.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, C. scalar or array_like
+        :return: pressure loss, Pa
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        flowing = m_dot > 0
+        m_dot = m_dot[flowing]
+        temp = temp[flowing]
+
+        rho = eval_property_array(self.fluid.density, temp)
+        velocity = m_dot / (self.annular_area * rho)
+        f = self.friction_factor_annulus_array(self.re_annulus_array(m_dot, temp))
+
+        loss = np.zeros(flowing.shape)
+        loss[flowing] = f * self.length / self.annular_hydraulic_diameter * rho * velocity**2 / 2
+        return loss
+
+    def pressure_loss(self, m_dot: float, temp: float) -> float:
+        """
+        Pressure loss through the borehole, down the inner pipe and up the annulus, or the reverse
+
+        :param m_dot: mass flow rate, kg/s
+        :param temp: temperature, C
+        :return: pressure loss, Pa
+        """
+
+        return self.inner_pipe.pressure_loss(m_dot, temp) + self.pressure_loss_annulus(m_dot, temp)
+
+    def pressure_loss_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Vectorized version of pressure_loss.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, C. scalar or array_like
+        :return: pressure loss, Pa
+        """
+
+        return self.inner_pipe.pressure_loss_array(m_dot, temp) + self.pressure_loss_annulus_array(m_dot, temp)
+
     def calc_local_bh_resistance(self, m_dot, temp):
         """
         Grundmann, Rachel Marie. "Improved design methods for ground heat exchangers."
@@ -177,18 +471,132 @@ class Coaxial:
         # resistances progressing from inside to outside
         r_conv_inner_pipe = self.inner_pipe.calc_conv_resist(m_dot, temp)
         r_cond_inner_pipe, r_cond_outer_pipe = self.calc_cond_resist()
-        r_conv_outside_inner_pipe = self.calc_conv_resist_annulus(m_dot, temp)[0]
-        r_conv_inside_outer_pipe = self.calc_conv_resist_annulus(m_dot, temp)[1]
-        r_cond_grout = log(self.borehole_diameter / self.outer_pipe.pipe_outer_diameter) / (
-            2 * pi * self.grout_conductivity
-        )
+        r_conv_outside_inner_pipe, r_conv_inside_outer_pipe = self.calc_conv_resist_annulus(m_dot, temp)
 
         r_internal_resist = sum([r_conv_inner_pipe, r_cond_inner_pipe, r_conv_outside_inner_pipe])
-        r_borehole_resist = sum([r_conv_inside_outer_pipe, r_cond_outer_pipe, r_cond_grout])
+        r_borehole_resist = sum([r_conv_inside_outer_pipe, r_cond_outer_pipe, self.r_cond_grout])
+        local_bh_resist = r_internal_resist + r_borehole_resist
+
+        return [local_bh_resist, r_internal_resist, r_borehole_resist]
+
+    def calc_local_bh_resistance_array(self, m_dot, temp) -> list[np.ndarray]:
+        """
+        Vectorized version of calc_local_bh_resistance.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, C. scalar or array_like
+        :return: local_bh_resist: total local borehole resistance K /(W/m)
+        :return: r_internal_resist: local internal borehole resistance K /(W/m)
+        :return: r_borehole_resist: local borehole resistance K /(W/m)
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        r_conv_inner_pipe = self.inner_pipe.calc_conv_resist_array(m_dot, temp)
+        r_cond_inner_pipe, r_cond_outer_pipe = self.calc_cond_resist()
+        r_conv_outside_inner_pipe, r_conv_inside_outer_pipe = self.calc_conv_resist_annulus_array(m_dot, temp)
+
+        r_internal_resist = r_conv_inner_pipe + r_cond_inner_pipe + r_conv_outside_inner_pipe
+        r_borehole_resist = r_conv_inside_outer_pipe + r_cond_outer_pipe + self.r_cond_grout
         local_bh_resist = r_internal_resist + r_borehole_resist
 
         return [local_bh_resist, r_internal_resist, r_borehole_resist]
 
+    def calc_resistances(self, m_dot: float, temp: float) -> ResistanceBreakdown:
+        """
+        Calculates all resistance components with a single evaluation of the fluid properties
+        and convection resistances.
+
+        Flow quantities are those of the annulus. The local borehole resistance and internal resistance are
+        the annulus-to-borehole-wall and the inner-pipe-to-annulus resistances used in the effective
+        resistance calculations.
+
+        :param m_dot: mass flow rate, kg/s
+        :param temp: temperature, C
+        :return: resistance breakdown
+        """
+
+        k = self.fluid.k(temp)
+
+        re = self.re_annulus(m_dot, temp)
+        nu_ii, nu_oo = self.calc_nusselt_annulus(re, temp)
+        r_conv_outside_inner_pipe = self.annular_hydraulic_diameter / (
+            nu_ii * k * self.inner_pipe.pipe_outer_diameter * pi
+        )
+        r_conv_inside_outer_pipe = self.annular_hydraulic_diameter / (
+            nu_oo * k * self.outer_pipe.pipe_inner_diameter * pi
+        )
+
+        nu_inner_pipe = self.inner_pipe.calc_nusselt(self.inner_pipe.mdot_to_re(m_dot, temp), temp)
+        r_conv_inner_pipe = 1 / (nu_inner_pipe * pi * k)
+        r_cond_inner_pipe, r_cond_outer_pipe = self.calc_cond_resist()
+
+        r_a = r_conv_inner_pipe + r_cond_inner_pipe + r_conv_outside_inner_pipe
+        r_b = r_conv_inside_outer_pipe + r_cond_outer_pipe + self.r_cond_grout
+
+        rv = self.length / (m_dot * self.fluid.cp(temp))
+        effective_bhr_uhf = r_b + 1 / (3 * r_a) * rv**2
+        n = rv / (2 * r_b) * (1 + 4 * r_b / r_a) ** (1 / 2)
+        effective_bhr_ubwt = r_b * n * coth(n)
+
+        return ResistanceBreakdown(
+            reynolds=re,
+            nusselt=nu_oo,
+            flow_regime=self.flow_regime_annulus(re),
+            conv_resist=r_conv_outside_inner_pipe + r_conv_inside_outer_pipe,
+            cond_resist=r_cond_outer_pipe,
+            fluid_pipe_resist=r_cond_outer_pipe + r_conv_outside_inner_pipe + r_conv_inside_outer_pipe,
+            grout_resist=self.r_cond_grout,
+            local_bh_resist=r_b,
+            internal_resist=r_a,
+            effective_bh_resist_uhf=effective_bhr_uhf,
+            effective_bh_resist_ubwt=effective_bhr_ubwt,
+        )
+
+    def calc_resistances_array(self, m_dot, temp) -> dict[str, np.ndarray]:
+        """
+        Vectorized version of calc_resistances.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, C. scalar or array_like
+        :return: dict mapping the ResistanceBreakdown field names to arrays. flow regimes are an object array
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        k = eval_property_array(self.fluid.k, temp)
+
+        re = self.re_annulus_array(m_dot, temp)
+        nu_ii, nu_oo = self.calc_nusselt_annulus_array(re, temp)
+        r_conv_outside_inner_pipe = self.annular_hydraulic_diameter / (
+            nu_ii * k * self.inner_pipe.pipe_outer_diameter * pi
+        )
+        r_conv_inside_outer_pipe = self.annular_hydraulic_diameter / (
+            nu_oo * k * self.outer_pipe.pipe_inner_diameter * pi
+        )
+
+        nu_inner_pipe = self.inner_pipe.calc_nusselt_array(self.inner_pipe.mdot_to_re_array(m_dot, temp), temp)
+        r_conv_inner_pipe = 1 / (nu_inner_pipe * pi * k)
+        r_cond_inner_pipe, r_cond_outer_pipe = self.calc_cond_resist()
+
+        r_a = r_conv_inner_pipe + r_cond_inner_pipe + r_conv_outside_inner_pipe
+        r_b = r_conv_inside_outer_pipe + r_cond_outer_pipe + self.r_cond_grout
+
+        rv = self.length / (m_dot * eval_property_array(self.fluid.cp, temp))
+        n = rv / (2 * r_b) * (1 + 4 * r_b / r_a) ** (1 / 2)
+
+        return {
+            "reynolds": re,
+            "nusselt": nu_oo,
+            "flow_regime": self.flow_regime_annulus_array(re),
+            "conv_resist": r_conv_outside_inner_pipe + r_conv_inside_outer_pipe,
+            "cond_resist": np.full_like(re, r_cond_outer_pipe),
+            "fluid_pipe_resist": r_cond_outer_pipe + r_conv_outside_inner_pipe + r_conv_inside_outer_pipe,
+            "grout_resist": np.full_like(re, self.r_cond_grout),
+            "local_bh_resist": r_b,
+            "internal_resist": r_a,
+            "effective_bh_resist_uhf": r_b + 1 / (3 * r_a) * rv**2,
+            "effective_bh_resist_ubwt": r_b * n * coth_array(n),
+        }
+
     def calc_effective_bh_resistance_uhf(self, m_dot, temp):
         """
         Grundmann, Rachel Marie. "Improved design methods for ground heat exchangers."
@@ -208,6 +616,22 @@ class Coaxial:
 
         return effective_bhr_uhf
 
+    def calc_effective_bh_resistance_uhf_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Vectorized version of calc_effective_bh_resistance_uhf.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, C. scalar or array_like
+        :return: effective_bhr_uhf: effective borehole resistance for
+                 uniform heat flux boundary condition, K/(W/m)
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        _, r_a, r_b = self.calc_local_bh_resistance_array(m_dot, temp)
+        rv = self.length / (m_dot * eval_property_array(self.fluid.cp, temp))
+
+        return r_b + 1 / (3 * r_a) * rv**2
+
     def calc_effective_bh_resistance_ubwt(self, m_dot, temp):
         """
         Grundmann, Rachel Marie. "Improved design methods for ground heat exchangers."
@@ -228,12 +652,29 @@ class Coaxial:
 
         return effective_bhr_ubwt
 
+    def calc_effective_bh_resistance_ubwt_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Vectorized version of calc_effective_bh_resistance_ubwt.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, C. scalar or array_like
+        :return: effective_bhr_ubwt: effective borehole resistance for
+                 uniform borehole wall temperature boundary condition, K/(W/m)
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        _, r_a, r_b = self.calc_local_bh_resistance_array(m_dot, temp)
+        rv = self.length / (m_dot * eval_property_array(self.fluid.cp, temp))
+        n = rv / (2 * r_b) * (1 + 4 * r_b / r_a) ** (1 / 2)
+
+        return r_b * n * coth_array(n)
+
     def calc_cond_resist(self) -> tuple[float, float]:
         """
         Computes the pipe conduction resistance for the inner and outer pipes.
         :return: pipe conduction resistance, K/(W/m)
         """
-        return self.inner_pipe.calc_cond_resist(), self.outer_pipe.calc_cond_resist()
+        return self.r_cond_inner_pipe, self.r_cond_outer_pipe
 
     def calc_conv_resist(self, m_dot, temp) -> tuple[float, float]:
         """
@@ -254,6 +695,33 @@ class Coaxial:
         """
 
         _, r_cond_outer_pipe = self.calc_cond_resist()
-        r_conv_outside_inner_pipe = self.calc_conv_resist_annulus(m_dot, temp)[0]
-        r_conv_inside_outer_pipe = self.calc_conv_resist_annulus(m_dot, temp)[1]
+        r_conv_outside_inner_pipe, r_conv_inside_outer_pipe = self.calc_conv_resist_annulus(m_dot, temp)
+        return r_cond_outer_pipe + r_conv_outside_inner_pipe + r_conv_inside_outer_pipe
+
+    def calc_conv_resist_array(self, m_dot, temp) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized version of calc_conv_resist.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, C. scalar or array_like
+        :return: convection resistance, K/(W/m)
+        """
+
+        r_conv_outside_inner_pipe, r_conv_inside_outer_pipe = self.calc_conv_resist_annulus_array(m_dot, temp)
+        return (
+            self.inner_pipe.calc_conv_resist_array(m_dot, temp),
+            r_conv_outside_inner_pipe + r_conv_inside_outer_pipe,
+        )
+
+    def calc_fluid_pipe_resist_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Vectorized version of calc_fluid_pipe_resist.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, C. scalar or array_like
+        :return: annular convection resistance and outer pipe conduction resistance, K/(W/m)
+        """
+
+        _, r_cond_outer_pipe = self.calc_cond_resist()
+        r_conv_outside_inner_pipe, r_conv_inside_outer_pipe = self.calc_conv_resist_annulus_array(m_dot, temp)
         return r_cond_outer_pipe + r_conv_outside_inner_pipe + r_conv_inside_outer_pipe
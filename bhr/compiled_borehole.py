@@ -0,0 +1,760 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from math import pi
+from typing import overload
+
+import numpy as np
+
+from bhr.coaxial_borehole import ANNULUS_HIGH_REYNOLDS, ANNULUS_LOW_REYNOLDS, Coaxial, coaxial_static_parameters
+from bhr.double_u_borehole import DoubleUTube, double_u_static_parameters
+from bhr.dual import Dual, coth, log, smoothing_function
+from bhr.enums import DoubleUPipeInletArrangement
+from bhr.fluid import eval_property_dual
+from bhr.pipe import PIPE_HIGH_REYNOLDS, PIPE_LOW_REYNOLDS, Pipe, pipe_nusselt_array
+from bhr.single_u_borehole import SingleUBorehole, single_u_static_parameters
+from bhr.utilities import smoothing_function_array
+
+# friction factor at the upper transition limit, which lies on the smoothed branch of Pipe.friction_factor
+_F_PIPE_HIGH_REYNOLDS = smoothing_function(
+    PIPE_HIGH_REYNOLDS,
+    PIPE_LOW_REYNOLDS,
+    PIPE_HIGH_REYNOLDS,
+    Pipe.laminar_friction_factor(PIPE_HIGH_REYNOLDS),
+    Pipe.turbulent_friction_factor(PIPE_HIGH_REYNOLDS),
+)
+
+# Dittus-Boelter coefficient at the upper annulus transition limit
+_DB_ANNULUS_HIGH_REYNOLDS = 0.023 * ANNULUS_HIGH_REYNOLDS**0.8
+
+
+def _gnielinski(re: float | Dual, pr: float | Dual) -> float | Dual:
+    """
+    Turbulent pipe Nusselt number, see Pipe.turbulent_nusselt
+
+    :param re: Reynolds number, >= PIPE_HIGH_REYNOLDS
+    :param pr: Prandtl number
+    :return: Nusselt number
+    """
+
+    f = (0.79 * log(re) - 1.64) ** (-2.0) if re > PIPE_HIGH_REYNOLDS else _F_PIPE_HIGH_REYNOLDS
+    return (f / 8) * (re - 1000) * pr / (1 + 12.7 * (f / 8) ** 0.5 * (pr ** (2 / 3) - 1))
+
+
+def _pipe_nusselt(re: float | Dual | np.ndarray, pr: float | Dual | np.ndarray) -> float | Dual | np.ndarray:
+    """
+    Pipe internal Nusselt number, see Pipe.calc_nusselt. Works on floats, Duals, or arrays.
+
+    :param re: Reynolds number
+    :param pr: Prandtl number
+    :return: Nusselt number
+    """
+
+    if isinstance(re, np.ndarray) or isinstance(pr, np.ndarray):
+        return pipe_nusselt_array(re, pr)
+
+    if re < PIPE_LOW_REYNOLDS:
+        return Pipe.laminar_nusselt()
+
+    if re < PIPE_HIGH_REYNOLDS:
+        nu_high = _gnielinski(PIPE_HIGH_REYNOLDS, pr)
+        return smoothing_function(re, PIPE_LOW_REYNOLDS, PIPE_HIGH_REYNOLDS, Pipe.laminar_nusselt(), nu_high)
+
+    return _gnielinski(re, pr)
+
+
+def _annulus_nusselt(re, pr, nu_ii_laminar, nu_oo_laminar):
+    """
+    Annulus Nusselt numbers, see Coaxial.calc_nusselt_annulus. Works on floats, Duals, or arrays.
+
+    :param re: annulus Reynolds number
+    :param pr: Prandtl number
+    :param nu_ii_laminar: laminar Nusselt number for inner surface of annulus pipe
+    :param nu_oo_laminar: laminar Nusselt number for outer annulus pipe surface
+    :return: Nusselt numbers for the inner and outer annulus surfaces
+    """
+
+    if isinstance(re, np.ndarray):
+        nu_high = _DB_ANNULUS_HIGH_REYNOLDS * pr**0.35
+        turbulent = re >= ANNULUS_HIGH_REYNOLDS
+        nu_turbulent = 0.023 * np.where(turbulent, re, ANNULUS_HIGH_REYNOLDS) ** 0.8 * pr**0.35
+        nu_ii = smoothing_function_array(re, ANNULUS_LOW_REYNOLDS, ANNULUS_HIGH_REYNOLDS, nu_ii_laminar, nu_high)
+        nu_oo = smoothing_function_array(re, ANNULUS_LOW_REYNOLDS, ANNULUS_HIGH_REYNOLDS, nu_oo_laminar, nu_high)
+        return np.where(turbulent, nu_turbulent, nu_ii), np.where(turbulent, nu_turbulent, nu_oo)
+
+    if re < ANNULUS_LOW_REYNOLDS:
+        return nu_ii_laminar, nu_oo_laminar
+
+    if re < ANNULUS_HIGH_REYNOLDS:
+        nu_high = _DB_ANNULUS_HIGH_REYNOLDS * pr**0.35
+        return (
+            smoothing_function(re, ANNULUS_LOW_REYNOLDS, ANNULUS_HIGH_REYNOLDS, nu_ii_laminar, nu_high),
+            smoothing_function(re, ANNULUS_LOW_REYNOLDS, ANNULUS_HIGH_REYNOLDS, nu_oo_laminar, nu_high),
+        )
+
+    nu = 0.023 * re**0.8 * pr**0.35
+    return nu, nu
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSingleU:
+    """
+    Immutable evaluator for a grouted single u-tube borehole, see SingleUBorehole.
+
+    All terms that depend only on the geometry and conductivities are folded into constants. An evaluator built by
+    from_geometry from arrays holds one value per borehole in each constant, as in bhr.borehole_batch.
+
+    :param uniform_heat_flux: True for the uniform heat flux boundary condition, False for uniform
+                              borehole wall temperature.
+    :param re_factor: Reynolds number per unit mass flow rate and unit inverse viscosity
+    :param cond_resist: pipe conduction resistance, K/(W/m)
+    :param two_pi_kg: 2 * pi * grout conductivity, W/(m-K)
+    :param length: borehole length, m
+    :param rb_term_1: first term of the local borehole resistance, dimensionless
+    :param rb_term_2_num: numerator of the second term of the local borehole resistance, dimensionless
+    :param rb_term_2_den_pt_2: static part of the denominator of the second term of the local borehole resistance
+    :param one_over_four_pi_kg: 1 / (4 * pi * grout conductivity), (m-K)/W
+    :param ra_term_1: first term of the internal resistance, dimensionless
+    :param ra_term_2_num: numerator of the second term of the internal resistance, dimensionless
+    :param ra_term_2_den_pt_1_factor: Beta factor of the denominator of the second term of the internal resistance
+    :param ra_term_2_den_static: static part of the denominator of the second term of the internal resistance
+    :param one_over_pi_kg: 1 / (pi * grout conductivity), (m-K)/W
+    :param mu: fluid viscosity function
+    :param k: fluid conductivity function
+    :param cp: fluid specific heat function
+    """
+
+    uniform_heat_flux: bool
+    re_factor: float
+    cond_resist: float
+    two_pi_kg: float
+    length: float
+    rb_term_1: float
+    rb_term_2_num: float
+    rb_term_2_den_pt_2: float
+    one_over_four_pi_kg: float
+    ra_term_1: float
+    ra_term_2_num: float
+    ra_term_2_den_pt_1_factor: float
+    ra_term_2_den_static: float
+    one_over_pi_kg: float
+    mu: Callable[[float], float]
+    k: Callable[[float], float]
+    cp: Callable[[float], float]
+
+    def calc_bh_resist(self, m_dot: float, temp: float) -> float:
+        """
+        Computes the effective borehole thermal resistance.
+
+        :param m_dot: mass flow rate, kg/s
+        :param temp: temperature, Celsius
+        :return: effective borehole resistance, K/(W/m)
+        """
+
+        return self._calc_bh_resist(m_dot, self.mu(temp), self.k(temp), self.cp(temp))
+
+    def calc_bh_resist_with_grad(self, m_dot: float, temp: float) -> tuple[float, float, float]:
+        """
+        Computes the effective borehole thermal resistance and its exact derivatives with respect to mass flow
+        rate and temperature, by forward-mode differentiation.
+
+        :param m_dot: mass flow rate, kg/s
+        :param temp: temperature, Celsius
+        :return: effective borehole resistance, K/(W/m), and its derivatives with respect to mass flow rate,
+                 (K/(W/m))/(kg/s), and temperature, (K/(W/m))/K
+        """
+
+        temp_dual = Dual(temp, 0.0, 1.0)
+        mu = eval_property_dual(self.mu, temp_dual)
+        k = eval_property_dual(self.k, temp_dual)
+        cp = eval_property_dual(self.cp, temp_dual)
+        resist = self._calc_bh_resist(Dual(m_dot, 1.0, 0.0), mu, k, cp)
+        return resist.value, resist.d_m_dot, resist.d_temp
+
+    @overload
+    def _calc_bh_resist(self, m_dot: float, mu: float, k: float, cp: float) -> float: ...
+
+    @overload
+    def _calc_bh_resist(self, m_dot: Dual, mu: Dual, k: Dual, cp: Dual) -> Dual: ...
+
+    @overload
+    def _calc_bh_resist(self, m_dot: np.ndarray, mu: np.ndarray, k: np.ndarray, cp: np.ndarray) -> np.ndarray: ...
+
+    def _calc_bh_resist(
+        self,
+        m_dot: float | Dual | np.ndarray,
+        mu: float | Dual | np.ndarray,
+        k: float | Dual | np.ndarray,
+        cp: float | Dual | np.ndarray,
+    ) -> float | Dual | np.ndarray:
+        """
+        Effective borehole thermal resistance for given fluid properties. Works on floats, Duals, or arrays.
+
+        :param m_dot: mass flow rate, kg/s
+        :param mu: fluid viscosity, Pa-s
+        :param k: fluid conductivity, W/(m-K)
+        :param cp: fluid specific heat, J/(kg-K)
+        :return: effective borehole resistance, K/(W/m)
+        """
+
+        nu = _pipe_nusselt(self.re_factor * m_dot / mu, cp * mu / k)
+        beta = self.two_pi_kg * (1 / (nu * pi * k) + self.cond_resist)
+        beta_ratio = (1 + beta) / (1 - beta)
+
+        r_b = self.one_over_four_pi_kg * (
+            beta + self.rb_term_1 - self.rb_term_2_num / (beta_ratio + self.rb_term_2_den_pt_2)
+        )
+        r_a = self.one_over_pi_kg * (
+            beta
+            + self.ra_term_1
+            - self.ra_term_2_num / (beta_ratio * self.ra_term_2_den_pt_1_factor + self.ra_term_2_den_static)
+        )
+        r_v = self.length / (cp * m_dot)
+
+        if self.uniform_heat_flux:
+            return r_b + 1 / (3 * r_a) * r_v**2
+
+        n = r_v / (r_b * r_a) ** 0.5
+        return r_b * n * coth(n)
+
+    def transition_bands(self) -> list[tuple[float, float]]:
+        """
+        Ranges of mass flow rate over viscosity, m_dot / mu, over which the convection correlations
+        blend between laminar and turbulent flow. The correlations are discontinuous at the band limits.
+
+        :return: list of (lower, upper) limits, (kg/s)/(Pa-s)
+        """
+
+        return [(PIPE_LOW_REYNOLDS / self.re_factor, PIPE_HIGH_REYNOLDS / self.re_factor)]
+
+    @classmethod
+    def from_borehole(cls, bh: SingleUBorehole, uniform_heat_flux: bool) -> "CompiledSingleU":
+        """
+        Compiles a single u-tube borehole.
+
+        :param bh: single u-tube borehole
+        :param uniform_heat_flux: True for the uniform heat flux boundary condition, False for uniform
+                                  borehole wall temperature.
+        :return: compiled evaluator
+        """
+
+        return cls.from_geometry(
+            bh.borehole_diameter,
+            bh.pipe_outer_diameter,
+            bh.dimension_ratio,
+            bh.bh_length,
+            bh.shank_space,
+            bh.pipe_conductivity,
+            bh.grout_conductivity,
+            bh.soil_conductivity,
+            bh.fluid,
+            uniform_heat_flux,
+        )
+
+    @classmethod
+    def from_geometry(
+        cls,
+        borehole_diameter,
+        pipe_outer_diameter,
+        pipe_dimension_ratio,
+        length,
+        shank_space,
+        pipe_conductivity,
+        grout_conductivity,
+        soil_conductivity,
+        fluid,
+        uniform_heat_flux: bool,
+    ) -> "CompiledSingleU":
+        """
+        Compiles a single u-tube borehole from the SingleUBorehole inputs. Given arrays with one value per borehole,
+        the evaluator holds one value per borehole in each field, and evaluates every borehole at once.
+
+        :param fluid: fluid
+        :param uniform_heat_flux: True for the uniform heat flux boundary condition, False for uniform
+                                  borehole wall temperature.
+        :return: compiled evaluator
+        """
+
+        pipe_inner_diameter = Pipe.get_inner_dia(pipe_outer_diameter, pipe_dimension_ratio)
+        parameters = single_u_static_parameters(
+            borehole_diameter, pipe_outer_diameter, shank_space, grout_conductivity, soil_conductivity
+        )
+
+        return cls(
+            uniform_heat_flux=uniform_heat_flux,
+            re_factor=4 / (pi * pipe_inner_diameter),
+            cond_resist=Pipe.get_cond_resist(pipe_outer_diameter, pipe_inner_diameter, pipe_conductivity),
+            two_pi_kg=parameters["two_pi_kg"],
+            length=length,
+            rb_term_1=parameters["rb_term_1"],
+            rb_term_2_num=parameters["rb_term_2_num"],
+            rb_term_2_den_pt_2=parameters["rb_term_2_den_pt_2"],
+            one_over_four_pi_kg=parameters["one_over_four_pi_kg"],
+            ra_term_1=parameters["ra_term_1"],
+            ra_term_2_num=parameters["ra_term_2_num"],
+            ra_term_2_den_pt_1_factor=parameters["ra_term_2_den_pt_1_factor"],
+            ra_term_2_den_static=parameters["ra_term_2_den_pt_3"] - parameters["ra_term_2_den_pt_2"],
+            one_over_pi_kg=parameters["one_over_pi_kg"],
+            mu=fluid.mu,
+            k=fluid.k,
+            cp=fluid.cp,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledDoubleU:
+    """
+    Immutable evaluator for a grouted double u-tube borehole, see DoubleUTube.
+
+    All terms that depend only on the geometry and conductivities are folded into constants. An evaluator built by
+    from_geometry from arrays holds one value per borehole in each constant, as in bhr.borehole_batch.
+
+    :param uniform_heat_flux: True for the uniform heat flux boundary condition, False for uniform
+                              borehole wall temperature.
+    :param diagonal: True for diagonal pipe inlets, False for adjacent pipe inlets.
+    :param re_factor: Reynolds number per unit mass flow rate and unit inverse viscosity
+    :param cond_resist: pipe conduction resistance, K/(W/m)
+    :param two_pi_kg: 2 * pi * grout conductivity, W/(m-K)
+    :param length: borehole length, m
+    :param p_pc: pipe radius ratio, dimensionless
+    :param rb0_static: static part of the 0th order local borehole resistance, K/(W/m)
+    :param rb1_num: static numerator of the 1st order local borehole resistance correction, K/(W/m)
+    :param rb1_den: static denominator factor of the 1st order local borehole resistance correction
+    :param ra0_static: static part of the 0th order internal resistance, K/(W/m)
+    :param two_over_two_pi_kg: 2 / (2 * pi * grout conductivity), (m-K)/W
+    :param diagonal_num: static numerator of the 1st order diagonal internal resistance correction
+    :param diagonal_den: static denominator factor of the 1st order diagonal internal resistance correction
+    :param adjacent_m11: static factor of the 1st order adjacent matrix element 11
+    :param adjacent_m22: static factor of the 1st order adjacent matrix element 22
+    :param adjacent_v1: first element of the 1st order adjacent vector
+    :param adjacent_v2: second element of the 1st order adjacent vector
+    :param mu: fluid viscosity function
+    :param k: fluid conductivity function
+    :param cp: fluid specific heat function
+    """
+
+    uniform_heat_flux: bool
+    diagonal: bool
+    re_factor: float
+    cond_resist: float
+    two_pi_kg: float
+    length: float
+    p_pc: float
+    rb0_static: float
+    rb1_num: float
+    rb1_den: float
+    ra0_static: float
+    two_over_two_pi_kg: float
+    diagonal_num: float
+    diagonal_den: float
+    adjacent_m11: float
+    adjacent_m22: float
+    adjacent_v1: float
+    adjacent_v2: float
+    mu: Callable[[float], float]
+    k: Callable[[float], float]
+    cp: Callable[[float], float]
+
+    def calc_bh_resist(self, m_dot: float, temp: float) -> float:
+        """
+        Computes the effective borehole thermal resistance.
+
+        :param m_dot: total mass flow rate, kg/s
+        :param temp: temperature, Celsius
+        :return: effective borehole resistance, K/(W/m)
+        """
+
+        return self._calc_bh_resist(m_dot, self.mu(temp), self.k(temp), self.cp(temp))
+
+    def calc_bh_resist_with_grad(self, m_dot: float, temp: float) -> tuple[float, float, float]:
+        """
+        Computes the effective borehole thermal resistance and its exact derivatives with respect to mass flow
+        rate and temperature, by forward-mode differentiation.
+
+        :param m_dot: total mass flow rate, kg/s
+        :param temp: temperature, Celsius
+        :return: effective borehole resistance, K/(W/m), and its derivatives with respect to mass flow rate,
+                 (K/(W/m))/(kg/s), and temperature, (K/(W/m))/K
+        """
+
+        temp_dual = Dual(temp, 0.0, 1.0)
+        mu = eval_property_dual(self.mu, temp_dual)
+        k = eval_property_dual(self.k, temp_dual)
+        cp = eval_property_dual(self.cp, temp_dual)
+        resist = self._calc_bh_resist(Dual(m_dot, 1.0, 0.0), mu, k, cp)
+        return resist.value, resist.d_m_dot, resist.d_temp
+
+    @overload
+    def _calc_bh_resist(self, m_dot: float, mu: float, k: float, cp: float) -> float: ...
+
+    @overload
+    def _calc_bh_resist(self, m_dot: Dual, mu: Dual, k: Dual, cp: Dual) -> Dual: ...
+
+    @overload
+    def _calc_bh_resist(self, m_dot: np.ndarray, mu: np.ndarray, k: np.ndarray, cp: np.ndarray) -> np.ndarray: ...
+
+    def _calc_bh_resist(
+        self,
+        m_dot: float | Dual | np.ndarray,
+        mu: float | Dual | np.ndarray,
+        k: float | Dual | np.ndarray,
+        cp: float | Dual | np.ndarray,
+    ) -> float | Dual | np.ndarray:
+        """
+        Effective borehole thermal resistance for given fluid properties. Works on floats, Duals, or arrays.
+
+        :param m_dot: total mass flow rate, kg/s
+        :param mu: fluid viscosity, Pa-s
+        :param k: fluid conductivity, W/(m-K)
+        :param cp: fluid specific heat, J/(kg-K)
+        :return: effective borehole resistance, K/(W/m)
+        """
+
+        m_dot_per_u_tube = m_dot / 2
+
+        nu = _pipe_nusselt(self.re_factor * m_dot_per_u_tube / mu, cp * mu / k)
+        pipe_resist = 1 / (nu * pi * k) + self.cond_resist
+        beta = self.two_pi_kg * pipe_resist
+        b1 = (1 - beta) / (1 + beta)
+
+        r_b = pipe_resist / 4 + self.rb0_static - b1 * self.rb1_num / (1 + b1 * self.rb1_den)
+
+        if self.diagonal:
+            r_a = (
+                2 * pipe_resist
+                + self.ra0_static
+                - self.two_over_two_pi_kg * b1 * self.diagonal_num / (1 - b1 * self.diagonal_den)
+            )
+        else:
+            matrix_element_11 = 1 + b1 * self.adjacent_m11
+            matrix_element_22 = -1 - b1 * self.adjacent_m22
+            matrix_element_21 = b1 * self.p_pc
+            v_1 = self.adjacent_v1
+            v_2 = self.adjacent_v2
+            r_a = (
+                2 * pipe_resist
+                + self.ra0_static
+                + self.two_over_two_pi_kg
+                * matrix_element_21
+                / 2
+                * (v_2**2 * matrix_element_11 - 2 * v_1 * v_2 * matrix_element_21 - v_1**2 * matrix_element_22)
+                / (matrix_element_11 * matrix_element_22 + matrix_element_21**2)
+            )
+
+        r_v = self.length / (cp * m_dot_per_u_tube)
+
+        if self.uniform_heat_flux:
+            return r_b + r_v**2 / (6 * r_a)
+
+        n = r_v / (2 * r_b * r_a) ** 0.5
+        return r_b * n * coth(n)
+
+    def transition_bands(self) -> list[tuple[float, float]]:
+        """
+        Ranges of mass flow rate over viscosity, m_dot / mu, over which the convection correlations
+        blend between laminar and turbulent flow. The correlations are discontinuous at the band limits.
+
+        :return: list of (lower, upper) limits, (kg/s)/(Pa-s)
+        """
+
+        # each u-tube carries half the flow
+        return [(2 * PIPE_LOW_REYNOLDS / self.re_factor, 2 * PIPE_HIGH_REYNOLDS / self.re_factor)]
+
+    @classmethod
+    def from_borehole(cls, bh: DoubleUTube, uniform_heat_flux: bool) -> "CompiledDoubleU":
+        """
+        Compiles a double u-tube borehole.
+
+        :param bh: double u-tube borehole
+        :param uniform_heat_flux: True for the uniform heat flux boundary condition, False for uniform
+                                  borehole wall temperature.
+        :return: compiled evaluator
+        """
+
+        return cls.from_geometry(
+            bh.borehole_diameter,
+            bh.pipe_outer_diameter,
+            bh.dimension_ratio,
+            bh.bh_length,
+            bh.shank_space,
+            bh.pipe_conductivity,
+            bh.grout_conductivity,
+            bh.soil_conductivity,
+            bh.fluid,
+            uniform_heat_flux,
+            bh.pipe_inlet_arrangement == DoubleUPipeInletArrangement.DIAGONAL,
+        )
+
+    @classmethod
+    def from_geometry(
+        cls,
+        borehole_diameter,
+        pipe_outer_diameter,
+        pipe_dimension_ratio,
+        length,
+        shank_space,
+        pipe_conductivity,
+        grout_conductivity,
+        soil_conductivity,
+        fluid,
+        uniform_heat_flux: bool,
+        diagonal: bool,
+    ) -> "CompiledDoubleU":
+        """
+        Compiles a double u-tube borehole from the DoubleUTube inputs. Given arrays with one value per borehole,
+        the evaluator holds one value per borehole in each field, and evaluates every borehole at once.
+
+        :param fluid: fluid
+        :param uniform_heat_flux: True for the uniform heat flux boundary condition, False for uniform
+                                  borehole wall temperature.
+        :param diagonal: True for diagonal pipe inlets, False for adjacent pipe inlets.
+        :return: compiled evaluator
+        """
+
+        pipe_inner_diameter = Pipe.get_inner_dia(pipe_outer_diameter, pipe_dimension_ratio)
+        parameters = double_u_static_parameters(
+            borehole_diameter, pipe_outer_diameter, shank_space, grout_conductivity, soil_conductivity
+        )
+        sigma = parameters["sigma"]
+        two_pi_kg = parameters["two_pi_kg"]
+        eight_pi_kg = parameters["eight_pi_kg"]
+        c_1 = parameters["c_1"]
+        p_pc = parameters["p_pc"]
+        p_c = parameters["p_c"]
+        p_b = parameters["p_b"]
+
+        if diagonal:
+            ra0_static = 2 / two_pi_kg * (log(c_1) + sigma * parameters["ln_c2_c3"])
+        else:
+            ra0_static = 2 / two_pi_kg * (log(2 * c_1) + sigma * parameters["ln_d2_d3"])
+
+        return cls(
+            uniform_heat_flux=uniform_heat_flux,
+            diagonal=diagonal,
+            re_factor=4 / (pi * pipe_inner_diameter),
+            cond_resist=Pipe.get_cond_resist(pipe_outer_diameter, pipe_inner_diameter, pipe_conductivity),
+            two_pi_kg=two_pi_kg,
+            length=length,
+            p_pc=p_pc,
+            rb0_static=1 / eight_pi_kg * (parameters["b_2"] + sigma * parameters["b_3"]),
+            rb1_num=1 / eight_pi_kg * p_pc * (3 - 8 * sigma * p_c**4) ** 2,
+            rb1_den=p_pc * (5 + 64 * sigma * p_c**4 * p_b**4),
+            ra0_static=ra0_static,
+            two_over_two_pi_kg=2 / two_pi_kg,
+            diagonal_num=p_pc * (1 + 8 * sigma * parameters["c_4"]) ** 2,
+            diagonal_den=p_pc * (3 - 32 * sigma * parameters["c_5"]),
+            adjacent_m11=16 * sigma * p_pc * parameters["d_4"],
+            adjacent_m22=16 * sigma * p_pc * parameters["d_5"],
+            adjacent_v1=1 - 8 * sigma * p_c**3 * p_b,
+            adjacent_v2=3 + 8 * sigma * p_c * p_b**3,
+            mu=fluid.mu,
+            k=fluid.k,
+            cp=fluid.cp,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledCoaxial:
+    """
+    Immutable evaluator for a grouted coaxial borehole, see Coaxial.
+
+    All terms that depend only on the geometry and conductivities are folded into constants. An evaluator built by
+    from_geometry from arrays holds one value per borehole in each constant, as in bhr.borehole_batch.
+
+    :param uniform_heat_flux: True for the uniform heat flux boundary condition, False for uniform
+                              borehole wall temperature.
+    :param re_factor_inner_pipe: inner pipe Reynolds number per unit mass flow rate and unit inverse viscosity
+    :param re_factor_annulus: annulus Reynolds number per unit mass flow rate and unit inverse viscosity
+    :param nu_ii_laminar: laminar Nusselt number for inner surface of annulus pipe
+    :param nu_oo_laminar: laminar Nusselt number for outer annulus pipe surface
+    :param conv_factor_inner: annulus convection resistance per unit inverse Nusselt number and conductivity,
+                              outer wall of the inner pipe
+    :param conv_factor_outer: annulus convection resistance per unit inverse Nusselt number and conductivity,
+                              inside wall of the outer pipe
+    :param r_cond_inner_pipe: inner pipe conduction resistance, K/(W/m)
+    :param r_cond_static: outer pipe and grout conduction resistance, K/(W/m)
+    :param length: borehole length, m
+    :param mu: fluid viscosity function
+    :param k: fluid conductivity function
+    :param cp: fluid specific heat function
+    """
+
+    uniform_heat_flux: bool
+    re_factor_inner_pipe: float
+    re_factor_annulus: float
+    nu_ii_laminar: float
+    nu_oo_laminar: float
+    conv_factor_inner: float
+    conv_factor_outer: float
+    r_cond_inner_pipe: float
+    r_cond_static: float
+    length: float
+    mu: Callable[[float], float]
+    k: Callable[[float], float]
+    cp: Callable[[float], float]
+
+    def calc_bh_resist(self, m_dot: float, temp: float) -> float:
+        """
+        Computes the effective borehole thermal resistance.
+
+        :param m_dot: mass flow rate, kg/s
+        :param temp: temperature, Celsius
+        :return: effective borehole resistance, K/(W/m)
+        """
+
+        return self._calc_bh_resist(m_dot, self.mu(temp), self.k(temp), self.cp(temp))
+
+    def calc_bh_resist_with_grad(self, m_dot: float, temp: float) -> tuple[float, float, float]:
+        """
+        Computes the effective borehole thermal resistance and its exact derivatives with respect to mass flow
+        rate and temperature, by forward-mode differentiation.
+
+        :param m_dot: mass flow rate, kg/s
+        :param temp: temperature, Celsius
+        :return: effective borehole resistance, K/(W/m), and its derivatives with respect to mass flow rate,
+                 (K/(W/m))/(kg/s), and temperature, (K/(W/m))/K
+        """
+
+        temp_dual = Dual(temp, 0.0, 1.0)
+        mu = eval_property_dual(self.mu, temp_dual)
+        k = eval_property_dual(self.k, temp_dual)
+        cp = eval_property_dual(self.cp, temp_dual)
+        resist = self._calc_bh_resist(Dual(m_dot, 1.0, 0.0), mu, k, cp)
+        return resist.value, resist.d_m_dot, resist.d_temp
+
+    @overload
+    def _calc_bh_resist(self, m_dot: float, mu: float, k: float, cp: float) -> float: ...
+
+    @overload
+    def _calc_bh_resist(self, m_dot: Dual, mu: Dual, k: Dual, cp: Dual) -> Dual: ...
+
+    @overload
+    def _calc_bh_resist(self, m_dot: np.ndarray, mu: np.ndarray, k: np.ndarray, cp: np.ndarray) -> np.ndarray: ...
+
+    def _calc_bh_resist(
+        self,
+        m_dot: float | Dual | np.ndarray,
+        mu: float | Dual | np.ndarray,
+        k: float | Dual | np.ndarray,
+        cp: float | Dual | np.ndarray,
+    ) -> float | Dual | np.ndarray:
+        """
+        Effective borehole thermal resistance for given fluid properties. Works on floats, Duals, or arrays.
+
+        :param m_dot: mass flow rate, kg/s
+        :param mu: fluid viscosity, Pa-s
+        :param k: fluid conductivity, W/(m-K)
+        :param cp: fluid specific heat, J/(kg-K)
+        :return: effective borehole resistance, K/(W/m)
+        """
+
+        pr = cp * mu / k
+
+        # inner pipe
+        nu_inner_pipe = _pipe_nusselt(self.re_factor_inner_pipe * m_dot / mu, pr)
+
+        # annulus
+        re = self.re_factor_annulus * m_dot / mu
+        nu_ii, nu_oo = _annulus_nusselt(re, pr, self.nu_ii_laminar, self.nu_oo_laminar)
+
+        r_a = 1 / (nu_inner_pipe * pi * k) + self.r_cond_inner_pipe + self.conv_factor_inner / (nu_ii * k)
+        r_b = self.conv_factor_outer / (nu_oo * k) + self.r_cond_static
+        rv = self.length / (m_dot * cp)
+
+        if self.uniform_heat_flux:
+            return r_b + 1 / (3 * r_a) * rv**2
+
+        n = rv / (2 * r_b) * (1 + 4 * r_b / r_a) ** (1 / 2)
+        return r_b * n * coth(n)
+
+    def transition_bands(self) -> list[tuple[float, float]]:
+        """
+        Ranges of mass flow rate over viscosity, m_dot / mu, over which the convection correlations
+        blend between laminar and turbulent flow. The correlations are discontinuous at the band limits.
+
+        :return: list of (lower, upper) limits, (kg/s)/(Pa-s)
+        """
+
+        return [
+            (PIPE_LOW_REYNOLDS / self.re_factor_inner_pipe, PIPE_HIGH_REYNOLDS / self.re_factor_inner_pipe),
+            (ANNULUS_LOW_REYNOLDS / self.re_factor_annulus, ANNULUS_HIGH_REYNOLDS / self.re_factor_annulus),
+        ]
+
+    @classmethod
+    def from_borehole(cls, bh: Coaxial, uniform_heat_flux: bool) -> "CompiledCoaxial":
+        """
+        Compiles a coaxial borehole.
+
+        :param bh: coaxial borehole
+        :param uniform_heat_flux: True for the uniform heat flux boundary condition, False for uniform
+                                  borehole wall temperature.
+        :return: compiled evaluator
+        """
+
+        return cls.from_geometry(
+            bh.borehole_diameter,
+            bh.outer_pipe.pipe_outer_diameter,
+            bh.outer_pipe.dimension_ratio,
+            bh.outer_pipe.pipe_conductivity,
+            bh.inner_pipe.pipe_outer_diameter,
+            bh.inner_pipe.dimension_ratio,
+            bh.inner_pipe.pipe_conductivity,
+            bh.length,
+            bh.grout_conductivity,
+            bh.fluid,
+            uniform_heat_flux,
+        )
+
+    @classmethod
+    def from_geometry(
+        cls,
+        borehole_diameter,
+        outer_pipe_outer_diameter,
+        outer_pipe_dimension_ratio,
+        outer_pipe_conductivity,
+        inner_pipe_outer_diameter,
+        inner_pipe_dimension_ratio,
+        inner_pipe_conductivity,
+        length,
+        grout_conductivity,
+        fluid,
+        uniform_heat_flux: bool,
+    ) -> "CompiledCoaxial":
+        """
+        Compiles a coaxial borehole from the Coaxial inputs. Given arrays with one value per borehole, the evaluator
+        holds one value per borehole in each field, and evaluates every borehole at once.
+
+        :param fluid: fluid
+        :param uniform_heat_flux: True for the uniform heat flux boundary condition, False for uniform
+                                  borehole wall temperature.
+        :return: compiled evaluator
+        """
+
+        outer_pipe_inner_diameter = Pipe.get_inner_dia(outer_pipe_outer_diameter, outer_pipe_dimension_ratio)
+        inner_pipe_inner_diameter = Pipe.get_inner_dia(inner_pipe_outer_diameter, inner_pipe_dimension_ratio)
+        parameters = coaxial_static_parameters(
+            borehole_diameter,
+            outer_pipe_outer_diameter,
+            outer_pipe_inner_diameter,
+            outer_pipe_conductivity,
+            inner_pipe_outer_diameter,
+            inner_pipe_inner_diameter,
+            inner_pipe_conductivity,
+            grout_conductivity,
+        )
+        annular_hydraulic_diameter = parameters["annular_hydraulic_diameter"]
+
+        return cls(
+            uniform_heat_flux=uniform_heat_flux,
+            re_factor_inner_pipe=4 / (pi * inner_pipe_inner_diameter),
+            re_factor_annulus=4 / parameters["annular_wetted_perimeter"],
+            nu_ii_laminar=parameters["nu_ii_laminar"],
+            nu_oo_laminar=parameters["nu_oo_laminar"],
+            conv_factor_inner=annular_hydraulic_diameter / (inner_pipe_outer_diameter * pi),
+            conv_factor_outer=annular_hydraulic_diameter / (outer_pipe_inner_diameter * pi),
+            r_cond_inner_pipe=parameters["r_cond_inner_pipe"],
+            r_cond_static=parameters["r_cond_outer_pipe"] + parameters["r_cond_grout"],
+            length=length,
+            mu=fluid.mu,
+            k=fluid.k,
+            cp=fluid.cp,
+        )
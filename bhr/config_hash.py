@@ -0,0 +1,91 @@
+"""
+Canonical form and hash of Borehole.init_from_dict inputs.
+
+Two inputs that build the same borehole have the same canonical form, and so the same hash, however they were
+written: keys in any order, names in any case, integers or floats, inputs for other borehole types left in, or
+the default boundary condition left out.
+"""
+
+import hashlib
+import json
+
+from bhr.enums import BoreholeType, BoundaryCondition, DoubleUPipeInletArrangement
+
+_COMMON_INPUTS = ("borehole_diameter", "length", "grout_conductivity", "soil_conductivity")
+
+_PIPE_INPUTS = {
+    BoreholeType.SINGLE_U_TUBE: ("pipe_outer_diameter", "pipe_dimension_ratio", "pipe_conductivity", "shank_space"),
+    BoreholeType.DOUBLE_U_TUBE: ("pipe_outer_diameter", "pipe_dimension_ratio", "pipe_conductivity", "shank_space"),
+    BoreholeType.COAXIAL: (
+        "outer_pipe_outer_diameter",
+        "outer_pipe_dimension_ratio",
+        "outer_pipe_conductivity",
+        "inner_pipe_outer_diameter",
+        "inner_pipe_dimension_ratio",
+        "inner_pipe_conductivity",
+    ),
+}
+
+
+def _float(value) -> str:
+    """
+    :param value: number
+    :return: shortest string that round-trips the number as a float, so 2, 2.0, and "2" are all "2.0"
+    """
+
+    value = float(value)
+    return repr(value + 0.0)  # + 0.0 turns -0.0 into 0.0
+
+
+def _enum_name(enum_cls, value, input_name: str) -> str:
+    name = str(getattr(value, "name", value)).upper()
+    if name not in enum_cls.__members__:
+        raise LookupError(f'{input_name} "{name}" not supported')
+    return name
+
+
+def canonical_config(config: dict) -> dict:
+    """
+    Normalizes Borehole.init_from_dict inputs.
+
+    Enum inputs are upper case names, numbers are strings of their float value, the fluid concentration is 0 for
+    water and clipped at 0 otherwise, as in get_fluid, and only the inputs of the borehole type are kept.
+
+    :param config: Borehole.init_from_dict input
+    :return: canonical inputs, with the same structure as init_from_dict inputs
+    """
+
+    bh_type = BoreholeType[_enum_name(BoreholeType, config["borehole_type"], "borehole_type")]
+    fluid_type = str(config["fluid_type"]).upper()
+    concentration = 0.0 if fluid_type == "WATER" else max(float(config["fluid_concentration"]), 0.0)
+    boundary_condition = config.get("boundary_condition", BoundaryCondition.UNIFORM_HEAT_FLUX.name)
+
+    canonical: dict[str, str | dict[str, str]] = {
+        "borehole_type": bh_type.name,
+        "boundary_condition": _enum_name(BoundaryCondition, boundary_condition, "boundary_condition"),
+        "fluid_type": fluid_type,
+        "fluid_concentration": _float(concentration),
+        **{name: _float(config[name]) for name in _COMMON_INPUTS},
+    }
+
+    key = bh_type.name.lower()
+    pipe = {name: _float(config[key][name]) for name in _PIPE_INPUTS[bh_type]}
+    if bh_type == BoreholeType.DOUBLE_U_TUBE:
+        pipe["pipe_inlet_arrangement"] = _enum_name(
+            DoubleUPipeInletArrangement, config[key]["pipe_inlet_arrangement"], "pipe_inlet_arrangement"
+        )
+    canonical[key] = pipe
+    return canonical
+
+
+def config_hash(config: dict) -> str:
+    """
+    Hash of the canonical form of Borehole.init_from_dict inputs, see canonical_config. Stable across processes,
+    platforms, and Python versions.
+
+    :param config: Borehole.init_from_dict input
+    :return: hex digest
+    """
+
+    text = json.dumps(canonical_config(config), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
@@ -0,0 +1,267 @@
+"""
+Persistent cache of effective borehole resistances, shared between runs and processes.
+
+Results are stored in a SQLite database, keyed by the config_hash of the borehole inputs and the exact mass flow
+rate and temperature. The database runs in write-ahead-log mode, so readers do not block writers, and each
+process opens its own connection, so any number of processes may use the same file. Every write is a single
+transaction, and a writer waits up to the timeout for another to finish.
+
+Stored results are tagged with MODEL_VERSION. Opening a database written under another version discards its
+results, so a change to the model equations never returns stale values. Results computed with tabulated fluid
+properties, see bhr.fluid.enable_tabulated_fluids, are stored under the same keys as exact ones, so a cache
+should only be shared between runs that use the same fluid property mode.
+"""
+
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from bhr.result_cache import CacheInfo
+
+# bump whenever a change to the model equations changes any result
+MODEL_VERSION = 1
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS results ("
+    "config TEXT NOT NULL, m_dot REAL NOT NULL, temp REAL NOT NULL, resist REAL NOT NULL, "
+    "last_used INTEGER NOT NULL, PRIMARY KEY (config, m_dot, temp)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)",
+)
+
+# caches opened in this process, so a cache passed to worker processes is opened once per worker
+_open_caches: dict[tuple, "DiskCache"] = {}
+_open_caches_lock = threading.Lock()
+
+
+def _reopen(*args) -> "DiskCache":
+    with _open_caches_lock:
+        cache = _open_caches.get(args)
+        if cache is None:
+            cache = _open_caches[args] = DiskCache(*args)
+        return cache
+
+
+class DiskCache:
+    """
+    Persistent least-recently-used cache of effective borehole resistances, see the module docstring.
+
+    A DiskCache may be shared between threads, and passed to worker processes, where it is reopened from its path.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_entries: int = 10_000_000,
+        timeout: float = 30.0,
+        model_version: int = MODEL_VERSION,
+    ):
+        """
+        :param path: database file. created if it does not exist
+        :param max_entries: maximum number of stored results. the least recently used results are evicted when full
+        :param timeout: seconds to wait for another writer to finish before raising sqlite3.OperationalError
+        :param model_version: version tag of the stored results. results stored under other versions are discarded
+        """
+
+        if max_entries < 1:
+            raise ValueError(f"Invalid max_entries: {max_entries}. Must be at least 1")
+
+        self.path = str(path)
+        self.max_entries = int(max_entries)
+        self.timeout = float(timeout)
+        self.model_version = int(model_version)
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute(f"PRAGMA busy_timeout = {int(self.timeout * 1000)}")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS wanted (i INTEGER, m_dot REAL, temp REAL)")
+
+        with self._transaction() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            row = conn.execute("SELECT value FROM meta WHERE key = 'model_version'").fetchone()
+            if row is None or int(row[0]) != self.model_version:
+                conn.execute("DELETE FROM results")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('model_version', ?)", (str(self.model_version),)
+                )
+                self._set_size(conn, 0)
+            elif conn.execute("SELECT value FROM meta WHERE key = 'size'").fetchone() is None:
+                # written before the row count was kept in meta
+                self._set_size(conn, conn.execute("SELECT COUNT(*) FROM results").fetchone()[0])
+
+    def __reduce__(self):
+        return _reopen, (self.path, self.max_entries, self.timeout, self.model_version)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._size(self._conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _size(conn: sqlite3.Connection) -> int:
+        # the row count is kept in meta, so a write does not have to count the results table
+        return int(conn.execute("SELECT value FROM meta WHERE key = 'size'").fetchone()[0])
+
+    @staticmethod
+    def _set_size(conn: sqlite3.Connection, size: int) -> None:
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('size', ?)", (str(size),))
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def get(self, config_hash: str, m_dot, temp) -> np.ndarray:
+        """
+        Looks up stored results, marking them as used.
+
+        :param config_hash: config_hash of the borehole inputs
+        :param m_dot: total borehole mass flow rate, in kg/s. scalar or array_like
+        :param temp: average fluid temperature, in Celsius. scalar or array_like
+        :return: stored effective borehole resistances, in K/W-m, with nan where there is none. the broadcast shape
+                 of the inputs
+        """
+
+        m_dot, temp = np.broadcast_arrays(np.asarray(m_dot, dtype=float), np.asarray(temp, dtype=float))
+        resist = np.full(m_dot.size, np.nan)
+        rows = [(i, m, t) for i, (m, t) in enumerate(zip(m_dot.ravel().tolist(), temp.ravel().tolist()))]
+
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM wanted")
+            conn.executemany("INSERT INTO wanted (i, m_dot, temp) VALUES (?, ?, ?)", rows)
+            found = conn.execute(
+                "SELECT wanted.i, results.resist FROM wanted JOIN results ON results.config = ? "
+                "AND results.m_dot = wanted.m_dot AND results.temp = wanted.temp",
+                (config_hash,),
+            ).fetchall()
+            if found:
+                conn.execute(
+                    "UPDATE results SET last_used = ? WHERE config = ? "
+                    "AND (m_dot, temp) IN (SELECT m_dot, temp FROM wanted)",
+                    (time.time_ns(), config_hash),
+                )
+            self.hits += len(found)
+            self.misses += resist.size - len(found)
+
+        for i, value in found:
+            resist[i] = value
+        return resist.reshape(m_dot.shape)
+
+    def put(self, config_hash: str, m_dot, temp, resist) -> None:
+        """
+        Stores results, evicting the least recently used results if the cache is full. Non-finite inputs and
+        results are not stored.
+
+        :param config_hash: config_hash of the borehole inputs
+        :param m_dot: total borehole mass flow rate, in kg/s. scalar or array_like
+        :param temp: average fluid temperature, in Celsius. scalar or array_like
+        :param resist: effective borehole resistance, in K/W-m. scalar or array_like
+        """
+
+        arrays = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (m_dot, temp, resist)))
+        m_dot, temp, resist = (array.ravel() for array in arrays)
+        finite = np.isfinite(m_dot) & np.isfinite(temp) & np.isfinite(resist)
+        now = time.time_ns()
+        rows = [
+            (config_hash, m, t, r, now)
+            for m, t, r in zip(m_dot[finite].tolist(), temp[finite].tolist(), resist[finite].tolist())
+        ]
+        if not rows:
+            return
+
+        with self._transaction() as conn:
+            changes = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO results (config, m_dot, temp, resist, last_used) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            inserted = conn.total_changes - changes
+            if inserted < len(rows):
+                # some of the results were already stored
+                conn.executemany(
+                    "UPDATE results SET resist = ?, last_used = ? WHERE config = ? AND m_dot = ? AND temp = ?",
+                    [(r, last_used, config, m, t) for config, m, t, r, last_used in rows],
+                )
+            if inserted == 0:
+                return
+
+            size = self._size(conn) + inserted
+            excess = size - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM results WHERE (config, m_dot, temp) IN "
+                    "(SELECT config, m_dot, temp FROM results ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+                size -= excess
+            self._set_size(conn, size)
+
+    def get_or_compute(
+        self, config_hash: str, m_dot, temp, func: Callable[[np.ndarray, np.ndarray], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Looks up stored results, computing and storing the missing ones.
+
+        :param config_hash: config_hash of the borehole inputs
+        :param m_dot: total borehole mass flow rate, in kg/s. scalar or array_like
+        :param temp: average fluid temperature, in Celsius. scalar or array_like
+        :param func: function of 1-D arrays of (m_dot, temp), e.g. Borehole.calc_bh_resist_array, called with the
+                     missing points only
+        :return: effective borehole resistances, in K/W-m, with the broadcast shape of the inputs
+        """
+
+        m_dot, temp = np.broadcast_arrays(np.asarray(m_dot, dtype=float), np.asarray(temp, dtype=float))
+        resist = self.get(config_hash, m_dot, temp)
+        missing = np.isnan(resist)
+        if missing.any():
+            resist[missing] = func(m_dot[missing], temp[missing])
+            self.put(config_hash, m_dot[missing], temp[missing], resist[missing])
+        return resist
+
+    def clear(self) -> None:
+        """
+        Removes every stored result.
+        """
+
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM results")
+            self._set_size(conn, 0)
+
+    def info(self) -> CacheInfo:
+        """
+        :return: hit and miss counts of this connection, and the size of the cache
+        """
+
+        return CacheInfo(self.hits, self.misses, self.max_entries, len(self))
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+
+        with _open_caches_lock:
+            key = (self.path, self.max_entries, self.timeout, self.model_version)
+            if _open_caches.get(key) is self:
+                del _open_caches[key]
+        with self._lock:
+            self._conn.close()
@@ -1,12 +1,112 @@
 from math import log as ln
-from math import pi, sqrt
+from math import pi
+from typing import Any
 
+import numpy as np
+
+from bhr.dual import log
 from bhr.enums import DoubleUPipeInletArrangement
+from bhr.fluid import eval_property_array
+from bhr.resistance_breakdown import ResistanceBreakdown
 from bhr.u_tube import UTube
-from bhr.utilities import coth
+from bhr.utilities import broadcast_inputs, coth, coth_array
+
+
+def double_u_shank_space_limits(borehole_diameter, pipe_outer_diameter):
+    """
+    Shank spacings between which the pipes neither overlap nor extend beyond the borehole wall. Works on floats, or
+    on arrays with one value per borehole.
+
+    :param borehole_diameter: borehole diameter, in m.
+    :param pipe_outer_diameter: outer diameter of the pipe, in m.
+    :return: lower and upper limits of the shank spacing, in m.
+    """
+
+    return (pipe_outer_diameter**2 / 2) ** 0.5, 0.5 * (borehole_diameter - pipe_outer_diameter)
+
+
+def double_u_static_parameters(
+    borehole_diameter, pipe_outer_diameter, shank_space, grout_conductivity, soil_conductivity
+) -> dict[str, Any]:
+    """
+    Terms of the double u-tube resistance formulas that depend only on the geometry and conductivities, shared by
+    DoubleUTube and its compiled and batch evaluators. Works on floats, or on arrays with one value per borehole.
+
+    :param borehole_diameter: borehole diameter, in m.
+    :param pipe_outer_diameter: outer diameter of the pipe, in m.
+    :param shank_space: radial distance from the borehole center to the pipe centers, in m.
+    :param grout_conductivity: grout thermal conductivity, in W/m-K.
+    :param soil_conductivity: soil thermal conductivity, in W/m-K.
+    :return: terms, named after the DoubleUTube attributes
+    """
+
+    borehole_radius = borehole_diameter / 2
+    pipe_radius = pipe_outer_diameter / 2
+    pipe_centers_radius = shank_space
+    sigma = (grout_conductivity - soil_conductivity) / (grout_conductivity + soil_conductivity)
+
+    # calc_bh_resist_local
+    p_pc = pipe_radius**2 / (4 * pipe_centers_radius**2)
+    p_c = pipe_centers_radius**2 / (borehole_radius**8 - pipe_centers_radius**8) ** 0.25
+    p_b = borehole_radius**2 / (borehole_radius**8 - pipe_centers_radius**8) ** 0.25
+    b_2 = log(borehole_radius**4 / (4 * pipe_radius * pipe_centers_radius**3))
+    b_3 = log(borehole_radius**8 / (borehole_radius**8 - pipe_centers_radius**8))
+
+    # calc_internal_resist
+    c_2 = borehole_radius**4 + pipe_centers_radius**4
+    c_3 = borehole_radius**4 - pipe_centers_radius**4
+    d_2 = borehole_radius**2 + pipe_centers_radius**2
+    d_3 = borehole_radius**2 - pipe_centers_radius**2
+
+    return {
+        "borehole_radius": borehole_radius,
+        "pipe_radius": pipe_radius,
+        "pipe_centers_radius": pipe_centers_radius,
+        "sigma": sigma,
+        "p_pc": p_pc,
+        "p_c": p_c,
+        "p_b": p_b,
+        "eight_pi_kg": 8 * pi * grout_conductivity,
+        "b_2": b_2,
+        "b_3": b_3,
+        "two_pi_kg": 2 * pi * grout_conductivity,
+        "c_1": pipe_centers_radius / pipe_radius,
+        "ln_c2_c3": log(c_2 / c_3),
+        "c_4": p_c**2 * p_b**2,
+        "c_5": p_c**2 * p_b**6 + p_c**6 * p_b**2,
+        "ln_d2_d3": log(d_2 / d_3),
+        "d_4": 3 * p_c**3 * p_b**5 + p_c**7 * p_b,
+        "d_5": p_c * p_b**7 + 3 * p_c**5 * p_b**3,
+    }
 
 
 class DoubleUTube(UTube):
+    __slots__ = (
+        "b_2",
+        "b_3",
+        "bh_length",
+        "borehole_diameter",
+        "borehole_radius",
+        "c_1",
+        "c_4",
+        "c_5",
+        "d_4",
+        "d_5",
+        "eight_pi_kg",
+        "grout_conductivity",
+        "ln_c2_c3",
+        "ln_d2_d3",
+        "p_b",
+        "p_c",
+        "p_pc",
+        "pipe_centers_radius",
+        "pipe_inlet_arrangement",
+        "pipe_radius",
+        "sigma",
+        "soil_conductivity",
+        "two_pi_kg",
+    )
+
     def __init__(
         self,
         borehole_diameter: float,
@@ -59,8 +159,6 @@ class DoubleUTube(UTube):
         # static parameters
         self.borehole_diameter = borehole_diameter
         self.grout_conductivity = grout_conductivity
-        self.borehole_radius = borehole_diameter / 2  # radius of borehole (m)
-        self.pipe_radius = pipe_outer_diameter / 2  # pipe outer radius (m)
 
         if pipe_inlet_arrangement == DoubleUPipeInletArrangement.ADJACENT.name:
             self.pipe_inlet_arrangement = DoubleUPipeInletArrangement.ADJACENT
@@ -77,17 +175,10 @@ class DoubleUTube(UTube):
         self.grout_conductivity = grout_conductivity  # W/(m-K)
         self.soil_conductivity = soil_conductivity  # W/(m-K)
 
-        # (m) radial distance between centers of symmetrically placed pipes and borehole center (rc)
-        self.pipe_centers_radius = shank_space
-
-        # thermal conductivity ratio, dimensionless
-        self.sigma = (self.grout_conductivity - self.soil_conductivity) / (
-            self.grout_conductivity + self.soil_conductivity
-        )
-
         # Check if shank spacing realistic
-        lower_shank_space_limit = sqrt(pipe_outer_diameter**2 / 2)
-        upper_shank_space_limit = 0.5 * (borehole_diameter - pipe_outer_diameter)
+        lower_shank_space_limit, upper_shank_space_limit = double_u_shank_space_limits(
+            borehole_diameter, pipe_outer_diameter
+        )
         if shank_space < lower_shank_space_limit:
             msg = (
                 "Shank spacing is too small and must be greater than the 2 pipe radii to prevent "
@@ -101,34 +192,39 @@ class DoubleUTube(UTube):
             )
             raise AssertionError(msg)
 
+        parameters = double_u_static_parameters(
+            borehole_diameter, pipe_outer_diameter, shank_space, grout_conductivity, soil_conductivity
+        )
+        self.borehole_radius = parameters["borehole_radius"]  # radius of borehole (m)
+        self.pipe_radius = parameters["pipe_radius"]  # pipe outer radius (m)
+
+        # (m) radial distance between centers of symmetrically placed pipes and borehole center (rc)
+        self.pipe_centers_radius = parameters["pipe_centers_radius"]
+
+        # thermal conductivity ratio, dimensionless
+        self.sigma = parameters["sigma"]
+
         # static parameters - calc_bh_resist_local
-        self.p_pc = self.pipe_radius**2 / (4 * self.pipe_centers_radius**2)
-        self.p_c = self.pipe_centers_radius**2 / (self.borehole_radius**8 - self.pipe_centers_radius**8) ** 0.25
-        self.p_b = self.borehole_radius**2 / (self.borehole_radius**8 - self.pipe_centers_radius**8) ** 0.25
-        self.eight_pi_kg = 8 * pi * self.grout_conductivity
-        self.b_2 = ln(self.borehole_radius**4 / (4 * self.pipe_radius * self.pipe_centers_radius**3))
-        self.b_3 = ln(self.borehole_radius**8 / (self.borehole_radius**8 - self.pipe_centers_radius**8))
+        self.p_pc = parameters["p_pc"]
+        self.p_c = parameters["p_c"]
+        self.p_b = parameters["p_b"]
+        self.eight_pi_kg = parameters["eight_pi_kg"]
+        self.b_2 = parameters["b_2"]
+        self.b_3 = parameters["b_3"]
 
         # static parameter - calc_internal_resist
-        self.two_pi_kg = 2 * pi * self.grout_conductivity
-        self.c_1 = self.pipe_centers_radius / self.pipe_radius
-        c_2 = self.borehole_radius**4 + self.pipe_centers_radius**4
-        c_3 = self.borehole_radius**4 - self.pipe_centers_radius**4
-        self.ln_c2_c3 = ln(c_2 / c_3)
-        self.c_4 = self.p_c**2 * self.p_b**2
-        self.c_5 = self.p_c**2 * self.p_b**6 + self.p_c**6 * self.p_b**2
-        d_2 = self.borehole_radius**2 + self.pipe_centers_radius**2
-        d_3 = self.borehole_radius**2 - self.pipe_centers_radius**2
-        self.ln_d2_d3 = ln(d_2 / d_3)
-        self.d_4 = 3 * self.p_c**3 * self.p_b**5 + self.p_c**7 * self.p_b
-        self.d_5 = self.p_c * self.p_b**7 + 3 * self.p_c**5 * self.p_b**3
-
-        # non-static parameters
-        self.pipe_resist: float | None = None
+        self.two_pi_kg = parameters["two_pi_kg"]
+        self.c_1 = parameters["c_1"]
+        self.ln_c2_c3 = parameters["ln_c2_c3"]
+        self.c_4 = parameters["c_4"]
+        self.c_5 = parameters["c_5"]
+        self.ln_d2_d3 = parameters["ln_d2_d3"]
+        self.d_4 = parameters["d_4"]
+        self.d_5 = parameters["d_5"]
 
     def update_b1(self, m_dot_per_u_tube: float, temperature: float) -> float:
         """
-        Updates b1 coefficient.
+        Computes the b1 coefficient.
 
         Javed, S. & Spitler, J.D. Calculation of Borehole Thermal Resistance. In 'Advances in
         Ground-Source Heat Pump Systems,' pp. 84. Rees, S.J. ed. Cambridge, MA. Elsevier Ltd. 2016.
@@ -147,12 +243,19 @@ class DoubleUTube(UTube):
                     & grout conductivity, dimensionless
         """
 
-        pipe_resist = self.calc_fluid_pipe_resist(m_dot_per_u_tube, temperature)
-        self.pipe_resist = pipe_resist
-        beta = 2 * pi * self.grout_conductivity * pipe_resist
-        b1 = (1 - beta) / (1 + beta)  # dimensionless parameter
+        return self.calc_b1(self.calc_fluid_pipe_resist(m_dot_per_u_tube, temperature))
 
-        return b1
+    def calc_b1(self, pipe_resist):
+        """
+        Computes the b1 coefficient from the pipe resistance. Works on scalar or array inputs.
+
+        :param pipe_resist: combined convection and conduction pipe resistance, K/(W/m)
+
+        :return: b1: a ratio of (1-beta)/(1+beta), dimensionless
+        """
+
+        beta = 2 * pi * self.grout_conductivity * pipe_resist
+        return (1 - beta) / (1 + beta)  # dimensionless parameter
 
     def calc_bh_resist_local(self, m_dot_per_u_tube: float, temperature: float) -> float:
         """
@@ -171,13 +274,22 @@ class DoubleUTube(UTube):
         :return: borehole_resist_local: local borehole resistance, K/(W/m)
         """
 
-        b1 = self.update_b1(m_dot_per_u_tube, temperature)
+        pipe_resist = self.calc_fluid_pipe_resist(m_dot_per_u_tube, temperature)
+        return self._calc_bh_resist_local(pipe_resist, self.calc_b1(pipe_resist))
+
+    def _calc_bh_resist_local(self, pipe_resist, b1):
+        """
+        Local borehole resistance for a given pipe resistance and b1 coefficient.
+        Works on scalar or array inputs.
+
+        :param pipe_resist: combined convection and conduction pipe resistance, K/(W/m)
+        :param b1: b1 coefficient, dimensionless
 
-        if self.pipe_resist is None:
-            raise ValueError("Pipe resistance has not been calculated yet.")
+        :return: borehole_resist_local: local borehole resistance, K/(W/m)
+        """
 
         # --Borehole resistance, 0th order [K/(W/m)]--
-        rb0 = self.pipe_resist / 4 + 1 / self.eight_pi_kg * (self.b_2 + self.sigma * self.b_3)
+        rb0 = pipe_resist / 4 + 1 / self.eight_pi_kg * (self.b_2 + self.sigma * self.b_3)
 
         # --Borehole resistance, 1st order [K/(W/m)]--
         borehole_resist_local = rb0 - 1 / self.eight_pi_kg * (
@@ -203,14 +315,23 @@ class DoubleUTube(UTube):
         :return: internal_resist: local internal resistance, K/(W/m)
         """
 
-        b1 = self.update_b1(m_dot_per_u_tube, temperature)
+        pipe_resist = self.calc_fluid_pipe_resist(m_dot_per_u_tube, temperature)
+        return self._calc_internal_resist(pipe_resist, self.calc_b1(pipe_resist))
+
+    def _calc_internal_resist(self, pipe_resist, b1):
+        """
+        Internal resistance for a given pipe resistance and b1 coefficient.
+        Works on scalar or array inputs.
+
+        :param pipe_resist: combined convection and conduction pipe resistance, K/(W/m)
+        :param b1: b1 coefficient, dimensionless
 
-        if self.pipe_resist is None:
-            raise ValueError("Pipe resistance has not been calculated yet.")
+        :return: internal_resist: local internal resistance, K/(W/m)
+        """
 
         if self.pipe_inlet_arrangement == DoubleUPipeInletArrangement.DIAGONAL:
             # 0th order
-            ra0 = 2 * self.pipe_resist + 2 / self.two_pi_kg * (ln(self.c_1) + self.sigma * self.ln_c2_c3)
+            ra0 = 2 * pipe_resist + 2 / self.two_pi_kg * (ln(self.c_1) + self.sigma * self.ln_c2_c3)
 
             # 1st order
             internal_resist = ra0 - 2 / self.two_pi_kg * (b1 * self.p_pc * (1 + 8 * self.sigma * self.c_4) ** 2) / (
@@ -221,7 +342,7 @@ class DoubleUTube(UTube):
 
         elif self.pipe_inlet_arrangement == DoubleUPipeInletArrangement.ADJACENT:
             # 0th order
-            ra0 = 2 * self.pipe_resist + 2 / self.two_pi_kg * (ln(2 * self.c_1) + self.sigma * self.ln_d2_d3)
+            ra0 = 2 * pipe_resist + 2 / self.two_pi_kg * (ln(2 * self.c_1) + self.sigma * self.ln_d2_d3)
 
             # 1st order
             matrix_element_11 = 1 + 16 * b1 * self.sigma * self.p_pc * self.d_4
@@ -258,8 +379,10 @@ class DoubleUTube(UTube):
         """
 
         m_dot_per_u_tube = m_dot / 2
-        internal_resist = self.calc_internal_resist(m_dot_per_u_tube, temp)
-        borehole_resist_local = self.calc_bh_resist_local(m_dot_per_u_tube, temp)
+        pipe_resist = self.calc_fluid_pipe_resist(m_dot_per_u_tube, temp)
+        b1 = self.calc_b1(pipe_resist)
+        internal_resist = self._calc_internal_resist(pipe_resist, b1)
+        borehole_resist_local = self._calc_bh_resist_local(pipe_resist, b1)
         rv = self.bh_length / (self.fluid.cp(temp) * m_dot_per_u_tube)  # (K/(w/m)) thermal resistance factor
 
         effective_bhr_uhf = borehole_resist_local + rv**2 / (6 * internal_resist)
@@ -285,11 +408,138 @@ class DoubleUTube(UTube):
         """
 
         m_dot_per_u_tube = m_dot / 2
-        internal_resist = self.calc_internal_resist(m_dot_per_u_tube, temp)
-        borehole_resist_local = self.calc_bh_resist_local(m_dot_per_u_tube, temp)
+        pipe_resist = self.calc_fluid_pipe_resist(m_dot_per_u_tube, temp)
+        b1 = self.calc_b1(pipe_resist)
+        internal_resist = self._calc_internal_resist(pipe_resist, b1)
+        borehole_resist_local = self._calc_bh_resist_local(pipe_resist, b1)
 
         rv = self.bh_length / (self.fluid.cp(temp) * m_dot_per_u_tube)  # (K/(w/m)) thermal resistance factor
         n = rv / (2 * borehole_resist_local * internal_resist) ** 0.5
         effective_bhr_ubwt = borehole_resist_local * n * coth(n)
 
         return effective_bhr_ubwt
+
+    def calc_resistances(self, m_dot: float, temp: float) -> ResistanceBreakdown:
+        """
+        Calculates all resistance components with a single evaluation of the fluid properties
+        and pipe resistances.
+
+        Flow quantities and pipe resistances are those of one u-tube, which carries half the total flow.
+
+        :param m_dot: mass flow rate, kg/s
+        :param temp: temperature, Celsius
+
+        :return: resistance breakdown
+        """
+
+        m_dot_per_u_tube = m_dot / 2
+        re = self.mdot_to_re(m_dot_per_u_tube, temp)
+        nu = self.calc_nusselt(re, temp)
+        conv_resist = 1 / (nu * pi * self.fluid.k(temp))
+        cond_resist = self.calc_cond_resist()
+        pipe_resist = conv_resist + cond_resist
+        b1 = self.calc_b1(pipe_resist)
+
+        internal_resist = self._calc_internal_resist(pipe_resist, b1)
+        borehole_resist_local = self._calc_bh_resist_local(pipe_resist, b1)
+        rv = self.bh_length / (self.fluid.cp(temp) * m_dot_per_u_tube)
+
+        effective_bhr_uhf = borehole_resist_local + rv**2 / (6 * internal_resist)
+        n = rv / (2 * borehole_resist_local * internal_resist) ** 0.5
+        effective_bhr_ubwt = borehole_resist_local * n * coth(n)
+
+        return ResistanceBreakdown(
+            reynolds=re,
+            nusselt=nu,
+            flow_regime=self.flow_regime(re),
+            conv_resist=conv_resist,
+            cond_resist=cond_resist,
+            fluid_pipe_resist=pipe_resist,
+            grout_resist=borehole_resist_local - pipe_resist / 4,
+            local_bh_resist=borehole_resist_local,
+            internal_resist=internal_resist,
+            effective_bh_resist_uhf=effective_bhr_uhf,
+            effective_bh_resist_ubwt=effective_bhr_ubwt,
+        )
+
+    def calc_resistances_array(self, m_dot, temp) -> dict[str, np.ndarray]:
+        """
+        Vectorized version of calc_resistances.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, Celsius. scalar or array_like
+
+        :return: dict mapping the ResistanceBreakdown field names to arrays. flow regimes are an object array
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        m_dot_per_u_tube = m_dot / 2
+        re = self.mdot_to_re_array(m_dot_per_u_tube, temp)
+        nu = self.calc_nusselt_array(re, temp)
+        conv_resist = 1 / (nu * pi * eval_property_array(self.fluid.k, temp))
+        cond_resist = self.calc_cond_resist()
+        pipe_resist = conv_resist + cond_resist
+        b1 = self.calc_b1(pipe_resist)
+
+        internal_resist = self._calc_internal_resist(pipe_resist, b1)
+        borehole_resist_local = self._calc_bh_resist_local(pipe_resist, b1)
+        rv = self.bh_length / (eval_property_array(self.fluid.cp, temp) * m_dot_per_u_tube)
+
+        n = rv / (2 * borehole_resist_local * internal_resist) ** 0.5
+
+        return {
+            "reynolds": re,
+            "nusselt": nu,
+            "flow_regime": self.flow_regime_array(re),
+            "conv_resist": conv_resist,
+            "cond_resist": np.full_like(re, cond_resist),
+            "fluid_pipe_resist": pipe_resist,
+            "grout_resist": borehole_resist_local - pipe_resist / 4,
+            "local_bh_resist": borehole_resist_local,
+            "internal_resist": internal_resist,
+            "effective_bh_resist_uhf": borehole_resist_local + rv**2 / (6 * internal_resist),
+            "effective_bh_resist_ubwt": borehole_resist_local * n * coth_array(n),
+        }
+
+    def calc_effective_bh_resistance_uhf_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Vectorized version of calc_effective_bh_resistance_uhf.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, Celsius. scalar or array_like
+
+        :return: effective_bhr_uhf: effective borehole resistance under uniform heat flux boundary conditions [K/(W/m)]
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        m_dot_per_u_tube = m_dot / 2
+        pipe_resist = self.calc_fluid_pipe_resist_array(m_dot_per_u_tube, temp)
+        b1 = self.calc_b1(pipe_resist)
+        internal_resist = self._calc_internal_resist(pipe_resist, b1)
+        borehole_resist_local = self._calc_bh_resist_local(pipe_resist, b1)
+        rv = self.bh_length / (eval_property_array(self.fluid.cp, temp) * m_dot_per_u_tube)
+
+        return borehole_resist_local + rv**2 / (6 * internal_resist)
+
+    def calc_effective_bh_resistance_ubwt_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Vectorized version of calc_effective_bh_resistance_ubwt.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, Celsius. scalar or array_like
+
+        :return: effective_bhr_ubwt: effective borehole resistance for uniform borehole wall temperature
+                                    boundary condition [K/(W/m)]
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        m_dot_per_u_tube = m_dot / 2
+        pipe_resist = self.calc_fluid_pipe_resist_array(m_dot_per_u_tube, temp)
+        b1 = self.calc_b1(pipe_resist)
+        internal_resist = self._calc_internal_resist(pipe_resist, b1)
+        borehole_resist_local = self._calc_bh_resist_local(pipe_resist, b1)
+
+        rv = self.bh_length / (eval_property_array(self.fluid.cp, temp) * m_dot_per_u_tube)
+        n = rv / (2 * borehole_resist_local * internal_resist) ** 0.5
+
+        return borehole_resist_local * n * coth_array(n)
@@ -0,0 +1,168 @@
+"""
+Forward-mode dual numbers for exact derivatives of the resistance calculation.
+
+A Dual carries a value and its derivatives with respect to the mass flow rate and the temperature. The functions
+below accept floats or Duals, so calculations written with them give values for float inputs and values plus
+derivatives for Dual inputs. log and coth also accept NumPy arrays, so the same calculations evaluate many
+boreholes at once, as in bhr.borehole_batch.
+"""
+
+import math
+
+import numpy as np
+
+from bhr.utilities import coth_array
+
+
+class Dual:
+    """
+    Value and its derivatives with respect to mass flow rate and temperature.
+
+    Comparisons use the value only, so branches are taken as for the value alone.
+    """
+
+    __slots__ = ("d_m_dot", "d_temp", "value")
+
+    def __init__(self, value: float, d_m_dot: float = 0.0, d_temp: float = 0.0):
+        """
+        :param value: value
+        :param d_m_dot: derivative with respect to mass flow rate
+        :param d_temp: derivative with respect to temperature
+        """
+
+        self.value = value
+        self.d_m_dot = d_m_dot
+        self.d_temp = d_temp
+
+    def __repr__(self):
+        return f"Dual({self.value!r}, {self.d_m_dot!r}, {self.d_temp!r})"
+
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value + other.value, self.d_m_dot + other.d_m_dot, self.d_temp + other.d_temp)
+        return Dual(self.value + other, self.d_m_dot, self.d_temp)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value - other.value, self.d_m_dot - other.d_m_dot, self.d_temp - other.d_temp)
+        return Dual(self.value - other, self.d_m_dot, self.d_temp)
+
+    def __rsub__(self, other):
+        return Dual(other - self.value, -self.d_m_dot, -self.d_temp)
+
+    def __mul__(self, other):
+        if isinstance(other, Dual):
+            return Dual(
+                self.value * other.value,
+                self.d_m_dot * other.value + self.value * other.d_m_dot,
+                self.d_temp * other.value + self.value * other.d_temp,
+            )
+        return Dual(self.value * other, self.d_m_dot * other, self.d_temp * other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Dual):
+            inv = 1 / other.value
+            value = self.value * inv
+            return Dual(
+                value,
+                (self.d_m_dot - value * other.d_m_dot) * inv,
+                (self.d_temp - value * other.d_temp) * inv,
+            )
+        inv = 1 / other
+        return Dual(self.value * inv, self.d_m_dot * inv, self.d_temp * inv)
+
+    def __rtruediv__(self, other):
+        inv = 1 / self.value
+        value = other * inv
+        return Dual(value, -value * self.d_m_dot * inv, -value * self.d_temp * inv)
+
+    def __neg__(self):
+        return Dual(-self.value, -self.d_m_dot, -self.d_temp)
+
+    def __pos__(self):
+        return self
+
+    def __pow__(self, other):
+        if isinstance(other, Dual):
+            return exp(other * log(self))
+        if other == 0:
+            return Dual(1.0)
+        value = self.value**other
+        d_value = other * self.value ** (other - 1)
+        return Dual(value, d_value * self.d_m_dot, d_value * self.d_temp)
+
+    def __rpow__(self, other):
+        value = other**self.value
+        d_value = value * math.log(other)
+        return Dual(value, d_value * self.d_m_dot, d_value * self.d_temp)
+
+    def __lt__(self, other):
+        return self.value < (other.value if isinstance(other, Dual) else other)
+
+    def __le__(self, other):
+        return self.value <= (other.value if isinstance(other, Dual) else other)
+
+    def __gt__(self, other):
+        return self.value > (other.value if isinstance(other, Dual) else other)
+
+    def __ge__(self, other):
+        return self.value >= (other.value if isinstance(other, Dual) else other)
+
+    def __int__(self):
+        return int(self.value)
+
+
+def _chain(x: Dual, value: float, d_value: float) -> Dual:
+    return Dual(value, d_value * x.d_m_dot, d_value * x.d_temp)
+
+
+def exp(x):
+    if isinstance(x, Dual):
+        value = math.exp(x.value)
+        return _chain(x, value, value)
+    return math.exp(x)
+
+
+def log(x):
+    if isinstance(x, Dual):
+        return _chain(x, math.log(x.value), 1 / x.value)
+    if isinstance(x, np.ndarray):
+        return np.log(x)
+    return math.log(x)
+
+
+def coth(x):
+    if isinstance(x, Dual):
+        sinh = math.sinh(x.value)
+        return _chain(x, math.cosh(x.value) / sinh, -1 / sinh**2)
+    if isinstance(x, np.ndarray):
+        return coth_array(x)
+    return math.cosh(x) / math.sinh(x)
+
+
+def smoothing_function(x, x_low_limit, x_high_limit, y_low_limit, y_high_limit):
+    """
+    Sigmoid smoothing function, see bhr.utilities.smoothing_function
+
+    :param x: independent variable
+    :param x_low_limit: lower limit on x range
+    :param x_high_limit: upper limit on x range
+    :param y_low_limit: lower limit on y range
+    :param y_high_limit: upper limit on y range
+    :return: smoothed value between x_low_limit and x_high_limit. returns y_low_limit and y_high_limit
+    below and above the x_low_limit and x_high_limit, respectively.
+    """
+
+    if x < x_low_limit:
+        return y_low_limit
+
+    if x > x_high_limit:
+        return y_high_limit
+
+    s_x = (x - x_low_limit) / (x_high_limit - x_low_limit) * 10 - 5
+    s_y = 1 / (1 + exp(-s_x))
+    return s_y * (y_high_limit - y_low_limit) + y_low_limit
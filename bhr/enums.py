@@ -15,3 +15,9 @@ class BoreholeType(Enum):
 class DoubleUPipeInletArrangement(Enum):
     ADJACENT = auto()
     DIAGONAL = auto()
+
+
+class FlowRegime(Enum):
+    LAMINAR = auto()
+    TRANSITIONAL = auto()
+    TURBULENT = auto()
@@ -1,13 +1,120 @@
 import logging
+import threading
+import warnings
+import weakref
+from collections.abc import Callable
+from importlib import import_module
+from itertools import pairwise
+from math import ceil, log
+from typing import TypeVar
 
-from scp.ethyl_alcohol import EthylAlcohol
-from scp.ethylene_glycol import EthyleneGlycol
-from scp.methyl_alcohol import MethylAlcohol
-from scp.propylene_glycol import PropyleneGlycol
-from scp.water import Water
+import numpy as np
+
+from bhr.dual import Dual, exp
+
+# scalar property lookups also accept Duals, for eval_property_dual
+_FloatOrDual = TypeVar("_FloatOrDual", float, Dual)
+
+# SecondaryCoolantProps module and class of each fluid type. the modules are imported on first use, so only the
+# fluids that are actually requested are loaded
+_SCP_FLUIDS = {
+    "ETHYLALCOHOL": ("scp.ethyl_alcohol", "EthylAlcohol"),
+    "ETHYLENEGLYCOL": ("scp.ethylene_glycol", "EthyleneGlycol"),
+    "METHYLALCOHOL": ("scp.methyl_alcohol", "MethylAlcohol"),
+    "PROPYLENEGLYCOL": ("scp.propylene_glycol", "PropyleneGlycol"),
+    "WATER": ("scp.water", "Water"),
+}
+
+
+def _scp_fluid_class(fluid_name: str) -> type:
+    """
+    :param fluid_name: upper case fluid type, a key of _SCP_FLUIDS
+    :return: SecondaryCoolantProps fluid class
+    """
+
+    module_name, class_name = _SCP_FLUIDS[fluid_name]
+    return getattr(import_module(module_name), class_name)
+
+
+# options passed to TabulatedFluid by get_fluid. None when tabulated fluids are disabled.
+_tabulated_options: dict | None = None
+
+
+def enable_tabulated_fluids(step: float = 0.25, method: str = "cubic", out_of_range: str = "fallback") -> None:
+    """
+    Makes get_fluid return TabulatedFluid objects, so all pipes and boreholes constructed afterwards
+    use interpolated fluid properties.
+
+    :param step: temperature grid spacing, in C
+    :param method: interpolation method. "cubic" or "linear"
+    :param out_of_range: behavior for queries outside the grid. "fallback" or "raise"
+    """
+
+    global _tabulated_options  # noqa: PLW0603
+    _tabulated_options = {"step": step, "method": method, "out_of_range": out_of_range}
+
+
+def disable_tabulated_fluids() -> None:
+    """
+    Makes get_fluid return SecondaryCoolantProps fluid objects. This is the default.
+    """
+
+    global _tabulated_options  # noqa: PLW0603
+    _tabulated_options = None
+
+
+# shared fluid instances, keyed by fluid name, concentration, and tabulation options
+_fluid_registry: dict[tuple, object] = {}
+_fluid_registry_lock = threading.Lock()
+
+# called with each fluid added to the registry, see bhr.profiling
+_registry_hooks: list[Callable[[object], None]] = []
 
 
 def get_fluid(fluid_type: str, fluid_concentration: float = 0):
+    """
+    Returns the fluid object for a fluid type and concentration.
+
+    Fluids are interned, so every call with the same fluid type and concentration returns the same instance.
+    Fluid objects hold no calculation state and are shared between pipes and boreholes, so they must be
+    treated as read-only. Unsupported fluid types raise a LookupError.
+
+    :param fluid_type: fluid type. "ETHYLALCOHOL", "ETHYLENEGLYCOL", "METHYLALCOHOL", "PROPYLENEGLYCOL", or "WATER"
+    :param fluid_concentration: fractional concentration of antifreeze mixture, from 0-0.6.
+    :return: fluid object
+    """
+
+    fluid_name = fluid_type.upper()
+    concentration = 0.0 if fluid_name == "WATER" else max(float(fluid_concentration), 0.0)
+    options = None if _tabulated_options is None else tuple(sorted(_tabulated_options.items()))
+    key = (fluid_name, concentration, options)
+
+    fluid = _fluid_registry.get(key)
+    if fluid is not None:
+        return fluid
+
+    with _fluid_registry_lock:
+        fluid = _fluid_registry.get(key)
+        if fluid is None:
+            fluid = _get_scp_fluid(fluid_type, fluid_concentration)
+            if _tabulated_options is not None:
+                fluid = TabulatedFluid(fluid, **_tabulated_options)
+            _fluid_registry[key] = fluid
+            for hook in _registry_hooks:
+                hook(fluid)
+        return fluid
+
+
+def clear_fluid_registry() -> None:
+    """
+    Removes all shared fluid instances. Objects that already hold a fluid keep it.
+    """
+
+    with _fluid_registry_lock:
+        _fluid_registry.clear()
+
+
+def _get_scp_fluid(fluid_type: str, fluid_concentration: float = 0):
     if fluid_concentration < 0:
         logging.warning("Attempting to set <0 water-antifreeze mixture concentration.")
         logging.warning("Expect fluid concentration 0 <= x <= 0.6")
@@ -15,28 +122,474 @@ def get_fluid(fluid_type: str, fluid_concentration: float = 0):
         fluid_concentration = 0
 
     fluid_name = fluid_type.upper()
+    if fluid_name not in _SCP_FLUIDS:
+        raise LookupError(f'Unsupported fluid "{fluid_type}". Must be one of {", ".join(_SCP_FLUIDS)}')
+
     if fluid_name == "WATER":
         if fluid_concentration == 0:
-            return Water()
+            return _scp_fluid_class(fluid_name)()
         else:
             logging.warning(
                 f'Fluid "{fluid_name}" - attempting to set non-zero \
                             water-antifreeze mixture concentration "{fluid_concentration:0.3f}".'
             )
             logging.warning("Defaulting to pure water.")
-            return Water()
+            return _scp_fluid_class(fluid_name)()
 
     if fluid_concentration == 0:
         logging.warning(f'Setting fluid "{fluid_name} with fluid-antifreeze mixture concentration = 0')
 
-    if fluid_name == "ETHYLALCOHOL":
-        return EthylAlcohol(fluid_concentration)
-    elif fluid_name == "ETHYLENEGLYCOL":
-        return EthyleneGlycol(fluid_concentration)
-    elif fluid_name == "METHYLALCOHOL":
-        return MethylAlcohol(fluid_concentration)
-    elif fluid_name == "PROPYLENEGLYCOL":
-        return PropyleneGlycol(fluid_concentration)
+    return _scp_fluid_class(fluid_name)(fluid_concentration)
+
+
+# temperatures where a fluid's property correlations switch equations, keyed by fluid name.
+# tables are split at these points so interpolation never spans a discontinuity.
+_CORRELATION_BREAKPOINTS: dict[str, tuple[float, ...]] = {"Water": (20.0,)}
+
+
+class _TableSegment:
+    """
+    Property values on a uniform temperature grid between two breakpoints.
+    """
+
+    def __init__(self, fluid, properties: tuple, t_lo: float, t_hi: float, step: float, sample_hi: float):
+        num_points = max(ceil((t_hi - t_lo) / step) + 1, 4)
+        self.t_lo = t_lo
+        self.t_hi = t_hi
+        self.step = (t_hi - t_lo) / (num_points - 1)
+        self.inv_step = 1 / self.step
+        self.num_points = num_points
+        self.temps = np.linspace(t_lo, t_hi, num_points)
+
+        # the upper end of the segment is sampled at sample_hi, which is just below a breakpoint
+        sample_temps = self.temps.tolist()
+        sample_temps[-1] = sample_hi
+
+        self.tables = {}
+        self.lists = {}
+        for name in properties:
+            values = [getattr(fluid, name)(t) for t in sample_temps]
+            self.tables[name] = np.array(values)
+            self.lists[name] = values
+
+    def interp_scalar(self, name: str, temp: _FloatOrDual, method: str) -> _FloatOrDual:
+        x = (temp - self.t_lo) * self.inv_step
+        y = self.lists[name]
+
+        if method == "linear":
+            i = min(int(x), self.num_points - 2)
+            s = x - i
+            return y[i] + s * (y[i + 1] - y[i])
+
+        # 4-point Lagrange interpolation using points i-1, i, i+1, i+2
+        i = min(max(int(x), 1), self.num_points - 3)
+        s = x - i
+        sp1 = s + 1
+        sm1 = s - 1
+        sm2 = s - 2
+        return (
+            -s * sm1 * sm2 / 6 * y[i - 1]
+            + sp1 * sm1 * sm2 / 2 * y[i]
+            - sp1 * s * sm2 / 2 * y[i + 1]
+            + sp1 * s * sm1 / 6 * y[i + 2]
+        )
+
+    def interp_array(self, name: str, temp: np.ndarray, method: str) -> np.ndarray:
+        x = (temp - self.t_lo) * self.inv_step
+        y = self.tables[name]
+
+        if method == "linear":
+            i = np.minimum(x.astype(int), self.num_points - 2)
+            s = x - i
+            return y[i] + s * (y[i + 1] - y[i])
+
+        i = np.clip(x.astype(int), 1, self.num_points - 3)
+        s = x - i
+        sp1 = s + 1
+        sm1 = s - 1
+        sm2 = s - 2
+        return (
+            -s * sm1 * sm2 / 6 * y[i - 1]
+            + sp1 * sm1 * sm2 / 2 * y[i]
+            - sp1 * s * sm2 / 2 * y[i + 1]
+            + sp1 * s * sm1 / 6 * y[i + 2]
+        )
+
+
+class TabulatedFluid:
+    """
+    Fluid properties precomputed on a uniform temperature grid and answered by interpolation.
+
+    Wraps a SecondaryCoolantProps fluid and exposes the same property methods (mu, density, cp, k, prandtl and their
+    long-form names). Each method accepts a scalar or an array of temperatures.
+
+    With the default 0.25 C grid, the maximum relative error against SecondaryCoolantProps is below 1e-6 for
+    cubic interpolation and below 1e-3 for linear interpolation, for every supported fluid and concentration.
+    The error actually observed halfway between grid points is stored in ``max_rel_error``.
+
+    By default, the grid spans the valid temperature range of the underlying fluid. Queries outside the grid are
+    passed through to the underlying fluid when ``out_of_range="fallback"``, or raise a ValueError when
+    ``out_of_range="raise"``.
+    """
+
+    _properties = ("viscosity", "density", "specific_heat", "conductivity", "prandtl")
+
+    def __init__(
+        self,
+        fluid,
+        t_min: float | None = None,
+        t_max: float | None = None,
+        step: float = 0.25,
+        method: str = "cubic",
+        out_of_range: str = "fallback",
+    ):
+        """
+        :param fluid: SecondaryCoolantProps fluid object to tabulate
+        :param t_min: lower limit of the temperature grid, in C. defaults to the lower limit of the fluid
+        :param t_max: upper limit of the temperature grid, in C. defaults to the upper limit of the fluid
+        :param step: maximum temperature grid spacing, in C
+        :param method: interpolation method. "cubic" or "linear"
+        :param out_of_range: behavior for queries outside the grid. "fallback" or "raise"
+        """
+
+        if method not in ("cubic", "linear"):
+            raise ValueError(f'Unsupported interpolation method "{method}"')
+
+        if out_of_range not in ("fallback", "raise"):
+            raise ValueError(f'Unsupported out_of_range option "{out_of_range}"')
+
+        self.fluid = fluid
+        self.method = method
+        self.out_of_range = out_of_range
+        self.t_min = fluid.t_min if t_min is None else max(t_min, fluid.t_min)
+        self.t_max = fluid.t_max if t_max is None else min(t_max, fluid.t_max)
+
+        breakpoints = [t for t in _CORRELATION_BREAKPOINTS.get(fluid.fluid_name, ()) if self.t_min < t < self.t_max]
+        bounds = [self.t_min, *breakpoints, self.t_max]
+        self._segments = []
+        for t_lo, t_hi in pairwise(bounds):
+            sample_hi = t_hi if t_hi == self.t_max else t_hi - 1e-9
+            self._segments.append(_TableSegment(fluid, self._properties, t_lo, t_hi, step, sample_hi))
+
+        # check the error halfway between grid points, where the interpolation error is largest
+        self.max_rel_error = dict.fromkeys(self._properties, 0.0)
+        for segment in self._segments:
+            midpoints = segment.temps[:-1] + segment.step / 2
+            for name in self._properties:
+                exact = np.array([getattr(fluid, name)(t) for t in midpoints.tolist()])
+                rel_error = np.max(np.abs(segment.interp_array(name, midpoints, method) / exact - 1))
+                self.max_rel_error[name] = max(self.max_rel_error[name], float(rel_error))
+
+    def __getattr__(self, name):
+        # everything that is not tabulated is answered by the underlying fluid
+        if name == "fluid":
+            raise AttributeError(name)
+        return getattr(self.fluid, name)
+
+    def _interp_scalar(self, name: str, temp: _FloatOrDual) -> _FloatOrDual:
+        if temp < self.t_min or temp > self.t_max:
+            if self.out_of_range == "raise":
+                raise ValueError(f"Temperature {temp} C outside of tabulated range {self.t_min} to {self.t_max} C")
+            return getattr(self.fluid, name)(temp)
+
+        for segment in self._segments:
+            if temp < segment.t_hi:
+                return segment.interp_scalar(name, temp, self.method)
+        return self._segments[-1].interp_scalar(name, temp, self.method)
+
+    def _interp_array(self, name: str, temp: np.ndarray) -> np.ndarray:
+        outside = (temp < self.t_min) | (temp > self.t_max)
+        if outside.any() and self.out_of_range == "raise":
+            raise ValueError(f"Temperatures outside of tabulated range {self.t_min} to {self.t_max} C")
+
+        if len(self._segments) == 1 and not outside.any():
+            return self._segments[0].interp_array(name, temp, self.method)
+
+        values = np.empty_like(temp)
+        values[outside] = [getattr(self.fluid, name)(t) for t in temp[outside].tolist()]
+        for i, segment in enumerate(self._segments):
+            in_segment = ~outside & (temp >= segment.t_lo)
+            if i < len(self._segments) - 1:
+                in_segment &= temp < segment.t_hi
+            values[in_segment] = segment.interp_array(name, temp[in_segment], self.method)
+        return values
+
+    def _interp(self, name: str, temp):
+        if isinstance(temp, (int, float)):
+            return self._interp_scalar(name, temp)
+        temp = np.asarray(temp, dtype=float)
+        if temp.ndim == 0:
+            return self._interp_scalar(name, float(temp))
+        return self._interp_array(name, temp)
+
+    def viscosity(self, temp):
+        """
+        :param temp: temperature, C. scalar or array_like
+        :return: dynamic viscosity, Pa-s
+        """
+        return self._interp("viscosity", temp)
+
+    def density(self, temp):
+        """
+        :param temp: temperature, C. scalar or array_like
+        :return: density, kg/m3
+        """
+        return self._interp("density", temp)
+
+    def specific_heat(self, temp):
+        """
+        :param temp: temperature, C. scalar or array_like
+        :return: specific heat, J/kg-K
+        """
+        return self._interp("specific_heat", temp)
+
+    def conductivity(self, temp):
+        """
+        :param temp: temperature, C. scalar or array_like
+        :return: thermal conductivity, W/m-K
+        """
+        return self._interp("conductivity", temp)
+
+    def prandtl(self, temp):
+        """
+        :param temp: temperature, C. scalar or array_like
+        :return: Prandtl number, dimensionless
+        """
+        return self._interp("prandtl", temp)
+
+    mu = viscosity
+    rho = density
+    cp = specific_heat
+    k = conductivity
+    pr = prandtl
+
+
+# long-form names of the property shorthands
+_PROPERTY_NAMES = {"mu": "viscosity", "rho": "density", "cp": "specific_heat", "k": "conductivity", "pr": "prandtl"}
+
+# relative tolerance of the vectorized correlations against the SecondaryCoolantProps methods
+_ARRAY_PROPERTY_RTOL = 1e-12
+
+_LN_10 = log(10)
+
+
+def _clip_temperature(fluid, temp: np.ndarray) -> np.ndarray:
+    """
+    Clamps temperatures to the limits of a SecondaryCoolantProps fluid, with the warning it gives for a scalar.
+    """
+
+    if np.any(temp < fluid.t_min):
+        warnings.warn(
+            f'Fluid "{fluid.fluid_name}", temperature must be greater than {fluid.t_min:0.1f}.\n'
+            f"Resetting temperature to {fluid.t_min:0.1f}.",
+            stacklevel=3,
+        )
+    if np.any(temp > fluid.t_max):
+        warnings.warn(
+            f'Fluid "{fluid.fluid_name}", temperature must be less than {fluid.t_max:0.1f}.\n'
+            f"Resetting temperature to {fluid.t_max:0.1f}.",
+            stacklevel=3,
+        )
+    return np.clip(temp, fluid.t_min, fluid.t_max)
+
+
+def _melinder_temperature_coefficients(fluid, name: str) -> tuple[float, ...]:
+    """
+    Coefficients of a Melinder property polynomial in (t - t_base), with the concentration terms summed for the
+    fluid's concentration. Only reads the public coefficients, concentration, and base values of the fluid.
+
+    :param fluid: Melinder fluid
+    :param name: property name, "viscosity", "density", "specific_heat", or "conductivity"
+    :return: coefficients of the powers 0 to 3 of (t - t_base)
+    """
+
+    x_xm = fluid.x_pct - fluid.x_base
+    coefficients = [0.0] * 4
+    for i, row in enumerate(getattr(fluid, f"coefficient_{name}")()):
+        for j, c in enumerate(row):
+            coefficients[j] += c * x_xm**i
+    return tuple(coefficients)
+
+
+def _melinder_array_property(fluid, name: str) -> Callable[[np.ndarray], np.ndarray]:
+    a0, a1, a2, a3 = _melinder_temperature_coefficients(fluid, name)
+
+    def prop(temp: np.ndarray) -> np.ndarray:
+        y = _clip_temperature(fluid, temp) - fluid.t_base
+        value = a0 + y * (a1 + y * (a2 + y * a3))
+        # the viscosity correlation is the exponential of the polynomial
+        return np.exp(value) / 1000.0 if name == "viscosity" else value
+
+    return prop
+
+
+def _water_array_property(fluid, name: str) -> Callable[[np.ndarray], np.ndarray]:
+    # the correlations of scp.water.Water, which only accepts scalars, with the polynomials in Horner form
+    def viscosity(temp: np.ndarray) -> np.ndarray:
+        t = _clip_temperature(fluid, temp)
+        dt = t - 20
+        below = np.exp(_LN_10 * (-3.30233 + 1301 / (998.333 + dt * (8.1855 + 0.00585 * dt)))) * 0.1
+        above = 1.002 * np.exp(_LN_10 * dt * (-1.3272 - 0.001053 * dt) / (t + 105)) * 0.001
+        return np.where(t < 20, below, above)
+
+    def specific_heat(temp: np.ndarray) -> np.ndarray:
+        t = _clip_temperature(fluid, temp)
+        return (4.21534 + t * (-0.00287819 + t * (7.4729e-05 + t * (-7.79624e-07 + t * 3.220424e-09)))) * 1000
+
+    def conductivity(temp: np.ndarray) -> np.ndarray:
+        t = _clip_temperature(fluid, temp)
+        return 0.560101 + t * (0.00211703 + t * (-1.05172e-05 + t * (1.497323e-08 + t * -1.48553e-11)))
+
+    def density(temp: np.ndarray) -> np.ndarray:
+        t = _clip_temperature(fluid, temp)
+        numerator = 999.83952 + t * (
+            16.945176 + t * (-0.0079870401 + t * (-4.6170461e-05 + t * (1.0556302e-07 + t * -2.8054253e-10)))
+        )
+        return numerator / (1 + 0.01687985 * t)
+
+    return {
+        "viscosity": viscosity,
+        "specific_heat": specific_heat,
+        "conductivity": conductivity,
+        "density": density,
+    }[name]
+
+
+def _build_array_property(fluid, name: str) -> Callable[[np.ndarray], np.ndarray] | None:
+    """
+    Vectorized version of a SecondaryCoolantProps property method, or None if there is none.
+
+    The vectorized correlation is checked against the scalar method across the valid temperature range, and
+    discarded if they disagree, so a change to SecondaryCoolantProps falls back to the scalar method rather than
+    returning different values.
+    """
+
+    from scp.base_melinder import BaseMelinder  # noqa: PLC0415
+
+    if name == "prandtl":
+        cp = _array_property(fluid, "specific_heat")
+        mu = _array_property(fluid, "viscosity")
+        k = _array_property(fluid, "conductivity")
+        if cp is None or mu is None or k is None:
+            return None
+        return lambda temp: cp(temp) * mu(temp) / k(temp)
+
+    if name not in ("viscosity", "density", "specific_heat", "conductivity"):
+        return None
+    if isinstance(fluid, BaseMelinder):
+        prop = _melinder_array_property(fluid, name)
+    elif type(fluid).__module__ == "scp.water" and type(fluid).__name__ == "Water":
+        prop = _water_array_property(fluid, name)
     else:
-        logging.error(f'Unsupported fluid "{fluid_name}"')
-        assert False
+        return None
+
+    check_temps = np.linspace(fluid.t_min, fluid.t_max, 41)
+    expected = [getattr(fluid, name)(t) for t in check_temps.tolist()]
+    if not np.allclose(prop(check_temps), expected, rtol=_ARRAY_PROPERTY_RTOL, atol=0):
+        logging.warning(f'Vectorized {name} of fluid "{fluid.fluid_name}" does not match SecondaryCoolantProps')
+        return None
+    return prop
+
+
+# vectorized property methods of SecondaryCoolantProps fluids, keyed by fluid and property name
+_array_properties: "weakref.WeakKeyDictionary[object, dict]" = weakref.WeakKeyDictionary()
+_array_properties_lock = threading.RLock()
+
+
+def _array_property(fluid, name: str) -> Callable[[np.ndarray], np.ndarray] | None:
+    with _array_properties_lock:
+        properties = _array_properties.setdefault(fluid, {})
+        if name not in properties:
+            properties[name] = _build_array_property(fluid, name)
+        return properties[name]
+
+
+def eval_property_array(prop: Callable[[float], float], temp) -> np.ndarray:
+    """
+    Evaluates a scalar fluid property function over an array of temperatures.
+
+    Tabulated fluid properties, and the correlations of the SecondaryCoolantProps fluids, are evaluated in a
+    single vectorized call. Otherwise, each unique temperature is only evaluated once.
+
+    :param prop: fluid property function, e.g. ``fluid.mu``
+    :param temp: temperature, C. scalar or array_like
+    :return: property values, with the same shape as temp
+    """
+
+    temp = np.asarray(temp, dtype=float)
+    fluid = getattr(prop, "__self__", None)
+    if isinstance(fluid, TabulatedFluid):
+        return np.asarray(prop(temp.ravel()), dtype=float).reshape(temp.shape)
+
+    if fluid is not None and type(fluid).__module__.startswith("scp."):
+        array_prop = _array_property(fluid, _PROPERTY_NAMES.get(prop.__name__, prop.__name__))
+        if array_prop is not None:
+            return array_prop(temp)
+
+    unique_temps, inverse = np.unique(temp.ravel(), return_inverse=True)
+    values = np.fromiter((prop(t) for t in unique_temps.tolist()), dtype=float, count=unique_temps.size)
+    return values[inverse].reshape(temp.shape)
+
+
+def eval_property_dual(prop: Callable[[float], float], temp: Dual) -> Dual:
+    """
+    Evaluates a fluid property function and its exact derivative with respect to temperature.
+
+    SecondaryCoolantProps correlations are evaluated in forward mode. Tabulated properties are differentiated
+    through the interpolating polynomial, so the derivative is that of the values actually returned.
+
+    :param prop: fluid property function, e.g. ``fluid.mu``
+    :param temp: temperature, C
+    :return: property value and derivatives
+    """
+
+    fluid = getattr(prop, "__self__", None)
+    if fluid is None:
+        raise TypeError(f"{prop!r} is not a fluid property method")
+    name = _PROPERTY_NAMES.get(prop.__name__, prop.__name__)
+    return _eval_property_dual(fluid, name, temp)
+
+
+def _eval_property_dual(fluid, name: str, temp: Dual) -> Dual:
+    if name == "prandtl":
+        mu = _eval_property_dual(fluid, "viscosity", temp)
+        k = _eval_property_dual(fluid, "conductivity", temp)
+        return _eval_property_dual(fluid, "specific_heat", temp) * mu / k
+
+    if isinstance(fluid, TabulatedFluid):
+        if temp < fluid.t_min or temp > fluid.t_max:
+            if fluid.out_of_range == "raise":
+                raise ValueError(
+                    f"Temperature {temp.value} C outside of tabulated range {fluid.t_min} to {fluid.t_max} C"
+                )
+            return _eval_property_dual(fluid.fluid, name, temp)
+        return fluid._interp_scalar(name, temp)
+
+    from scp.base_melinder import BaseMelinder  # noqa: PLC0415
+
+    if isinstance(fluid, BaseMelinder) and name in ("viscosity", "density", "specific_heat", "conductivity"):
+        value = _melinder_polynomial_dual(fluid, name, temp)
+        # the viscosity correlation is the exponential of the polynomial
+        return exp(value) / 1000.0 if name == "viscosity" else value
+
+    return getattr(fluid, name)(temp)
+
+
+def _melinder_polynomial_dual(fluid, name: str, temp: Dual) -> Dual:
+    """
+    Melinder property polynomial and its derivative, see BaseMelinder._f_prop
+
+    :param fluid: Melinder fluid
+    :param name: property name, "viscosity", "density", "specific_heat", or "conductivity"
+    :param temp: temperature, C
+    :return: polynomial value and derivatives
+    """
+
+    a0, a1, a2, a3 = _melinder_temperature_coefficients(fluid, name)
+    t = float(_clip_temperature(fluid, np.asarray(temp.value)))
+    y = t - fluid.t_base
+    value = a0 + y * (a1 + y * (a2 + y * a3))
+
+    # temperatures outside of the correlation limits are clamped, so the property does not change with them
+    d_value = a1 + y * (2 * a2 + y * 3 * a3) if t == temp.value else 0.0
+    return Dual(value, d_value * temp.d_m_dot, d_value * temp.d_temp)
@@ -0,0 +1,223 @@
+"""
+Finite line source g-functions of bore fields.
+
+Every borehole is a finite line source of the same length, burial depth, and uniform heat rejection rate. The
+g-function is the mean over the boreholes of the summed responses of every borehole to every other, with the
+response of a borehole to itself taken at the borehole radius. The response between two boreholes depends only
+on their distance, so pairs at the same distance are evaluated once.
+
+The response is an integral over s from 1/sqrt(4 alpha t) to infinity. Splitting the integral at the lower limit
+of each time, the part of the integrand that does not depend on the distance is evaluated once for all pairs and
+times, and the distance only enters through exp(-d^2 s^2). Distances are split across processes. Everything is
+computed in units of the borehole length, so a g-function depends only on the normalized layout and on ln(t/ts),
+which also key the optional disk cache.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import pairwise
+from math import ceil, pi, sqrt
+from pathlib import Path
+
+import numpy as np
+
+from bhr.simulation import GFunction
+
+# bump whenever a change to the calculation changes any result, so cached g-functions are not reused
+GFUNCTION_VERSION = 1
+
+# ln(t/ts) values used when none are given
+DEFAULT_LNTTS = np.arange(-8.5, 3.01, 0.25)
+
+# Gauss-Legendre nodes per integration interval, and maximum interval width in ln(s)
+_NODES = 12
+_MAX_INTERVAL = 0.5
+
+# the integrand is negligible where d * s exceeds this
+_CUTOFF = 7.0
+
+# distances, relative to the borehole length, closer than this are evaluated as one
+_DISTANCE_RESOLUTION = 1e-9
+
+
+def _erf(x: np.ndarray) -> np.ndarray:
+    """
+    Error function, to about 1e-15, as numpy has none.
+
+    Below 3, a series of positive terms. Between 3 and 6, a continued fraction for erfc. Above 6, erf is 1 to
+    double precision.
+    """
+
+    x = np.asarray(x, dtype=float)
+    ax = np.abs(x)
+    result = np.ones_like(ax)
+
+    small = ax < 3
+    if small.any():
+        xs = ax[small]
+        term = xs.copy()
+        total = xs.copy()
+        for n in range(1, 90):
+            term = term * 2 * xs**2 / (2 * n + 1)
+            total += term
+        result[small] = 2 / sqrt(pi) * np.exp(-(xs**2)) * total
+
+    mid = (ax >= 3) & (ax < 6)
+    if mid.any():
+        xm = ax[mid]
+        fraction = xm.copy()
+        for n in range(60, 0, -1):
+            fraction = xm + (n / 2) / fraction
+        result[mid] = 1 - np.exp(-(xm**2)) / (sqrt(pi) * fraction)
+
+    return np.copysign(result, x)
+
+
+def _ierf(x: np.ndarray) -> np.ndarray:
+    """
+    Integral of the error function, ierf(x) = x erf(x) - (1 - exp(-x^2)) / sqrt(pi).
+    """
+
+    return x * _erf(x) + np.expm1(-(x**2)) / sqrt(pi)
+
+
+def _fls_bracket(s: np.ndarray, depth: float) -> np.ndarray:
+    """
+    Distance-independent part of the finite line source integrand between two boreholes of unit length at the
+    same burial depth.
+    """
+
+    return 2 * _ierf(s) + 2 * _ierf((2 * depth + 1) * s) - _ierf(2 * depth * s) - _ierf((2 * depth + 2) * s)
+
+
+def _quadrature(lntts: np.ndarray, max_distance_inverse: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Gauss-Legendre nodes in ln(s) over the intervals between the lower integration limits of the times.
+
+    :param lntts: ln(t/ts), increasing
+    :param max_distance_inverse: 1 / smallest distance, sets the upper integration limit
+    :return: nodes s, weights in ln(s), and the index of the first node of each time's interval
+    """
+
+    # lower limits, with t/ts = exp(lntts) and alpha = 1/9 in normalized units. decreasing with time
+    limits = np.log(1.5) - lntts / 2
+    upper = np.log(_CUTOFF * max_distance_inverse)
+    edges = np.concatenate(([max(upper, limits[0] + _MAX_INTERVAL)], limits))
+
+    x, w = np.polynomial.legendre.leggauss(_NODES)
+    nodes: list[np.ndarray] = []
+    weights: list[np.ndarray] = []
+    starts: list[int] = []
+    for k in range(lntts.size):
+        hi, lo = edges[k], edges[k + 1]
+        count = ceil((hi - lo) / _MAX_INTERVAL)
+        bounds = np.linspace(lo, hi, count + 1)
+        starts.append(len(nodes) * _NODES)
+        for a, b in pairwise(bounds):
+            nodes.append((b - a) / 2 * x + (a + b) / 2)
+            weights.append((b - a) / 2 * w)
+    return np.exp(np.concatenate(nodes)), np.concatenate(weights), np.array(starts)
+
+
+def _responses(distances: np.ndarray, s: np.ndarray, weighted_bracket: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    Finite line source responses at each time for each distance.
+
+    :return: array of shape (distances, times)
+    """
+
+    terms = np.exp(-np.square(distances[:, None] * s[None, :])) * weighted_bracket[None, :]
+    return 0.5 * np.cumsum(np.add.reduceat(terms, starts, axis=1), axis=1)
+
+
+def _cache_key(coordinates: np.ndarray, radius: float, depth: float, lntts: np.ndarray) -> str:
+    data = {
+        "version": GFUNCTION_VERSION,
+        "coordinates": [[repr(float(v)) for v in point] for point in coordinates.tolist()],
+        "radius": repr(float(radius)),
+        "depth": repr(float(depth)),
+        "lntts": [repr(float(v)) for v in lntts.tolist()],
+    }
+    return hashlib.sha256(json.dumps(data, separators=(",", ":")).encode()).hexdigest()
+
+
+def fls_gfunction(
+    coordinates,
+    length: float,
+    borehole_radius: float,
+    burial_depth: float = 4.0,
+    lntts=None,
+    workers: int = 1,
+    cache_dir: str | Path | None = None,
+) -> GFunction:
+    """
+    Computes the finite line source g-function of a bore field with uniform heat rejection rate.
+
+    :param coordinates: borehole (x, y) positions, in m. array_like of shape (number of boreholes, 2)
+    :param length: borehole length, in m
+    :param borehole_radius: borehole radius, in m
+    :param burial_depth: depth of the top of the boreholes, in m
+    :param lntts: ln(t/ts) at which to evaluate the g-function, increasing. defaults to DEFAULT_LNTTS
+    :param workers: number of worker processes. 1 evaluates in this process
+    :param cache_dir: directory of cached g-functions, keyed by the normalized layout and times, or None
+    :return: g-function
+    """
+
+    coordinates = np.asarray(coordinates, dtype=float)
+    if coordinates.ndim != 2 or coordinates.shape[1] != 2 or coordinates.shape[0] < 1:
+        raise ValueError("Invalid coordinates. Must be an array of (x, y) positions, one per borehole")
+    if length <= 0 or borehole_radius <= 0 or burial_depth < 0:
+        raise ValueError("Invalid borehole geometry. Length and radius must be > 0, and burial depth >= 0")
+    if workers < 1:
+        raise ValueError(f"Invalid number of workers {workers}. Must be >= 1")
+
+    lntts = DEFAULT_LNTTS if lntts is None else np.asarray(lntts, dtype=float)
+    if lntts.ndim != 1 or lntts.size < 2 or np.any(np.diff(lntts) <= 0):
+        raise ValueError("Invalid lntts. Must be increasing, with at least 2 values")
+
+    # normalized by the borehole length, and in a canonical order, since the g-function does not depend on it
+    points = (coordinates - coordinates.min(axis=0)) / length
+    points = points[np.lexsort((points[:, 1], points[:, 0]))]
+    radius = borehole_radius / length
+    depth = burial_depth / length
+
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = Path(cache_dir) / f"{_cache_key(points, radius, depth, lntts)}.npy"
+        if cache_path.exists():
+            return GFunction(lntts, np.load(cache_path))
+
+    # every pair at the same distance has the same response
+    i, j = np.triu_indices(points.shape[0], k=1)
+    pair_distances = np.hypot(*(points[i] - points[j]).T)
+    if np.any(pair_distances < 2 * radius):
+        raise ValueError("Invalid coordinates. Boreholes overlap")
+    keys, counts = np.unique(np.round(pair_distances / _DISTANCE_RESOLUTION), return_counts=True)
+    distances = np.concatenate(([radius], keys * _DISTANCE_RESOLUTION))
+    multiplicity = np.concatenate(([points.shape[0]], 2 * counts))
+
+    s, weights, starts = _quadrature(lntts, 1 / radius)
+    weighted_bracket = weights * _fls_bracket(s, depth) / s
+
+    chunks = np.array_split(distances, min(workers * 4, distances.size)) if workers > 1 else [distances]
+    args = (s, weighted_bracket, starts)
+    if len(chunks) == 1:
+        responses = _responses(distances, *args)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            responses = np.concatenate(list(executor.map(_responses, chunks, *([arg] * len(chunks) for arg in args))))
+
+    g = multiplicity @ responses / points.shape[0]
+
+    if cache_path is not None:
+        # written to a temporary file and renamed, so concurrent writers never leave a partial file
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_path.parent, suffix=".npy")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, g)
+        os.replace(tmp, cache_path)
+
+    return GFunction(lntts, g)
@@ -0,0 +1,430 @@
+"""
+Flow distribution and pressure drop of a field of boreholes connected in parallel between a supply and a return
+header.
+
+Borehole k is connected to the headers between header segments k and k + 1, counting from the field inlet, so
+supply header segment k carries the flow of boreholes k and beyond. With a direct return, the fluid returns along
+the supply header to an outlet next to the inlet, and return header segment k also carries the flow of boreholes
+k and beyond. With a reverse return, the fluid continues to an outlet at the far end of the field, and return
+header segment k carries the flow of boreholes 0 to k.
+
+The flow split is solved by Newton's method on the borehole flows and the field pressure drop. Each Newton step
+is a symmetric positive definite system for the borehole flows, bordered by the mass balance. The bordered part is
+eliminated through its Schur complement, and the remaining systems are solved by preconditioned conjugate
+gradients, using matrix-vector products computed from cumulative sums of the header flows, so the cost of a step
+grows linearly with the number of boreholes. The Jacobian and the solution are kept between solves and reused
+while they keep converging, so a series of similar timesteps needs few Jacobian evaluations.
+"""
+
+import logging
+from dataclasses import dataclass
+from math import pi
+
+import numpy as np
+
+from bhr.borehole import Borehole
+from bhr.coaxial_borehole import Coaxial
+from bhr.config_hash import config_hash
+from bhr.double_u_borehole import DoubleUTube
+from bhr.fluid import get_fluid
+from bhr.pipe import Pipe, pipe_friction_factor_array
+
+# relative step of the finite difference pressure loss derivatives
+_DERIVATIVE_STEP = 1e-6
+
+# smallest fraction of a Newton step tried by the line search
+_MIN_STEP = 1 / 64
+
+# header pipe conductivity, W/m-K. it does not enter the pressure loss
+_HEADER_PIPE_CONDUCTIVITY = 0.4
+
+
+@dataclass(frozen=True)
+class HydraulicSolution:
+    """
+    Flow distribution and pressure drop of a field for one timestep.
+
+    :param branch_flows: mass flow rate through each borehole, kg/s
+    :param pressure_drop: pressure drop from the field inlet to the field outlet, Pa
+    :param pumping_power: pumping power, W
+    :param iterations: number of Newton iterations
+    """
+
+    branch_flows: np.ndarray
+    pressure_drop: float
+    pumping_power: float
+    iterations: int
+
+
+@dataclass(frozen=True)
+class _Jacobian:
+    """
+    Pressure loss derivatives with respect to flow, and the solution of the Jacobian system for a unit residual.
+    """
+
+    branch: np.ndarray
+    supply: np.ndarray
+    ret: np.ndarray
+    diagonal: np.ndarray
+    unit_solution: np.ndarray
+
+
+@dataclass(frozen=True)
+class _Ducts:
+    """
+    Flow passages of every borehole in a field, stacked so the branch pressure losses are evaluated in one
+    vectorized call.
+
+    A single or double u-tube is one u-tube, which carries half of the borehole flow in a double u-tube. A coaxial
+    borehole is its inner pipe and its annulus, in series.
+
+    :param branch: index of the borehole
+    :param flow_fraction: fraction of the borehole flow through the passage
+    :param length: passage length, m
+    :param diameter: hydraulic diameter, m
+    :param area: cross-sectional area, m^2
+    :param perimeter: wetted perimeter, m
+    :param laminar_ratio: ratio of the laminar friction factor to that of a round pipe
+    """
+
+    branch: np.ndarray
+    flow_fraction: np.ndarray
+    length: np.ndarray
+    diameter: np.ndarray
+    area: np.ndarray
+    perimeter: np.ndarray
+    laminar_ratio: np.ndarray
+
+
+def _borehole_ducts(bh: Borehole) -> list[tuple[float, float, float, float, float, float]]:
+    """
+    :return: flow fraction, length, hydraulic diameter, area, wetted perimeter, and laminar friction ratio of each
+             flow passage of a borehole
+    """
+
+    geometry = bh._bh
+    if geometry is None:
+        raise TypeError("Borehole not initialized")
+
+    if isinstance(geometry, Coaxial):
+        pipe = geometry.inner_pipe
+        return [
+            (1.0, pipe.pipe_length, pipe.pipe_inner_diameter, pipe.area_cr_inner, pi * pipe.pipe_inner_diameter, 1.0),
+            (
+                1.0,
+                geometry.length,
+                geometry.annular_hydraulic_diameter,
+                geometry.annular_area,
+                geometry.annular_wetted_perimeter,
+                geometry.annular_laminar_friction_ratio,
+            ),
+        ]
+
+    flow_fraction = 0.5 if isinstance(geometry, DoubleUTube) else 1.0
+    return [
+        (
+            flow_fraction,
+            geometry.pipe_length,
+            geometry.pipe_inner_diameter,
+            geometry.area_cr_inner,
+            pi * geometry.pipe_inner_diameter,
+            1.0,
+        )
+    ]
+
+
+def _reverse_cumsum(x: np.ndarray) -> np.ndarray:
+    return np.cumsum(x[::-1])[::-1]
+
+
+def _derivative(pressure_loss, m_dot: np.ndarray, temp: float, loss: np.ndarray) -> np.ndarray:
+    step = _DERIVATIVE_STEP * m_dot
+    return (pressure_loss(m_dot + step, temp) - loss) / step
+
+
+class HydraulicNetwork:
+    """
+    Field of boreholes connected in parallel between a supply and a return header.
+    """
+
+    def __init__(
+        self,
+        configs: list[dict],
+        header: dict | None = None,
+        reverse_return: bool = True,
+        rtol: float = 1e-8,
+        max_iter: int = 50,
+        pump_efficiency: float = 1.0,
+    ):
+        """
+        :param configs: list of Borehole.init_from_dict inputs, one per borehole, in order along the headers.
+                        every borehole must have the same fluid
+        :param header: header pipe, as a dict with "pipe_outer_diameter", in m, "pipe_dimension_ratio", and
+                       "segment_length", the header length between neighbouring boreholes, in m. None for no
+                       header losses
+        :param reverse_return: True for a reverse return header, False for a direct return header
+        :param rtol: tolerance on the pressure balance between boreholes, relative to the field pressure drop
+        :param max_iter: maximum number of Newton iterations per timestep
+        :param pump_efficiency: pump efficiency, used for the pumping power
+        """
+
+        configs = list(configs)
+        if not configs:
+            raise ValueError("A hydraulic network needs at least one borehole")
+
+        fluids = {(config["fluid_type"].upper(), float(config["fluid_concentration"])) for config in configs}
+        if len(fluids) > 1:
+            raise ValueError(f"Every borehole must have the same fluid, got {sorted(fluids)}")
+        fluid_type, fluid_concentration = fluids.pop()
+        self.fluid = get_fluid(fluid_type, fluid_concentration)
+
+        if not 0 < pump_efficiency <= 1:
+            raise ValueError(f"Invalid pump efficiency {pump_efficiency}. Must be 0 < efficiency <= 1")
+
+        # identical boreholes share one Borehole
+        boreholes: dict[str, Borehole] = {}
+        ducts: list[tuple[float, ...]] = []
+        for i, config in enumerate(configs):
+            key = config_hash(config)
+            if key not in boreholes:
+                boreholes[key] = Borehole()
+                boreholes[key].init_from_dict(config)
+            ducts.extend((i, *duct) for duct in _borehole_ducts(boreholes[key]))
+
+        columns = np.array(ducts).T
+        self._ducts = _Ducts(columns[0].astype(int), *columns[1:])
+
+        self.header = None
+        if header is not None:
+            self.header = Pipe(
+                header["pipe_outer_diameter"],
+                header["pipe_dimension_ratio"],
+                header["segment_length"],
+                _HEADER_PIPE_CONDUCTIVITY,
+                fluid_type,
+                fluid_concentration,
+            )
+
+        self.num_boreholes = len(configs)
+        self.reverse_return = reverse_return
+        self.rtol = rtol
+        self.max_iter = max_iter
+        self.pump_efficiency = pump_efficiency
+
+        # kept between solves, see solve
+        self._fractions = np.full(self.num_boreholes, 1 / self.num_boreholes)
+        self._jacobian: _Jacobian | None = None
+
+    def _branch_losses(self, q: np.ndarray, temp: float) -> np.ndarray:
+        ducts = self._ducts
+        m_dot = q[ducts.branch] * ducts.flow_fraction
+        flowing = m_dot > 0
+        m_dot = m_dot[flowing]
+
+        rho = self.fluid.density(temp)
+        re = 4 * m_dot / (self.fluid.mu(temp) * ducts.perimeter[flowing])
+        velocity = m_dot / (ducts.area[flowing] * rho)
+        f = pipe_friction_factor_array(re, ducts.laminar_ratio[flowing])
+
+        loss = np.zeros(flowing.shape)
+        loss[flowing] = f * ducts.length[flowing] / ducts.diameter[flowing] * rho * velocity**2 / 2
+        return np.bincount(ducts.branch, weights=loss, minlength=self.num_boreholes)
+
+    def _header_flows(self, q: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        supply = _reverse_cumsum(q)
+        ret = np.cumsum(q) if self.reverse_return else supply
+        return supply, ret
+
+    def _path_losses(self, q: np.ndarray, temp: float):
+        """
+        Pressure loss along the path through each borehole.
+
+        :return: path losses, and the branch, supply header, and return header losses and flows
+        """
+
+        branch = self._branch_losses(q, temp)
+        if self.header is None:
+            return branch, (q, branch)
+
+        supply_flow, return_flow = self._header_flows(q)
+        supply = self.header.pressure_loss_array(supply_flow, temp)
+        ret = self.header.pressure_loss_array(return_flow, temp)
+        return_path = _reverse_cumsum(ret) if self.reverse_return else np.cumsum(ret)
+        path = branch + np.cumsum(supply) + return_path
+        return path, (q, branch, supply_flow, supply, return_flow, ret)
+
+    def _jacobian_product(self, jacobian: _Jacobian, x: np.ndarray) -> np.ndarray:
+        y = jacobian.branch * x
+        if self.header is None:
+            return y
+
+        supply_dx, return_dx = self._header_flows(x)
+        y += np.cumsum(jacobian.supply * supply_dx)
+        if self.reverse_return:
+            y += _reverse_cumsum(jacobian.ret * return_dx)
+        else:
+            y += np.cumsum(jacobian.ret * return_dx)
+        return y
+
+    def _conjugate_gradient(self, jacobian: _Jacobian, b: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """
+        Solves the Jacobian system by conjugate gradients, with a diagonal preconditioner.
+
+        :param b: right hand side
+        :param x: initial guess
+        :return: solution
+        """
+
+        r = b - self._jacobian_product(jacobian, x)
+        z = r / jacobian.diagonal
+        p = z.copy()
+        rz = r @ z
+        tol = (1e-12 * np.linalg.norm(b)) ** 2
+
+        for _ in range(self.num_boreholes + 10):
+            if r @ r <= tol:
+                break
+            ap = self._jacobian_product(jacobian, p)
+            alpha = rz / (p @ ap)
+            x = x + alpha * p
+            r = r - alpha * ap
+            z = r / jacobian.diagonal
+            rz_new = r @ z
+            p = z + rz_new / rz * p
+            rz = rz_new
+        return x
+
+    def _evaluate_jacobian(self, temp: float, losses) -> _Jacobian:
+        if self.header is None:
+            q, branch = losses
+            d_branch = self._branch_derivative(q, temp, branch)
+            d_supply = d_return = np.zeros(0)
+            diagonal = d_branch
+        else:
+            q, branch, supply_flow, supply, return_flow, ret = losses
+            d_branch = self._branch_derivative(q, temp, branch)
+            d_supply = _derivative(self.header.pressure_loss_array, supply_flow, temp, supply)
+            d_return = _derivative(self.header.pressure_loss_array, return_flow, temp, ret)
+            return_diagonal = _reverse_cumsum(d_return) if self.reverse_return else np.cumsum(d_return)
+            diagonal = d_branch + np.cumsum(d_supply) + return_diagonal
+
+        jacobian = _Jacobian(d_branch, d_supply, d_return, diagonal, np.zeros(0))
+        previous = self._jacobian
+        guess = previous.unit_solution if previous is not None else 1 / diagonal
+        unit_solution = self._conjugate_gradient(jacobian, np.ones(self.num_boreholes), guess)
+        return _Jacobian(d_branch, d_supply, d_return, diagonal, unit_solution)
+
+    def _branch_derivative(self, q: np.ndarray, temp: float, loss: np.ndarray) -> np.ndarray:
+        return _derivative(self._branch_losses, q, temp, loss)
+
+    def _error(self, q: np.ndarray, path: np.ndarray, pressure_drop: float, total: float) -> float:
+        """
+        :return: largest of the pressure imbalance, relative to the field pressure drop, and the mass imbalance,
+                 relative to the field flow
+        """
+
+        return max(float(np.abs(path - pressure_drop).max()) / pressure_drop, abs(q.sum() - total) / total)
+
+    def solve(self, field_mass_flow_rate: float, temperature: float) -> HydraulicSolution:
+        """
+        Solves for the flow through each borehole and the field pressure drop.
+
+        The solve starts from the flow split and Jacobian of the previous solve, so solving a series of timesteps
+        in order converges in few iterations. A network must not be solved from several threads at once.
+
+        The friction factors jump slightly at the limits of the laminar-turbulent transition, so where a borehole
+        flow sits at one of those limits, the pressures balance only to within the jump, and the solve stops once
+        a line search along the Newton step no longer improves the balance.
+
+        :param field_mass_flow_rate: total field mass flow rate, in kg/s
+        :param temperature: average fluid temperature, in Celsius
+        :return: solution
+        """
+
+        total = float(field_mass_flow_rate)
+        if total <= 0:
+            return HydraulicSolution(np.zeros(self.num_boreholes), 0.0, 0.0, 0)
+
+        q = self._fractions * total
+        path, losses = self._path_losses(q, temperature)
+        pressure_drop = float(path.mean())
+        error = self._error(q, path, pressure_drop, total)
+        jacobian = self._jacobian
+        fresh = False
+
+        iterations = 0
+        while error > self.rtol:
+            if iterations == self.max_iter:
+                logging.warning(
+                    f"Hydraulic network did not converge in {self.max_iter} iterations. "
+                    f"Max pressure imbalance {np.ptp(path):0.3g} Pa"
+                )
+                break
+            iterations += 1
+
+            if jacobian is None:
+                jacobian = self._jacobian = self._evaluate_jacobian(temperature, losses)
+                fresh = True
+
+            # Newton step for the bordered system [J, -1; 1^T, 0], by the Schur complement of J
+            residual = path - pressure_drop
+            u = self._conjugate_gradient(jacobian, residual, residual / jacobian.diagonal)
+            w = jacobian.unit_solution
+            d_pressure = (u.sum() - q.sum() + total) / w.sum()
+            d_q = d_pressure * w - u
+
+            # backtrack until the error falls. no flow falls by more than 90% in one step, which keeps every
+            # flow positive where the linearization overshoots
+            step = 1.0
+            while True:
+                new_q = np.maximum(q + step * d_q, 0.1 * q)
+                new_pressure_drop = pressure_drop + step * d_pressure
+                new_path, new_losses = self._path_losses(new_q, temperature)
+                new_error = self._error(new_q, new_path, new_pressure_drop, total)
+                if new_error < error or not fresh or step < _MIN_STEP:
+                    break
+                step /= 2
+
+            if new_error >= error:
+                if fresh:
+                    # the flows sit at a jump in the friction factor, at the limits of the laminar-turbulent
+                    # transition, so the balance cannot be improved further
+                    break
+                # the Jacobian from an earlier solution no longer points downhill, so evaluate it again here
+                jacobian = None
+                continue
+
+            # keep the Jacobian while it converges quickly, and evaluate it again otherwise
+            fresh = False
+            if new_error > 0.1 * error:
+                jacobian = None
+
+            q, pressure_drop, path, losses, error = new_q, new_pressure_drop, new_path, new_losses, new_error
+
+        self._fractions = q / q.sum()
+        pumping_power = pressure_drop * total / self.fluid.density(temperature) / self.pump_efficiency
+        return HydraulicSolution(q, pressure_drop, pumping_power, iterations)
+
+    def solve_series(self, field_mass_flow_rate, temperature) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Solves a series of timesteps in order, each starting from the solution of the one before.
+
+        :param field_mass_flow_rate: total field mass flow rate, in kg/s. scalar or array_like
+        :param temperature: average fluid temperature, in Celsius. scalar or array_like
+        :return: borehole flows, in kg/s, shape (timesteps, number of boreholes), field pressure drop, in Pa,
+                 and pumping power, in W
+        """
+
+        m_dot, temp = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(field_mass_flow_rate, dtype=float)),
+            np.atleast_1d(np.asarray(temperature, dtype=float)),
+        )
+        flows = np.empty((m_dot.size, self.num_boreholes))
+        pressure_drop = np.empty(m_dot.size)
+        pumping_power = np.empty(m_dot.size)
+        for i, (m, t) in enumerate(zip(m_dot.ravel().tolist(), temp.ravel().tolist())):
+            solution = self.solve(m, t)
+            flows[i] = solution.branch_flows
+            pressure_drop[i] = solution.pressure_drop
+            pumping_power[i] = solution.pumping_power
+        return flows, pressure_drop, pumping_power
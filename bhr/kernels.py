@@ -0,0 +1,399 @@
+"""
+Scalar resistance kernels with a selectable compute backend.
+
+The kernels are the closed-form calculations of the compiled evaluators, written as plain functions of a parameter
+array, a fluid property table, the mass flow rate, and the temperature, so they can be compiled by Numba. Fluid
+properties are interpolated from a table, as in TabulatedFluid. Tabulated fluids, see
+bhr.fluid.enable_tabulated_fluids, keep their grid and interpolation method, and other fluids are tabulated with the
+TabulatedFluid defaults. Temperatures outside the table are clamped to it, as the fluid correlations clamp to their
+valid range.
+
+Two backends are available:
+
+- "python": the kernels run as ordinary Python functions. This is the default and needs no extra dependencies.
+- "numba": the kernels are compiled with ``numba.njit`` the first time they are used. Requires numba,
+  ``pip install BHResist[numba]``.
+
+Both backends run the same code, so they give the same answers, to round-off in the math library.
+"""
+
+import threading
+from dataclasses import fields
+from math import cosh, exp, log, pi, sinh
+from types import SimpleNamespace
+
+import numpy as np
+
+from bhr.compiled_borehole import (
+    _DB_ANNULUS_HIGH_REYNOLDS,
+    _F_PIPE_HIGH_REYNOLDS,
+    ANNULUS_HIGH_REYNOLDS,
+    ANNULUS_LOW_REYNOLDS,
+    PIPE_HIGH_REYNOLDS,
+    PIPE_LOW_REYNOLDS,
+    CompiledCoaxial,
+    CompiledDoubleU,
+    CompiledSingleU,
+)
+from bhr.fluid import TabulatedFluid
+from bhr.pipe import Pipe
+
+BACKENDS = ("python", "numba")
+
+_PIPE_LAMINAR_NUSSELT = Pipe.laminar_nusselt()
+
+# fluid properties in the table, in row order
+_TABLE_PROPERTIES = ("viscosity", "conductivity", "specific_heat")
+
+_backend = "python"
+_kernels: dict[str, SimpleNamespace] = {}
+_tables: dict[int, tuple[object, np.ndarray]] = {}
+_lock = threading.Lock()
+
+
+def _import_numba():
+    try:
+        import numba  # noqa: PLC0415
+    except ImportError as e:
+        raise ImportError('The numba backend requires numba. Install with "pip install BHResist[numba]"') from e
+    return numba
+
+
+def set_backend(backend: str) -> None:
+    """
+    Selects the compute backend used by evaluators compiled afterwards.
+
+    :param backend: "python" or "numba"
+    """
+
+    global _backend  # noqa: PLW0603
+
+    if backend not in BACKENDS:
+        raise ValueError(f'Unsupported backend "{backend}". Use one of {BACKENDS}')
+    if backend == "numba":
+        _import_numba()
+    _backend = backend
+
+
+def get_backend() -> str:
+    """
+    :return: the current compute backend
+    """
+
+    return _backend
+
+
+def _make_kernels(jit) -> SimpleNamespace:
+    """
+    Defines the kernels, each passed through jit.
+
+    The table is a flat array. The first entry is the number of segments and the second is 1 for linear
+    interpolation or 0 for cubic, followed by (t_lo, t_hi, inv_step, num_points, offset) for each segment. The
+    viscosity, conductivity, and specific heat values of a segment follow at offset, offset + num_points, and
+    offset + 2 * num_points.
+
+    :param jit: decorator applied to each kernel
+    :return: namespace of kernels
+    """
+
+    @jit
+    def interp(table, row, temp):
+        num_segments = int(table[0])
+        t_min = table[2]
+        t_max = table[5 * (num_segments - 1) + 3]
+        # clamped to the table, as the fluid correlations clamp to their valid range
+        t = min(max(temp, t_min), t_max)
+
+        seg = num_segments - 1
+        for j in range(num_segments):
+            if t < table[5 * j + 3]:
+                seg = j
+                break
+
+        t_lo = table[5 * seg + 2]
+        inv_step = table[5 * seg + 4]
+        num_points = int(table[5 * seg + 5])
+        start = int(table[5 * seg + 6]) + row * num_points
+        x = (t - t_lo) * inv_step
+
+        # linear or 4-point Lagrange interpolation, see _TableSegment.interp_scalar
+        if table[1] != 0:
+            i = min(int(x), num_points - 2)
+            s = x - i
+            k = start + i
+            return table[k] + s * (table[k + 1] - table[k])
+
+        i = min(max(int(x), 1), num_points - 3)
+        s = x - i
+        sp1 = s + 1
+        sm1 = s - 1
+        sm2 = s - 2
+        k = start + i
+        return (
+            -s * sm1 * sm2 / 6 * table[k - 1]
+            + sp1 * sm1 * sm2 / 2 * table[k]
+            - sp1 * s * sm2 / 2 * table[k + 1]
+            + sp1 * s * sm1 / 6 * table[k + 2]
+        )
+
+    @jit
+    def smoothing(x, x_low_limit, x_high_limit, y_low_limit, y_high_limit):
+        s_x = (x - x_low_limit) / (x_high_limit - x_low_limit) * 10 - 5
+        s_y = 1 / (1 + exp(-s_x))
+        return s_y * (y_high_limit - y_low_limit) + y_low_limit
+
+    @jit
+    def gnielinski(re, pr):
+        f = (0.79 * log(re) - 1.64) ** (-2.0) if re > PIPE_HIGH_REYNOLDS else _F_PIPE_HIGH_REYNOLDS
+        return (f / 8) * (re - 1000) * pr / (1 + 12.7 * (f / 8) ** 0.5 * (pr ** (2 / 3) - 1))
+
+    @jit
+    def pipe_nusselt(re, pr):
+        if re < PIPE_LOW_REYNOLDS:
+            return _PIPE_LAMINAR_NUSSELT
+        if re < PIPE_HIGH_REYNOLDS:
+            nu_high = gnielinski(PIPE_HIGH_REYNOLDS, pr)
+            return smoothing(re, PIPE_LOW_REYNOLDS, PIPE_HIGH_REYNOLDS, _PIPE_LAMINAR_NUSSELT, nu_high)
+        return gnielinski(re, pr)
+
+    @jit
+    def single_u(params, table, m_dot, temp):
+        # see CompiledSingleU._calc_bh_resist
+        mu = interp(table, 0, temp)
+        k = interp(table, 1, temp)
+        cp = interp(table, 2, temp)
+
+        nu = pipe_nusselt(params[1] * m_dot / mu, cp * mu / k)
+        beta = params[3] * (1 / (nu * pi * k) + params[2])
+        beta_ratio = (1 + beta) / (1 - beta)
+
+        r_b = params[8] * (beta + params[5] - params[6] / (beta_ratio + params[7]))
+        r_a = params[13] * (beta + params[9] - params[10] / (beta_ratio * params[11] + params[12]))
+        r_v = params[4] / (cp * m_dot)
+
+        if params[0] != 0:
+            return r_b + 1 / (3 * r_a) * r_v**2
+
+        n = r_v / (r_b * r_a) ** 0.5
+        return r_b * n * (cosh(n) / sinh(n))
+
+    @jit
+    def double_u(params, table, m_dot, temp):
+        # see CompiledDoubleU._calc_bh_resist
+        mu = interp(table, 0, temp)
+        k = interp(table, 1, temp)
+        cp = interp(table, 2, temp)
+
+        m_dot_per_u_tube = m_dot / 2
+
+        nu = pipe_nusselt(params[2] * m_dot_per_u_tube / mu, cp * mu / k)
+        pipe_resist = 1 / (nu * pi * k) + params[3]
+        beta = params[4] * pipe_resist
+        b1 = (1 - beta) / (1 + beta)
+
+        r_b = pipe_resist / 4 + params[7] - b1 * params[8] / (1 + b1 * params[9])
+
+        if params[1] != 0:
+            r_a = 2 * pipe_resist + params[10] - params[11] * b1 * params[12] / (1 - b1 * params[13])
+        else:
+            matrix_element_11 = 1 + b1 * params[14]
+            matrix_element_22 = -1 - b1 * params[15]
+            matrix_element_21 = b1 * params[6]
+            v_1 = params[16]
+            v_2 = params[17]
+            r_a = (
+                2 * pipe_resist
+                + params[10]
+                + params[11]
+                * matrix_element_21
+                / 2
+                * (v_2**2 * matrix_element_11 - 2 * v_1 * v_2 * matrix_element_21 - v_1**2 * matrix_element_22)
+                / (matrix_element_11 * matrix_element_22 + matrix_element_21**2)
+            )
+
+        r_v = params[5] / (cp * m_dot_per_u_tube)
+
+        if params[0] != 0:
+            return r_b + r_v**2 / (6 * r_a)
+
+        n = r_v / (2 * r_b * r_a) ** 0.5
+        return r_b * n * (cosh(n) / sinh(n))
+
+    @jit
+    def coaxial(params, table, m_dot, temp):
+        # see CompiledCoaxial._calc_bh_resist
+        mu = interp(table, 0, temp)
+        k = interp(table, 1, temp)
+        cp = interp(table, 2, temp)
+
+        pr = cp * mu / k
+
+        nu_inner_pipe = pipe_nusselt(params[1] * m_dot / mu, pr)
+
+        re = params[2] * m_dot / mu
+        if re < ANNULUS_LOW_REYNOLDS:
+            nu_ii = params[3]
+            nu_oo = params[4]
+        elif re < ANNULUS_HIGH_REYNOLDS:
+            nu_high = _DB_ANNULUS_HIGH_REYNOLDS * pr**0.35
+            nu_ii = smoothing(re, ANNULUS_LOW_REYNOLDS, ANNULUS_HIGH_REYNOLDS, params[3], nu_high)
+            nu_oo = smoothing(re, ANNULUS_LOW_REYNOLDS, ANNULUS_HIGH_REYNOLDS, params[4], nu_high)
+        else:
+            nu_ii = 0.023 * re**0.8 * pr**0.35
+            nu_oo = nu_ii
+
+        r_a = 1 / (nu_inner_pipe * pi * k) + params[7] + params[5] / (nu_ii * k)
+        r_b = params[6] / (nu_oo * k) + params[8]
+        rv = params[9] / (m_dot * cp)
+
+        if params[0] != 0:
+            return r_b + 1 / (3 * r_a) * rv**2
+
+        n = rv / (2 * r_b) * (1 + 4 * r_b / r_a) ** (1 / 2)
+        return r_b * n * (cosh(n) / sinh(n))
+
+    def make_array_kernel(kernel):
+        @jit
+        def array_kernel(params, table, m_dot, temp, out):
+            for i in range(out.size):
+                out[i] = kernel(params, table, m_dot[i], temp[i])
+
+        return array_kernel
+
+    return SimpleNamespace(
+        single_u=single_u,
+        double_u=double_u,
+        coaxial=coaxial,
+        single_u_array=make_array_kernel(single_u),
+        double_u_array=make_array_kernel(double_u),
+        coaxial_array=make_array_kernel(coaxial),
+    )
+
+
+def _get_kernels(backend: str) -> SimpleNamespace:
+    kernels = _kernels.get(backend)
+    if kernels is not None:
+        return kernels
+
+    with _lock:
+        kernels = _kernels.get(backend)
+        if kernels is None:
+            jit = _import_numba().njit if backend == "numba" else (lambda func: func)
+            kernels = _make_kernels(jit)
+            _kernels[backend] = kernels
+        return kernels
+
+
+def _fluid_table(fluid) -> np.ndarray:
+    """
+    Property table of a fluid, built once per fluid.
+
+    :param fluid: TabulatedFluid, whose grid and interpolation method are used, or SecondaryCoolantProps fluid,
+                  which is tabulated with the TabulatedFluid defaults
+    :return: flat table, see _make_kernels
+    """
+
+    # fluids are interned by get_fluid; the fluid is held so its id is not reused
+    entry = _tables.get(id(fluid))
+    if entry is not None:
+        return entry[1]
+
+    with _lock:
+        entry = _tables.get(id(fluid))
+        if entry is None:
+            tabulated = fluid if isinstance(fluid, TabulatedFluid) else TabulatedFluid(fluid)
+            segments = tabulated._segments
+            header = [float(len(segments)), float(tabulated.method == "linear")]
+            values = []
+            offset = 2 + 5 * len(segments)
+            for segment in segments:
+                header.extend([segment.t_lo, segment.t_hi, segment.inv_step, segment.num_points, offset])
+                for name in _TABLE_PROPERTIES:
+                    values.extend(segment.lists[name])
+                offset += len(_TABLE_PROPERTIES) * segment.num_points
+            entry = (fluid, np.array(header + values))
+            _tables[id(fluid)] = entry
+        return entry[1]
+
+
+class KernelEvaluator:
+    """
+    Evaluator that runs a scalar resistance kernel on the backend selected when it was compiled.
+    """
+
+    __slots__ = ("_array_kernel", "_kernel", "_params", "_table", "backend")
+
+    def __init__(self, compiled: CompiledSingleU | CompiledDoubleU | CompiledCoaxial, backend: str | None = None):
+        """
+        :param compiled: compiled evaluator, see Borehole.compile
+        :param backend: "python" or "numba". defaults to the backend selected with set_backend
+        """
+
+        backend = _backend if backend is None else backend
+        if backend not in BACKENDS:
+            raise ValueError(f'Unsupported backend "{backend}". Use one of {BACKENDS}')
+
+        kernels = _get_kernels(backend)
+        if isinstance(compiled, CompiledSingleU):
+            self._kernel, self._array_kernel = kernels.single_u, kernels.single_u_array
+        elif isinstance(compiled, CompiledDoubleU):
+            self._kernel, self._array_kernel = kernels.double_u, kernels.double_u_array
+        elif isinstance(compiled, CompiledCoaxial):
+            self._kernel, self._array_kernel = kernels.coaxial, kernels.coaxial_array
+        else:
+            raise NotImplementedError(f"{type(compiled).__name__} not supported")
+
+        # every field but the fluid property functions, in declaration order
+        params = [float(getattr(compiled, f.name)) for f in fields(compiled) if f.name not in ("mu", "k", "cp")]
+        fluid = getattr(compiled.mu, "__self__", None)
+        if fluid is None:
+            raise TypeError(f"{compiled.mu!r} is not a fluid property method")
+        table = _fluid_table(fluid)
+
+        self.backend = backend
+        self._params: np.ndarray | list[float]
+        self._table: np.ndarray | list[float]
+        if backend == "numba":
+            self._params = np.array(params)
+            self._table = table
+        else:
+            # list indexing is faster than array indexing in pure Python
+            self._params = params
+            self._table = table.tolist()
+
+    def calc_bh_resist(self, m_dot: float, temp: float) -> float:
+        """
+        Computes the effective borehole thermal resistance.
+
+        :param m_dot: mass flow rate, kg/s
+        :param temp: temperature, Celsius
+        :return: effective borehole resistance, K/(W/m)
+        """
+
+        return self._kernel(self._params, self._table, m_dot, temp)
+
+    def calc_bh_resist_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Computes the effective borehole thermal resistance for a series of flow rates and temperatures.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, Celsius. scalar or array_like
+        :return: effective borehole resistance, K/(W/m)
+        """
+
+        m_dot, temp = np.broadcast_arrays(np.asarray(m_dot, dtype=float), np.asarray(temp, dtype=float))
+        out = np.empty(m_dot.shape)
+        if self.backend == "numba":
+            self._array_kernel(
+                self._params,
+                self._table,
+                np.ascontiguousarray(m_dot).ravel(),
+                np.ascontiguousarray(temp).ravel(),
+                out.ravel(),
+            )
+        else:
+            out.ravel()[:] = [
+                self._kernel(self._params, self._table, m, t)
+                for m, t in zip(m_dot.ravel().tolist(), temp.ravel().tolist())
+            ]
+        return out
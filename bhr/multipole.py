@@ -0,0 +1,378 @@
+"""
+Borehole resistances of u-tube layouts by the multipole method to any order.
+
+Claesson, J. & Hellström, G. 2011. 'Multipole Method to Calculate Borehole Thermal Resistances in a Borehole
+Heat Exchanger.' HVAC&R Research 17(6): 895-911.
+
+The grout temperature is a sum of line sources at the pipe centers, multipoles of orders 1 to N at each pipe,
+and their images in the borehole wall. The multipole strengths follow from the pipe wall condition, a linear
+system whose coefficients depend only on the geometry and conductivities, except for the dimensionless pipe
+resistance beta = 2 pi k_grout R_p on its diagonal. With identical pipes, beta is a single number, and the system
+can be written as (S + beta I) x = b(beta) with S fixed. S is diagonalized once at construction, so the fluid to
+borehole wall resistance matrix at any beta is a short sum of rational terms in beta, with no solve per call.
+The first-order closed forms of SingleUBorehole and DoubleUTube are the special case N = 1.
+
+In the symmetric layouts of single and double u-tubes, every pipe sees the same surroundings, so the resistance
+matrix R has equal row sums, and the pattern of inlet and outlet pipes is an eigenvector of R. The local and
+internal resistances are then the quadratic forms of R on the all-ones vector and on that pattern, with no
+inverse of R. Each form is projected onto the eigenmodes once, which leaves a sum of c_i / (lambda_i + beta)
+over the few modes that the pattern excites.
+"""
+
+from math import comb, log, pi
+
+import numpy as np
+
+from bhr.enums import DoubleUPipeInletArrangement
+from bhr.fluid import eval_property_array
+from bhr.utilities import broadcast_inputs, coth_array
+
+# eigenvector condition number above which the multipole system is solved directly at each beta
+_MAX_EIGENVECTOR_CONDITION = 1e8
+
+# residues of a quadratic form below this fraction of their total are modes the pipe pattern does not excite
+_MIN_RESIDUE = 1e-14
+
+# dimensionless pipe resistances at which a layout is checked for the symmetry of calc_resistances
+_SYMMETRY_CHECK_BETAS = (0.05, 0.5, 5.0)
+
+
+class Multipole:
+    """
+    Fluid to borehole wall resistances of identical pipes in a grouted borehole, see the module docstring.
+    """
+
+    def __init__(
+        self,
+        pipe_positions,
+        pipe_radius: float,
+        borehole_radius: float,
+        grout_conductivity: float,
+        soil_conductivity: float,
+        order: int = 3,
+    ):
+        """
+        :param pipe_positions: (x, y) positions of the pipe centers relative to the borehole center, in m.
+                               array_like of shape (number of pipes, 2)
+        :param pipe_radius: outer radius of the pipes, in m
+        :param borehole_radius: borehole radius, in m
+        :param grout_conductivity: grout thermal conductivity, in W/m-K
+        :param soil_conductivity: soil thermal conductivity, in W/m-K
+        :param order: highest multipole order, >= 1
+        """
+
+        positions = np.asarray(pipe_positions, dtype=float)
+        if positions.ndim != 2 or positions.shape[1] != 2 or positions.shape[0] < 1:
+            raise ValueError("Invalid pipe positions. Must be an array of (x, y) positions, one per pipe")
+        if order < 1:
+            raise ValueError(f"Invalid order {order}. Must be >= 1")
+
+        z = positions[:, 0] + 1j * positions[:, 1]
+        if np.any(np.abs(z) + pipe_radius >= borehole_radius):
+            raise ValueError("Invalid pipe positions. Pipes must lie inside the borehole")
+        gaps = np.abs(z[:, None] - z[None, :]) + np.eye(z.size) * 2 * borehole_radius
+        if np.any(gaps <= 2 * pipe_radius):
+            raise ValueError("Invalid pipe positions. Pipes overlap")
+
+        self.num_pipes = z.size
+        self.order = int(order)
+        self.two_pi_kg = 2 * pi * grout_conductivity
+
+        # thermal conductivity ratio, dimensionless
+        sigma = (grout_conductivity - soil_conductivity) / (grout_conductivity + soil_conductivity)
+        self._build(z, pipe_radius, borehole_radius, sigma)
+
+    def _build(self, z: np.ndarray, rp: float, rb: float, sigma: float) -> None:
+        """
+        Assembles the multipole system. In units of q / (2 pi k_grout), the fluid temperatures above the borehole
+        wall temperature are (R0 + beta I) q + E x, where x holds the real and imaginary parts of the multipole
+        strengths, which satisfy (I + G) x + beta K (I - G) x = -(H - beta K H) q, with K the multipole orders.
+        """
+
+        n_p, n = self.num_pipes, self.order
+        rb2 = rb**2
+
+        # zeroth order: line sources and their images
+        dz = z[:, None] - z[None, :]  # z_m - z_n
+        a = rb2 - z[:, None] * np.conj(z[None, :])  # r_b^2 - z_m conj(z_n)
+        with np.errstate(divide="ignore"):
+            r0 = np.log(rb / np.abs(dz)) + sigma * np.log(rb2 / np.abs(a))
+        r0[np.diag_indices(n_p)] = log(rb / rp) + sigma * np.log(rb2 / (rb2 - np.abs(z) ** 2))
+
+        # Taylor coefficients, in powers of (z - z_m) / r_p, of the field at pipe m from each source at pipe n.
+        # line sources for orders k >= 1, and multipoles of order j and their images for orders k >= 0
+        line = np.zeros((n_p, n, n_p), dtype=complex)
+        pole = np.zeros((n_p, n + 1, n_p, n), dtype=complex)
+        image = np.zeros((n_p, n + 1, n_p, n), dtype=complex)
+        other = ~np.eye(n_p, dtype=bool)
+        for k in range(1, n + 1):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                line[:, k - 1, :] = np.where(other, (rp / -dz) ** k / k, 0)
+            line[:, k - 1, :] += sigma * (rp * np.conj(z[None, :]) / a) ** k / k
+        for k in range(n + 1):
+            for j in range(1, n + 1):
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    pole[:, k, :, j - 1] = np.where(other, comb(j + k - 1, k) * (rp / dz) ** j * (-rp / dz) ** k, 0)
+                terms = sum(
+                    comb(j, i)
+                    * z[:, None] ** (j - i)
+                    * comb(j + k - i - 1, k - i)
+                    * (np.conj(z[None, :]) / a) ** (k - i)
+                    for i in range(min(j, k) + 1)
+                )
+                image[:, k, :, j - 1] = sigma * (rp / a) ** j * rp**k * terms
+
+        size = n_p * n
+        b_conj = np.conj(pole[:, 1:].reshape(size, size))
+        c_conj = np.conj(image[:, 1:].reshape(size, size))
+        b0 = pole[:, 0].reshape(n_p, size)
+        c0 = image[:, 0].reshape(n_p, size)
+        line_flat = line.reshape(size, n_p)
+
+        # conj(F) = G x + H q, split into real and imaginary parts
+        g = np.block(
+            [
+                [c_conj.real + b_conj.real, -c_conj.imag + b_conj.imag],
+                [c_conj.imag + b_conj.imag, c_conj.real - b_conj.real],
+            ]
+        )
+        h = np.concatenate((line_flat.real, -line_flat.imag))
+        e = np.concatenate(((b0 + c0).real, c0.imag - b0.imag), axis=1)
+        orders = np.tile(np.arange(1, n + 1, dtype=float), 2 * n_p)
+
+        self._r0 = r0
+        self._forms: dict[bytes, tuple | None] = {}
+        a0 = np.eye(2 * size) + g
+        a1 = orders[:, None] * (np.eye(2 * size) - g)
+        u1 = np.linalg.solve(a1, h)
+        u2 = np.linalg.solve(a1, orders[:, None] * h)
+
+        # S = A1^-1 A0 = V diag(lambda) V^-1
+        eigenvalues, vectors = np.linalg.eig(np.linalg.solve(a1, a0))
+        if np.linalg.cond(vectors) < _MAX_EIGENVECTOR_CONDITION:
+            self._eigenvalues = eigenvalues
+            self._left = e @ vectors
+            self._right_1 = np.linalg.solve(vectors, u1)
+            self._right_2 = np.linalg.solve(vectors, u2)
+            self._system = None
+        else:
+            self._system = (a0, a1, h, orders[:, None] * h, e)
+
+    def resistance_matrix(self, pipe_resist) -> np.ndarray:
+        """
+        Computes the fluid to borehole wall resistance matrix, such that the fluid temperatures above the
+        borehole wall temperature are R @ q, with q the heat flows per unit length out of each pipe.
+
+        :param pipe_resist: combined convection and conduction resistance of one pipe, in K/(W/m). scalar or
+                            array_like
+        :return: resistance matrix, in K/(W/m), of shape pipe_resist.shape + (number of pipes, number of pipes)
+        """
+
+        beta = self.two_pi_kg * np.asarray(pipe_resist, dtype=float)[..., None]
+        identity = np.eye(self.num_pipes)
+
+        if self._system is None:
+            weights = 1 / (self._eigenvalues + beta)
+            multipoles = np.einsum("mi,...i,in->...mn", self._left, weights, self._right_1) - np.einsum(
+                "mi,...i,in->...mn", self._left, beta * weights, self._right_2
+            )
+        else:
+            a0, a1, h, kh, e = self._system
+            x = np.linalg.solve(a0 + beta[..., None] * a1, -(h - beta[..., None] * kh))
+            multipoles = -(e @ x)
+
+        r = self._r0 + beta[..., None] * identity - multipoles.real
+        return r / self.two_pi_kg
+
+    def calc_resistances(self, pipe_resist, inlets) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Computes the local and total internal borehole resistances.
+
+        The local resistance is between the fluid, at one temperature in all pipes, and the borehole wall. The
+        internal resistance is the temperature difference between the inlet and outlet pipes over the heat
+        flow per unit length out of one inlet pipe.
+
+        :param pipe_resist: combined convection and conduction resistance of one pipe, in K/(W/m). scalar or
+                            array_like
+        :param inlets: True for each pipe that carries fluid down, False for each that carries it up
+        :return: local and internal resistances, in K/(W/m), with the shape of pipe_resist
+        """
+
+        inlets = np.asarray(inlets, dtype=bool)
+        key = inlets.tobytes()
+        if key not in self._forms:
+            self._forms[key] = self._symmetric_forms(np.where(inlets, 0.5, -0.5))
+        forms = self._forms[key]
+
+        if forms is not None:
+            # R 1 = rho 1 and R p = mu p, so 1^T R^-1 1 = n / rho and R^-1 p = p / mu
+            ones_form, pattern_form = forms
+            beta = self.two_pi_kg * pipe_resist
+            local = _eval_form(ones_form, beta) / (self.two_pi_kg * self.num_pipes**2)
+            internal = 8 * _eval_form(pattern_form, beta) / (self.two_pi_kg * self.num_pipes)
+            return local, internal
+
+        conductance = np.linalg.inv(self.resistance_matrix(pipe_resist))
+        local = 1 / conductance.sum(axis=(-2, -1))
+        flows = conductance @ np.where(inlets, 0.5, -0.5)
+        internal = 1 / flows[..., inlets].mean(axis=-1)
+        return local, internal
+
+    def _symmetric_forms(self, pattern: np.ndarray) -> tuple | None:
+        """
+        Projects the quadratic forms of 2 pi k_grout R on the all-ones vector and on the inlet pattern onto the
+        eigenmodes, see _quadratic_form.
+
+        :param pattern: 0.5 for each inlet pipe, -0.5 for each outlet pipe
+        :return: forms on the all-ones vector and on the pattern, or None if the system is solved directly, or
+                 if R does not have equal row sums with the pattern as an eigenvector
+        """
+
+        if self._system is not None:
+            return None
+
+        ones = np.ones(self.num_pipes)
+        r = self.resistance_matrix(np.array(_SYMMETRY_CHECK_BETAS) / self.two_pi_kg)
+        for u in (ones, pattern):
+            ru = r @ u
+            eigenvalue = ru @ u / (u @ u)
+            if not np.allclose(ru, eigenvalue[:, None] * u, rtol=1e-10, atol=0):
+                return None
+
+        return self._quadratic_form(ones), self._quadratic_form(pattern)
+
+    def _quadratic_form(self, u: np.ndarray) -> tuple:
+        """
+        Projects u^T (2 pi k_grout R) u onto the eigenmodes. With the multipole part of resistance_matrix,
+        u^T M u = sum_i (c1_i - beta c2_i) / (lambda_i + beta) = sum_i d_i / (lambda_i + beta) - sum_i c2_i, with
+        d_i = c1_i + lambda_i c2_i, so
+
+            u^T (2 pi k_grout R) u = u^T R0 u + sum_i c2_i + beta u^T u - sum_i d_i / (lambda_i + beta)
+
+        :param u: pipe vector
+        :return: static part, coefficient of beta, the poles lambda_i and residues d_i of the modes that u
+                 excites, and the same poles and residues as pairs of complex numbers for scalar beta
+        """
+
+        projection = u @ self._left
+        c1 = projection * (self._right_1 @ u)
+        c2 = projection * (self._right_2 @ u)
+        residues = c1 + self._eigenvalues * c2
+        excited = np.abs(residues) > _MIN_RESIDUE * np.abs(residues).sum()
+        static = float(u @ self._r0 @ u + c2.sum().real)
+        poles = self._eigenvalues[excited].astype(complex)
+        residues = residues[excited].astype(complex)
+        return static, float(u @ u), poles, residues, list(zip(poles.tolist(), residues.tolist()))
+
+
+def _eval_form(form: tuple, beta):
+    """
+    Evaluates a quadratic form from Multipole._quadratic_form.
+
+    :param form: static part, coefficient of beta, poles, residues, and pairs of poles and residues
+    :param beta: dimensionless pipe resistance. scalar or array_like
+    :return: value of the form
+    """
+
+    static, slope, poles, residues, terms = form
+    if isinstance(beta, float):
+        return static + slope * beta - sum(d / (p + beta) for p, d in terms).real
+
+    beta = np.asarray(beta, dtype=float)
+    return static + slope * beta - (residues / (poles + beta[..., None])).sum(axis=-1).real
+
+
+class MultipoleBorehole:
+    """
+    Effective resistance of a single or double u-tube borehole, with the local and internal resistances computed
+    by the multipole method to any order. Built with Borehole.compile_multipole.
+    """
+
+    def __init__(self, bh, positions, inlets, num_u_tubes: int, uniform_heat_flux: bool, order: int):
+        """
+        :param bh: SingleUBorehole or DoubleUTube, for the pipe resistances, fluid, and length
+        :param positions: (x, y) positions of the pipe centers, in m
+        :param inlets: True for each pipe that carries fluid down
+        :param num_u_tubes: number of u-tubes in parallel
+        :param uniform_heat_flux: True for the uniform heat flux boundary condition, False for uniform borehole
+                                  wall temperature
+        :param order: highest multipole order
+        """
+
+        self._bh = bh
+        self.inlets = np.asarray(inlets, dtype=bool)
+        self.num_u_tubes = num_u_tubes
+        self.uniform_heat_flux = uniform_heat_flux
+        self.multipole = Multipole(
+            positions,
+            bh.pipe_outer_diameter / 2,
+            bh.borehole_diameter / 2,
+            bh.grout_conductivity,
+            bh.soil_conductivity,
+            order,
+        )
+
+    @classmethod
+    def from_single_u(cls, bh, uniform_heat_flux: bool, order: int) -> "MultipoleBorehole":
+        positions = [(-bh.shank_space, 0.0), (bh.shank_space, 0.0)]
+        return cls(bh, positions, [True, False], 1, uniform_heat_flux, order)
+
+    @classmethod
+    def from_double_u(cls, bh, uniform_heat_flux: bool, order: int) -> "MultipoleBorehole":
+        s = bh.shank_space
+        positions = [(s, 0.0), (0.0, s), (-s, 0.0), (0.0, -s)]
+        if bh.pipe_inlet_arrangement == DoubleUPipeInletArrangement.DIAGONAL:
+            inlets = [True, False, True, False]
+        else:
+            inlets = [True, True, False, False]
+        return cls(bh, positions, inlets, 2, uniform_heat_flux, order)
+
+    def calc_local_and_internal_resist(self, m_dot, temp) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :param m_dot: total borehole mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, Celsius. scalar or array_like
+        :return: local and total internal borehole resistances, K/(W/m)
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        pipe_resist = self._bh.calc_fluid_pipe_resist_array(m_dot / self.num_u_tubes, temp)
+        return self.multipole.calc_resistances(pipe_resist, self.inlets)
+
+    def calc_bh_resist_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Computes the effective borehole resistance, with the short-circuiting corrections of the closed forms.
+
+        :param m_dot: total borehole mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, Celsius. scalar or array_like
+        :return: effective borehole resistance, K/(W/m)
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        r_b, r_a = self.calc_local_and_internal_resist(m_dot, temp)
+        return self._effective_resist(r_b, r_a, m_dot, eval_property_array(self._bh.fluid.cp, temp))
+
+    def calc_bh_resist(self, m_dot: float, temp: float) -> float:
+        """
+        Scalar version of calc_bh_resist_array. The pipe resistances and fluid properties are evaluated by the
+        scalar methods, which are faster than the array methods for a single point.
+
+        :param m_dot: total borehole mass flow rate, kg/s
+        :param temp: temperature, Celsius
+        :return: effective borehole resistance, K/(W/m)
+        """
+
+        pipe_resist = self._bh.calc_fluid_pipe_resist(m_dot / self.num_u_tubes, temp)
+        r_b, r_a = self.multipole.calc_resistances(pipe_resist, self.inlets)
+        return float(self._effective_resist(r_b, r_a, m_dot, self._bh.fluid.cp(temp)))
+
+    def _effective_resist(self, r_b, r_a, m_dot, cp):
+        """
+        Effective borehole resistance from the local and internal resistances, see the closed forms of
+        SingleUBorehole and DoubleUTube.
+        """
+
+        r_v = self._bh.bh_length / (cp * m_dot / self.num_u_tubes)
+        if self.uniform_heat_flux:
+            return r_b + r_v**2 / (3 * self.num_u_tubes * r_a)
+        n = r_v / (self.num_u_tubes * r_b * r_a) ** 0.5
+        return r_b * n * coth_array(n)
@@ -1,10 +1,106 @@
 from math import log, pi
 
-from bhr.fluid import get_fluid
-from bhr.utilities import inch_to_m, smoothing_function
+import numpy as np
+
+from bhr import dual
+from bhr.enums import FlowRegime
+from bhr.fluid import eval_property_array, get_fluid
+from bhr.utilities import broadcast_inputs, inch_to_m, smoothing_function, smoothing_function_array
+
+# limits of the transitional region of the pipe friction factor and Nusselt number correlations
+PIPE_LOW_REYNOLDS = 2000
+PIPE_HIGH_REYNOLDS = 4000
+
+
+def pipe_friction_factor_array(re, laminar_ratio=1.0) -> np.ndarray:
+    """
+    Vectorized friction factor in smooth tubes, see Pipe.friction_factor
+
+    :param re: Reynolds number, dimensionless. scalar or array_like
+    :param laminar_ratio: ratio of the laminar friction factor to that of a round pipe, 1 for round pipes. scalar
+                          or array_like broadcastable with re
+    :return: friction factor
+    """
+
+    re, laminar_ratio = broadcast_inputs(re, laminar_ratio)
+    laminar = re < PIPE_LOW_REYNOLDS
+    turbulent = re > PIPE_HIGH_REYNOLDS
+    transitional = ~(laminar | turbulent)
+
+    f = np.empty_like(re)
+    f[laminar] = laminar_ratio[laminar] * Pipe.laminar_friction_factor(re[laminar])
+    f[turbulent] = Pipe.turbulent_friction_factor_array(re[turbulent])
+
+    re_trans = re[transitional]
+    f_low = laminar_ratio[transitional] * Pipe.laminar_friction_factor(re_trans)
+    f_high = Pipe.turbulent_friction_factor_array(re_trans)
+    f[transitional] = smoothing_function_array(re_trans, PIPE_LOW_REYNOLDS, PIPE_HIGH_REYNOLDS, f_low, f_high)
+
+    return f
+
+
+def pipe_turbulent_nusselt_array(re, pr) -> np.ndarray:
+    """
+    Vectorized turbulent Nusselt number for smooth pipes, see Pipe.turbulent_nusselt
+
+    :param re: Reynolds number. scalar or array_like
+    :param pr: Prandtl number. scalar or array_like
+    :return: Nusselt number
+    """
+
+    re, pr = broadcast_inputs(re, pr)
+    f = pipe_friction_factor_array(re)
+    return (f / 8) * (re - 1000) * pr / (1 + 12.7 * (f / 8) ** 0.5 * (pr ** (2 / 3) - 1))
+
+
+def pipe_nusselt_array(re, pr) -> np.ndarray:
+    """
+    Vectorized pipe internal Nusselt number, see Pipe.calc_nusselt
+
+    :param re: Reynolds number. scalar or array_like
+    :param pr: Prandtl number. scalar or array_like
+    :return: Nusselt number
+    """
+
+    re, pr = broadcast_inputs(re, pr)
+    transitional = (re >= PIPE_LOW_REYNOLDS) & (re < PIPE_HIGH_REYNOLDS)
+    turbulent = re >= PIPE_HIGH_REYNOLDS
+
+    nu = np.full_like(re, Pipe.laminar_nusselt())
+
+    if transitional.any():
+        nu_high = pipe_turbulent_nusselt_array(PIPE_HIGH_REYNOLDS, pr[transitional])
+        nu[transitional] = smoothing_function_array(
+            re[transitional], PIPE_LOW_REYNOLDS, PIPE_HIGH_REYNOLDS, Pipe.laminar_nusselt(), nu_high
+        )
+
+    if turbulent.any():
+        nu[turbulent] = pipe_turbulent_nusselt_array(re[turbulent], pr[turbulent])
+
+    return nu
 
 
 class Pipe:
+    # instances are held by the thousand, so attributes are kept in slots rather than a __dict__. every attribute,
+    # including the derived geometry, is a plain attribute that can be read and assigned
+    __slots__ = (
+        "area_cr_inner",
+        "area_cr_outer",
+        "area_cr_pipe",
+        "area_s_inner",
+        "area_s_outer",
+        "dimension_ratio",
+        "fluid",
+        "fluid_vol",
+        "pipe_conductivity",
+        "pipe_inner_diameter",
+        "pipe_length",
+        "pipe_outer_diameter",
+        "pipe_wall_vol",
+        "thickness",
+        "total_vol",
+    )
+
     def __init__(
         self,
         pipe_outer_diameter: float,
@@ -21,7 +117,7 @@ class Pipe:
 
         # set diameters and thickness
         self.pipe_outer_diameter = pipe_outer_diameter
-        self.pipe_inner_diameter = self.pipe_outer_diameter * (1 - 2 / self.dimension_ratio)
+        self.pipe_inner_diameter = self.get_inner_dia(self.pipe_outer_diameter, self.dimension_ratio)
         self.thickness = self.pipe_outer_diameter / self.dimension_ratio
 
         # set length
@@ -48,6 +144,20 @@ class Pipe:
     def get_inner_dia(outer_dia: float, dimension_ratio: float) -> float:
         return outer_dia * (1 - 2 / dimension_ratio)
 
+    @staticmethod
+    def get_cond_resist(outer_dia: float, inner_dia: float, conductivity: float) -> float:
+        """
+        Pipe radial conduction thermal resistance, see calc_cond_resist. Works on floats, or on arrays with one
+        value per pipe.
+
+        :param outer_dia: pipe outer diameter, m
+        :param inner_dia: pipe inner diameter, m
+        :param conductivity: pipe conductivity, W/(m-K)
+        :return: conduction resistance, K/(W/m)
+        """
+
+        return dual.log(outer_dia / inner_dia) / (2 * pi * conductivity)
+
     def get_pipe_diameters_imperial(self, nominal_pipe_size_inches: float, dimension_ratio: float):
         if nominal_pipe_size_inches == 0.75:
             outer_dia = 1.05
@@ -94,6 +204,18 @@ class Pipe:
 
         return 4 * m_dot / (self.fluid.mu(temp) * pi * self.pipe_inner_diameter)
 
+    def mdot_to_re_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Vectorized version of mdot_to_re.
+
+        :param m_dot: mass flow rate, in kg/s. scalar or array_like
+        :param temp: temperature, in C. scalar or array_like
+        :return: Reynolds number, dimensionless
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        return 4 * m_dot / (eval_property_array(self.fluid.mu, temp) * pi * self.pipe_inner_diameter)
+
     def mdot_to_velocity(self, m_dot: float, temp: float) -> float:
         """
         Computes velocity based on mass flow rate.
@@ -132,6 +254,16 @@ class Pipe:
 
         return smoothing_function(re, low_reynolds, high_reynolds, f_low, f_high)
 
+    def friction_factor_array(self, re) -> np.ndarray:
+        """
+        Vectorized version of friction_factor.
+
+        :param re: Reynolds number, dimensionless. scalar or array_like
+        :return: friction factor
+        """
+
+        return pipe_friction_factor_array(re)
+
     @staticmethod
     def laminar_friction_factor(re: float):
         """
@@ -158,6 +290,17 @@ class Pipe:
 
         return (0.79 * log(re) - 1.64) ** (-2.0)
 
+    @staticmethod
+    def turbulent_friction_factor_array(re) -> np.ndarray:
+        """
+        Vectorized version of turbulent_friction_factor.
+
+        :param re: Reynolds number, array_like
+        :return: friction factor
+        """
+
+        return (0.79 * np.log(re) - 1.64) ** (-2.0)
+
     def pressure_loss(self, m_dot: float, temp: float) -> float:
         """
         Pressure loss in straight pipe
@@ -176,6 +319,30 @@ class Pipe:
 
         return term_1 * term_2
 
+    def pressure_loss_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Vectorized version of pressure_loss.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, C. scalar or array_like
+        :return: pressure loss, Pa
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        flowing = m_dot > 0
+        m_dot = m_dot[flowing]
+        temp = temp[flowing]
+
+        rho = eval_property_array(self.fluid.density, temp)
+        re = 4 * m_dot / (eval_property_array(self.fluid.mu, temp) * pi * self.pipe_inner_diameter)
+        velocity = m_dot / (self.area_cr_inner * rho)
+
+        loss = np.zeros(flowing.shape)
+        loss[flowing] = (
+            self.friction_factor_array(re) * self.pipe_length / self.pipe_inner_diameter * rho * velocity**2 / 2
+        )
+        return loss
+
     def pressure_loss_v_dot(self, v_dot: float, temp: float) -> float:
         """
         Pressure loss in a straight pipe
@@ -214,6 +381,18 @@ class Pipe:
         pr = self.fluid.prandtl(temp)
         return (f / 8) * (re - 1000) * pr / (1 + 12.7 * (f / 8) ** 0.5 * (pr ** (2 / 3) - 1))
 
+    def turbulent_nusselt_array(self, re, temp) -> np.ndarray:
+        """
+        Vectorized version of turbulent_nusselt.
+
+        :param re: Reynolds number, array_like
+        :param temp: temperature, C. array_like
+        :return: Nusselt number
+        """
+
+        re, temp = broadcast_inputs(re, temp)
+        return pipe_turbulent_nusselt_array(re, eval_property_array(self.fluid.prandtl, temp))
+
     def calc_cond_resist(self) -> float:
         """
         Calculates the pipe radial conduction thermal resistance, in [K/(W/m)].
@@ -224,7 +403,7 @@ class Pipe:
         :return: conduction resistance, K/(W/m)
         """
 
-        return log(self.pipe_outer_diameter / self.pipe_inner_diameter) / (2 * pi * self.pipe_conductivity)
+        return self.get_cond_resist(self.pipe_outer_diameter, self.pipe_inner_diameter, self.pipe_conductivity)
 
     def calc_conv_resist(self, m_dot: float, temp: float) -> float:
         """
@@ -238,21 +417,89 @@ class Pipe:
         :return: convection resistance, K/(W/m)
         """
 
+        re = self.mdot_to_re(m_dot, temp)
+        nu = self.calc_nusselt(re, temp)
+        return 1 / (nu * pi * self.fluid.k(temp))
+
+    def calc_nusselt(self, re: float, temp: float) -> float:
+        """
+        Calculates the pipe internal Nusselt number, blending the laminar and turbulent correlations
+        in the transitional region.
+
+        :param re: Reynolds number
+        :param temp: temperature, C
+        :return: Nusselt number
+        """
+
         low_reynolds = 2000
         high_reynolds = 4000
 
-        re = self.mdot_to_re(m_dot, temp)
-
         if re < low_reynolds:
-            nu = self.laminar_nusselt()
-        elif low_reynolds <= re < high_reynolds:
+            return self.laminar_nusselt()
+
+        if re < high_reynolds:
             nu_low = self.laminar_nusselt()
             nu_high = self.turbulent_nusselt(high_reynolds, temp)
-            nu = smoothing_function(re, low_reynolds, high_reynolds, nu_low, nu_high)
-        else:
-            nu = self.turbulent_nusselt(re, temp)
+            return smoothing_function(re, low_reynolds, high_reynolds, nu_low, nu_high)
 
-        return 1 / (nu * pi * self.fluid.k(temp))
+        return self.turbulent_nusselt(re, temp)
+
+    @staticmethod
+    def flow_regime(re: float) -> FlowRegime:
+        """
+        Flow regime used by the pipe convection correlations
+
+        :param re: Reynolds number
+        :return: flow regime
+        """
+
+        if re < PIPE_LOW_REYNOLDS:
+            return FlowRegime.LAMINAR
+        if re < PIPE_HIGH_REYNOLDS:
+            return FlowRegime.TRANSITIONAL
+        return FlowRegime.TURBULENT
+
+    @staticmethod
+    def flow_regime_array(re) -> np.ndarray:
+        """
+        Vectorized version of flow_regime.
+
+        :param re: Reynolds number, array_like
+        :return: flow regimes, as an object array
+        """
+
+        regimes = np.array([FlowRegime.LAMINAR, FlowRegime.TRANSITIONAL, FlowRegime.TURBULENT], dtype=object)
+        return regimes[np.searchsorted([PIPE_LOW_REYNOLDS, PIPE_HIGH_REYNOLDS], re, side="right")]
+
+    def calc_nusselt_array(self, re, temp) -> np.ndarray:
+        """
+        Vectorized version of calc_nusselt.
+
+        :param re: Reynolds number, array_like
+        :param temp: temperature, C. array_like
+        :return: Nusselt number
+        """
+
+        re, temp = broadcast_inputs(re, temp)
+        pr = np.full_like(temp, np.nan)
+        # the Prandtl number is only needed outside of laminar flow
+        flowing = re >= PIPE_LOW_REYNOLDS
+        if flowing.any():
+            pr[flowing] = eval_property_array(self.fluid.prandtl, temp[flowing])
+        return pipe_nusselt_array(re, pr)
+
+    def calc_conv_resist_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Vectorized version of calc_conv_resist.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, C. scalar or array_like
+        :return: convection resistance, K/(W/m)
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        nu = self.calc_nusselt_array(self.mdot_to_re_array(m_dot, temp), temp)
+        return 1 / (nu * pi * eval_property_array(self.fluid.k, temp))
 
     def calc_fluid_pipe_resist(self, m_dot: float, temp: float):
         """
@@ -269,3 +516,14 @@ class Pipe:
         """
 
         return self.calc_conv_resist(m_dot, temp) + self.calc_cond_resist()
+
+    def calc_fluid_pipe_resist_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Vectorized version of calc_fluid_pipe_resist.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, C. scalar or array_like
+        :return: combined convection and conduction pipe resistance, K/(W/m)
+        """
+
+        return self.calc_conv_resist_array(m_dot, temp) + self.calc_cond_resist()
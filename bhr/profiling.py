@@ -0,0 +1,308 @@
+"""
+Opt-in instrumentation of the resistance calculation.
+
+Nothing is instrumented until ``collect`` is entered. On entry, the pipe friction factor and convection resistance,
+the smoothing function, and the borehole resistance methods are replaced by counting and timing wrappers. The
+property methods of the fluids created by ``bhr.fluid.get_fluid`` are wrapped on each fluid instance, including
+fluids created while collecting, so the SecondaryCoolantProps classes are not modified. The originals are restored
+on exit, so there is no cost outside of ``collect``.
+
+Calls are attributed to the Borehole whose calc method they were made from. Times are inclusive, so the time of a
+call includes the time of the calls it makes. Compiled evaluators and surrogates hold direct references to the
+fluid property methods and are not instrumented.
+"""
+
+import contextvars
+import inspect
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bhr.borehole import Borehole
+
+_FLUID_PROPERTIES = ("viscosity", "density", "specific_heat", "conductivity", "prandtl")
+_FLUID_ALIASES = {"mu": "viscosity", "rho": "density", "cp": "specific_heat", "k": "conductivity", "pr": "prandtl"}
+
+# Borehole whose calc method is running in the current thread
+_current_borehole = contextvars.ContextVar("current_borehole", default=None)
+
+_active_lock = threading.Lock()
+_active: "Profile | None" = None
+
+
+@dataclass
+class CallStats:
+    """
+    Number of calls to a method and the total time spent in them.
+    """
+
+    calls: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class BoreholeProfile:
+    """
+    Instrumentation results for one Borehole.
+
+    :param label: description of the borehole
+    :param calls: call statistics, keyed by method name
+    :param evaluations: number of scalar evaluations of each method at each (m_dot, temp) point, keyed by
+                        (method name, m_dot, temp)
+    """
+
+    label: str
+    calls: dict[str, CallStats] = field(default_factory=dict)
+    evaluations: Counter = field(default_factory=Counter)
+
+    @property
+    def repeated(self) -> dict[tuple[str, float, float], int]:
+        """
+        Evaluations of a method repeated at the same mass flow rate and temperature.
+
+        :return: number of evaluations, keyed by (method name, m_dot, temp), for points evaluated more than once
+        """
+
+        return {key: count for key, count in self.evaluations.items() if count > 1}
+
+    def report(self, max_repeated: int = 10) -> str:
+        """
+        :param max_repeated: maximum number of repeated evaluations to list
+        :return: table of call counts and times, followed by the repeated evaluations
+        """
+
+        lines = [self.label, f"  {'call':<58} {'calls':>10} {'total, s':>12} {'mean, us':>12}"]
+        for name, stats in sorted(self.calls.items(), key=lambda item: -item[1].seconds):
+            mean = stats.seconds / stats.calls * 1e6
+            lines.append(f"  {name:<58} {stats.calls:>10} {stats.seconds:>12.6f} {mean:>12.3f}")
+
+        repeated = self.repeated
+        if repeated:
+            lines.append(f"  {len(repeated)} (m_dot, temp) evaluations repeated:")
+            ranked = sorted(repeated.items(), key=lambda item: -item[1])
+            for (name, m_dot, temp), count in ranked[:max_repeated]:
+                lines.append(f"    {name} at m_dot={m_dot:g}, temp={temp:g}: {count} times")
+            if len(ranked) > max_repeated:
+                lines.append(f"    ... {len(ranked) - max_repeated} more")
+        return "\n".join(lines)
+
+
+class Profile:
+    """
+    Instrumentation results collected by ``collect``, per Borehole.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # keyed by id; the boreholes are held so their ids are not reused while collecting
+        self._boreholes: dict[int, tuple[Borehole, BoreholeProfile]] = {}
+        self.unattributed = BoreholeProfile("Calls outside of a Borehole")
+
+    @property
+    def boreholes(self) -> list[BoreholeProfile]:
+        """
+        :return: results for each Borehole, in the order they were first used
+        """
+
+        return [profile for _, profile in self._boreholes.values()]
+
+    def for_borehole(self, bh: "Borehole") -> BoreholeProfile:
+        """
+        :param bh: Borehole
+        :return: results for the Borehole
+        """
+
+        entry = self._boreholes.get(id(bh))
+        if entry is None:
+            raise LookupError("Borehole was not used while collecting")
+        return entry[1]
+
+    def _profile(self, bh: "Borehole | None") -> BoreholeProfile:
+        if bh is None:
+            return self.unattributed
+        entry = self._boreholes.get(id(bh))
+        if entry is None:
+            bh_type = "not initialized" if bh._bh_type is None else bh._bh_type.name
+            bc = "" if bh._boundary_condition is None else f", {bh._boundary_condition.name}"
+            entry = (bh, BoreholeProfile(f"Borehole {len(self._boreholes) + 1}: {bh_type}{bc}"))
+            self._boreholes[id(bh)] = entry
+        return entry[1]
+
+    def _record(self, name: str, seconds: float, point: tuple[float, float] | None) -> None:
+        with self._lock:
+            profile = self._profile(_current_borehole.get())
+            stats = profile.calls.get(name)
+            if stats is None:
+                stats = profile.calls[name] = CallStats()
+            stats.calls += 1
+            stats.seconds += seconds
+            if point is not None:
+                profile.evaluations[(name, *point)] += 1
+
+    def report(self, max_repeated: int = 10) -> str:
+        """
+        :param max_repeated: maximum number of repeated evaluations to list per Borehole
+        :return: text report of every Borehole
+        """
+
+        profiles = self.boreholes
+        if self.unattributed.calls:
+            profiles.append(self.unattributed)
+        return "\n\n".join(profile.report(max_repeated) for profile in profiles)
+
+
+def _scalar_point(signature: inspect.Signature, args: tuple, kwargs: dict) -> tuple[float, float] | None:
+    # the first two arguments after self are the mass flow rate and temperature
+    values = list(signature.bind(*args, **kwargs).arguments.values())[1:3]
+    if len(values) == 2 and all(isinstance(v, (int, float)) for v in values):
+        return float(values[0]), float(values[1])
+    return None
+
+
+def _wrap(func, name: str, track_points: bool = False, borehole_entry: bool = False):
+    signature = inspect.signature(func) if track_points else None
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _current_borehole.set(args[0]) if borehole_entry else None
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            seconds = perf_counter() - start
+            profile = _active
+            if profile is not None:
+                point = _scalar_point(signature, args, kwargs) if track_points else None
+                profile._record(name, seconds, point)
+            if token is not None:
+                _current_borehole.reset(token)
+
+    return wrapper
+
+
+def _targets() -> list[tuple[object, str, str, bool, bool]]:
+    """
+    Methods and functions to instrument.
+
+    :return: list of (owner, attribute name, report name, track (m_dot, temp) points, is a Borehole entry point)
+    """
+
+    from bhr import coaxial_borehole, pipe  # noqa: PLC0415
+    from bhr.borehole import Borehole  # noqa: PLC0415
+    from bhr.coaxial_borehole import Coaxial  # noqa: PLC0415
+    from bhr.double_u_borehole import DoubleUTube  # noqa: PLC0415
+    from bhr.pipe import Pipe  # noqa: PLC0415
+    from bhr.single_u_borehole import SingleUBorehole  # noqa: PLC0415
+
+    targets: list[tuple[object, str, str, bool, bool]] = []
+
+    for name, member in Borehole.__dict__.items():
+        if name.startswith("calc_") and callable(member):
+            targets.append((Borehole, name, f"Borehole.{name}", not name.endswith("_array"), True))
+
+    for cls in (SingleUBorehole, DoubleUTube, Coaxial):
+        for name in cls.__dict__:
+            if name.startswith("calc_effective_bh_resistance_") or name in ("update_beta", "update_b1"):
+                targets.append((cls, name, f"{cls.__name__}.{name}", not name.endswith("_array"), False))
+
+    for name in ("calc_conv_resist", "calc_conv_resist_array"):
+        targets.append((Pipe, name, f"Pipe.{name}", not name.endswith("_array"), False))
+    for name in ("friction_factor", "friction_factor_array"):
+        targets.append((Pipe, name, f"Pipe.{name}", False, False))
+
+    for module in (pipe, coaxial_borehole):
+        for name in ("smoothing_function", "smoothing_function_array"):
+            targets.append((module, name, name, False, False))
+
+    return targets
+
+
+def _fluid_targets(fluid) -> list[tuple[str, str]]:
+    """
+    Fluid property methods to instrument on a fluid instance.
+
+    :param fluid: fluid created by ``get_fluid``
+    :return: list of (attribute name, report name)
+    """
+
+    cls = type(fluid)
+    targets = [(name, f"fluid.{name}") for name in _FLUID_PROPERTIES if hasattr(cls, name)]
+    # aliases that refer to the same function, rather than calling the long-form method
+    for alias, name in _FLUID_ALIASES.items():
+        member = getattr(cls, alias, None)
+        if member is not None and member is getattr(cls, name, None):
+            targets.append((alias, f"fluid.{name}"))
+    return targets
+
+
+def _wrap_fluid(fluid, wrapped: list[tuple[object, str]]) -> None:
+    for attr, name in _fluid_targets(fluid):
+        if attr in vars(fluid):
+            continue
+        wrapper = _wrap(getattr(fluid, attr), name)
+        # keep the wrapper recognizable as a property method of the fluid, see bhr.fluid.eval_property_array
+        wrapper.__self__ = fluid
+        setattr(fluid, attr, wrapper)
+        wrapped.append((fluid, attr))
+
+
+@contextmanager
+def collect() -> Iterator[Profile]:
+    """
+    Counts and times the calls made by the resistance calculation, per Borehole, while the context is active.
+    Scalar evaluations of the Borehole and borehole resistance methods are also recorded by mass flow rate and
+    temperature, so repeated evaluations at the same point can be found.
+
+    Usage::
+
+        with collect() as profile:
+            bh.calc_bh_resist(0.5, 20)
+        print(profile.report())
+
+    Only one collection may be active at a time.
+
+    :return: Profile, filled in as calls are made
+    """
+
+    from bhr import fluid  # noqa: PLC0415
+
+    global _active  # noqa: PLW0603
+
+    with _active_lock:
+        if _active is not None:
+            raise RuntimeError("Profiling is already active")
+        profile = Profile()
+        _active = profile
+
+    originals: list[tuple[object, str, object]] = []
+    wrapped: list[tuple[object, str]] = []
+
+    def hook(new_fluid) -> None:
+        _wrap_fluid(new_fluid, wrapped)
+
+    try:
+        for owner, attr, name, track_points, borehole_entry in _targets():
+            original = vars(owner)[attr]
+            originals.append((owner, attr, original))
+            setattr(owner, attr, _wrap(original, name, track_points, borehole_entry))
+        with fluid._fluid_registry_lock:
+            for instance in fluid._fluid_registry.values():
+                _wrap_fluid(instance, wrapped)
+            fluid._registry_hooks.append(hook)
+        yield profile
+    finally:
+        with fluid._fluid_registry_lock:
+            if hook in fluid._registry_hooks:
+                fluid._registry_hooks.remove(hook)
+            for instance, attr in reversed(wrapped):
+                delattr(instance, attr)
+        for owner, attr, original in reversed(originals):
+            setattr(owner, attr, original)
+        with _active_lock:
+            _active = None
@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+
+from bhr.enums import FlowRegime
+
+
+@dataclass(frozen=True)
+class ResistanceBreakdown:
+    """
+    All resistance components of a borehole at one flow rate and temperature.
+
+    For u-tube boreholes, the flow quantities are those of a single pipe, i.e. at the total flow rate for
+    single u-tubes and at half the total flow rate for double u-tubes. For coaxial boreholes, the flow quantities
+    are those of the annulus, the convection resistance is the sum of both annulus surfaces, the conduction
+    resistance is that of the outer pipe, and the Nusselt number is that of the outer annulus surface.
+
+    :param reynolds: Reynolds number, dimensionless
+    :param nusselt: Nusselt number, dimensionless
+    :param flow_regime: flow regime used by the convection correlations
+    :param conv_resist: fluid convection resistance, K/(W/m)
+    :param cond_resist: pipe conduction resistance, K/(W/m)
+    :param fluid_pipe_resist: combined convection and conduction resistance, K/(W/m)
+    :param grout_resist: grout resistance, K/(W/m)
+    :param local_bh_resist: local borehole resistance, Rb, K/(W/m)
+    :param internal_resist: internal borehole resistance, Ra, K/(W/m)
+    :param effective_bh_resist_uhf: effective borehole resistance for uniform heat flux, K/(W/m)
+    :param effective_bh_resist_ubwt: effective borehole resistance for uniform borehole wall temperature, K/(W/m)
+    """
+
+    reynolds: float
+    nusselt: float
+    flow_regime: FlowRegime
+    conv_resist: float
+    cond_resist: float
+    fluid_pipe_resist: float
+    grout_resist: float
+    local_bh_resist: float
+    internal_resist: float
+    effective_bh_resist_uhf: float
+    effective_bh_resist_ubwt: float
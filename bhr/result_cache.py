@@ -0,0 +1,124 @@
+"""
+Bounded cache of borehole resistances at quantized operating points.
+
+Inputs are rounded to a fixed resolution before lookup, and a miss is evaluated at the rounded inputs, so every
+call that rounds to the same key returns the same value, whatever order the calls are made in.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from math import isfinite
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    """
+    Statistics of a ResultCache.
+
+    :param hits: number of lookups answered from the cache
+    :param misses: number of lookups that were evaluated
+    :param maxsize: maximum number of entries
+    :param currsize: current number of entries
+    """
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        :return: fraction of lookups answered from the cache, 0 before the first lookup
+        """
+
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResultCache:
+    """
+    Least-recently-used cache keyed on (mass flow rate, temperature), rounded to a fixed resolution.
+
+    Safe to share between threads. Copies and pickles of a cache keep its settings, but start empty.
+    """
+
+    def __init__(self, maxsize: int = 1024, m_dot_resolution: float = 1e-6, temp_resolution: float = 0.01):
+        """
+        :param maxsize: maximum number of entries. the least recently used entry is evicted when full
+        :param m_dot_resolution: mass flow rates are rounded to a multiple of this, in kg/s
+        :param temp_resolution: temperatures are rounded to a multiple of this, in Celsius
+        """
+
+        if maxsize < 1:
+            raise ValueError(f"Invalid maxsize: {maxsize}. Must be at least 1")
+        if m_dot_resolution <= 0 or temp_resolution <= 0:
+            raise ValueError("Invalid resolution. Must be greater than 0")
+
+        self.maxsize = int(maxsize)
+        self.m_dot_resolution = float(m_dot_resolution)
+        self.temp_resolution = float(temp_resolution)
+        self._entries: OrderedDict[tuple[int, int], float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __reduce__(self):
+        return type(self), (self.maxsize, self.m_dot_resolution, self.temp_resolution)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, mass_flow_rate: float, temperature: float, func: Callable[[float, float], float]) -> float:
+        """
+        Looks up the value at the rounded inputs, evaluating and storing it on a miss.
+
+        :param mass_flow_rate: mass flow rate, in kg/s
+        :param temperature: temperature, in Celsius
+        :param func: function of (mass flow rate, temperature) evaluated on a miss
+        :return: value of func at the rounded inputs, or at the inputs themselves if either is NaN or infinite
+        """
+
+        # NaN and infinite inputs have no grid point, so they are evaluated directly
+        if not (isfinite(mass_flow_rate) and isfinite(temperature)):
+            return func(mass_flow_rate, temperature)
+
+        key = (round(mass_flow_rate / self.m_dot_resolution), round(temperature / self.temp_resolution))
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+            self._misses += 1
+
+        # evaluated outside of the lock, so other threads are not held up. two threads missing on the same key
+        # compute the same value
+        value = func(key[0] * self.m_dot_resolution, key[1] * self.temp_resolution)
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """
+        Removes every entry and resets the statistics.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> CacheInfo:
+        """
+        :return: hit and miss counts, and the size of the cache
+        """
+
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._entries))
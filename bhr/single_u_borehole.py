@@ -1,10 +1,87 @@
-from math import log, pi
+from math import pi
+from typing import Any
 
+import numpy as np
+
+from bhr.dual import log
+from bhr.fluid import eval_property_array
+from bhr.resistance_breakdown import ResistanceBreakdown
 from bhr.u_tube import UTube
-from bhr.utilities import coth
+from bhr.utilities import broadcast_inputs, coth, coth_array
+
+
+def single_u_static_parameters(
+    borehole_diameter, pipe_outer_diameter, shank_space, grout_conductivity, soil_conductivity
+) -> dict[str, Any]:
+    """
+    Terms of the single u-tube resistance formulas that depend only on the geometry and conductivities, shared by
+    SingleUBorehole and its compiled and batch evaluators. Works on floats, or on arrays with one value per borehole.
+
+    :param borehole_diameter: borehole diameter, in m.
+    :param pipe_outer_diameter: outer diameter of the pipe, in m.
+    :param shank_space: radial distance from the borehole center to the pipe center, in m.
+    :param grout_conductivity: grout thermal conductivity, in W/m-K.
+    :param soil_conductivity: soil thermal conductivity, in W/m-K.
+    :return: terms, named after the SingleUBorehole attributes
+    """
+
+    theta_1 = 2 * shank_space / borehole_diameter
+    theta_2 = borehole_diameter / pipe_outer_diameter
+    theta_3 = 1 / (2 * theta_1 * theta_2)
+    sigma = (grout_conductivity - soil_conductivity) / (grout_conductivity + soil_conductivity)
+    theta_1_4 = theta_1**4
+
+    # calc_local_bh_resistance
+    rb_term_1 = log(theta_2 / (2 * theta_1 * (1 - theta_1_4) ** sigma))
+    rb_term_2_num = theta_3**2 * (1 - (4 * sigma * theta_1_4) / (1 - theta_1_4)) ** 2
+    rb_term_2_den_pt_2 = theta_3**2 * (1 + (16 * sigma * theta_1_4) / (1 - theta_1_4) ** 2)
+
+    # calc_total_internal_bh_resistance
+    term_1_num = (1 + theta_1**2) ** sigma
+    term_1_den = theta_3 * (1 - theta_1**2) ** sigma
+
+    return {
+        "theta_1": theta_1,
+        "theta_2": theta_2,
+        "theta_3": theta_3,
+        "sigma": sigma,
+        "two_pi_kg": 2 * pi * grout_conductivity,
+        "rb_term_1": rb_term_1,
+        "rb_term_2_num": rb_term_2_num,
+        "rb_term_2_den_pt_2": rb_term_2_den_pt_2,
+        "one_over_four_pi_kg": 1 / (4 * pi * grout_conductivity),
+        "ra_term_1": log(term_1_num / term_1_den),
+        "ra_term_2_num": theta_3**2 * (1 - theta_1_4 + 4 * sigma * theta_1**2) ** 2,
+        "ra_term_2_den_pt_1_factor": (1 - theta_1_4) ** 2,
+        "ra_term_2_den_pt_2": theta_3**2 * (1 - theta_1_4) ** 2,
+        "ra_term_2_den_pt_3": 8 * sigma * theta_1**2 * theta_3**2 * (1 + theta_1_4),
+        "one_over_pi_kg": 1 / (pi * grout_conductivity),
+    }
 
 
 class SingleUBorehole(UTube):
+    __slots__ = (
+        "bh_length",
+        "borehole_diameter",
+        "grout_conductivity",
+        "one_over_four_pi_kg",
+        "one_over_pi_kg",
+        "ra_term_1",
+        "ra_term_2_den_pt_1_factor",
+        "ra_term_2_den_pt_2",
+        "ra_term_2_den_pt_3",
+        "ra_term_2_num",
+        "rb_term_1",
+        "rb_term_2_den_pt_2",
+        "rb_term_2_num",
+        "sigma",
+        "soil_conductivity",
+        "theta_1",
+        "theta_2",
+        "theta_3",
+        "two_pi_kg",
+    )
+
     def __init__(
         self,
         borehole_diameter: float,
@@ -55,21 +132,34 @@ class SingleUBorehole(UTube):
         self.borehole_diameter = borehole_diameter
         self.grout_conductivity = grout_conductivity
         self.soil_conductivity = soil_conductivity
-        self.theta_1 = 2 * self.shank_space / self.borehole_diameter
-        self.theta_2 = self.borehole_diameter / self.pipe_outer_diameter
-        self.theta_3 = 1 / (2 * self.theta_1 * self.theta_2)
-        self.sigma = (self.grout_conductivity - self.soil_conductivity) / (
-            self.grout_conductivity + self.soil_conductivity
-        )
         self.bh_length = length
-        self.two_pi_kg = 2 * pi * self.grout_conductivity
 
-        # non-static parameters
-        self.pipe_resist = None
+        parameters = single_u_static_parameters(
+            borehole_diameter, pipe_outer_diameter, shank_space, grout_conductivity, soil_conductivity
+        )
+        self.theta_1 = parameters["theta_1"]
+        self.theta_2 = parameters["theta_2"]
+        self.theta_3 = parameters["theta_3"]
+        self.sigma = parameters["sigma"]
+        self.two_pi_kg = parameters["two_pi_kg"]
+
+        # static parameters - calc_local_bh_resistance
+        self.rb_term_1 = parameters["rb_term_1"]
+        self.rb_term_2_num = parameters["rb_term_2_num"]
+        self.rb_term_2_den_pt_2 = parameters["rb_term_2_den_pt_2"]
+        self.one_over_four_pi_kg = parameters["one_over_four_pi_kg"]
+
+        # static parameters - calc_total_internal_bh_resistance
+        self.ra_term_1 = parameters["ra_term_1"]
+        self.ra_term_2_num = parameters["ra_term_2_num"]
+        self.ra_term_2_den_pt_1_factor = parameters["ra_term_2_den_pt_1_factor"]
+        self.ra_term_2_den_pt_2 = parameters["ra_term_2_den_pt_2"]
+        self.ra_term_2_den_pt_3 = parameters["ra_term_2_den_pt_3"]
+        self.one_over_pi_kg = parameters["one_over_pi_kg"]
 
     def update_beta(self, m_dot: float, temp: float) -> float:
         """
-        Updates Beta coefficient.
+        Computes the Beta coefficient.
 
         Javed, S. & Spitler, J.D. Calculation of Borehole Thermal Resistance. In 'Advances in
         Ground-Source Heat Pump Systems,' pp. 84. Rees, S.J. ed. Cambridge, MA. Elsevier Ltd. 2016.
@@ -83,13 +173,11 @@ class SingleUBorehole(UTube):
 
         :param m_dot: mass flow rate, kg/s
         :param temp: temperature, Celsius
-        """
 
-        pipe_resist = self.calc_fluid_pipe_resist(m_dot, temp)
-        self.pipe_resist = pipe_resist
-        beta = self.two_pi_kg * pipe_resist
+        :return: Beta coefficient, dimensionless
+        """
 
-        return beta
+        return self.two_pi_kg * self.calc_fluid_pipe_resist(m_dot, temp)
 
     def calc_direct_coupling_resistance(self, m_dot: float, temp: float) -> tuple:
         r_a = self.calc_total_internal_bh_resistance(m_dot, temp)
@@ -121,16 +209,20 @@ class SingleUBorehole(UTube):
         :return: average thermal resistance, K/(W/m)
         """
         beta = self.update_beta(m_dot, temp)
+        return self._calc_local_bh_resistance(beta)
 
-        final_term_1 = log(self.theta_2 / (2 * self.theta_1 * (1 - self.theta_1**4) ** self.sigma))
+    def _calc_local_bh_resistance(self, beta):
+        """
+        Local borehole resistance for a given Beta coefficient. Works on scalar or array Beta values.
+
+        :param beta: Beta coefficient, dimensionless
+        :return: average thermal resistance, K/(W/m)
+        """
 
-        term_2_num = self.theta_3**2 * (1 - (4 * self.sigma * self.theta_1**4) / (1 - self.theta_1**4)) ** 2
-        term_2_den_pt_1 = (1 + beta) / (1 - beta)
-        term_2_den_pt_2 = self.theta_3**2 * (1 + (16 * self.sigma * self.theta_1**4) / (1 - self.theta_1**4) ** 2)
-        term_2_den = term_2_den_pt_1 + term_2_den_pt_2
-        final_term_2 = term_2_num / term_2_den
+        term_2_den = (1 + beta) / (1 - beta) + self.rb_term_2_den_pt_2
+        final_term_2 = self.rb_term_2_num / term_2_den
 
-        resist_bh_ave = (1 / (4 * pi * self.grout_conductivity)) * (beta + final_term_1 - final_term_2)
+        resist_bh_ave = self.one_over_four_pi_kg * (beta + self.rb_term_1 - final_term_2)
         return resist_bh_ave
 
     def calc_total_internal_bh_resistance(self, m_dot: float, temp: float) -> float:
@@ -148,19 +240,21 @@ class SingleUBorehole(UTube):
         :return: total internal thermal resistance, K/(W/m)
         """
         beta = self.update_beta(m_dot, temp)
+        return self._calc_total_internal_bh_resistance(beta)
 
-        term_1_num = (1 + self.theta_1**2) ** self.sigma
-        term_1_den = self.theta_3 * (1 - self.theta_1**2) ** self.sigma
-        final_term_1 = log(term_1_num / term_1_den)
+    def _calc_total_internal_bh_resistance(self, beta):
+        """
+        Total internal borehole resistance for a given Beta coefficient. Works on scalar or array Beta values.
+
+        :param beta: Beta coefficient, dimensionless
+        :return: total internal thermal resistance, K/(W/m)
+        """
 
-        term_2_num = self.theta_3**2 * (1 - self.theta_1**4 + 4 * self.sigma * self.theta_1**2) ** 2
-        term_2_den_pt_1 = (1 + beta) / (1 - beta) * (1 - self.theta_1**4) ** 2
-        term_2_den_pt_2 = self.theta_3**2 * (1 - self.theta_1**4) ** 2
-        term_2_den_pt_3 = 8 * self.sigma * self.theta_1**2 * self.theta_3**2 * (1 + self.theta_1**4)
-        term_2_den = term_2_den_pt_1 - term_2_den_pt_2 + term_2_den_pt_3
-        final_term_2 = term_2_num / term_2_den
+        term_2_den_pt_1 = (1 + beta) / (1 - beta) * self.ra_term_2_den_pt_1_factor
+        term_2_den = term_2_den_pt_1 - self.ra_term_2_den_pt_2 + self.ra_term_2_den_pt_3
+        final_term_2 = self.ra_term_2_num / term_2_den
 
-        resist_bh_total_internal = 1 / (pi * self.grout_conductivity) * (beta + final_term_1 - final_term_2)
+        resist_bh_total_internal = self.one_over_pi_kg * (beta + self.ra_term_1 - final_term_2)
 
         return resist_bh_total_internal
 
@@ -179,10 +273,9 @@ class SingleUBorehole(UTube):
         :return: grout resistance, K/(W-m)
         """
 
-        if self.pipe_resist is None:
-            raise ValueError("Pipe resistance has not been calculated yet.")
-
-        resist_bh_grout = self.calc_local_bh_resistance(m_dot, temp) - self.pipe_resist / 2.0
+        pipe_resist = self.calc_fluid_pipe_resist(m_dot, temp)
+        beta = self.two_pi_kg * pipe_resist
+        resist_bh_grout = self._calc_local_bh_resistance(beta) - pipe_resist / 2.0
         return resist_bh_grout
 
     def calc_effective_bh_resistance_uhf(self, m_dot: float, temp: float) -> float:
@@ -200,8 +293,9 @@ class SingleUBorehole(UTube):
         :return: effective thermal resistance, K/(W/m)
         """
 
-        r_a = self.calc_total_internal_bh_resistance(m_dot, temp)
-        r_b = self.calc_local_bh_resistance(m_dot, temp)
+        beta = self.two_pi_kg * self.calc_fluid_pipe_resist(m_dot, temp)
+        r_a = self._calc_total_internal_bh_resistance(beta)
+        r_b = self._calc_local_bh_resistance(beta)
 
         pt_1 = 1 / (3 * r_a)
         pt_2 = (self.bh_length / (self.fluid.cp(temp) * m_dot)) ** 2
@@ -223,10 +317,129 @@ class SingleUBorehole(UTube):
         :return: effective thermal resistance, K/(W/m)
         """
 
-        r_a = self.calc_total_internal_bh_resistance(m_dot, temp)  # R_a
-        r_b = self.calc_local_bh_resistance(m_dot, temp)  # R_b
+        beta = self.two_pi_kg * self.calc_fluid_pipe_resist(m_dot, temp)
+        r_a = self._calc_total_internal_bh_resistance(beta)  # R_a
+        r_b = self._calc_local_bh_resistance(beta)  # R_b
         r_v = self.bh_length / (m_dot * self.fluid.cp(temp))  # (K/(w/m)) thermal resistance factor
         n = r_v / (r_b * r_a) ** 0.5
         resist_bh_effective_ubt = r_b * n * coth(n)
 
         return resist_bh_effective_ubt
+
+    def calc_resistances(self, m_dot: float, temp: float) -> ResistanceBreakdown:
+        """
+        Calculates all resistance components with a single evaluation of the fluid properties
+        and pipe resistances.
+
+        :param m_dot: mass flow rate, kg/s
+        :param temp: temperature, Celsius
+
+        :return: resistance breakdown
+        """
+
+        re = self.mdot_to_re(m_dot, temp)
+        nu = self.calc_nusselt(re, temp)
+        conv_resist = 1 / (nu * pi * self.fluid.k(temp))
+        cond_resist = self.calc_cond_resist()
+        pipe_resist = conv_resist + cond_resist
+        beta = self.two_pi_kg * pipe_resist
+
+        r_a = self._calc_total_internal_bh_resistance(beta)
+        r_b = self._calc_local_bh_resistance(beta)
+        r_v = self.bh_length / (m_dot * self.fluid.cp(temp))
+
+        resist_bh_effective_uhf = r_b + 1 / (3 * r_a) * r_v**2
+        n = r_v / (r_b * r_a) ** 0.5
+        resist_bh_effective_ubwt = r_b * n * coth(n)
+
+        return ResistanceBreakdown(
+            reynolds=re,
+            nusselt=nu,
+            flow_regime=self.flow_regime(re),
+            conv_resist=conv_resist,
+            cond_resist=cond_resist,
+            fluid_pipe_resist=pipe_resist,
+            grout_resist=r_b - pipe_resist / 2.0,
+            local_bh_resist=r_b,
+            internal_resist=r_a,
+            effective_bh_resist_uhf=resist_bh_effective_uhf,
+            effective_bh_resist_ubwt=resist_bh_effective_ubwt,
+        )
+
+    def calc_resistances_array(self, m_dot, temp) -> dict[str, np.ndarray]:
+        """
+        Vectorized version of calc_resistances.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, Celsius. scalar or array_like
+
+        :return: dict mapping the ResistanceBreakdown field names to arrays. flow regimes are an object array
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        re = self.mdot_to_re_array(m_dot, temp)
+        nu = self.calc_nusselt_array(re, temp)
+        conv_resist = 1 / (nu * pi * eval_property_array(self.fluid.k, temp))
+        cond_resist = self.calc_cond_resist()
+        pipe_resist = conv_resist + cond_resist
+        beta = self.two_pi_kg * pipe_resist
+
+        r_a = self._calc_total_internal_bh_resistance(beta)
+        r_b = self._calc_local_bh_resistance(beta)
+        r_v = self.bh_length / (m_dot * eval_property_array(self.fluid.cp, temp))
+
+        n = r_v / (r_b * r_a) ** 0.5
+
+        return {
+            "reynolds": re,
+            "nusselt": nu,
+            "flow_regime": self.flow_regime_array(re),
+            "conv_resist": conv_resist,
+            "cond_resist": np.full_like(re, cond_resist),
+            "fluid_pipe_resist": pipe_resist,
+            "grout_resist": r_b - pipe_resist / 2.0,
+            "local_bh_resist": r_b,
+            "internal_resist": r_a,
+            "effective_bh_resist_uhf": r_b + 1 / (3 * r_a) * r_v**2,
+            "effective_bh_resist_ubwt": r_b * n * coth_array(n),
+        }
+
+    def calc_effective_bh_resistance_uhf_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Vectorized version of calc_effective_bh_resistance_uhf.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, Celsius. scalar or array_like
+
+        :return: effective thermal resistance, K/(W/m)
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        beta = self.two_pi_kg * self.calc_fluid_pipe_resist_array(m_dot, temp)
+        r_a = self._calc_total_internal_bh_resistance(beta)
+        r_b = self._calc_local_bh_resistance(beta)
+
+        pt_1 = 1 / (3 * r_a)
+        pt_2 = (self.bh_length / (eval_property_array(self.fluid.cp, temp) * m_dot)) ** 2
+        resist_short_circuiting = pt_1 * pt_2
+
+        return r_b + resist_short_circuiting
+
+    def calc_effective_bh_resistance_ubwt_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Vectorized version of calc_effective_bh_resistance_ubwt.
+
+        :param m_dot: mass flow rate, kg/s. scalar or array_like
+        :param temp: temperature, Celsius. scalar or array_like
+
+        :return: effective thermal resistance, K/(W/m)
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        beta = self.two_pi_kg * self.calc_fluid_pipe_resist_array(m_dot, temp)
+        r_a = self._calc_total_internal_bh_resistance(beta)
+        r_b = self._calc_local_bh_resistance(beta)
+        r_v = self.bh_length / (m_dot * eval_property_array(self.fluid.cp, temp))
+        n = r_v / (r_b * r_a) ** 0.5
+
+        return r_b * n * coth_array(n)
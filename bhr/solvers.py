@@ -0,0 +1,191 @@
+"""
+Inverse solvers for design questions: the mass flow rate that brings the effective borehole resistance down to a
+target, or that keeps every flow passage at a target Reynolds number.
+"""
+
+from math import exp, inf, isfinite, log, log1p, nan
+
+import numpy as np
+
+from bhr.coaxial_borehole import Coaxial
+from bhr.double_u_borehole import DoubleUTube
+from bhr.single_u_borehole import SingleUBorehole
+from bhr.utilities import broadcast_inputs
+
+
+def _illinois(func, a: float, b: float, f_a: float, f_b: float, xtol: float, max_iter: int) -> float:
+    """
+    Bracketed root finder, using the Illinois variant of regula falsi.
+
+    The function value kept at the end of the bracket that did not move is halved whenever the same end moves
+    twice in a row, which avoids the one-sided convergence of plain regula falsi.
+
+    :param func: function of one variable
+    :param a: lower end of the bracket, with func(a) > 0
+    :param b: upper end of the bracket, with func(b) <= 0
+    :param f_a: func(a)
+    :param f_b: func(b)
+    :param xtol: tolerance on the bracket width
+    :param max_iter: maximum number of iterations
+    :return: upper end of the final bracket, where func <= 0
+    """
+
+    side = 0
+    for _ in range(max_iter):
+        if b - a <= xtol or f_b == 0:
+            return b
+
+        c = (a * f_b - b * f_a) / (f_b - f_a)
+        if not a < c < b:
+            c = (a + b) / 2
+
+        f_c = func(c)
+        if f_c <= 0:
+            b, f_b = c, f_c
+            if side == -1:
+                f_a /= 2
+            side = -1
+        else:
+            a, f_a = c, f_c
+            if side == 1:
+                f_b /= 2
+            side = 1
+
+    if b - a <= xtol:
+        return b
+    raise RuntimeError(f"Root finder did not converge in {max_iter} iterations")
+
+
+def _solve_for_resist(evaluator, target: float, temp: float, m_lo: float, m_hi: float, rtol: float, max_iter: int):
+    """
+    Mass flow rate at which the effective borehole resistance first falls to the target.
+
+    :param evaluator: compiled borehole evaluator
+    :param target: target effective borehole resistance, K/(W/m)
+    :param temp: average fluid temperature, C
+    :param m_lo: lower limit of the mass flow rate, kg/s
+    :param m_hi: upper limit of the mass flow rate, kg/s
+    :param rtol: relative tolerance on the mass flow rate
+    :param max_iter: maximum number of iterations
+    :return: mass flow rate, kg/s, or nan if the target is not crossed within the limits
+    """
+
+    if not target > 0 or not isfinite(temp):
+        return nan
+
+    # the resistance falls roughly as a power of the flow, so the residual is close to linear in log-log terms.
+    # log1p keeps the sign of the residual exact at round-off
+    def residual(u):
+        return log1p((evaluator.calc_bh_resist(exp(u), temp) - target) / target)
+
+    # the correlations are smooth between the transition band limits, so the limits split the search into
+    # segments that each hold a continuous function
+    mu = evaluator.mu(temp)
+    limits = sorted(mu * x for band in evaluator.transition_bands() for x in band)
+    points = [log(m) for m in (m_lo, *(m for m in limits if m_lo < m < m_hi), m_hi)]
+
+    a = points[0]
+    f_a = residual(a)
+    if f_a <= 0:
+        return nan
+
+    for b in points[1:]:
+        f_b = residual(b)
+        if f_b <= 0:
+            return exp(_illinois(residual, a, b, f_a, f_b, log(1 + rtol), max_iter))
+        a, f_a = b, f_b
+
+    return nan
+
+
+def _passage_reynolds_array(model, m_dot, temp) -> np.ndarray:
+    """
+    Lowest Reynolds number of the borehole's flow passages.
+
+    :param model: SingleUBorehole, DoubleUTube, or Coaxial
+    :param m_dot: total borehole mass flow rate, kg/s. scalar or array_like
+    :param temp: average fluid temperature, C. scalar or array_like
+    :return: Reynolds number
+    """
+
+    if isinstance(model, SingleUBorehole):
+        return model.mdot_to_re_array(m_dot, temp)
+
+    if isinstance(model, DoubleUTube):
+        # each u-tube carries half the flow
+        return model.mdot_to_re_array(np.asarray(m_dot, dtype=float) / 2, temp)
+
+    if isinstance(model, Coaxial):
+        return np.minimum(model.inner_pipe.mdot_to_re_array(m_dot, temp), model.re_annulus_array(m_dot, temp))
+
+    raise NotImplementedError(f"{type(model).__name__} not supported")
+
+
+def mass_flow_for_resist(
+    borehole,
+    target,
+    temp,
+    m_dot_range: tuple[float, float] = (0.001, 10.0),
+    rtol: float = 1e-9,
+    max_iter: int = 200,
+):
+    """
+    Smallest mass flow rate at which the effective borehole resistance falls to the target.
+
+    The search range is split at the limits of the laminar-turbulent transition bands, which scale with flow as
+    the Reynolds number does, m_dot / mu. Within each segment the resistance is continuous, and the first
+    segment over which the resistance crosses the target is solved with the Illinois method, in terms of the
+    logarithms of the flow and resistance. Where the target falls within a jump at a band limit, the result is the
+    band limit.
+
+    :param borehole: initialized Borehole
+    :param target: target effective borehole resistance, K/(W/m). scalar or array_like
+    :param temp: average fluid temperature, C. scalar or array_like
+    :param m_dot_range: (lower, upper) limits of the total borehole mass flow rate, kg/s
+    :param rtol: relative tolerance on the mass flow rate
+    :param max_iter: maximum number of iterations per target
+    :return: mass flow rate, kg/s. the resistance at the returned flow is at or below the target. nan where the
+             resistance is already at or below the target at the lower limit, or still above it at the upper
+             limit. float for scalar inputs, otherwise an array
+    """
+
+    m_lo, m_hi = m_dot_range
+    if not 0 < m_lo < m_hi < inf:
+        raise ValueError(f"Invalid mass flow rate range {m_dot_range}. Must be 0 < lower < upper")
+    if rtol <= 0:
+        raise ValueError(f"Invalid tolerance {rtol}. Must be > 0")
+
+    evaluator = borehole.compile()
+    target_arr, temp_arr = broadcast_inputs(target, temp)
+    m_dot = np.array(
+        [
+            _solve_for_resist(evaluator, r, t, m_lo, m_hi, rtol, max_iter)
+            for r, t in zip(target_arr.ravel().tolist(), temp_arr.ravel().tolist())
+        ]
+    ).reshape(target_arr.shape)
+
+    if m_dot.ndim == 0:
+        return float(m_dot)
+    return m_dot
+
+
+def mass_flow_for_reynolds(model, re, temp):
+    """
+    Mass flow rate at which the lowest Reynolds number of the borehole's flow passages equals the target.
+
+    The Reynolds number of each passage is proportional to the mass flow rate, so the solution is exact, from
+    the Reynolds number at unit flow. The passages are the pipe of a single u-tube, each u-tube of a double
+    u-tube, which carries half the flow, and both the inner pipe and the annulus of a coaxial borehole.
+
+    :param model: SingleUBorehole, DoubleUTube, or Coaxial
+    :param re: target Reynolds number. scalar or array_like
+    :param temp: average fluid temperature, C. scalar or array_like
+    :return: mass flow rate, kg/s. float for scalar inputs, otherwise an array
+    """
+
+    re, temp = broadcast_inputs(re, temp)
+    m_dot = re / _passage_reynolds_array(model, 1.0, temp)
+
+    if m_dot.ndim == 0:
+        return float(m_dot)
+    return m_dot
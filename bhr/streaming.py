@@ -0,0 +1,410 @@
+import csv
+import json
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import fields
+from itertools import islice
+from pathlib import Path
+from typing import Any, TextIO
+
+import numpy as np
+
+from bhr.borehole import Borehole
+from bhr.config_hash import config_hash
+from bhr.disk_cache import DiskCache
+from bhr.resistance_breakdown import ResistanceBreakdown
+
+BREAKDOWN_COLUMNS = tuple(field.name for field in fields(ResistanceBreakdown))
+
+
+def _import_parquet():
+    try:
+        import pyarrow as pa  # noqa: PLC0415
+        import pyarrow.parquet as pq  # noqa: PLC0415
+    except ImportError as e:
+        raise ImportError(
+            'Reading and writing Parquet files requires pyarrow. Install with "pip install pyarrow"'
+        ) from e
+    return pa, pq
+
+
+def file_format(path: str | Path) -> str:
+    """
+    Determines the file format from the file extension.
+
+    :param path: file path
+    :return: "csv", "json", or "parquet"
+    """
+
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix == ".json":
+        return "json"
+    if suffix in (".parquet", ".pq"):
+        return "parquet"
+    raise ValueError(f'Unsupported file extension "{suffix}". Use ".csv", ".json", or ".parquet"')
+
+
+def read_chunks(path: str | Path, chunk_size: int = 100_000) -> Iterator[dict]:
+    """
+    Reads a CSV or Parquet file in chunks of rows, so memory use does not depend on the file length.
+
+    CSV values are returned as strings. Parquet columns are returned as numpy arrays. JSON files, holding a list of
+    records, are also accepted, but are loaded whole before being split into chunks.
+
+    :param path: CSV, JSON, or Parquet file path
+    :param chunk_size: maximum number of rows per chunk
+    :return: iterator of dicts mapping column names to column values
+    """
+
+    if chunk_size < 1:
+        raise ValueError(f"Invalid chunk size {chunk_size}. Must be >= 1")
+
+    fmt = file_format(path)
+    if fmt == "csv":
+        with open(path, newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            while rows := list(islice(reader, chunk_size)):
+                yield {name: list(values) for name, values in zip(header, zip(*rows))}
+
+    elif fmt == "json":
+        with open(path) as f:
+            records = json.load(f)
+        if not records:
+            return
+        columns = list(records[0])
+        for i in range(0, len(records), chunk_size):
+            rows = records[i : i + chunk_size]
+            yield {name: [row[name] for row in rows] for name in columns}
+
+    else:
+        _, pq = _import_parquet()
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield {
+                name: column.to_numpy(zero_copy_only=False) for name, column in zip(batch.schema.names, batch.columns)
+            }
+
+
+def _read_columns(path: str | Path) -> list[str]:
+    """
+    :param path: CSV, JSON, or Parquet file path
+    :return: column names of the file. empty for a file without a header or records
+    """
+
+    fmt = file_format(path)
+    if fmt == "csv":
+        with open(path, newline="") as f:
+            return next(csv.reader(f), [])
+    if fmt == "json":
+        with open(path) as f:
+            records = json.load(f)
+        return list(records[0]) if records else []
+    _, pq = _import_parquet()
+    return list(pq.ParquetFile(path).schema_arrow.names)
+
+
+class ChunkWriter:
+    """
+    Writes chunks of columns to a CSV, JSON, or Parquet file as they are produced. JSON files hold a list of records.
+
+    The columns of the first chunk set the columns of the file. Use as a context manager, or call close
+    when done.
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        :param path: CSV, JSON, or Parquet file path
+        """
+
+        self.path = Path(path)
+        self.format = file_format(path)
+
+        self._file: TextIO | None = None
+        # csv writer, or pyarrow ParquetWriter
+        self._writer: Any = None
+        self._columns: list[str] | None = None
+        self.rows_written = 0
+
+    def write(self, chunk: dict) -> None:
+        """
+        Writes a chunk of rows.
+
+        :param chunk: dict mapping column names to column values
+        """
+
+        if self._columns is None:
+            self._columns = list(chunk)
+        elif list(chunk) != self._columns:
+            raise ValueError(f"Chunk columns {list(chunk)} do not match the file columns {self._columns}")
+
+        if self.format == "csv":
+            if self._writer is None:
+                self._file = open(self.path, "w", newline="")  # noqa: SIM115
+                self._writer = csv.writer(self._file)
+                self._writer.writerow(self._columns)
+            columns = [np.asarray(values).tolist() for values in chunk.values()]
+            self._writer.writerows(zip(*columns))
+        elif self.format == "json":
+            if self._file is None:
+                self._file = open(self.path, "w")  # noqa: SIM115
+                self._file.write("[")
+            columns = [np.asarray(values).tolist() for values in chunk.values()]
+            for row in zip(*columns):
+                self._file.write(",\n" if self.rows_written else "\n")
+                self._file.write(json.dumps(dict(zip(self._columns, row))))
+                self.rows_written += 1
+            return
+        else:
+            pa, pq = _import_parquet()
+            table = pa.table({name: np.asarray(values) for name, values in chunk.items()})
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+
+        self.rows_written += len(next(iter(chunk.values()), []))
+
+    def close(self) -> None:
+        if self.format == "json" and self._file is not None:
+            self._file.write("\n]\n")
+        if self._file is not None:
+            self._file.close()
+        elif self._writer is not None:
+            self._writer.close()
+        self._file = None
+        self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def evaluate_chunk(
+    chunk: dict,
+    boreholes: Borehole | dict[str, Borehole],
+    m_dot_column: str,
+    temp_column: str,
+    borehole_id_column: str | None = None,
+    breakdown: bool = False,
+    cache: DiskCache | None = None,
+    config_hashes: str | dict[str, str] | None = None,
+) -> dict:
+    """
+    Evaluates the effective borehole resistance for each row of a chunk.
+
+    :param chunk: dict mapping column names to column values
+    :param boreholes: Borehole for all rows, or dict mapping borehole ids to Boreholes when a borehole id column
+                      is given. ids are matched as strings.
+    :param m_dot_column: name of the total borehole mass flow rate column, in kg/s
+    :param temp_column: name of the average fluid temperature column, in Celsius
+    :param borehole_id_column: name of the borehole id column, or None
+    :param breakdown: also add the resistance breakdown columns. see ResistanceBreakdown
+    :param cache: persistent cache of the "bh_resist" results, or None
+    :param config_hashes: config_hash of the inputs of the boreholes, with the same structure as boreholes.
+                          required with a cache
+    :return: input columns with a "bh_resist" column and, optionally, the breakdown columns added
+    """
+
+    if cache is not None and config_hashes is None:
+        raise ValueError("config_hashes are required with a cache")
+
+    m_dot = np.asarray(chunk[m_dot_column], dtype=float)
+    temp = np.asarray(chunk[temp_column], dtype=float)
+
+    groups: list[tuple[Borehole, str | None, slice | np.ndarray]] = []
+    if borehole_id_column is None:
+        if isinstance(boreholes, dict) or isinstance(config_hashes, dict):
+            raise ValueError("borehole_id_column is required when boreholes are given per borehole id")
+        groups.append((boreholes, config_hashes, slice(None)))
+    else:
+        if not isinstance(boreholes, dict) or isinstance(config_hashes, str):
+            raise ValueError("boreholes must map borehole ids to Boreholes when borehole_id_column is given")
+        # sort the rows by id once, and split them where the id changes
+        ids = np.asarray(chunk[borehole_id_column]).astype(str)
+        order = np.argsort(ids, kind="stable")
+        sorted_ids = ids[order]
+        starts = np.flatnonzero(sorted_ids[1:] != sorted_ids[:-1]) + 1
+        unique_ids = sorted_ids[np.concatenate(([0], starts))] if ids.size else sorted_ids
+        for bh_id, id_rows in zip(unique_ids.tolist(), np.split(order, starts)):
+            if bh_id not in boreholes:
+                raise LookupError(f'borehole id "{bh_id}" not found in configs')
+            groups.append((boreholes[bh_id], None if config_hashes is None else config_hashes[bh_id], id_rows))
+
+    resist = np.empty_like(m_dot)
+    breakdown_columns: dict[str, Any] = {}
+    if breakdown:
+        breakdown_columns = {
+            name: np.empty(m_dot.size, dtype=object if name == "flow_regime" else float) for name in BREAKDOWN_COLUMNS
+        }
+    for bh, key, rows in groups:
+        if cache is not None and key is not None:
+            resist[rows] = cache.get_or_compute(key, m_dot[rows], temp[rows], bh.calc_bh_resist_array)
+        else:
+            resist[rows] = bh.calc_bh_resist_array(m_dot[rows], temp[rows])
+        if breakdown:
+            for name, values in bh.calc_resistances_array(m_dot[rows], temp[rows]).items():
+                breakdown_columns[name][rows] = values
+
+    if breakdown:
+        breakdown_columns["flow_regime"] = [regime.name for regime in breakdown_columns["flow_regime"].tolist()]
+
+    return {**chunk, "bh_resist": resist, **breakdown_columns}
+
+
+def build_boreholes(configs: dict) -> Borehole | dict[str, Borehole]:
+    """
+    Builds boreholes from init_from_dict inputs.
+
+    :param configs: a single init_from_dict input, or a dict mapping borehole ids to init_from_dict inputs
+    :return: Borehole, or dict mapping borehole ids, as strings, to Boreholes
+    """
+
+    if "borehole_type" in configs:
+        bh = Borehole()
+        bh.init_from_dict(configs)
+        return bh
+
+    boreholes = {}
+    for bh_id, config in configs.items():
+        bh = Borehole()
+        bh.init_from_dict(config)
+        boreholes[str(bh_id)] = bh
+    return boreholes
+
+
+def _config_hashes(configs: dict) -> str | dict[str, str]:
+    """
+    :param configs: a single init_from_dict input, or a dict mapping borehole ids to init_from_dict inputs
+    :return: config_hash of the input, or dict mapping borehole ids, as strings, to config_hashes
+    """
+
+    if "borehole_type" in configs:
+        return config_hash(configs)
+    return {str(bh_id): config_hash(config) for bh_id, config in configs.items()}
+
+
+def _check_configs(boreholes: Borehole | dict[str, Borehole], borehole_id_column: str | None) -> None:
+    if borehole_id_column is None and isinstance(boreholes, dict):
+        raise ValueError("borehole_id_column is required when configs are given per borehole id")
+    if borehole_id_column is not None and not isinstance(boreholes, dict):
+        raise ValueError("configs must map borehole ids to init_from_dict inputs when borehole_id_column is given")
+
+
+# boreholes of a worker process, see evaluate_chunks
+_worker_boreholes: Borehole | dict[str, Borehole] | None = None
+
+
+def _init_worker(configs: dict) -> None:
+    global _worker_boreholes  # noqa: PLW0603
+    _worker_boreholes = build_boreholes(configs)
+
+
+def _evaluate_chunk_in_worker(chunk: dict, *args) -> dict:
+    if _worker_boreholes is None:
+        raise TypeError("Worker boreholes not initialized")
+    return evaluate_chunk(chunk, _worker_boreholes, *args)
+
+
+def evaluate_chunks(
+    chunks: Iterable[dict],
+    configs: dict,
+    m_dot_column: str = "m_dot",
+    temp_column: str = "temp",
+    borehole_id_column: str | None = None,
+    breakdown: bool = False,
+    workers: int = 1,
+    cache: DiskCache | None = None,
+) -> Iterator[dict]:
+    """
+    Evaluates a stream of chunks, see evaluate_chunk, yielding the results in input order.
+
+    With more than one worker, chunks are evaluated across a process pool with at most two chunks per worker in
+    flight, so memory use still does not depend on the number of chunks.
+
+    :param chunks: iterable of dicts mapping column names to column values
+    :param configs: a single init_from_dict input, or a dict mapping borehole ids to init_from_dict inputs when a
+                    borehole id column is given
+    :param m_dot_column: name of the total borehole mass flow rate column, in kg/s
+    :param temp_column: name of the average fluid temperature column, in Celsius
+    :param borehole_id_column: name of the borehole id column, or None
+    :param breakdown: also add the resistance breakdown columns. see ResistanceBreakdown
+    :param workers: number of worker processes. 1 evaluates in this process
+    :param cache: persistent cache of the "bh_resist" results, or None. each worker process opens its own
+                  connection
+    :return: iterator of evaluated chunks
+    """
+
+    if workers < 1:
+        raise ValueError(f"Invalid number of workers {workers}. Must be >= 1")
+
+    boreholes = build_boreholes(configs)
+    _check_configs(boreholes, borehole_id_column)
+    config_hashes = None if cache is None else _config_hashes(configs)
+    args = (m_dot_column, temp_column, borehole_id_column, breakdown, cache, config_hashes)
+
+    if workers == 1:
+        for chunk in chunks:
+            yield evaluate_chunk(chunk, boreholes, *args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(configs,)) as executor:
+        pending: deque[Future[dict]] = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_evaluate_chunk_in_worker, chunk, *args))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def process_file(
+    input_path: str | Path,
+    output_path: str | Path,
+    configs: dict,
+    m_dot_column: str = "m_dot",
+    temp_column: str = "temp",
+    borehole_id_column: str | None = None,
+    chunk_size: int = 100_000,
+    breakdown: bool = False,
+    workers: int = 1,
+    cache: DiskCache | None = None,
+) -> int:
+    """
+    Streams a CSV or Parquet file of mass flow rates and temperatures through the resistance calculation, chunk by
+    chunk, and writes the input columns plus the results to a CSV, JSON, or Parquet file. Memory use depends on the
+    chunk size, not the file length. An input without rows gives an output with only the header.
+
+    :param input_path: CSV or Parquet input file path
+    :param output_path: CSV, JSON, or Parquet output file path
+    :param configs: a single init_from_dict input, or a dict mapping borehole ids to init_from_dict inputs when a
+                    borehole id column is given
+    :param m_dot_column: name of the total borehole mass flow rate column, in kg/s
+    :param temp_column: name of the average fluid temperature column, in Celsius
+    :param borehole_id_column: name of the borehole id column, or None
+    :param chunk_size: maximum number of rows per chunk
+    :param breakdown: also write the resistance breakdown columns. see ResistanceBreakdown
+    :param workers: number of worker processes. 1 evaluates in this process
+    :param cache: persistent cache of the "bh_resist" results, or None
+    :return: number of rows written
+    """
+
+    chunks = read_chunks(input_path, chunk_size)
+    with ChunkWriter(output_path) as writer:
+        for chunk in evaluate_chunks(
+            chunks, configs, m_dot_column, temp_column, borehole_id_column, breakdown, workers, cache
+        ):
+            writer.write(chunk)
+
+        # an input without rows still gets an output file, holding only the header
+        if writer.rows_written == 0:
+            columns = [*_read_columns(input_path), "bh_resist", *(BREAKDOWN_COLUMNS if breakdown else ())]
+            writer.write({name: [] for name in columns})
+
+    return writer.rows_written
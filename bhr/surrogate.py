@@ -0,0 +1,262 @@
+import logging
+from bisect import bisect_right
+from math import log
+
+import numpy as np
+
+from bhr.fluid import _CORRELATION_BREAKPOINTS, eval_property_array
+from bhr.utilities import broadcast_inputs
+
+# offset used to evaluate the one-sided limits at a discontinuity
+_LIMIT_OFFSET = 1e-9
+
+
+def _limit_points(nodes: np.ndarray) -> np.ndarray:
+    """
+    Points at which to evaluate the function for each node. Discontinuities are stored as duplicated nodes,
+    the first of which holds the limit from below and the second the limit from above.
+
+    :param nodes: sorted node coordinates
+    :return: evaluation coordinates
+    """
+
+    points = nodes.copy()
+    duplicated = np.flatnonzero(np.diff(nodes) == 0)
+    points[duplicated] -= _LIMIT_OFFSET
+    points[duplicated + 1] += _LIMIT_OFFSET
+    return points
+
+
+def _split(nodes: np.ndarray, intervals: np.ndarray) -> np.ndarray:
+    """
+    Bisects the selected intervals.
+
+    :param nodes: sorted node coordinates
+    :param intervals: boolean mask of the intervals to bisect
+    :return: refined node coordinates
+    """
+
+    idx = np.flatnonzero(intervals)
+    return np.insert(nodes, idx + 1, (nodes[idx] + nodes[idx + 1]) / 2)
+
+
+def _initial_nodes(lo: float, hi: float, num: int, discontinuities: list[float], bands: list[tuple[float, float]]):
+    """
+    Initial node coordinates: evenly spaced nodes, duplicated nodes at the discontinuities, and extra
+    nodes inside each band.
+
+    :param lo: lower limit
+    :param hi: upper limit
+    :param num: number of evenly spaced nodes
+    :param discontinuities: coordinates of the discontinuities
+    :param bands: (lower, upper) limits of the regions to resolve with extra nodes
+    :return: sorted node coordinates
+    """
+
+    nodes = [*np.linspace(lo, hi, num).tolist()]
+    for band_lo, band_hi in bands:
+        band_nodes = np.linspace(max(band_lo, lo), min(band_hi, hi), 9).tolist()
+        nodes.extend(x for x in band_nodes if lo < x < hi)
+
+    nodes = sorted(set(nodes) - set(discontinuities))
+    for d in discontinuities:
+        if lo < d < hi:
+            nodes.extend([d, d])
+    return np.array(sorted(nodes))
+
+
+class BoreholeSurrogate:
+    """
+    Interpolation table of the effective borehole resistance over a mass flow rate and temperature envelope.
+
+    The table is bilinear in the logarithm of the mass flow rate over viscosity, which is proportional to the
+    Reynolds number, and in temperature. The convection correlations are discontinuous at the limits of the
+    Reynolds transition bands, so the table holds nodes on both sides of each limit, and is seeded with extra
+    nodes inside each band. Intervals are then bisected until the relative error at the midpoints of all cell
+    edges and cell centers is below the tolerance. The largest error observed in the final check is stored
+    in ``max_error``.
+
+    Queries outside the envelope are passed through to the full calculation when ``out_of_range="fallback"``,
+    or raise a ValueError when ``out_of_range="raise"``.
+    """
+
+    def __init__(
+        self,
+        borehole,
+        m_dot_range: tuple[float, float],
+        temp_range: tuple[float, float],
+        rtol: float = 1e-4,
+        out_of_range: str = "fallback",
+        max_nodes: int = 1_000_000,
+    ):
+        """
+        :param borehole: initialized Borehole
+        :param m_dot_range: (lower, upper) limits of the total borehole mass flow rate, in kg/s
+        :param temp_range: (lower, upper) limits of the average fluid temperature, in C
+        :param rtol: relative error tolerance
+        :param out_of_range: behavior for queries outside the envelope. "fallback" or "raise"
+        :param max_nodes: maximum number of table entries. refinement stops with a warning when exceeded
+        """
+
+        if out_of_range not in ("fallback", "raise"):
+            raise ValueError(f'Unsupported out_of_range option "{out_of_range}"')
+
+        m_lo, m_hi = m_dot_range
+        t_lo, t_hi = temp_range
+        if not 0 < m_lo < m_hi:
+            raise ValueError(f"Invalid mass flow rate range {m_dot_range}. Must be 0 < lower < upper")
+        if not t_lo < t_hi:
+            raise ValueError(f"Invalid temperature range {temp_range}. Must be lower < upper")
+        if rtol <= 0:
+            raise ValueError(f"Invalid tolerance {rtol}. Must be > 0")
+
+        self._evaluator = borehole.compile()
+        self._mu = self._evaluator.mu
+        self.m_dot_range = (m_lo, m_hi)
+        self.temp_range = (t_lo, t_hi)
+        self.rtol = rtol
+        self.out_of_range = out_of_range
+
+        def exact(u, temp):
+            m_dot = np.exp(u) * eval_property_array(self._mu, temp)
+            return borehole.calc_bh_resist_array(m_dot, temp)
+
+        # the table covers m_dot / mu over the whole envelope, padded so round-off never leaves the table
+        mu = eval_property_array(self._mu, np.linspace(t_lo, t_hi, 101))
+        u_lo = log(m_lo / mu.max()) - 1e-6
+        u_hi = log(m_hi / mu.min()) + 1e-6
+
+        bands = [(log(lo), log(hi)) for lo, hi in self._evaluator.transition_bands()]
+        u_discontinuities = [x for band in bands for x in band]
+        fluid_name = getattr(getattr(self._mu, "__self__", None), "fluid_name", "")
+        t_discontinuities = list(_CORRELATION_BREAKPOINTS.get(fluid_name, ()))
+
+        u = _initial_nodes(u_lo, u_hi, 17, u_discontinuities, bands)
+        t = _initial_nodes(t_lo, t_hi, 5, t_discontinuities, [])
+
+        while True:
+            u_eval = _limit_points(u)
+            t_eval = _limit_points(t)
+            values = exact(u_eval[:, None], t_eval[None, :])
+
+            # compare against the exact values halfway along each cell edge and at each cell center
+            u_width = np.diff(u) > 0
+            t_width = np.diff(t) > 0
+            u_mid = (u[:-1] + u[1:])[u_width] / 2
+            t_mid = (t[:-1] + t[1:])[t_width] / 2
+
+            v_u_mid = ((values[:-1, :] + values[1:, :]) / 2)[u_width, :]
+            err_u = np.abs(v_u_mid / exact(u_mid[:, None], t_eval[None, :]) - 1)
+
+            v_t_mid = ((values[:, :-1] + values[:, 1:]) / 2)[:, t_width]
+            err_t = np.abs(v_t_mid / exact(u_eval[:, None], t_mid[None, :]) - 1)
+
+            v_center = (v_u_mid[:, :-1] + v_u_mid[:, 1:])[:, t_width] / 2
+            err_center = np.abs(v_center / exact(u_mid[:, None], t_mid[None, :]) - 1)
+
+            self.max_error = float(max(err_u.max(), err_t.max(), err_center.max()))
+
+            split_u = err_u.max(axis=1) > rtol
+            split_t = err_t.max(axis=0) > rtol
+            unresolved = (err_center > rtol) & ~split_u[:, None] & ~split_t[None, :]
+            split_u |= unresolved.any(axis=1)
+            split_t |= unresolved.any(axis=0)
+
+            if not split_u.any() and not split_t.any():
+                break
+
+            num_u = u.size + np.count_nonzero(split_u)
+            num_t = t.size + np.count_nonzero(split_t)
+            if num_u * num_t > max_nodes:
+                logging.warning(
+                    f"Surrogate refinement stopped at {u.size * t.size} nodes. "
+                    f"Max relative error {self.max_error:0.3g} exceeds the tolerance {rtol:0.3g}"
+                )
+                break
+
+            u_split = np.zeros(u.size - 1, dtype=bool)
+            u_split[u_width] = split_u
+            t_split = np.zeros(t.size - 1, dtype=bool)
+            t_split[t_width] = split_t
+            u = _split(u, u_split)
+            t = _split(t, t_split)
+
+        self.shape = values.shape
+        self._u = u
+        self._t = t
+        self._values = values
+        self._u_list = u.tolist()
+        self._t_list = t.tolist()
+        self._values_list = values.tolist()
+
+    def _outside(self, m_dot, temp):
+        m_lo, m_hi = self.m_dot_range
+        t_lo, t_hi = self.temp_range
+        return (m_dot < m_lo) | (m_dot > m_hi) | (temp < t_lo) | (temp > t_hi)
+
+    def calc_bh_resist(self, mass_flow_rate: float, temperature: float) -> float:
+        """
+        Computes the effective borehole thermal resistance.
+
+        :param mass_flow_rate: total borehole mass flow rate, in kg/s
+        :param temperature: average fluid temperature, in Celsius
+        :return: effective borehole resistance, in K/W-m
+        """
+
+        if self._outside(mass_flow_rate, temperature):
+            if self.out_of_range == "raise":
+                raise ValueError(
+                    f"Mass flow rate {mass_flow_rate} kg/s and temperature {temperature} C outside of the "
+                    f"surrogate range {self.m_dot_range} kg/s, {self.temp_range} C"
+                )
+            return self._evaluator.calc_bh_resist(mass_flow_rate, temperature)
+
+        u = log(mass_flow_rate / self._mu(temperature))
+        u_nodes = self._u_list
+        t_nodes = self._t_list
+        i = min(max(bisect_right(u_nodes, u) - 1, 0), len(u_nodes) - 2)
+        j = min(max(bisect_right(t_nodes, temperature) - 1, 0), len(t_nodes) - 2)
+
+        w_u = (u - u_nodes[i]) / (u_nodes[i + 1] - u_nodes[i])
+        w_t = (temperature - t_nodes[j]) / (t_nodes[j + 1] - t_nodes[j])
+        row_0 = self._values_list[i]
+        row_1 = self._values_list[i + 1]
+        v_0 = row_0[j] + w_t * (row_0[j + 1] - row_0[j])
+        v_1 = row_1[j] + w_t * (row_1[j + 1] - row_1[j])
+        return v_0 + w_u * (v_1 - v_0)
+
+    def calc_bh_resist_array(self, m_dot, temp) -> np.ndarray:
+        """
+        Computes the effective borehole thermal resistance for a series of flow rates and temperatures.
+
+        :param m_dot: total borehole mass flow rate, in kg/s. scalar or array_like
+        :param temp: average fluid temperature, in Celsius. scalar or array_like
+        :return: effective borehole resistance, in K/W-m
+        """
+
+        m_dot, temp = broadcast_inputs(m_dot, temp)
+        outside = self._outside(m_dot, temp)
+        if outside.any() and self.out_of_range == "raise":
+            raise ValueError(
+                f"Mass flow rates or temperatures outside of the surrogate range "
+                f"{self.m_dot_range} kg/s, {self.temp_range} C"
+            )
+
+        inside = ~outside
+        m_in = m_dot[inside]
+        t_in = temp[inside]
+        u = np.log(m_in / eval_property_array(self._mu, t_in))
+        i = np.clip(np.searchsorted(self._u, u, side="right") - 1, 0, self._u.size - 2)
+        j = np.clip(np.searchsorted(self._t, t_in, side="right") - 1, 0, self._t.size - 2)
+
+        w_u = (u - self._u[i]) / (self._u[i + 1] - self._u[i])
+        w_t = (t_in - self._t[j]) / (self._t[j + 1] - self._t[j])
+        v_0 = self._values[i, j] + w_t * (self._values[i, j + 1] - self._values[i, j])
+        v_1 = self._values[i + 1, j] + w_t * (self._values[i + 1, j + 1] - self._values[i + 1, j])
+
+        resist = np.empty_like(m_dot)
+        resist[inside] = v_0 + w_u * (v_1 - v_0)
+        resist[outside] = [
+            self._evaluator.calc_bh_resist(m, t) for m, t in zip(m_dot[outside].tolist(), temp[outside].tolist())
+        ]
+        return resist
@@ -0,0 +1,62 @@
+import unittest
+
+import numpy as np
+
+from bhr.batch import evaluate
+from bhr.borehole import Borehole
+
+BASE = {
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 200,
+    "borehole_diameter": 0.115,
+    "borehole_type": "single_u_tube",
+    "single_u_tube": {
+        "pipe_outer_diameter": 0.032,
+        "pipe_dimension_ratio": 11,
+        "pipe_conductivity": 0.4,
+        "shank_space": 0.02,
+    },
+}
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.configs = [{**BASE, "length": length} for length in range(50, 250, 10)]
+        self.configs[3] = {**BASE, "borehole_type": "triple_u_tube"}
+        self.configs[7] = {key: val for key, val in BASE.items() if key != "length"}
+
+    def check_results(self, results, m_dot, temp):
+        self.assertEqual(len(results), len(self.configs))
+        for i, (config, result) in enumerate(zip(self.configs, results)):
+            if i in (3, 7):
+                self.assertIsNone(result.resist)
+                self.assertIsNotNone(result.error)
+                continue
+
+            bh = Borehole()
+            bh.init_from_dict(config)
+            self.assertIsNone(result.error)
+            np.testing.assert_allclose(result.resist, bh.calc_bh_resist_array(m_dot, temp), rtol=1e-12)
+
+    def test_evaluate_serial(self):
+        results = evaluate(self.configs, 0.5, 20, workers=1)
+        self.check_results(results, 0.5, 20)
+        self.assertIsInstance(results[0].resist, float)
+        self.assertIn("LookupError", results[3].error)
+        self.assertIn("KeyError", results[7].error)
+
+    def test_evaluate_pool(self):
+        m_dot = np.linspace(0.1, 1.0, 10)
+        temp = np.linspace(0, 30, 10)
+        results = evaluate(self.configs, m_dot, temp, workers=2, chunk_size=3)
+        self.check_results(results, m_dot, temp)
+
+    def test_evaluate_invalid(self):
+        self.assertEqual(evaluate([], 0.5, 20), [])
+        with self.assertRaises(ValueError):
+            evaluate(self.configs, 0.5, 20, workers=0)
+        with self.assertRaises(ValueError):
+            evaluate(self.configs, 0.5, 20, chunk_size=0)
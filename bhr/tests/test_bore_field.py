@@ -0,0 +1,85 @@
+import unittest
+
+import numpy as np
+
+from bhr.bore_field import BoreField
+from bhr.borehole import Borehole
+
+SINGLE_U = {
+    "borehole_type": "single_u_tube",
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 200,
+    "borehole_diameter": 0.14,
+    "single_u_tube": {
+        "pipe_outer_diameter": 0.032,
+        "pipe_dimension_ratio": 11,
+        "pipe_conductivity": 0.4,
+        "shank_space": 0.032,
+    },
+}
+
+COAXIAL = {
+    "borehole_type": "coaxial",
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 100,
+    "borehole_diameter": 0.14,
+    "coaxial": {
+        "outer_pipe_outer_diameter": 0.1,
+        "outer_pipe_dimension_ratio": 11,
+        "outer_pipe_conductivity": 0.4,
+        "inner_pipe_outer_diameter": 0.05,
+        "inner_pipe_dimension_ratio": 11,
+        "inner_pipe_conductivity": 0.4,
+    },
+}
+
+
+class TestBoreField(unittest.TestCase):
+    def test_calc_bh_resist(self):
+        # same definition with the keys in a different order
+        reordered = dict(reversed(list(SINGLE_U.items())))
+        configs = [SINGLE_U, COAXIAL, reordered, SINGLE_U, COAXIAL, {**SINGLE_U, "grout_conductivity": 2}]
+
+        field = BoreField(configs)
+        self.assertEqual(field.num_boreholes, 6)
+        self.assertEqual(field.num_groups, 3)
+        self.assertIs(field.boreholes[field.group_index[0]], field.boreholes[field.group_index[2]])
+
+        field_m_dot = np.linspace(1, 6, 24)
+        temp = np.linspace(0, 30, 24)
+        result = field.calc_bh_resist(field_m_dot, temp)
+        self.assertEqual(result.per_borehole.shape, (6, 24))
+        self.assertEqual(result.field_average.shape, (24,))
+
+        # the field flow is split evenly across the boreholes
+        for config, resist in zip(configs, result.per_borehole):
+            bh = Borehole()
+            bh.init_from_dict(config)
+            np.testing.assert_allclose(resist, bh.calc_bh_resist_array(field_m_dot / 6, temp), rtol=1e-14)
+
+        lengths = np.array([config["length"] for config in configs], dtype=float)[:, None]
+        expected = lengths.sum() / (lengths / result.per_borehole).sum(axis=0)
+        np.testing.assert_allclose(result.field_average, expected, rtol=1e-14)
+
+        # a field of identical boreholes has the resistance of one of them
+        result = BoreField([COAXIAL] * 10).calc_bh_resist(3, 20)
+        self.assertEqual(result.per_borehole.shape, (10,))
+        bh = Borehole()
+        bh.init_from_dict(COAXIAL)
+        self.assertAlmostEqual(float(result.field_average), bh.calc_bh_resist(0.3, 20), delta=1e-14)
+
+    def test_ids(self):
+        field = BoreField({"a": SINGLE_U, "b": SINGLE_U, 3: COAXIAL})
+        self.assertEqual(field.ids, ["a", "b", "3"])
+        self.assertEqual(field.num_groups, 2)
+
+        self.assertEqual(BoreField([SINGLE_U, COAXIAL]).ids, [0, 1])
+
+        with self.assertRaises(ValueError):
+            BoreField([])
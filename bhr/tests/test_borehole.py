@@ -1,6 +1,13 @@
+import dataclasses
+import pickle
+import sys
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 
 from bhr.borehole import Borehole
+from bhr.enums import FlowRegime
 
 
 class TestBorehole(unittest.TestCase):
@@ -65,6 +72,7 @@ class TestBorehole(unittest.TestCase):
 
         bh = Borehole()
         bh.init_from_dict(inputs)
+        self.assertEqual(bh.length, 100)
 
         # only pass flow rate, so pipe resistance should be computed in the process of this call
 
@@ -152,6 +160,7 @@ class TestBorehole(unittest.TestCase):
 
         bh = Borehole()
         bh.init_from_dict(inputs)
+        self.assertEqual(bh.length, 200)
 
         # only pass flow rate, so pipe resistance should be computed in the process of this call
         self.assertAlmostEqual(bh.calc_bh_resist(temperature=20, mass_flow_rate=0.4154), 0.1090, delta=1e-4)
@@ -228,9 +237,540 @@ class TestBorehole(unittest.TestCase):
 
         bh = Borehole()
         bh.init_from_dict(inputs)
+        self.assertEqual(bh.length, 200)
 
         # only pass flow rate, so pipe resistance should be computed in the process of this call
         self.assertAlmostEqual(bh.calc_bh_resist(mass_flow_rate=0.5, temperature=20), 0.18128, delta=1e-4)
         self.assertAlmostEqual(bh.calc_pipe_cond_resist(), 0.082102, delta=1e-4)
         self.assertAlmostEqual(bh.calc_fluid_resist(temperature=20, mass_flow_rate=0.5), 0.00872, delta=1e-4)
         self.assertAlmostEqual(bh.calc_fluid_pipe_resist(temperature=20, mass_flow_rate=0.5), 0.09082, delta=1e-4)
+
+    def test_calc_bh_resist_array(self):
+        base = {
+            "fluid_type": "PROPYLENEGLYCOL",
+            "fluid_concentration": 0.2,
+            "grout_conductivity": 1.5,
+            "soil_conductivity": 3,
+            "length": 200,
+            "borehole_diameter": 0.115,
+        }
+        configs = [
+            {
+                "borehole_type": "single_u_tube",
+                "single_u_tube": {
+                    "pipe_outer_diameter": 0.032,
+                    "pipe_dimension_ratio": 11,
+                    "pipe_conductivity": 0.4,
+                    "shank_space": 0.02,
+                },
+            },
+            {
+                "borehole_type": "double_u_tube",
+                "double_u_tube": {
+                    "pipe_outer_diameter": 0.032,
+                    "pipe_dimension_ratio": 18.9,
+                    "pipe_conductivity": 0.389,
+                    "shank_space": 0.02263,
+                    "pipe_inlet_arrangement": "DIAGONAL",
+                },
+            },
+            {
+                "borehole_type": "coaxial",
+                "coaxial": {
+                    "outer_pipe_outer_diameter": 0.064,
+                    "outer_pipe_dimension_ratio": 11,
+                    "outer_pipe_conductivity": 0.389,
+                    "inner_pipe_outer_diameter": 0.032,
+                    "inner_pipe_dimension_ratio": 11,
+                    "inner_pipe_conductivity": 0.389,
+                },
+            },
+        ]
+
+        # spans laminar, transitional, and turbulent flow
+        m_dot = np.linspace(0.05, 2.0, 40)
+        temp = np.linspace(0, 40, 40)
+
+        for config in configs:
+            for bc in ("UNIFORM_HEAT_FLUX", "UNIFORM_BOREHOLE_WALL_TEMP"):
+                bh = Borehole()
+                bh.init_from_dict({**base, **config, "boundary_condition": bc})
+
+                expected = [bh.calc_bh_resist(m, t) for m, t in zip(m_dot, temp)]
+                np.testing.assert_allclose(bh.calc_bh_resist_array(m_dot, temp), expected, rtol=1e-12)
+
+                expected = [bh.calc_fluid_resist(m, t) for m, t in zip(m_dot, temp)]
+                np.testing.assert_allclose(bh.calc_fluid_resist_array(m_dot, temp), expected, rtol=1e-12)
+
+                expected = [bh.calc_fluid_pipe_resist(m, t) for m, t in zip(m_dot, temp)]
+                np.testing.assert_allclose(bh.calc_fluid_pipe_resist_array(m_dot, temp), expected, rtol=1e-12)
+
+    def test_calc_bh_resist_array_not_initialized(self):
+        bh = Borehole()
+        with self.assertRaises(TypeError):
+            bh.calc_bh_resist_array([0.5], [20])
+
+    def test_calc_resistances(self):
+        single = {
+            "fluid_type": "PROPYLENEGLYCOL",
+            "fluid_concentration": 0.2,
+            "borehole_type": "single_u_tube",
+            "single_u_tube": {
+                "pipe_outer_diameter": 0.042,
+                "pipe_dimension_ratio": 11,
+                "pipe_conductivity": 0.4,
+                "shank_space": 0.01,
+            },
+            "grout_conductivity": 1.2,
+            "soil_conductivity": 2.5,
+            "length": 100,
+            "borehole_diameter": 0.14,
+        }
+
+        bh = Borehole()
+        bh.init_from_dict(single)
+        res = bh.calc_resistances(mass_flow_rate=0.5, temperature=20)
+        self.assertAlmostEqual(res.effective_bh_resist_uhf, 0.20425, delta=1e-4)
+        self.assertAlmostEqual(res.effective_bh_resist_ubwt, 0.20414, delta=1e-4)
+        self.assertAlmostEqual(res.cond_resist, bh.calc_pipe_cond_resist(), delta=1e-12)
+        self.assertAlmostEqual(res.conv_resist, bh.calc_fluid_resist(0.5, 20), delta=1e-12)
+        self.assertAlmostEqual(res.fluid_pipe_resist, bh.calc_fluid_pipe_resist(0.5, 20), delta=1e-12)
+        self.assertEqual(res.flow_regime, FlowRegime.TURBULENT)
+
+        u_tube = bh._bh
+        self.assertAlmostEqual(res.reynolds, u_tube.mdot_to_re(0.5, 20), delta=1e-8)
+        self.assertAlmostEqual(res.local_bh_resist, u_tube.calc_local_bh_resistance(0.5, 20), delta=1e-12)
+        self.assertAlmostEqual(res.internal_resist, u_tube.calc_total_internal_bh_resistance(0.5, 20), delta=1e-12)
+        self.assertAlmostEqual(res.grout_resist, u_tube.calc_grout_resistance(0.5, 20), delta=1e-12)
+
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            res.reynolds = 0
+
+        # laminar flow
+        self.assertEqual(bh.calc_resistances(0.01, 20).flow_regime, FlowRegime.LAMINAR)
+
+        double = {
+            "fluid_type": "WATER",
+            "fluid_concentration": 0,
+            "borehole_type": "double_u_tube",
+            "double_u_tube": {
+                "pipe_outer_diameter": 0.032,
+                "pipe_dimension_ratio": 18.9,
+                "pipe_conductivity": 0.389,
+                "shank_space": 0.02263,
+                "pipe_inlet_arrangement": "DIAGONAL",
+            },
+            "grout_conductivity": 1.5,
+            "soil_conductivity": 3,
+            "length": 200,
+            "borehole_diameter": 0.115,
+        }
+
+        bh = Borehole()
+        bh.init_from_dict(double)
+        res = bh.calc_resistances(mass_flow_rate=0.4154, temperature=20)
+        u_tube = bh._bh
+        self.assertAlmostEqual(res.effective_bh_resist_uhf, u_tube.calc_effective_bh_resistance_uhf(0.4154, 20))
+        self.assertAlmostEqual(res.effective_bh_resist_ubwt, u_tube.calc_effective_bh_resistance_ubwt(0.4154, 20))
+        self.assertAlmostEqual(res.local_bh_resist, u_tube.calc_bh_resist_local(0.4154 / 2, 20), delta=1e-12)
+        self.assertAlmostEqual(res.internal_resist, u_tube.calc_internal_resist(0.4154 / 2, 20), delta=1e-12)
+        self.assertAlmostEqual(res.fluid_pipe_resist, u_tube.calc_fluid_pipe_resist(0.4154 / 2, 20), delta=1e-12)
+
+        coaxial = {
+            "fluid_type": "WATER",
+            "fluid_concentration": 0,
+            "borehole_type": "coaxial",
+            "coaxial": {
+                "outer_pipe_outer_diameter": 0.064,
+                "outer_pipe_dimension_ratio": 11,
+                "outer_pipe_conductivity": 0.389,
+                "inner_pipe_outer_diameter": 0.032,
+                "inner_pipe_dimension_ratio": 11,
+                "inner_pipe_conductivity": 0.389,
+            },
+            "grout_conductivity": 1.5,
+            "soil_conductivity": 3,
+            "length": 200,
+            "borehole_diameter": 0.115,
+        }
+
+        bh = Borehole()
+        bh.init_from_dict(coaxial)
+        coax = bh._bh
+        for m_dot in (0.1, 0.2, 0.5):
+            res = bh.calc_resistances(mass_flow_rate=m_dot, temperature=20)
+            _, r_a, r_b = coax.calc_local_bh_resistance(m_dot, 20)
+            self.assertAlmostEqual(res.effective_bh_resist_uhf, coax.calc_effective_bh_resistance_uhf(m_dot, 20))
+            self.assertAlmostEqual(res.effective_bh_resist_ubwt, coax.calc_effective_bh_resistance_ubwt(m_dot, 20))
+            self.assertAlmostEqual(res.internal_resist, r_a, delta=1e-12)
+            self.assertAlmostEqual(res.local_bh_resist, r_b, delta=1e-12)
+            self.assertAlmostEqual(res.conv_resist, bh.calc_fluid_resist(m_dot, 20), delta=1e-12)
+            self.assertAlmostEqual(res.fluid_pipe_resist, bh.calc_fluid_pipe_resist(m_dot, 20), delta=1e-12)
+            self.assertAlmostEqual(res.reynolds, coax.re_annulus(m_dot, 20), delta=1e-8)
+
+        self.assertEqual(bh.calc_resistances(0.2, 20).flow_regime, FlowRegime.TRANSITIONAL)
+
+        with self.assertRaises(TypeError):
+            Borehole().calc_resistances(0.5, 20)
+
+        # the vectorized version matches the scalar one across all flow regimes
+        m_dot = np.geomspace(0.01, 2.0, 40)
+        temp = np.linspace(0, 40, 40)
+        for config in (single, double, coaxial):
+            bh = Borehole()
+            bh.init_from_dict(config)
+            columns = bh.calc_resistances_array(m_dot, temp)
+            for i in range(m_dot.size):
+                res = bh.calc_resistances(float(m_dot[i]), float(temp[i]))
+                for field in dataclasses.fields(res):
+                    expected = getattr(res, field.name)
+                    if field.name == "flow_regime":
+                        self.assertEqual(columns[field.name][i], expected)
+                    else:
+                        self.assertAlmostEqual(columns[field.name][i], expected, delta=abs(expected) * 1e-12)
+
+        with self.assertRaises(TypeError):
+            Borehole().calc_resistances_array(0.5, 20)
+
+    def test_compile(self):
+        base = {
+            "fluid_type": "ETHYLENEGLYCOL",
+            "fluid_concentration": 0.3,
+            "grout_conductivity": 1.5,
+            "soil_conductivity": 3,
+            "length": 200,
+            "borehole_diameter": 0.115,
+        }
+        configs = [
+            {
+                "borehole_type": "single_u_tube",
+                "single_u_tube": {
+                    "pipe_outer_diameter": 0.032,
+                    "pipe_dimension_ratio": 11,
+                    "pipe_conductivity": 0.4,
+                    "shank_space": 0.02,
+                },
+            },
+            {
+                "borehole_type": "double_u_tube",
+                "double_u_tube": {
+                    "pipe_outer_diameter": 0.032,
+                    "pipe_dimension_ratio": 18.9,
+                    "pipe_conductivity": 0.389,
+                    "shank_space": 0.02263,
+                    "pipe_inlet_arrangement": "DIAGONAL",
+                },
+            },
+            {
+                "borehole_type": "double_u_tube",
+                "double_u_tube": {
+                    "pipe_outer_diameter": 0.032,
+                    "pipe_dimension_ratio": 18.9,
+                    "pipe_conductivity": 0.389,
+                    "shank_space": 0.02263,
+                    "pipe_inlet_arrangement": "ADJACENT",
+                },
+            },
+            {
+                "borehole_type": "coaxial",
+                "coaxial": {
+                    "outer_pipe_outer_diameter": 0.064,
+                    "outer_pipe_dimension_ratio": 11,
+                    "outer_pipe_conductivity": 0.389,
+                    "inner_pipe_outer_diameter": 0.032,
+                    "inner_pipe_dimension_ratio": 11,
+                    "inner_pipe_conductivity": 0.389,
+                },
+            },
+        ]
+
+        # spans laminar, transitional, and turbulent flow
+        m_dot = np.linspace(0.05, 3.0, 60)
+        temp = np.linspace(-5, 40, 60)
+
+        for config in configs:
+            for bc in ("UNIFORM_HEAT_FLUX", "UNIFORM_BOREHOLE_WALL_TEMP"):
+                bh = Borehole()
+                bh.init_from_dict({**base, **config, "boundary_condition": bc})
+                compiled = bh.compile()
+
+                for m, t in zip(m_dot, temp):
+                    self.assertAlmostEqual(compiled.calc_bh_resist(m, t), bh.calc_bh_resist(m, t), delta=1e-12)
+
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            compiled.length = 100
+
+        with self.assertRaises(TypeError):
+            Borehole().compile()
+
+    def test_calc_bh_resist_threads(self):
+        base = {
+            "fluid_type": "PROPYLENEGLYCOL",
+            "fluid_concentration": 0.2,
+            "grout_conductivity": 1.5,
+            "soil_conductivity": 3,
+            "length": 200,
+            "borehole_diameter": 0.115,
+        }
+        configs = [
+            {
+                "borehole_type": "single_u_tube",
+                "single_u_tube": {
+                    "pipe_outer_diameter": 0.032,
+                    "pipe_dimension_ratio": 11,
+                    "pipe_conductivity": 0.4,
+                    "shank_space": 0.02,
+                },
+            },
+            {
+                "borehole_type": "double_u_tube",
+                "double_u_tube": {
+                    "pipe_outer_diameter": 0.032,
+                    "pipe_dimension_ratio": 18.9,
+                    "pipe_conductivity": 0.389,
+                    "shank_space": 0.02263,
+                    "pipe_inlet_arrangement": "DIAGONAL",
+                },
+            },
+            {
+                "borehole_type": "coaxial",
+                "coaxial": {
+                    "outer_pipe_outer_diameter": 0.064,
+                    "outer_pipe_dimension_ratio": 11,
+                    "outer_pipe_conductivity": 0.389,
+                    "inner_pipe_outer_diameter": 0.032,
+                    "inner_pipe_dimension_ratio": 11,
+                    "inner_pipe_conductivity": 0.389,
+                },
+            },
+        ]
+
+        # spans laminar, transitional, and turbulent flow
+        rng = np.random.default_rng(0)
+        m_dot = rng.uniform(0.05, 2.0, 400).tolist()
+        temp = rng.uniform(0, 40, 400).tolist()
+
+        # switch threads as often as possible so calls interleave mid-calculation
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for config in configs:
+                for bc in ("UNIFORM_HEAT_FLUX", "UNIFORM_BOREHOLE_WALL_TEMP"):
+                    bh = Borehole()
+                    bh.init_from_dict({**base, **config, "boundary_condition": bc})
+
+                    expected = [bh.calc_bh_resist(m, t) for m, t in zip(m_dot, temp)]
+                    expected_breakdown = [bh.calc_resistances(m, t) for m, t in zip(m_dot, temp)]
+
+                    def run(offset, bh=bh):
+                        # each thread walks the points from a different starting place
+                        idx = [(i + offset) % len(m_dot) for i in range(len(m_dot))]
+                        resist = {i: bh.calc_bh_resist(m_dot[i], temp[i]) for i in idx}
+                        breakdown = {i: bh.calc_resistances(m_dot[i], temp[i]) for i in idx}
+                        return resist, breakdown
+
+                    with ThreadPoolExecutor(max_workers=16) as pool:
+                        results = list(pool.map(run, range(0, 400, 25)))
+
+                    for resist, breakdown in results:
+                        self.assertEqual([resist[i] for i in range(len(m_dot))], expected)
+                        self.assertEqual([breakdown[i] for i in range(len(m_dot))], expected_breakdown)
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+    def test_calc_bh_resist_with_grad(self):
+        base = {
+            "grout_conductivity": 1.5,
+            "soil_conductivity": 3,
+            "length": 200,
+            "borehole_diameter": 0.14,
+        }
+        configs = [
+            {
+                "borehole_type": "single_u_tube",
+                "single_u_tube": {
+                    "pipe_outer_diameter": 0.032,
+                    "pipe_dimension_ratio": 11,
+                    "pipe_conductivity": 0.4,
+                    "shank_space": 0.032,
+                },
+            },
+            {
+                "borehole_type": "double_u_tube",
+                "double_u_tube": {
+                    "pipe_outer_diameter": 0.032,
+                    "pipe_dimension_ratio": 11,
+                    "pipe_conductivity": 0.4,
+                    "shank_space": 0.032,
+                    "pipe_inlet_arrangement": "DIAGONAL",
+                },
+            },
+            {
+                "borehole_type": "double_u_tube",
+                "double_u_tube": {
+                    "pipe_outer_diameter": 0.032,
+                    "pipe_dimension_ratio": 11,
+                    "pipe_conductivity": 0.4,
+                    "shank_space": 0.032,
+                    "pipe_inlet_arrangement": "ADJACENT",
+                },
+            },
+            {
+                "borehole_type": "coaxial",
+                "coaxial": {
+                    "outer_pipe_outer_diameter": 0.1,
+                    "outer_pipe_dimension_ratio": 11,
+                    "outer_pipe_conductivity": 0.4,
+                    "inner_pipe_outer_diameter": 0.05,
+                    "inner_pipe_dimension_ratio": 11,
+                    "inner_pipe_conductivity": 0.4,
+                },
+            },
+        ]
+        fluids = [("WATER", 0), ("PROPYLENEGLYCOL", 0.3), ("ETHYLALCOHOL", 0.2)]
+
+        for config in configs:
+            for fluid_type, concentration in fluids:
+                for bc in ("UNIFORM_HEAT_FLUX", "UNIFORM_BOREHOLE_WALL_TEMP"):
+                    bh = Borehole()
+                    bh.init_from_dict(
+                        {
+                            **base,
+                            **config,
+                            "fluid_type": fluid_type,
+                            "fluid_concentration": concentration,
+                            "boundary_condition": bc,
+                        }
+                    )
+                    compiled = bh.compile()
+                    for temp in (10.0, 30.0):
+                        # laminar, inside each transition band, and turbulent
+                        mu = compiled.mu(temp)
+                        bands = compiled.transition_bands()
+                        m_dots = [mu * bands[0][0] / 2, mu * max(hi for _, hi in bands) * 2]
+                        m_dots.extend(mu * (lo * hi) ** 0.5 for lo, hi in bands)
+
+                        for m_dot in m_dots:
+                            resist, d_m_dot, d_temp = bh.calc_bh_resist_with_grad(m_dot, temp)
+                            self.assertAlmostEqual(resist, bh.calc_bh_resist(m_dot, temp), delta=1e-12)
+
+                            h = 1e-6 * m_dot
+                            fd_m_dot = (bh.calc_bh_resist(m_dot + h, temp) - bh.calc_bh_resist(m_dot - h, temp)) / (
+                                2 * h
+                            )
+                            h = 1e-4
+                            fd_temp = (bh.calc_bh_resist(m_dot, temp + h) - bh.calc_bh_resist(m_dot, temp - h)) / (
+                                2 * h
+                            )
+
+                            self.assertAlmostEqual(d_m_dot, fd_m_dot, delta=1e-6 * abs(fd_m_dot) + 1e-9)
+                            self.assertAlmostEqual(d_temp, fd_temp, delta=1e-5 * abs(fd_temp) + 1e-9)
+
+        with self.assertRaises(TypeError):
+            Borehole().calc_bh_resist_with_grad(0.5, 20)
+
+    def test_calc_bh_resist_with_grad_reinit(self):
+        # the compiled evaluator is kept between calls, and rebuilt after the borehole is re-initialized
+        bh = Borehole()
+        bh.init_single_u_borehole(0.14, 0.032, 11, 100, 0.04, 0.4, 1.5, 3, "WATER")
+        first = bh.calc_bh_resist_with_grad(0.5, 20)
+        self.assertEqual(bh.calc_bh_resist_with_grad(0.5, 20), first)
+
+        bh.init_single_u_borehole(0.14, 0.032, 11, 200, 0.04, 0.4, 1.5, 3, "WATER")
+        resist, _, _ = bh.calc_bh_resist_with_grad(0.5, 20)
+        self.assertNotAlmostEqual(resist, first[0], delta=1e-6)
+        self.assertAlmostEqual(resist, bh.calc_bh_resist(0.5, 20), delta=1e-12)
+
+    def test_calc_pressure_loss(self):
+        base = {
+            "fluid_type": "PROPYLENEGLYCOL",
+            "fluid_concentration": 0.2,
+            "grout_conductivity": 1.5,
+            "soil_conductivity": 3,
+            "length": 200,
+            "borehole_diameter": 0.14,
+        }
+        u_tube = {
+            "pipe_outer_diameter": 0.032,
+            "pipe_dimension_ratio": 11,
+            "pipe_conductivity": 0.4,
+            "shank_space": 0.032,
+        }
+
+        single_u = Borehole()
+        single_u.init_from_dict({**base, "borehole_type": "single_u_tube", "single_u_tube": u_tube})
+        double_u = Borehole()
+        double_u.init_from_dict(
+            {
+                **base,
+                "borehole_type": "double_u_tube",
+                "double_u_tube": {**u_tube, "pipe_inlet_arrangement": "ADJACENT"},
+            }
+        )
+
+        # each u-tube of a double u-tube carries half the flow
+        self.assertAlmostEqual(double_u.calc_pressure_loss(1.0, 20), single_u.calc_pressure_loss(0.5, 20), delta=1e-9)
+        self.assertGreater(single_u.calc_pressure_loss(1.0, 20), double_u.calc_pressure_loss(1.0, 20))
+
+        m_dot = np.array([0, 0.05, 0.2, 0.5, 1.0])
+        temp = np.array([20, 5, 10, 20, 30])
+        for bh in (single_u, double_u):
+            expected = [bh.calc_pressure_loss(m, t) for m, t in zip(m_dot, temp)]
+            np.testing.assert_allclose(bh.calc_pressure_loss_array(m_dot, temp), expected, rtol=1e-12)
+
+        with self.assertRaises(TypeError):
+            Borehole().calc_pressure_loss(0.5, 20)
+        with self.assertRaises(TypeError):
+            Borehole().calc_pressure_loss_array(0.5, 20)
+
+    def test_slots(self):
+        base = {
+            "fluid_type": "PROPYLENEGLYCOL",
+            "fluid_concentration": 0.2,
+            "grout_conductivity": 1.5,
+            "soil_conductivity": 3,
+            "length": 200,
+            "borehole_diameter": 0.14,
+        }
+        u_tube = {
+            "pipe_outer_diameter": 0.032,
+            "pipe_dimension_ratio": 11,
+            "pipe_conductivity": 0.4,
+            "shank_space": 0.032,
+        }
+        configs = [
+            {**base, "borehole_type": "single_u_tube", "single_u_tube": u_tube},
+            {
+                **base,
+                "borehole_type": "double_u_tube",
+                "double_u_tube": {**u_tube, "pipe_inlet_arrangement": "DIAGONAL"},
+            },
+            {
+                **base,
+                "borehole_type": "coaxial",
+                "coaxial": {
+                    "outer_pipe_outer_diameter": 0.1,
+                    "outer_pipe_dimension_ratio": 11,
+                    "outer_pipe_conductivity": 0.4,
+                    "inner_pipe_outer_diameter": 0.05,
+                    "inner_pipe_dimension_ratio": 11,
+                    "inner_pipe_conductivity": 0.4,
+                },
+            },
+        ]
+
+        for config in configs:
+            bh = Borehole()
+            bh.init_from_dict(config)
+
+            # no instance carries a __dict__
+            objects = [bh, bh._bh]
+            if config["borehole_type"] == "coaxial":
+                objects.extend([bh._bh.inner_pipe, bh._bh.outer_pipe])
+            for obj in objects:
+                self.assertFalse(hasattr(obj, "__dict__"))
+            with self.assertRaises(AttributeError):
+                bh.resist = 0.1
+
+            copy = pickle.loads(pickle.dumps(bh))  # noqa: S301
+            self.assertEqual(copy.calc_bh_resist(0.5, 20), bh.calc_bh_resist(0.5, 20))
@@ -0,0 +1,172 @@
+import unittest
+
+import numpy as np
+
+from bhr.borehole import Borehole
+from bhr.borehole_batch import BoreholeBatch, CoaxialBatch, DoubleUBatch, SingleUBatch
+
+SINGLE_U = {
+    "borehole_type": "single_u_tube",
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "boundary_condition": "uniform_heat_flux",
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 150,
+    "borehole_diameter": 0.14,
+    "single_u_tube": {
+        "pipe_outer_diameter": 0.032,
+        "pipe_dimension_ratio": 11,
+        "pipe_conductivity": 0.4,
+        "shank_space": 0.032,
+    },
+}
+
+DOUBLE_U = {
+    "borehole_type": "double_u_tube",
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "boundary_condition": "uniform_heat_flux",
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 150,
+    "borehole_diameter": 0.14,
+    "double_u_tube": {
+        "pipe_outer_diameter": 0.032,
+        "pipe_dimension_ratio": 11,
+        "pipe_conductivity": 0.4,
+        "shank_space": 0.032,
+        "pipe_inlet_arrangement": "ADJACENT",
+    },
+}
+
+COAXIAL = {
+    "borehole_type": "coaxial",
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "boundary_condition": "uniform_heat_flux",
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 100,
+    "borehole_diameter": 0.14,
+    "coaxial": {
+        "outer_pipe_outer_diameter": 0.1,
+        "outer_pipe_dimension_ratio": 11,
+        "outer_pipe_conductivity": 0.4,
+        "inner_pipe_outer_diameter": 0.05,
+        "inner_pipe_dimension_ratio": 11,
+        "inner_pipe_conductivity": 0.4,
+    },
+}
+
+
+def mixed_configs(base: dict) -> list[dict]:
+    """
+    Varied boreholes of one type, with both boundary conditions and, for double u-tubes, both inlet arrangements.
+    """
+
+    key = base["borehole_type"]
+    configs = []
+    for i, (length, grout_conductivity) in enumerate(((150, 1.5), (80, 2.0), (200, 0.8), (120, 1.2))):
+        config = {**base, "length": length, "grout_conductivity": grout_conductivity, key: dict(base[key])}
+        if i % 2:
+            config["boundary_condition"] = "uniform_borehole_wall_temp"
+        if key == "double_u_tube" and i >= 2:
+            config[key]["pipe_inlet_arrangement"] = "DIAGONAL"
+        configs.append(config)
+    return configs
+
+
+def expected_resist(configs: list[dict], m_dot, temp) -> np.ndarray:
+    """
+    Effective resistance of each borehole, evaluated one at a time, with shape (..., N).
+    """
+
+    results = []
+    for config, m, t in zip(configs, *np.broadcast_arrays(m_dot, temp, np.zeros(len(configs)))[:2]):
+        bh = Borehole()
+        bh.init_from_dict(config)
+        results.append(bh.compile().calc_bh_resist(m, t))
+    return np.array(results)
+
+
+class TestBoreholeBatch(unittest.TestCase):
+    def test_matches_compiled(self):
+        for base, batch_cls in ((SINGLE_U, SingleUBatch), (DOUBLE_U, DoubleUBatch), (COAXIAL, CoaxialBatch)):
+            configs = mixed_configs(base)
+            batch = BoreholeBatch.from_dicts(configs)
+            self.assertIsInstance(batch, batch_cls)
+            self.assertEqual(len(batch), 4)
+
+            # laminar, transitional, and turbulent flows
+            for m_dot in (0.05, 0.2, 0.5, 1.5):
+                for temp in (-5, 20, 40):
+                    np.testing.assert_allclose(
+                        batch.calc_bh_resist(m_dot, temp), expected_resist(configs, m_dot, temp), rtol=1e-12
+                    )
+
+            # one flow and temperature per borehole
+            m_dot = np.array([0.1, 0.3, 0.6, 1.2])
+            temp = np.array([0, 10, 20, 30])
+            np.testing.assert_allclose(
+                batch.calc_bh_resist(m_dot, temp), expected_resist(configs, m_dot, temp), rtol=1e-12
+            )
+
+    def test_timeseries(self):
+        configs = mixed_configs(DOUBLE_U)
+        batch = BoreholeBatch.from_dicts(configs)
+        m_dot = np.linspace(0.1, 1.0, 6)
+        temp = np.linspace(0, 30, 6)
+
+        results = batch.calc_bh_resist(m_dot[:, None], temp[:, None])
+        self.assertEqual(results.shape, (6, 4))
+        for i in range(6):
+            np.testing.assert_allclose(results[i], expected_resist(configs, m_dot[i], temp[i]), rtol=1e-12)
+
+    def test_from_table(self):
+        configs = mixed_configs(SINGLE_U)
+        table = {
+            "borehole_type": "SINGLE_U_TUBE",
+            "fluid_type": "PROPYLENEGLYCOL",
+            "fluid_concentration": 0.2,
+            "boundary_condition": [config["boundary_condition"] for config in configs],
+            "length": [config["length"] for config in configs],
+            "grout_conductivity": [config["grout_conductivity"] for config in configs],
+            "soil_conductivity": 3,
+            "borehole_diameter": 0.14,
+            **SINGLE_U["single_u_tube"],
+        }
+        from_table = BoreholeBatch.from_table(table)
+        from_dicts = BoreholeBatch.from_dicts(configs)
+        np.testing.assert_array_equal(from_table.calc_bh_resist(0.5, 20), from_dicts.calc_bh_resist(0.5, 20))
+
+        # the batch class can take the type from the table, or from the class
+        del table["borehole_type"]
+        batch = SingleUBatch.from_table(table)
+        np.testing.assert_array_equal(batch.calc_bh_resist(0.5, 20), from_dicts.calc_bh_resist(0.5, 20))
+        with self.assertRaises(ValueError):
+            BoreholeBatch.from_table(table)
+
+        # columns directly
+        batch = SingleUBatch("PROPYLENEGLYCOL", 0.2, **{k: v for k, v in table.items() if "fluid" not in k})
+        np.testing.assert_array_equal(batch.calc_bh_resist(0.5, 20), from_dicts.calc_bh_resist(0.5, 20))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            BoreholeBatch.from_dicts([])
+        with self.assertRaises(ValueError):
+            BoreholeBatch.from_dicts([SINGLE_U, DOUBLE_U])
+        with self.assertRaises(ValueError):
+            BoreholeBatch.from_dicts([SINGLE_U, {**SINGLE_U, "fluid_type": "WATER", "fluid_concentration": 0}])
+        with self.assertRaises(ValueError):
+            DoubleUBatch.from_dicts([SINGLE_U])
+        with self.assertRaises(ValueError):
+            BoreholeBatch.from_dicts([{**SINGLE_U, "boundary_condition": "UNIFORM_WHATEVER"}])
+        with self.assertRaises(ValueError):
+            BoreholeBatch.from_dicts(
+                [DOUBLE_U, {**DOUBLE_U, "double_u_tube": {**DOUBLE_U["double_u_tube"], "shank_space": 0.01}}]
+            )
+        with self.assertRaises(ValueError):
+            SingleUBatch("WATER", length=[100, 150])
+        with self.assertRaises(LookupError):
+            BoreholeBatch.from_dicts([{**SINGLE_U, "borehole_type": "triple_u_tube"}])
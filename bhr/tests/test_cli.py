@@ -0,0 +1,131 @@
+import contextlib
+import csv
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from bhr.borehole import Borehole
+from bhr.cli import main
+
+SINGLE = {
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 200,
+    "borehole_diameter": 0.115,
+    "borehole_type": "single_u_tube",
+    "single_u_tube": {
+        "pipe_outer_diameter": 0.032,
+        "pipe_dimension_ratio": 11,
+        "pipe_conductivity": 0.4,
+        "shank_space": 0.02,
+    },
+}
+
+
+class TestCLI(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp_dir.name)
+
+        self.m_dot = np.linspace(0.1, 1.0, 12)
+        self.temp = np.linspace(5, 30, 12)
+        self.points = self.dir / "points.csv"
+        with open(self.points, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["borehole", "m_dot", "temp"])
+            for i, (m, t) in enumerate(zip(self.m_dot, self.temp)):
+                writer.writerow([f"bh-{i % 2}", m, t])
+
+        self.bh = Borehole()
+        self.bh.init_from_dict(SINGLE)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_configs(self, configs) -> str:
+        path = self.dir / "configs.json"
+        path.write_text(json.dumps(configs))
+        return str(path)
+
+    def test_single_config_json_output(self):
+        output = self.dir / "out.json"
+        configs = self.write_configs(SINGLE)
+        self.assertEqual(main([configs, str(self.points), "-o", str(output), "--chunk-size", "5"]), 0)
+
+        records = json.loads(output.read_text())
+        self.assertEqual(len(records), 12)
+        actual = [record["bh_resist"] for record in records]
+        np.testing.assert_allclose(actual, self.bh.calc_bh_resist_array(self.m_dot, self.temp), rtol=1e-12)
+
+    def test_borehole_ids(self):
+        output = self.dir / "out.csv"
+        longer = {**SINGLE, "length": 300}
+        configs = self.write_configs({"bh-0": SINGLE, "bh-1": longer})
+        argv = [configs, str(self.points), "-o", str(output), "--id-column", "borehole", "--profile"]
+        self.assertEqual(main(argv), 0)
+
+        with open(output, newline="") as f:
+            rows = list(csv.DictReader(f))
+
+        self.assertAlmostEqual(float(rows[0]["bh_resist"]), self.bh.calc_bh_resist(0.1, 5), delta=1e-12)
+        bh = Borehole()
+        bh.init_from_dict(longer)
+        self.assertAlmostEqual(float(rows[1]["bh_resist"]), bh.calc_bh_resist(self.m_dot[1], self.temp[1]))
+
+    def test_config_list(self):
+        output = self.dir / "out.csv"
+        configs = self.write_configs([SINGLE, {**SINGLE, "borehole_type": "triple_u_tube"}])
+        self.assertEqual(main([configs, str(self.points), "-o", str(output), "--workers", "2"]), 0)
+
+        with open(output, newline="") as f:
+            rows = list(csv.DictReader(f))
+
+        self.assertEqual(len(rows), 24)
+        actual = [float(row["bh_resist"]) for row in rows[:12]]
+        np.testing.assert_allclose(actual, self.bh.calc_bh_resist_array(self.m_dot, self.temp), rtol=1e-12)
+        self.assertEqual(rows[0]["error"], "")
+        self.assertIn("LookupError", rows[12]["error"])
+
+    def test_cache(self):
+        cache = str(self.dir / "cache.sqlite")
+        for configs in (self.write_configs(SINGLE), self.write_configs([SINGLE])):
+            for i in range(2):
+                output = self.dir / f"out-{i}.csv"
+                self.assertEqual(main([configs, str(self.points), "-o", str(output), "--cache", cache]), 0)
+
+                with open(output, newline="") as f:
+                    actual = [float(row["bh_resist"]) for row in csv.DictReader(f)]
+                np.testing.assert_allclose(actual, self.bh.calc_bh_resist_array(self.m_dot, self.temp), rtol=1e-12)
+
+        from bhr.disk_cache import DiskCache  # noqa: PLC0415
+
+        with DiskCache(cache) as disk_cache:
+            self.assertEqual(len(disk_cache), 12)
+
+    def test_errors(self):
+        configs = self.write_configs({"bh-0": SINGLE})
+        self.assertEqual(main([configs, str(self.points), "-o", str(self.dir / "out.csv")]), 1)
+        self.assertEqual(main([configs, str(self.points), "-o", str(self.dir / "out.txt")]), 1)
+
+    def test_unsupported_fluid(self):
+        configs = self.write_configs({**SINGLE, "fluid_type": "FOO"})
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(main([configs, str(self.points), "-o", str(self.dir / "out.csv")]), 1)
+        self.assertIn('Unsupported fluid "FOO"', stderr.getvalue())
+
+    def test_lazy_imports(self):
+        code = "import sys, bhr.cli; print('numpy' in sys.modules, 'scp' in sys.modules)"
+        root = Path(__file__).parents[2]
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=root
+        )
+        self.assertEqual(result.stdout.split(), ["False", "False"])
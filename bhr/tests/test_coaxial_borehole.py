@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+import numpy as np
+
 from bhr.coaxial_borehole import Coaxial
 
 
@@ -66,6 +68,16 @@ class TestCoaxialBorehole(TestCase):
         # turbulent flow
         self.assertAlmostEqual(coax.calc_conv_resist_annulus(m_dot=0.5, temp=20)[1], 0.003314, delta=1e-3)
 
+    def test_convective_resist_annulus_array(self):
+        coax = Coaxial(**self.inputs)
+
+        # laminar, transitional, and turbulent flow
+        m_dot = np.array([0.1, 0.2, 0.5, 1.0])
+        r_ii, r_oo = coax.calc_conv_resist_annulus_array(m_dot, 20)
+        expected = [coax.calc_conv_resist_annulus(m, 20) for m in m_dot]
+        np.testing.assert_allclose(r_ii, [x[0] for x in expected], rtol=1e-14)
+        np.testing.assert_allclose(r_oo, [x[1] for x in expected], rtol=1e-14)
+
     def test_calc_local_bh_resistance(self):
         coax = Coaxial(**self.inputs)
 
@@ -85,3 +97,44 @@ class TestCoaxialBorehole(TestCase):
         coax = Coaxial(**self.inputs)
 
         self.assertAlmostEqual(coax.calc_effective_bh_resistance_ubwt(m_dot=0.02, temp=20), 2.31, delta=1e-3)
+
+    def test_calc_effective_bh_resistance_array(self):
+        coax = Coaxial(**self.inputs)
+        m_dot = np.array([0.02, 0.1, 0.2, 0.5, 1.0])
+        temp = np.array([5, 10, 20, 30, 40])
+
+        expected = [coax.calc_effective_bh_resistance_uhf(m, t) for m, t in zip(m_dot, temp)]
+        np.testing.assert_allclose(coax.calc_effective_bh_resistance_uhf_array(m_dot, temp), expected, rtol=1e-12)
+
+        expected = [coax.calc_effective_bh_resistance_ubwt(m, t) for m, t in zip(m_dot, temp)]
+        np.testing.assert_allclose(coax.calc_effective_bh_resistance_ubwt_array(m_dot, temp), expected, rtol=1e-12)
+
+    def test_friction_factor_annulus(self):
+        coax = Coaxial(**self.inputs)
+        self.assertGreater(coax.annular_laminar_friction_ratio, 1)
+        self.assertLess(coax.annular_laminar_friction_ratio, 1.5)
+
+        # laminar limits of a pipe and of parallel plates
+        thin = Coaxial(**{**self.inputs, "inner_pipe_outer_diameter": 1e-30})
+        self.assertAlmostEqual(thin.annular_laminar_friction_ratio, 1, delta=0.02)
+        narrow = Coaxial(**{**self.inputs, "inner_pipe_outer_diameter": 0.0521})
+        self.assertAlmostEqual(narrow.annular_laminar_friction_ratio, 1.5, delta=1e-3)
+
+        re = np.array([100, 1000, 2000, 3000, 4000, 10000])
+        expected = [coax.friction_factor_annulus(x) for x in re]
+        np.testing.assert_allclose(coax.friction_factor_annulus_array(re), expected, rtol=1e-14)
+
+    def test_pressure_loss(self):
+        coax = Coaxial(**self.inputs)
+        self.assertEqual(coax.pressure_loss(0, 20), 0)
+        self.assertGreater(coax.pressure_loss_annulus(0.5, 20), 0)
+        self.assertAlmostEqual(
+            coax.pressure_loss(0.5, 20),
+            coax.inner_pipe.pressure_loss(0.5, 20) + coax.pressure_loss_annulus(0.5, 20),
+            delta=1e-9,
+        )
+
+        m_dot = np.array([0, 0.02, 0.1, 0.2, 0.5, 1.0])
+        temp = np.array([20, 5, 10, 20, 30, 40])
+        expected = [coax.pressure_loss(m, t) for m, t in zip(m_dot, temp)]
+        np.testing.assert_allclose(coax.pressure_loss_array(m_dot, temp), expected, rtol=1e-12)
@@ -0,0 +1,67 @@
+import unittest
+
+from bhr.config_hash import canonical_config, config_hash
+
+DOUBLE_U = {
+    "borehole_type": "double_u_tube",
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 150,
+    "borehole_diameter": 0.14,
+    "double_u_tube": {
+        "pipe_outer_diameter": 0.032,
+        "pipe_dimension_ratio": 11,
+        "pipe_conductivity": 0.4,
+        "shank_space": 0.032,
+        "pipe_inlet_arrangement": "ADJACENT",
+    },
+}
+
+
+class TestConfigHash(unittest.TestCase):
+    def test_equivalent_configs(self):
+        expected = config_hash(DOUBLE_U)
+        self.assertEqual(len(expected), 64)
+
+        equivalent = [
+            dict(reversed(list(DOUBLE_U.items()))),
+            {**DOUBLE_U, "borehole_type": "DOUBLE_U_TUBE", "fluid_type": "propyleneglycol"},
+            {**DOUBLE_U, "soil_conductivity": 3.0, "length": "150"},
+            {**DOUBLE_U, "boundary_condition": "uniform_heat_flux"},
+            {**DOUBLE_U, "double_u_tube": {**DOUBLE_U["double_u_tube"], "pipe_inlet_arrangement": "adjacent"}},
+            # inputs of other borehole types are ignored, as in init_from_dict
+            {**DOUBLE_U, "single_u_tube": {"pipe_outer_diameter": 0.04}},
+        ]
+        for config in equivalent:
+            self.assertEqual(config_hash(config), expected)
+
+        different = [
+            {**DOUBLE_U, "length": 150.0001},
+            {**DOUBLE_U, "fluid_concentration": 0.3},
+            {**DOUBLE_U, "boundary_condition": "UNIFORM_BOREHOLE_WALL_TEMP"},
+            {**DOUBLE_U, "double_u_tube": {**DOUBLE_U["double_u_tube"], "pipe_inlet_arrangement": "DIAGONAL"}},
+        ]
+        for config in different:
+            self.assertNotEqual(config_hash(config), expected)
+
+        # the concentration does not apply to water
+        water = {**DOUBLE_U, "fluid_type": "WATER", "fluid_concentration": 0}
+        self.assertEqual(config_hash(water), config_hash({**water, "fluid_concentration": 0.4}))
+
+    def test_canonical_config(self):
+        canonical = canonical_config(DOUBLE_U)
+        self.assertEqual(canonical["borehole_type"], "DOUBLE_U_TUBE")
+        self.assertEqual(canonical["boundary_condition"], "UNIFORM_HEAT_FLUX")
+        self.assertEqual(canonical["length"], "150.0")
+        self.assertEqual(canonical["double_u_tube"]["shank_space"], "0.032")
+        self.assertNotIn("single_u_tube", canonical)
+
+    def test_invalid(self):
+        with self.assertRaises(LookupError):
+            config_hash({**DOUBLE_U, "borehole_type": "triple_u_tube"})
+        with self.assertRaises(LookupError):
+            config_hash({**DOUBLE_U, "boundary_condition": "UNIFORM_WHATEVER"})
+        with self.assertRaises(KeyError):
+            config_hash({key: val for key, val in DOUBLE_U.items() if key != "length"})
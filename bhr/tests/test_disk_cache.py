@@ -0,0 +1,143 @@
+import pickle
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from bhr.batch import evaluate
+from bhr.borehole import Borehole
+from bhr.config_hash import config_hash
+from bhr.disk_cache import DiskCache
+
+SINGLE_U = {
+    "borehole_type": "single_u_tube",
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 150,
+    "borehole_diameter": 0.14,
+    "single_u_tube": {
+        "pipe_outer_diameter": 0.032,
+        "pipe_dimension_ratio": 11,
+        "pipe_conductivity": 0.4,
+        "shank_space": 0.032,
+    },
+}
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "cache.sqlite"
+
+        self.bh = Borehole()
+        self.bh.init_from_dict(SINGLE_U)
+        self.key = config_hash(SINGLE_U)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_get_put(self):
+        m_dot = np.linspace(0.1, 1.0, 10)
+        temp = np.linspace(0, 30, 10)
+
+        with DiskCache(self.path) as cache:
+            self.assertTrue(np.isnan(cache.get(self.key, m_dot, temp)).all())
+            resist = cache.get_or_compute(self.key, m_dot, temp, self.bh.calc_bh_resist_array)
+            np.testing.assert_array_equal(resist, self.bh.calc_bh_resist_array(m_dot, temp))
+            self.assertEqual(len(cache), 10)
+
+        # results persist between connections
+        calls = []
+
+        def func(m, t):
+            calls.append(m.size)
+            return self.bh.calc_bh_resist_array(m, t)
+
+        with DiskCache(self.path) as cache:
+            m_more = np.append(m_dot, [1.5, 2.0])
+            t_more = np.append(temp, [20, 20])
+            resist = cache.get_or_compute(self.key, m_more, t_more, func)
+            np.testing.assert_array_equal(resist, self.bh.calc_bh_resist_array(m_more, t_more))
+            self.assertEqual(calls, [2])
+
+            info = cache.info()
+            self.assertEqual((info.hits, info.misses, info.currsize), (10, 2, 12))
+
+            # scalars, and other configurations
+            self.assertEqual(cache.get(self.key, 0.1, 0).shape, ())
+            self.assertAlmostEqual(float(cache.get(self.key, 0.1, 0)), float(resist[0]), delta=0)
+            self.assertTrue(np.isnan(cache.get("other", 0.1, 0)))
+
+            # non-finite results are not stored
+            cache.put(self.key, [3.0, np.nan], 20, [np.nan, 0.2])
+            self.assertEqual(len(cache), 12)
+
+            cache.clear()
+            self.assertEqual(len(cache), 0)
+
+    def test_eviction(self):
+        with DiskCache(self.path, max_entries=5) as cache:
+            cache.put(self.key, [0.1, 0.2, 0.3, 0.4], 20, [1, 2, 3, 4])
+            cache.get(self.key, 0.1, 20)  # 0.1 is now the most recently used
+            cache.put(self.key, [0.5, 0.6], 20, [5, 6])
+            self.assertEqual(len(cache), 5)
+            np.testing.assert_array_equal(cache.get(self.key, [0.1, 0.2, 0.3, 0.6], 20), [1, np.nan, 3, 6])
+
+            # stored results are replaced without growing the cache
+            cache.put(self.key, [0.1, 0.6, 0.6], 20, [10, 60, 61])
+            self.assertEqual(len(cache), 5)
+            np.testing.assert_array_equal(cache.get(self.key, [0.1, 0.6], 20), [10, 61])
+
+        # the row count kept in meta matches the table, and is rebuilt for databases written without it
+        conn = sqlite3.connect(self.path)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM results").fetchone()[0], 5)
+        with conn:
+            conn.execute("DELETE FROM meta WHERE key = 'size'")
+        conn.close()
+        with DiskCache(self.path, max_entries=5) as cache:
+            self.assertEqual(len(cache), 5)
+
+        with self.assertRaises(ValueError):
+            DiskCache(self.path, max_entries=0)
+
+    def test_model_version(self):
+        with DiskCache(self.path) as cache:
+            cache.put(self.key, 0.5, 20, 0.2)
+        with DiskCache(self.path) as cache:
+            self.assertEqual(len(cache), 1)
+        with DiskCache(self.path, model_version=0) as cache:
+            self.assertEqual(len(cache), 0)
+
+    def test_pickle(self):
+        with DiskCache(self.path, max_entries=100) as cache:
+            cache.put(self.key, 0.5, 20, 0.2)
+            copy = pickle.loads(pickle.dumps(cache))  # noqa: S301
+            self.assertEqual((copy.path, copy.max_entries), (cache.path, 100))
+            self.assertAlmostEqual(float(copy.get(self.key, 0.5, 20)), 0.2, delta=0)
+            self.assertIs(pickle.loads(pickle.dumps(cache)), copy)  # noqa: S301
+            copy.close()
+
+    def test_batch(self):
+        configs = [{**SINGLE_U, "length": length} for length in (100, 150, 200)]
+        configs.append({**SINGLE_U, "borehole_type": "triple_u_tube"})
+        m_dot = np.linspace(0.1, 1.0, 10)
+        temp = np.linspace(0, 30, 10)
+        expected = evaluate(configs, m_dot, temp, workers=1)
+
+        with DiskCache(self.path) as cache:
+            for workers in (1, 2, 1):
+                results = evaluate(configs, m_dot, temp, workers=workers, chunk_size=1, cache=cache)
+                for result, expected_result in zip(results[:3], expected[:3]):
+                    np.testing.assert_allclose(result.resist, expected_result.resist, rtol=1e-12)
+                self.assertIn("LookupError", results[3].error)
+
+            # the pool workers filled the cache, so the last run only read from it
+            self.assertEqual(len(cache), 30)
+            self.assertEqual(cache.info().misses, 30)
+
+            result = evaluate(configs[:1], 0.5, 20, workers=1, cache=cache)[0]
+            self.assertIsInstance(result.resist, float)
@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+import numpy as np
+
 from bhr.double_u_borehole import DoubleUTube
 
 
@@ -48,7 +50,8 @@ class TestDoubleUBorehole(TestCase):
         tolerance = 1e-3
 
         self.assertAlmostEqual(bh.update_b1(m_dot_per_u_tube=self.m_dot_per_u, temperature=20), 0.359, delta=tolerance)
-        self.assertAlmostEqual(bh.pipe_resist, 0.05, delta=tolerance)
+        self.assertAlmostEqual(bh.calc_fluid_pipe_resist(self.m_dot_per_u, 20), 0.05, delta=tolerance)
+        self.assertFalse(hasattr(bh, "pipe_resist"))
 
     def test_calc_bh_resist_local(self):
         bh = DoubleUTube(**self.inputs)
@@ -92,6 +95,21 @@ class TestDoubleUBorehole(TestCase):
             bh.calc_effective_bh_resistance_ubwt(m_dot=self.m_dot_bh, temp=20), 0.1062, delta=tolerance
         )
 
+    def test_calc_resistances_array(self):
+        m_dot = np.array([0.05, 0.1, 0.2, self.m_dot_bh, 1.0])
+        temp = np.array([5, 10, 20, 30, 40])
+
+        for arrangement in ("ADJACENT", "DIAGONAL"):
+            d = self.inputs.copy()
+            d.update({"pipe_inlet_arrangement": arrangement})
+            bh = DoubleUTube(**d)
+
+            expected = [bh.calc_effective_bh_resistance_uhf(m, t) for m, t in zip(m_dot, temp)]
+            np.testing.assert_allclose(bh.calc_effective_bh_resistance_uhf_array(m_dot, temp), expected, rtol=1e-12)
+
+            expected = [bh.calc_effective_bh_resistance_ubwt(m, t) for m, t in zip(m_dot, temp)]
+            np.testing.assert_allclose(bh.calc_effective_bh_resistance_ubwt_array(m_dot, temp), expected, rtol=1e-12)
+
     def test_invalid_pipe_arrangement(self):
         d = self.inputs.copy()
         d.update({"pipe_inlet_arrangement": "UNSUPPORTED"})
@@ -0,0 +1,66 @@
+import math
+import unittest
+
+import numpy as np
+
+from bhr.dual import Dual, coth, exp, log, smoothing_function
+from bhr.utilities import smoothing_function as float_smoothing_function
+
+
+def derivative(func, x: float, h: float = 1e-6) -> float:
+    return (func(x + h) - func(x - h)) / (2 * h)
+
+
+class TestDual(unittest.TestCase):
+    def check(self, func, x: float, rel_tol: float = 1e-7):
+        result = func(Dual(x, 1.0, 0.0))
+        self.assertAlmostEqual(result.value, func(x), delta=1e-14 * abs(func(x)))
+        self.assertTrue(math.isclose(result.d_m_dot, derivative(func, x), rel_tol=rel_tol))
+        self.assertEqual(result.d_temp, 0.0)
+
+    def test_arithmetic(self):
+        self.check(lambda x: 3 * x + 2 - x / 4, 1.5)
+        self.check(lambda x: 2 - x * x, 1.5)
+        self.check(lambda x: 3 / (1 + x) ** 2, 1.5)
+        self.check(lambda x: x**0.8 + x**-2.0 + 10**x, 1.5)
+        self.check(lambda x: x**x, 1.5)
+        self.check(lambda x: -x / (x - 4), 1.5)
+
+    def test_functions(self):
+        self.check(exp, 0.7)
+        self.check(log, 0.7)
+        self.check(coth, 0.7)
+        self.check(lambda x: exp(-x) * log(1 + x) / coth(x), 0.7)
+
+        self.assertEqual(exp(0.7), math.exp(0.7))
+        self.assertEqual(log(0.7), math.log(0.7))
+        self.assertIs(type(log(0.7)), float)
+
+        # arrays, as in bhr.borehole_batch
+        x = np.array([0.3, 0.7, 2.0])
+        np.testing.assert_allclose(log(x), [log(v) for v in x], rtol=1e-15)
+        np.testing.assert_allclose(coth(x), [coth(v) for v in x], rtol=1e-15)
+
+    def test_two_directions(self):
+        m = Dual(2.0, 1.0, 0.0)
+        t = Dual(3.0, 0.0, 1.0)
+        result = m * m * t + t / m
+        self.assertAlmostEqual(result.value, 13.5)
+        self.assertAlmostEqual(result.d_m_dot, 2 * 2 * 3 - 3 / 4)
+        self.assertAlmostEqual(result.d_temp, 4 + 1 / 2)
+
+    def test_comparisons(self):
+        x = Dual(2.0, 1.0, 0.0)
+        self.assertTrue(x < 3)
+        self.assertTrue(x <= Dual(2.0))
+        self.assertTrue(x > 1)
+        self.assertTrue(x >= 2)
+        self.assertEqual(int(Dual(2.7)), 2)
+
+    def test_smoothing_function(self):
+        for x in (1000, 2000, 2500, 3999, 4000, 5000):
+            expected = float_smoothing_function(x, 2000, 4000, 4.36, 30.0)
+            self.assertEqual(smoothing_function(x, 2000, 4000, 4.36, 30.0), expected)
+
+        self.check(lambda x: smoothing_function(x, 2000, 4000, 4.36, 30.0), 3100.0)
+        self.check(lambda x: smoothing_function(x, 2000, 4000, 4.36, 30.0 * x / 3000), 2500.0)
@@ -1,6 +1,19 @@
 import unittest
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 
-from bhr.fluid import get_fluid
+import numpy as np
+
+from bhr.coaxial_borehole import Coaxial
+from bhr.fluid import (
+    TabulatedFluid,
+    clear_fluid_registry,
+    disable_tabulated_fluids,
+    enable_tabulated_fluids,
+    eval_property_array,
+    get_fluid,
+)
+from bhr.pipe import Pipe
 
 
 class TestFluid(unittest.TestCase):
@@ -23,3 +36,155 @@ class TestFluid(unittest.TestCase):
     def test_init_water(self):
         f = get_fluid(fluid_type="WATER")
         self.assertAlmostEqual(f.density(20), 998.2, delta=0.1)
+
+    def test_unsupported_fluid(self):
+        with self.assertRaises(LookupError):
+            get_fluid(fluid_type="FOO")
+
+    def test_shared_instances(self):
+        f = get_fluid(fluid_type="PROPYLENEGLYCOL", fluid_concentration=0.2)
+        self.assertIs(get_fluid(fluid_type="propyleneglycol", fluid_concentration=0.2), f)
+        self.assertIsNot(get_fluid(fluid_type="PROPYLENEGLYCOL", fluid_concentration=0.3), f)
+        self.assertIs(get_fluid(fluid_type="WATER"), get_fluid(fluid_type="WATER", fluid_concentration=0.2))
+
+        coax = Coaxial(
+            borehole_diameter=0.115,
+            outer_pipe_outer_diameter=0.064,
+            outer_pipe_dimension_ratio=11,
+            outer_pipe_conductivity=0.389,
+            inner_pipe_outer_diameter=0.032,
+            inner_pipe_dimension_ratio=11,
+            inner_pipe_conductivity=0.389,
+            length=200,
+            grout_conductivity=1.5,
+            soil_conductivity=3,
+            fluid_type="PROPYLENEGLYCOL",
+            fluid_concentration=0.2,
+        )
+        self.assertIs(coax.fluid, f)
+        self.assertIs(coax.inner_pipe.fluid, f)
+        self.assertIs(coax.outer_pipe.fluid, f)
+
+    def test_clear_fluid_registry(self):
+        f = get_fluid(fluid_type="ETHYLENEGLYCOL", fluid_concentration=0.25)
+        clear_fluid_registry()
+        f_new = get_fluid(fluid_type="ETHYLENEGLYCOL", fluid_concentration=0.25)
+        self.assertIsNot(f_new, f)
+        self.assertEqual(f_new.density(20), f.density(20))
+
+    def test_shared_instances_threads(self):
+        clear_fluid_registry()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            fluids = list(pool.map(lambda _: get_fluid("METHYLALCOHOL", 0.15), range(200)))
+        self.assertTrue(all(f is fluids[0] for f in fluids))
+
+
+class TestTabulatedFluid(unittest.TestCase):
+    fluids = (
+        ("WATER", 0),
+        ("ETHYLALCOHOL", 0.2),
+        ("ETHYLENEGLYCOL", 0.3),
+        ("METHYLALCOHOL", 0.2),
+        ("PROPYLENEGLYCOL", 0.6),
+    )
+
+    def test_cubic_error(self):
+        for fluid_type, concentration in self.fluids:
+            f = get_fluid(fluid_type, concentration)
+            tf = TabulatedFluid(f)
+            temps = np.linspace(f.t_min, f.t_max, 997)
+            for name in ("mu", "density", "cp", "k", "prandtl"):
+                exact = np.array([getattr(f, name)(t) for t in temps])
+                np.testing.assert_allclose(getattr(tf, name)(temps), exact, rtol=1e-6)
+                self.assertAlmostEqual(getattr(tf, name)(float(temps[100])), exact[100], delta=exact[100] * 1e-6)
+            self.assertLess(max(tf.max_rel_error.values()), 1e-6)
+
+    def test_linear_error(self):
+        for fluid_type, concentration in self.fluids:
+            f = get_fluid(fluid_type, concentration)
+            tf = TabulatedFluid(f, method="linear")
+            temps = np.linspace(f.t_min, f.t_max, 997)
+            exact = np.array([f.mu(t) for t in temps])
+            np.testing.assert_allclose(tf.mu(temps), exact, rtol=1e-3)
+            self.assertLess(max(tf.max_rel_error.values()), 1e-3)
+
+    def test_out_of_range(self):
+        f = get_fluid("WATER")
+        tf = TabulatedFluid(f, t_min=10, t_max=30)
+        self.assertEqual(tf.mu(40), f.mu(40))
+        np.testing.assert_allclose(tf.mu(np.array([5, 20, 40])), [f.mu(5), f.mu(20), f.mu(40)], rtol=1e-6)
+
+        tf = TabulatedFluid(f, t_min=10, t_max=30, out_of_range="raise")
+        with self.assertRaises(ValueError):
+            tf.mu(40)
+        with self.assertRaises(ValueError):
+            tf.mu(np.array([20, 40]))
+
+    def test_invalid_options(self):
+        f = get_fluid("WATER")
+        with self.assertRaises(ValueError):
+            TabulatedFluid(f, method="quintic")
+        with self.assertRaises(ValueError):
+            TabulatedFluid(f, out_of_range="clamp")
+
+    def test_enable_tabulated_fluids(self):
+        inputs = {
+            "pipe_outer_diameter": 0.0334,
+            "pipe_dimension_ratio": 11,
+            "pipe_length": 100,
+            "pipe_conductivity": 0.4,
+            "fluid_type": "PROPYLENEGLYCOL",
+            "fluid_concentration": 0.2,
+        }
+        reference = Pipe(**inputs)
+
+        enable_tabulated_fluids()
+        try:
+            p = Pipe(**inputs)
+        finally:
+            disable_tabulated_fluids()
+
+        self.assertIsInstance(p.fluid, TabulatedFluid)
+        self.assertEqual(p.fluid.fluid_name, reference.fluid.fluid_name)
+        self.assertIsNot(type(get_fluid("WATER")), TabulatedFluid)
+
+        m_dot = np.array([0.05, 0.1, 0.5])
+        temp = np.array([0, 20, 40])
+        self.assertAlmostEqual(p.calc_conv_resist(0.5, 20), reference.calc_conv_resist(0.5, 20), delta=1e-8)
+        np.testing.assert_allclose(
+            p.calc_conv_resist_array(m_dot, temp), reference.calc_conv_resist_array(m_dot, temp), rtol=1e-6
+        )
+
+
+class TestEvalPropertyArray(unittest.TestCase):
+    fluids = TestTabulatedFluid.fluids
+
+    def test_matches_scalar(self):
+        for fluid_type, concentration in self.fluids:
+            f = get_fluid(fluid_type, concentration)
+            temps = np.linspace(f.t_min - 10, f.t_max + 10, 203).reshape(7, 29)
+            for name in ("mu", "density", "cp", "k", "prandtl"):
+                with self.subTest(fluid=fluid_type, prop=name), warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    prop = getattr(f, name)
+                    exact = np.array([prop(t) for t in temps.ravel()]).reshape(temps.shape)
+                    np.testing.assert_allclose(eval_property_array(prop, temps), exact, rtol=1e-12)
+
+    def test_vectorized(self):
+        # the SecondaryCoolantProps correlations are evaluated without calling the scalar methods
+        f = get_fluid("PROPYLENEGLYCOL", 0.2)
+        calls = []
+
+        def mu(t):
+            calls.append(t)
+            return f.mu(t)
+
+        mu.__self__ = f
+        mu.__name__ = "mu"
+        np.testing.assert_allclose(eval_property_array(mu, [5.0, 10.0]), [f.mu(5.0), f.mu(10.0)], rtol=1e-12)
+        self.assertEqual(calls, [])
+
+    def test_out_of_range_warning(self):
+        f = get_fluid("WATER")
+        with self.assertWarns(UserWarning):
+            eval_property_array(f.mu, [20.0, 120.0])
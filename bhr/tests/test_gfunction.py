@@ -0,0 +1,120 @@
+import math
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from bhr.borehole import Borehole
+from bhr.gfunction import DEFAULT_LNTTS, _erf, fls_gfunction
+
+COAXIAL = {
+    "borehole_type": "coaxial",
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 150,
+    "borehole_diameter": 0.15,
+    "coaxial": {
+        "outer_pipe_outer_diameter": 0.1,
+        "outer_pipe_dimension_ratio": 11,
+        "outer_pipe_conductivity": 0.4,
+        "inner_pipe_outer_diameter": 0.05,
+        "inner_pipe_dimension_ratio": 11,
+        "inner_pipe_conductivity": 0.4,
+    },
+}
+
+
+def fls_response(distance, lntts, length=150.0, depth=4.0):
+    """
+    Finite line source response, integrated with the trapezoidal rule on a fine grid in ln(s).
+    """
+
+    alpha = 1e-6
+    t = math.exp(lntts) * length**2 / (9 * alpha)
+    y = np.linspace(math.log(1 / math.sqrt(4 * alpha * t)), math.log(40 / distance), 100_001)
+    s = np.exp(y)
+
+    def ierf(x):
+        return x * np.vectorize(math.erf)(x) - (1 - np.exp(-(x**2))) / math.sqrt(math.pi)
+
+    bracket = (
+        2 * ierf(length * s)
+        + 2 * ierf((length + 2 * depth) * s)
+        - ierf(2 * depth * s)
+        - ierf((2 * length + 2 * depth) * s)
+    )
+    return 0.5 / length * np.trapezoid(np.exp(-((distance * s) ** 2)) * bracket / s, y)
+
+
+class TestGFunction(unittest.TestCase):
+    def test_erf(self):
+        x = np.linspace(-7, 7, 2001)
+        np.testing.assert_allclose(_erf(x), [math.erf(v) for v in x], rtol=0, atol=5e-15)
+
+    def test_single_borehole(self):
+        lntts = [-8, -4, 0, 3]
+        g = fls_gfunction([[10, 20]], 150, 0.075, 4, lntts)
+        np.testing.assert_allclose(g.g, [fls_response(0.075, v) for v in lntts], rtol=1e-7)
+        np.testing.assert_array_equal(g.lntts, lntts)
+
+    def test_field(self):
+        coordinates = [(0, 0), (6, 0), (0, 6), (7, 7)]
+        lntts = [-5, 2]
+        g = fls_gfunction(coordinates, 150, 0.075, 4, lntts)
+
+        expected = []
+        for v in lntts:
+            total = 0
+            for p in coordinates:
+                for q in coordinates:
+                    total += fls_response(max(math.dist(p, q), 0.075), v)
+            expected.append(total / len(coordinates))
+        np.testing.assert_allclose(g.g, expected, rtol=1e-7)
+
+        # the g-function depends on the layout relative to the length, not on the order or position of the boreholes
+        scaled = fls_gfunction(np.array(coordinates[::-1]) * 2 + 100, 300, 0.15, 8, lntts)
+        np.testing.assert_allclose(scaled.g, g.g, rtol=1e-12)
+
+    def test_parallel_and_cache(self):
+        coordinates = [(6 * i, 6 * j) for i in range(10) for j in range(8)]
+        serial = fls_gfunction(coordinates, 150, 0.075)
+        np.testing.assert_array_equal(serial.lntts, DEFAULT_LNTTS)
+        self.assertTrue(np.all(np.diff(serial.g) > 0))
+
+        parallel = fls_gfunction(coordinates, 150, 0.075, workers=2)
+        np.testing.assert_allclose(parallel.g, serial.g, rtol=1e-14)
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = fls_gfunction(coordinates, 150, 0.075, cache_dir=cache_dir)
+            self.assertEqual(len(list(Path(cache_dir).glob("*.npy"))), 1)
+            second = fls_gfunction(coordinates, 150, 0.075, cache_dir=cache_dir)
+            np.testing.assert_array_equal(first.g, second.g)
+            np.testing.assert_allclose(first.g, serial.g, rtol=1e-14)
+
+            fls_gfunction(coordinates, 150, 0.075, burial_depth=2, cache_dir=cache_dir)
+            self.assertEqual(len(list(Path(cache_dir).glob("*.npy"))), 2)
+
+    def test_borehole(self):
+        bh = Borehole()
+        bh.init_from_dict(COAXIAL)
+        coordinates = [(0, 0), (6, 0), (12, 0)]
+        expected = fls_gfunction(coordinates, 150, 0.075, lntts=[-4, 0])
+        np.testing.assert_array_equal(bh.calc_gfunction(coordinates, lntts=[-4, 0]).g, expected.g)
+
+        with self.assertRaises(TypeError):
+            Borehole().calc_gfunction(coordinates)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            fls_gfunction([0, 0], 150, 0.075)
+        with self.assertRaises(ValueError):
+            fls_gfunction([(0, 0), (0.1, 0)], 150, 0.075)
+        with self.assertRaises(ValueError):
+            fls_gfunction([(0, 0)], 150, 0.075, lntts=[0, -1])
+        with self.assertRaises(ValueError):
+            fls_gfunction([(0, 0)], 0, 0.075)
+        with self.assertRaises(ValueError):
+            fls_gfunction([(0, 0)], 150, 0.075, workers=0)
@@ -0,0 +1,184 @@
+import unittest
+
+import numpy as np
+
+from bhr.borehole import Borehole
+from bhr.hydraulics import HydraulicNetwork
+from bhr.pipe import Pipe
+
+SINGLE_U = {
+    "borehole_type": "single_u_tube",
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 150,
+    "borehole_diameter": 0.14,
+    "single_u_tube": {
+        "pipe_outer_diameter": 0.032,
+        "pipe_dimension_ratio": 11,
+        "pipe_conductivity": 0.4,
+        "shank_space": 0.032,
+    },
+}
+
+DOUBLE_U = {
+    "borehole_type": "double_u_tube",
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 150,
+    "borehole_diameter": 0.14,
+    "double_u_tube": {
+        "pipe_outer_diameter": 0.032,
+        "pipe_dimension_ratio": 11,
+        "pipe_conductivity": 0.4,
+        "shank_space": 0.032,
+        "pipe_inlet_arrangement": "ADJACENT",
+    },
+}
+
+COAXIAL = {
+    "borehole_type": "coaxial",
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 100,
+    "borehole_diameter": 0.14,
+    "coaxial": {
+        "outer_pipe_outer_diameter": 0.1,
+        "outer_pipe_dimension_ratio": 11,
+        "outer_pipe_conductivity": 0.4,
+        "inner_pipe_outer_diameter": 0.05,
+        "inner_pipe_dimension_ratio": 11,
+        "inner_pipe_conductivity": 0.4,
+    },
+}
+
+HEADER = {"pipe_outer_diameter": 0.09, "pipe_dimension_ratio": 11, "segment_length": 6}
+
+
+def path_losses(configs, flows, temp, reverse_return=True, header=HEADER):
+    """
+    Pressure loss along the path through each borehole, computed one segment at a time.
+    """
+
+    n = len(configs)
+    losses = []
+    for k in range(n):
+        bh = Borehole()
+        bh.init_from_dict(configs[k])
+        loss = bh.calc_pressure_loss(flows[k], temp)
+        if header is None:
+            losses.append(loss)
+            continue
+
+        header_pipe = Pipe(
+            header["pipe_outer_diameter"],
+            header["pipe_dimension_ratio"],
+            header["segment_length"],
+            0.4,
+            "PROPYLENEGLYCOL",
+            0.2,
+        )
+        loss += sum(header_pipe.pressure_loss(flows[j:].sum(), temp) for j in range(k + 1))
+        if reverse_return:
+            loss += sum(header_pipe.pressure_loss(flows[: j + 1].sum(), temp) for j in range(k, n))
+        else:
+            loss += sum(header_pipe.pressure_loss(flows[j:].sum(), temp) for j in range(k + 1))
+        losses.append(loss)
+    return np.array(losses)
+
+
+class TestHydraulicNetwork(unittest.TestCase):
+    def test_no_header(self):
+        net = HydraulicNetwork([SINGLE_U] * 8)
+        solution = net.solve(2.0, 20)
+        np.testing.assert_allclose(solution.branch_flows, 0.25, rtol=1e-12)
+
+        bh = Borehole()
+        bh.init_from_dict(SINGLE_U)
+        self.assertAlmostEqual(solution.pressure_drop, bh.calc_pressure_loss(0.25, 20), delta=1e-6)
+
+        # the shorter boreholes take more of the flow
+        configs = [SINGLE_U, {**SINGLE_U, "length": 100}, DOUBLE_U, COAXIAL]
+        solution = HydraulicNetwork(configs).solve(2.0, 20)
+        self.assertAlmostEqual(solution.branch_flows.sum(), 2.0, delta=1e-12)
+        self.assertGreater(solution.branch_flows[1], solution.branch_flows[0])
+
+        losses = path_losses(configs, solution.branch_flows, 20, header=None)
+        np.testing.assert_allclose(losses, solution.pressure_drop, rtol=1e-7)
+
+    def test_pressure_balance(self):
+        configs = [SINGLE_U, DOUBLE_U, COAXIAL, {**SINGLE_U, "length": 100}, SINGLE_U, DOUBLE_U, SINGLE_U]
+        for reverse_return in (True, False):
+            net = HydraulicNetwork(configs, header=HEADER, reverse_return=reverse_return, pump_efficiency=0.5)
+            for field_m_dot, temp in ((3.0, 20), (0.5, 5), (6.0, 30)):
+                solution = net.solve(field_m_dot, temp)
+                self.assertAlmostEqual(solution.branch_flows.sum(), field_m_dot, delta=1e-7 * field_m_dot)
+                self.assertTrue(np.all(solution.branch_flows > 0))
+
+                losses = path_losses(configs, solution.branch_flows, temp, reverse_return)
+                np.testing.assert_allclose(losses, solution.pressure_drop, rtol=1e-7)
+
+                expected = solution.pressure_drop * field_m_dot / net.fluid.density(temp) / 0.5
+                self.assertAlmostEqual(solution.pumping_power, expected, delta=1e-9 * expected)
+
+    def test_distinct_boreholes(self):
+        # every borehole differs, so no two share a Borehole
+        configs = [{**(SINGLE_U, DOUBLE_U, COAXIAL)[i % 3], "length": 80 + 5 * i} for i in range(12)]
+        net = HydraulicNetwork(configs, header=HEADER)
+        solution = net.solve(4.0, 10)
+        losses = path_losses(configs, solution.branch_flows, 10)
+        np.testing.assert_allclose(losses, solution.pressure_drop, rtol=1e-7)
+
+    def test_reverse_return(self):
+        configs = [SINGLE_U] * 20
+        direct = HydraulicNetwork(configs, header=HEADER, reverse_return=False).solve(8.0, 20)
+        reverse = HydraulicNetwork(configs, header=HEADER, reverse_return=True).solve(8.0, 20)
+
+        # with a direct return, the boreholes nearest the inlet and outlet take the most flow
+        self.assertTrue(np.all(np.diff(direct.branch_flows) < 0))
+
+        # a reverse return balances the path lengths, and so the flows
+        self.assertLess(np.ptp(reverse.branch_flows), np.ptp(direct.branch_flows))
+
+    def test_solve_series(self):
+        configs = [SINGLE_U, DOUBLE_U, COAXIAL] * 10
+        field_m_dot = 10 + 4 * np.sin(np.arange(12) / 3)
+        temp = 15 + 10 * np.cos(np.arange(12) / 4)
+
+        net = HydraulicNetwork(configs, header=HEADER)
+        flows, pressure_drop, pumping_power = net.solve_series(field_m_dot, temp)
+        self.assertEqual(flows.shape, (12, 30))
+
+        cold_iterations = 0
+        for i, (m, t) in enumerate(zip(field_m_dot, temp)):
+            # each solve from an even split and a new Jacobian
+            solution = HydraulicNetwork(configs, header=HEADER).solve(m, t)
+            cold_iterations += solution.iterations
+            np.testing.assert_allclose(flows[i], solution.branch_flows, rtol=1e-6)
+            self.assertAlmostEqual(pressure_drop[i], solution.pressure_drop, delta=1e-7 * solution.pressure_drop)
+            self.assertAlmostEqual(pumping_power[i], solution.pumping_power, delta=1e-7 * solution.pumping_power)
+
+        # warm starts from the previous timestep take fewer iterations
+        net = HydraulicNetwork(configs, header=HEADER)
+        warm_iterations = sum(net.solve(m, t).iterations for m, t in zip(field_m_dot, temp))
+        self.assertLess(warm_iterations, cold_iterations)
+
+    def test_zero_flow(self):
+        net = HydraulicNetwork([SINGLE_U] * 4, header=HEADER)
+        solution = net.solve(0, 20)
+        np.testing.assert_array_equal(solution.branch_flows, np.zeros(4))
+        self.assertEqual(solution.pressure_drop, 0)
+        self.assertEqual(solution.pumping_power, 0)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            HydraulicNetwork([])
+        with self.assertRaises(ValueError):
+            HydraulicNetwork([SINGLE_U, {**SINGLE_U, "fluid_type": "WATER", "fluid_concentration": 0}])
+        with self.assertRaises(ValueError):
+            HydraulicNetwork([SINGLE_U], pump_efficiency=0)
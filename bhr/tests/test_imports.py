@@ -0,0 +1,98 @@
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# import time of bhr.borehole, once numpy is loaded, s
+IMPORT_BUDGET = 0.1
+
+SINGLE_U = {
+    "borehole_type": "single_u_tube",
+    "fluid_type": "WATER",
+    "fluid_concentration": 0,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 100,
+    "borehole_diameter": 0.14,
+    "single_u_tube": {
+        "pipe_outer_diameter": 0.032,
+        "pipe_dimension_ratio": 11,
+        "pipe_conductivity": 0.4,
+        "shank_space": 0.032,
+    },
+}
+
+
+def run(code: str) -> str:
+    """
+    Runs code in a new interpreter, so no bhr or scp modules are loaded beforehand.
+
+    :return: standard output
+    """
+
+    return subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+
+
+class TestImports(unittest.TestCase):
+    def test_lazy_imports(self):
+        code = f"""
+import json, sys
+from bhr.borehole import Borehole
+
+def loaded():
+    return sorted(m for m in sys.modules if m.split(".")[0] in ("bhr", "scp"))
+
+before = loaded()
+bh = Borehole()
+bh.init_from_dict({SINGLE_U!r})
+bh.calc_bh_resist(0.5, 20)
+print(json.dumps([before, loaded()]))
+"""
+        before, after = json.loads(run(code))
+
+        lazy = [
+            "bhr.coaxial_borehole",
+            "bhr.compiled_borehole",
+            "bhr.double_u_borehole",
+            "bhr.fluid",
+            "bhr.kernels",
+            "bhr.multipole",
+            "bhr.single_u_borehole",
+            "bhr.solvers",
+            "bhr.surrogate",
+            "scp",
+        ]
+        for module in lazy:
+            self.assertNotIn(module, before)
+
+        # only the borehole type and fluid that were used
+        self.assertIn("bhr.single_u_borehole", after)
+        self.assertIn("scp.water", after)
+        for module in ("bhr.coaxial_borehole", "bhr.double_u_borehole", "bhr.compiled_borehole"):
+            self.assertNotIn(module, after)
+
+    def test_profiling_lazy_imports(self):
+        code = """
+import json, sys
+import bhr.profiling
+print(json.dumps(sorted(m for m in sys.modules if m.split(".")[0] in ("bhr", "scp"))))
+"""
+        loaded = json.loads(run(code))
+        for module in ("bhr.borehole", "bhr.fluid", "bhr.pipe", "scp"):
+            self.assertNotIn(module, loaded)
+
+    def test_import_time(self):
+        code = """
+from time import perf_counter
+import numpy
+t = perf_counter()
+import bhr.borehole
+print(perf_counter() - t)
+"""
+        elapsed = min(float(run(code)) for _ in range(3))
+        self.assertLess(elapsed, IMPORT_BUDGET)
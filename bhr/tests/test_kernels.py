@@ -0,0 +1,145 @@
+import importlib.util
+import unittest
+
+import numpy as np
+
+from bhr import kernels
+from bhr.borehole import Borehole
+from bhr.fluid import disable_tabulated_fluids, enable_tabulated_fluids
+
+BASE = {
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 200,
+    "borehole_diameter": 0.14,
+}
+FLUIDS = [
+    {"fluid_type": "WATER", "fluid_concentration": 0},
+    {"fluid_type": "PROPYLENEGLYCOL", "fluid_concentration": 0.2},
+]
+CONFIGS = [
+    {
+        "borehole_type": "single_u_tube",
+        "single_u_tube": {
+            "pipe_outer_diameter": 0.032,
+            "pipe_dimension_ratio": 11,
+            "pipe_conductivity": 0.4,
+            "shank_space": 0.032,
+        },
+    },
+    {
+        "borehole_type": "double_u_tube",
+        "double_u_tube": {
+            "pipe_outer_diameter": 0.032,
+            "pipe_dimension_ratio": 11,
+            "pipe_conductivity": 0.4,
+            "shank_space": 0.032,
+            "pipe_inlet_arrangement": "DIAGONAL",
+        },
+    },
+    {
+        "borehole_type": "double_u_tube",
+        "double_u_tube": {
+            "pipe_outer_diameter": 0.032,
+            "pipe_dimension_ratio": 11,
+            "pipe_conductivity": 0.4,
+            "shank_space": 0.032,
+            "pipe_inlet_arrangement": "ADJACENT",
+        },
+    },
+    {
+        "borehole_type": "coaxial",
+        "coaxial": {
+            "outer_pipe_outer_diameter": 0.1,
+            "outer_pipe_dimension_ratio": 11,
+            "outer_pipe_conductivity": 0.4,
+            "inner_pipe_outer_diameter": 0.05,
+            "inner_pipe_dimension_ratio": 11,
+            "inner_pipe_conductivity": 0.4,
+        },
+    },
+]
+
+# laminar, transitional, and turbulent flow, on both sides of the water correlation breakpoint
+M_DOT = np.geomspace(0.02, 3, 40)
+TEMP = np.linspace(1, 39, 40)
+
+
+def boreholes():
+    for fluid in FLUIDS:
+        for config in CONFIGS:
+            for bc in ("UNIFORM_HEAT_FLUX", "UNIFORM_BOREHOLE_WALL_TEMP"):
+                bh = Borehole()
+                bh.init_from_dict({**BASE, **fluid, **config, "boundary_condition": bc})
+                yield bh
+
+
+class TestKernels(unittest.TestCase):
+    def test_python_backend(self):
+        # the kernels are the compiled evaluators, with fluid properties interpolated as tabulated fluids do
+        enable_tabulated_fluids()
+        try:
+            expected = []
+            for bh in boreholes():
+                evaluator = bh.compile()
+                expected.append(np.array([evaluator.calc_bh_resist(m, t) for m, t in zip(M_DOT, TEMP)]))
+        finally:
+            disable_tabulated_fluids()
+
+        for bh, resist in zip(boreholes(), expected):
+            evaluator = bh.compile_kernel("python")
+            self.assertEqual(evaluator.backend, "python")
+            np.testing.assert_allclose(evaluator.calc_bh_resist_array(M_DOT, TEMP), resist, rtol=1e-12)
+            for m, t, r in zip(M_DOT.tolist(), TEMP.tolist(), resist.tolist()):
+                self.assertAlmostEqual(evaluator.calc_bh_resist(m, t), r, delta=1e-12 * r)
+
+            self.assertEqual(evaluator.calc_bh_resist_array(M_DOT.reshape(4, 10), 20).shape, (4, 10))
+
+    def test_tabulated_options(self):
+        # tabulated fluids keep their grid and interpolation method
+        for method in ("linear", "cubic"):
+            enable_tabulated_fluids(step=1.0, method=method)
+            try:
+                for bh in boreholes():
+                    evaluator = bh.compile()
+                    expected = np.array([evaluator.calc_bh_resist(m, t) for m, t in zip(M_DOT, TEMP)])
+                    kernel = bh.compile_kernel("python")
+                    np.testing.assert_allclose(kernel.calc_bh_resist_array(M_DOT, TEMP), expected, rtol=1e-12)
+            finally:
+                disable_tabulated_fluids()
+
+    @unittest.skipUnless(importlib.util.find_spec("numba"), "numba not installed")
+    def test_numba_backend(self):
+        for bh in boreholes():
+            python = bh.compile_kernel("python")
+            numba = bh.compile_kernel("numba")
+            self.assertEqual(numba.backend, "numba")
+
+            expected = python.calc_bh_resist_array(M_DOT, TEMP)
+            np.testing.assert_allclose(numba.calc_bh_resist_array(M_DOT, TEMP), expected, rtol=1e-13)
+            for m, t, r in zip(M_DOT.tolist(), TEMP.tolist(), expected.tolist()):
+                self.assertAlmostEqual(numba.calc_bh_resist(m, t), r, delta=1e-13 * r)
+
+    def test_set_backend(self):
+        self.assertEqual(kernels.get_backend(), "python")
+
+        with self.assertRaises(ValueError):
+            kernels.set_backend("fortran")
+
+        bh = next(boreholes())
+        with self.assertRaises(ValueError):
+            bh.compile_kernel("fortran")
+
+        if importlib.util.find_spec("numba") is None:
+            with self.assertRaises(ImportError):
+                kernels.set_backend("numba")
+            self.assertEqual(kernels.get_backend(), "python")
+        else:
+            kernels.set_backend("numba")
+            try:
+                self.assertEqual(bh.compile_kernel().backend, "numba")
+            finally:
+                kernels.set_backend("python")
+
+        with self.assertRaises(TypeError):
+            Borehole().compile_kernel()
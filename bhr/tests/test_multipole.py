@@ -0,0 +1,173 @@
+import unittest
+
+import numpy as np
+
+from bhr import multipole
+from bhr.borehole import Borehole
+from bhr.multipole import Multipole
+
+SINGLE_U = {
+    "borehole_type": "single_u_tube",
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "boundary_condition": "uniform_heat_flux",
+    "grout_conductivity": 1.0,
+    "soil_conductivity": 2.5,
+    "length": 150,
+    "borehole_diameter": 0.14,
+    "single_u_tube": {
+        "pipe_outer_diameter": 0.034,
+        "pipe_dimension_ratio": 11,
+        "pipe_conductivity": 0.4,
+        "shank_space": 0.03,
+    },
+}
+
+DOUBLE_U = {
+    "borehole_type": "double_u_tube",
+    "fluid_type": "WATER",
+    "fluid_concentration": 0,
+    "boundary_condition": "uniform_heat_flux",
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 200,
+    "borehole_diameter": 0.115,
+    "double_u_tube": {
+        "pipe_outer_diameter": 0.032,
+        "pipe_dimension_ratio": 20.164,
+        "pipe_conductivity": 0.389,
+        "shank_space": 0.02263,
+        "pipe_inlet_arrangement": "DIAGONAL",
+    },
+}
+
+COAXIAL = {
+    "borehole_type": "coaxial",
+    "fluid_type": "WATER",
+    "fluid_concentration": 0,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 100,
+    "borehole_diameter": 0.2,
+    "coaxial": {
+        "outer_pipe_outer_diameter": 0.1,
+        "outer_pipe_dimension_ratio": 11,
+        "outer_pipe_conductivity": 0.4,
+        "inner_pipe_outer_diameter": 0.05,
+        "inner_pipe_dimension_ratio": 11,
+        "inner_pipe_conductivity": 0.4,
+    },
+}
+
+M_DOT = np.array([0.05, 0.2, 0.5, 1.0])
+TEMP = np.array([2.0, 10.0, 25.0, 40.0])
+
+
+def configs():
+    adjacent = {**DOUBLE_U, "double_u_tube": {**DOUBLE_U["double_u_tube"], "pipe_inlet_arrangement": "ADJACENT"}}
+    for config in (SINGLE_U, DOUBLE_U, adjacent):
+        for boundary_condition in ("uniform_heat_flux", "uniform_borehole_wall_temp"):
+            yield {**config, "boundary_condition": boundary_condition}
+
+
+def make_borehole(config: dict) -> Borehole:
+    bh = Borehole()
+    bh.init_from_dict(config)
+    return bh
+
+
+class TestMultipole(unittest.TestCase):
+    def test_first_order_matches_closed_forms(self):
+        for config in configs():
+            with self.subTest(config=config["borehole_type"], bc=config["boundary_condition"]):
+                bh = make_borehole(config)
+                evaluator = bh.compile_multipole(order=1)
+                np.testing.assert_allclose(
+                    evaluator.calc_bh_resist_array(M_DOT, TEMP), bh.calc_bh_resist_array(M_DOT, TEMP), rtol=1e-12
+                )
+                self.assertAlmostEqual(evaluator.calc_bh_resist(0.5, 20), bh.calc_bh_resist(0.5, 20), delta=1e-12)
+
+    def test_local_and_internal_first_order(self):
+        bh = make_borehole(SINGLE_U)
+        r_b, r_a = bh.compile_multipole(order=1).calc_local_and_internal_resist(0.5, 20)
+        self.assertAlmostEqual(float(r_b), bh._bh.calc_local_bh_resistance(0.5, 20), delta=1e-12)
+        self.assertAlmostEqual(float(r_a), bh._bh.calc_total_internal_bh_resistance(0.5, 20), delta=1e-12)
+
+        bh = make_borehole(DOUBLE_U)
+        r_b, r_a = bh.compile_multipole(order=1).calc_local_and_internal_resist(0.5, 20)
+        self.assertAlmostEqual(float(r_b), bh._bh.calc_bh_resist_local(0.25, 20), delta=1e-12)
+        self.assertAlmostEqual(float(r_a), bh._bh.calc_internal_resist(0.25, 20), delta=1e-12)
+
+    def test_convergence(self):
+        for config in configs():
+            with self.subTest(config=config["borehole_type"], bc=config["boundary_condition"]):
+                bh = make_borehole(config)
+                reference = bh.compile_multipole(order=12).calc_bh_resist_array(M_DOT, TEMP)
+                errors = [
+                    np.max(np.abs(bh.compile_multipole(order).calc_bh_resist_array(M_DOT, TEMP) / reference - 1))
+                    for order in (1, 3, 8)
+                ]
+                self.assertLess(errors[1], 0.01)
+                self.assertLess(errors[2], 1e-3)
+                self.assertLess(errors[2], errors[0])
+
+    def test_projected_resistances(self):
+        # the projected forms of the symmetric layouts agree with the inverse of the full resistance matrix
+        pipe_resist = np.array([0.0, 0.01, 0.08, 0.3])
+        for config in configs():
+            for order in (1, 3, 8):
+                with self.subTest(config=config["borehole_type"], order=order):
+                    evaluator = make_borehole(config).compile_multipole(order)
+                    mp, inlets = evaluator.multipole, evaluator.inlets
+                    r_b, r_a = mp.calc_resistances(pipe_resist, inlets)
+                    r_b_scalar, r_a_scalar = mp.calc_resistances(0.08, inlets)
+                    self.assertIsNotNone(mp._forms[inlets.tobytes()])
+
+                    conductance = np.linalg.inv(mp.resistance_matrix(pipe_resist))
+                    flows = conductance @ np.where(inlets, 0.5, -0.5)
+                    np.testing.assert_allclose(r_b, 1 / conductance.sum(axis=(-2, -1)), rtol=1e-12)
+                    np.testing.assert_allclose(r_a, 1 / flows[..., inlets].mean(axis=-1), rtol=1e-12)
+                    self.assertAlmostEqual(r_b_scalar, r_b[2], delta=1e-14)
+                    self.assertAlmostEqual(r_a_scalar, r_a[2], delta=1e-14)
+
+    def test_eccentric_layout(self):
+        # any number of pipes at any position. the resistance matrix is symmetric
+        positions = [(0.03, 0.01), (-0.025, 0.0), (0.0, -0.035)]
+        mp = Multipole(positions, 0.012, 0.07, 1.2, 2.8, order=8)
+        r = mp.resistance_matrix([0.003, 0.01, 0.05])
+        self.assertEqual(r.shape, (3, 3, 3))
+        np.testing.assert_allclose(r, np.swapaxes(r, -1, -2), atol=1e-15)
+
+        # without equal row sums, the resistances fall back to the inverse of the resistance matrix
+        inlets = np.array([True, False, False])
+        r_b, _ = mp.calc_resistances([0.003, 0.01, 0.05], inlets)
+        self.assertIsNone(mp._forms[inlets.tobytes()])
+        np.testing.assert_allclose(r_b, 1 / np.linalg.inv(r).sum(axis=(-2, -1)), rtol=1e-12)
+
+    def test_direct_solve(self):
+        positions = [(0.03, 0.01), (-0.025, 0.0), (0.0, -0.035)]
+        pipe_resist = np.array([0.0, 0.01, 0.08])
+        expected = Multipole(positions, 0.012, 0.07, 1.2, 2.8, order=6).resistance_matrix(pipe_resist)
+
+        limit = multipole._MAX_EIGENVECTOR_CONDITION
+        multipole._MAX_EIGENVECTOR_CONDITION = 0
+        try:
+            direct = Multipole(positions, 0.012, 0.07, 1.2, 2.8, order=6)
+        finally:
+            multipole._MAX_EIGENVECTOR_CONDITION = limit
+        self.assertIsNotNone(direct._system)
+        np.testing.assert_allclose(direct.resistance_matrix(pipe_resist), expected, rtol=1e-10)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Multipole([(0.0, 0.0)], 0.01, 0.05, 1.5, 3, order=0)
+        with self.assertRaises(ValueError):
+            Multipole([(0.045, 0.0)], 0.01, 0.05, 1.5, 3)
+        with self.assertRaises(ValueError):
+            Multipole([(0.01, 0.0), (-0.005, 0.0)], 0.01, 0.05, 1.5, 3)
+        with self.assertRaises(ValueError):
+            Multipole([0.01, 0.0], 0.01, 0.05, 1.5, 3)
+        with self.assertRaises(NotImplementedError):
+            make_borehole(COAXIAL).compile_multipole()
+        with self.assertRaises(TypeError):
+            Borehole().compile_multipole()
@@ -1,6 +1,8 @@
 import unittest
 from math import log
 
+import numpy as np
+
 from bhr.pipe import Pipe
 
 
@@ -39,6 +41,23 @@ class TestPipe(unittest.TestCase):
         self.assertAlmostEqual(p.fluid_vol, 0.0586, delta=tol)
         self.assertAlmostEqual(p.pipe_wall_vol, 0.0289, delta=tol)
 
+    def test_geometry_attributes(self):
+        # derived geometry is stored on the instance and can be reassigned
+        p = Pipe(**self.inputs)
+        for name in (
+            "thickness",
+            "area_cr_pipe",
+            "area_s_inner",
+            "area_s_outer",
+            "total_vol",
+            "fluid_vol",
+            "pipe_wall_vol",
+        ):
+            value = getattr(p, name)
+            setattr(p, name, 2 * value)
+            self.assertEqual(getattr(p, name), 2 * value)
+        self.assertFalse(hasattr(p, "__dict__"))
+
     def test_mdot_to_re(self):
         p = Pipe(**self.inputs)
         tol = 0.1
@@ -78,6 +97,12 @@ class TestPipe(unittest.TestCase):
         re = 25000
         self.assertEqual(p.friction_factor(re), (0.79 * log(re) - 1.64) ** (-2.0))
 
+    def test_calc_friction_factor_array(self):
+        p = Pipe(**self.inputs)
+        re = np.array([100, 1000, 1400, 2000, 3000, 4000, 5000, 15000, 25000])
+        expected = [p.friction_factor(x) for x in re]
+        np.testing.assert_allclose(p.friction_factor_array(re), expected, rtol=1e-14)
+
     def test_laminar_nusselt(self):
         p = Pipe(**self.inputs)
         tol = 0.01
@@ -102,6 +127,17 @@ class TestPipe(unittest.TestCase):
         self.assertAlmostEqual(p.calc_conv_resist(0.07, temp), 0.020784, delta=tol)
         self.assertAlmostEqual(p.calc_conv_resist(2, temp), 0.00094, delta=tol)
 
+    def test_calc_convection_resistance_array(self):
+        p = Pipe(**self.inputs)
+        m_dot = np.array([0, 0.03, 0.05, 0.07, 0.1, 0.5, 2])
+        temp = np.array([20, 5, 10, 20, 30, 40, 20])
+        expected = [p.calc_conv_resist(m, t) for m, t in zip(m_dot, temp)]
+        np.testing.assert_allclose(p.calc_conv_resist_array(m_dot, temp), expected, rtol=1e-14)
+
+        # scalar temperature is broadcast against the flow rates
+        expected = [p.calc_fluid_pipe_resist(m, 20) for m in m_dot]
+        np.testing.assert_allclose(p.calc_fluid_pipe_resist_array(m_dot, 20), expected, rtol=1e-14)
+
     def test_calc_resist(self):
         pipe = Pipe(**self.inputs)
         tol = 0.00001
@@ -111,3 +147,10 @@ class TestPipe(unittest.TestCase):
         pipe = Pipe(**self.inputs)
         tol = 1
         self.assertAlmostEqual(pipe.pressure_loss(0.5, 20), 33533, delta=tol)
+
+    def test_pressure_loss_array(self):
+        pipe = Pipe(**self.inputs)
+        m_dot = np.array([0, 0.02, 0.05, 0.1, 0.5, 2])
+        temp = np.array([20, 5, 10, 20, 30, 40])
+        expected = [pipe.pressure_loss(m, t) for m, t in zip(m_dot, temp)]
+        np.testing.assert_allclose(pipe.pressure_loss_array(m_dot, temp), expected, rtol=1e-12)
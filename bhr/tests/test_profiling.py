@@ -0,0 +1,147 @@
+import unittest
+
+import numpy as np
+from scp.propylene_glycol import PropyleneGlycol
+
+from bhr import pipe, utilities
+from bhr.borehole import Borehole
+from bhr.fluid import clear_fluid_registry, disable_tabulated_fluids, enable_tabulated_fluids, get_fluid
+from bhr.pipe import Pipe
+from bhr.profiling import collect
+
+BASE = {
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 200,
+    "borehole_diameter": 0.14,
+}
+
+SINGLE_U = {
+    "borehole_type": "single_u_tube",
+    "single_u_tube": {
+        "pipe_outer_diameter": 0.032,
+        "pipe_dimension_ratio": 11,
+        "pipe_conductivity": 0.4,
+        "shank_space": 0.032,
+    },
+}
+
+DOUBLE_U = {
+    "borehole_type": "double_u_tube",
+    "boundary_condition": "UNIFORM_BOREHOLE_WALL_TEMP",
+    "double_u_tube": {
+        "pipe_outer_diameter": 0.032,
+        "pipe_dimension_ratio": 11,
+        "pipe_conductivity": 0.4,
+        "shank_space": 0.032,
+        "pipe_inlet_arrangement": "DIAGONAL",
+    },
+}
+
+
+def make_borehole(config: dict) -> Borehole:
+    bh = Borehole()
+    bh.init_from_dict({**BASE, **config})
+    return bh
+
+
+class TestProfiling(unittest.TestCase):
+    def test_collect(self):
+        single_u = make_borehole(SINGLE_U)
+        double_u = make_borehole(DOUBLE_U)
+        expected = single_u.calc_bh_resist(0.5, 20)
+
+        with collect() as profile:
+            for _ in range(3):
+                self.assertEqual(single_u.calc_bh_resist(0.5, 20), expected)
+            double_u.calc_bh_resist(0.25, 10)
+            double_u.calc_bh_resist(0.5, 10)
+            double_u.calc_bh_resist_array(np.linspace(0.1, 1, 10), 10)
+
+        self.assertEqual(len(profile.boreholes), 2)
+
+        calls = profile.for_borehole(single_u).calls
+        self.assertEqual(calls["Borehole.calc_bh_resist"].calls, 3)
+        self.assertEqual(calls["SingleUBorehole.calc_effective_bh_resistance_uhf"].calls, 3)
+        self.assertEqual(calls["Pipe.calc_conv_resist"].calls, 3)
+        self.assertEqual(calls["Pipe.friction_factor"].calls, 3)
+        self.assertGreaterEqual(calls["fluid.viscosity"].calls, 3)
+        self.assertGreater(calls["Borehole.calc_bh_resist"].seconds, 0)
+        self.assertNotIn("DoubleUTube.calc_effective_bh_resistance_ubwt", calls)
+
+        repeated = profile.for_borehole(single_u).repeated
+        self.assertEqual(repeated[("Borehole.calc_bh_resist", 0.5, 20.0)], 3)
+
+        calls = profile.for_borehole(double_u).calls
+        self.assertEqual(calls["DoubleUTube.calc_effective_bh_resistance_ubwt"].calls, 2)
+        self.assertEqual(calls["DoubleUTube.calc_effective_bh_resistance_ubwt_array"].calls, 1)
+        self.assertIn("smoothing_function", calls)
+        self.assertEqual(profile.for_borehole(double_u).repeated, {})
+
+        report = profile.report()
+        self.assertIn("SINGLE_U_TUBE, UNIFORM_HEAT_FLUX", report)
+        self.assertIn("DOUBLE_U_TUBE, UNIFORM_BOREHOLE_WALL_TEMP", report)
+        self.assertIn("Borehole.calc_bh_resist at m_dot=0.5, temp=20: 3 times", report)
+
+        with self.assertRaises(LookupError):
+            profile.for_borehole(Borehole())
+
+    def test_unattributed_calls(self):
+        bh = make_borehole(SINGLE_U)
+        with collect() as profile:
+            bh._bh.update_beta(0.5, 20)
+
+        self.assertEqual(profile.boreholes, [])
+        self.assertEqual(profile.unattributed.calls["SingleUBorehole.update_beta"].calls, 1)
+
+    def test_tabulated_fluids(self):
+        enable_tabulated_fluids()
+        try:
+            bh = make_borehole(SINGLE_U)
+            with collect() as profile:
+                bh.calc_bh_resist(0.5, 20)
+        finally:
+            disable_tabulated_fluids()
+
+        calls = profile.for_borehole(bh).calls
+        self.assertIn("fluid.viscosity", calls)
+        self.assertIn("fluid.prandtl", calls)
+
+    def test_restore(self):
+        calc_bh_resist = Borehole.__dict__["calc_bh_resist"]
+        friction_factor = Pipe.__dict__["friction_factor"]
+
+        with self.assertRaises(ValueError), collect():
+            self.assertIsNot(Borehole.__dict__["calc_bh_resist"], calc_bh_resist)
+            raise ValueError
+
+        self.assertIs(Borehole.__dict__["calc_bh_resist"], calc_bh_resist)
+        self.assertIs(Pipe.__dict__["friction_factor"], friction_factor)
+        self.assertIs(pipe.smoothing_function, utilities.smoothing_function)
+
+        # calls made after collection has ended are not recorded
+        bh = make_borehole(SINGLE_U)
+        with collect() as profile:
+            pass
+        bh.calc_bh_resist(0.5, 20)
+        self.assertEqual(profile.boreholes, [])
+
+    def test_fluid_instances(self):
+        # fluid classes are not modified; fluids created while collecting are instrumented
+        viscosity = PropyleneGlycol.viscosity
+        clear_fluid_registry()
+        with collect() as profile:
+            self.assertIs(PropyleneGlycol.viscosity, viscosity)
+            bh = make_borehole(SINGLE_U)
+            fluid = get_fluid("PROPYLENEGLYCOL", 0.2)
+            self.assertIn("viscosity", vars(fluid))
+            bh.calc_bh_resist(0.5, 20)
+
+        self.assertIn("fluid.viscosity", profile.for_borehole(bh).calls)
+        self.assertNotIn("viscosity", vars(fluid))
+
+    def test_nested(self):
+        with collect(), self.assertRaises(RuntimeError), collect():
+            pass
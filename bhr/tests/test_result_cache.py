@@ -0,0 +1,111 @@
+import math
+import pickle
+import unittest
+
+from bhr.borehole import Borehole
+from bhr.result_cache import ResultCache
+
+SINGLE_U = {
+    "borehole_type": "single_u_tube",
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 150,
+    "borehole_diameter": 0.14,
+    "single_u_tube": {
+        "pipe_outer_diameter": 0.032,
+        "pipe_dimension_ratio": 11,
+        "pipe_conductivity": 0.4,
+        "shank_space": 0.032,
+    },
+}
+
+
+class TestResultCache(unittest.TestCase):
+    def test_lru(self):
+        calls = []
+
+        def func(m_dot, temp):
+            calls.append((m_dot, temp))
+            return m_dot + temp
+
+        cache = ResultCache(maxsize=2, m_dot_resolution=0.1, temp_resolution=1)
+        self.assertAlmostEqual(cache.get(0.52, 20.2, func), 20.5, delta=1e-12)
+        self.assertAlmostEqual(cache.get(0.48, 19.8, func), 20.5, delta=1e-12)
+        self.assertEqual(len(calls), 1)
+
+        cache.get(1.0, 20, func)
+        cache.get(0.5, 20, func)  # most recently used, so (1.0, 20) is evicted next
+        cache.get(2.0, 20, func)
+        self.assertEqual(len(cache), 2)
+        cache.get(0.5, 20, func)
+        cache.get(1.0, 20, func)
+        self.assertEqual(len(calls), 4)
+
+        info = cache.info()
+        self.assertEqual((info.hits, info.misses, info.maxsize, info.currsize), (3, 4, 2, 2))
+        self.assertAlmostEqual(info.hit_rate, 3 / 7, delta=1e-12)
+
+        cache.clear()
+        info = cache.info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, 0, 0))
+        self.assertEqual(info.hit_rate, 0)
+
+        copy = pickle.loads(pickle.dumps(cache))  # noqa: S301
+        self.assertEqual((copy.maxsize, copy.m_dot_resolution, copy.temp_resolution), (2, 0.1, 1))
+
+        with self.assertRaises(ValueError):
+            ResultCache(maxsize=0)
+        with self.assertRaises(ValueError):
+            ResultCache(temp_resolution=0)
+
+    def test_non_finite(self):
+        # NaN and infinite inputs skip the cache and are passed to func unrounded
+        calls = []
+
+        def func(m_dot, temp):
+            calls.append((m_dot, temp))
+            return m_dot + temp
+
+        cache = ResultCache(m_dot_resolution=0.1, temp_resolution=1)
+        self.assertTrue(math.isnan(cache.get(math.nan, 20.2, func)))
+        self.assertEqual(cache.get(0.52, math.inf, func), math.inf)
+        self.assertEqual(calls[1], (0.52, math.inf))
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.info().misses, 0)
+
+    def test_borehole(self):
+        bh = Borehole()
+        bh.init_from_dict(SINGLE_U)
+        self.assertIsNone(bh.cache_info())
+        expected = bh.calc_bh_resist(0.5, 20)
+
+        bh.enable_cache(maxsize=16, temp_resolution=0.01)
+        self.assertAlmostEqual(bh.calc_bh_resist(0.5, 20), expected, delta=1e-15)
+        self.assertAlmostEqual(bh.calc_bh_resist(0.5, 20.004), expected, delta=1e-15)
+        self.assertAlmostEqual(bh.calc_bh_resist(0.5, 20), expected, delta=1e-15)
+        info = bh.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 1, 1))
+
+        # re-initializing empties the cache
+        bh.init_from_dict({**SINGLE_U, "length": 100})
+        self.assertEqual(bh.cache_info().currsize, 0)
+        self.assertLess(bh.calc_bh_resist(0.5, 20), expected)
+
+        bh.init_single_u_borehole(0.14, 0.032, 11, 150, 0.032, 0.4, 1.5, 3, "PROPYLENEGLYCOL", 0.2)
+        self.assertEqual(bh.cache_info().currsize, 0)
+        self.assertAlmostEqual(bh.calc_bh_resist(0.5, 20), expected, delta=1e-15)
+
+        copy = pickle.loads(pickle.dumps(bh))  # noqa: S301
+        self.assertEqual(copy.cache_info().currsize, 0)
+        self.assertAlmostEqual(copy.calc_bh_resist(0.5, 20), expected, delta=1e-15)
+
+        bh.disable_cache()
+        self.assertIsNone(bh.cache_info())
+
+        with self.assertRaises(TypeError):
+            uninitialized = Borehole()
+            uninitialized.enable_cache()
+            uninitialized.calc_bh_resist(0.5, 20)
@@ -0,0 +1,105 @@
+import unittest
+from math import log, pi
+
+import numpy as np
+
+from bhr.borehole import Borehole
+from bhr.fluid import get_fluid
+from bhr.simulation import GFunction, Simulation
+
+SINGLE_U = {
+    "borehole_type": "single_u_tube",
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 150,
+    "borehole_diameter": 0.14,
+    "single_u_tube": {
+        "pipe_outer_diameter": 0.032,
+        "pipe_dimension_ratio": 11,
+        "pipe_conductivity": 0.4,
+        "shank_space": 0.032,
+    },
+}
+
+# g-function of a 4 x 4 field, B/H = 0.05
+LNTTS = [-8.5, -7.8, -7.2, -6.5, -5.9, -5.2, -4.5, -3.963, -3.27, -2.864, -2.577, -2.171, -1.884, -1.191, -0.497]
+G = [4.03, 4.79, 5.48, 6.25, 6.87, 7.51, 8.04, 8.54, 9.06, 9.37, 9.63, 9.99, 10.28, 10.87, 11.46]
+
+
+class TestSimulation(unittest.TestCase):
+    def setUp(self):
+        self.gfunction = GFunction(LNTTS, G)
+        self.sim = Simulation(SINGLE_U, self.gfunction, 1e-6, 12, num_boreholes=16)
+
+        hours = np.arange(500)
+        self.loads = 30_000 * np.sin(2 * np.pi * hours / 200) + 10_000 * np.sin(2 * np.pi * hours / 24)
+
+    def test_borehole_wall_temp(self):
+        # direct superposition of the load steps, one step at a time
+        time_step = 3600
+        ts = 150**2 / (9 * 1e-6)
+        q_prime = self.loads / (16 * 150)
+        expected = np.empty_like(q_prime)
+        for n in range(q_prime.size):
+            total = 0
+            for i in range(n + 1):
+                d_q = q_prime[i] - (q_prime[i - 1] if i else 0)
+                total += d_q * self.gfunction(log((n - i + 1) * time_step / ts)) / (2 * pi * 3)
+            expected[n] = 12 + total
+
+        np.testing.assert_allclose(self.sim.borehole_wall_temp(self.loads, time_step), expected, rtol=0, atol=1e-10)
+
+        # a constant load gives the g-function response
+        t_b = self.sim.borehole_wall_temp(np.full(100, 16 * 150 * 2 * pi * 3.0), 1800)
+        np.testing.assert_allclose(t_b - 12, self.gfunction(np.log(1800 * np.arange(1, 101) / ts)), atol=1e-10)
+
+    def test_run(self):
+        m_dot = np.where(np.arange(500) % 50 < 25, 6.0, 4.0)
+        result = self.sim.run(self.loads, m_dot)
+
+        bh = Borehole()
+        bh.init_from_dict(SINGLE_U)
+        q_prime = self.loads / (16 * 150)
+        resist = bh.calc_bh_resist_array(m_dot / 16, result.mean_fluid_temp)
+        np.testing.assert_allclose(result.bh_resist, resist, rtol=1e-6)
+        np.testing.assert_allclose(
+            result.mean_fluid_temp, result.borehole_wall_temp + q_prime * resist, rtol=0, atol=1e-5
+        )
+
+        # heat rejection cools the fluid on its way through the boreholes
+        cp = get_fluid("PROPYLENEGLYCOL", 0.2).cp
+        for i in (0, 100, 260, 499):
+            delta_t = self.loads[i] / (m_dot[i] * cp(result.mean_fluid_temp[i]))
+            self.assertAlmostEqual(result.entering_fluid_temp[i] - result.exiting_fluid_temp[i], delta_t, delta=1e-9)
+            self.assertAlmostEqual(
+                (result.entering_fluid_temp[i] + result.exiting_fluid_temp[i]) / 2,
+                result.mean_fluid_temp[i],
+                delta=1e-9,
+            )
+
+    def test_zero_flow(self):
+        loads = self.loads.copy()
+        loads[100:150] = 0
+        m_dot = np.full(500, 6.0)
+        m_dot[100:150] = 0
+        result = self.sim.run(loads, m_dot)
+        np.testing.assert_array_equal(result.mean_fluid_temp[100:150], result.borehole_wall_temp[100:150])
+        np.testing.assert_array_equal(result.exiting_fluid_temp[100:150], result.borehole_wall_temp[100:150])
+        self.assertTrue(np.isnan(result.bh_resist[100:150]).all())
+        self.assertFalse(np.isnan(result.bh_resist[:100]).any())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            GFunction([1, 0], [1, 2])
+        with self.assertRaises(ValueError):
+            GFunction([0, 1], [1, 2, 3])
+        with self.assertRaises(ValueError):
+            Simulation(SINGLE_U, self.gfunction, 0, 12)
+        with self.assertRaises(ValueError):
+            self.sim.run(self.loads, 0)
+        with self.assertRaises(ValueError):
+            self.sim.run(self.loads, -1)
+        with self.assertRaises(ValueError):
+            self.sim.run(self.loads.reshape(10, 50), 6.0)
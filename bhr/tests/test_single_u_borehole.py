@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+import numpy as np
+
 from bhr.single_u_borehole import SingleUBorehole
 
 
@@ -25,8 +27,9 @@ class TestSingleUBorehole(TestCase):
 
     def test_update_beta(self):
         bh = SingleUBorehole(**self.inputs)
-        bh.update_beta(m_dot=0.5, temp=20)
-        self.assertAlmostEqual(bh.pipe_resist, 0.05, delta=0.00001)
+        self.assertAlmostEqual(bh.calc_fluid_pipe_resist(m_dot=0.5, temp=20), 0.05, delta=0.00001)
+        self.assertAlmostEqual(bh.update_beta(m_dot=0.5, temp=20), bh.two_pi_kg * 0.05, delta=0.0001)
+        self.assertFalse(hasattr(bh, "pipe_resist"))
 
     def test_calc_internal_and_grout_resistance(self):
         bh = SingleUBorehole(**self.inputs)
@@ -40,7 +43,6 @@ class TestSingleUBorehole(TestCase):
 
         self.inputs.update({"soil_conductivity": 1.0, "grout_conductivity": 3.6})
         bh = SingleUBorehole(**self.inputs)
-        bh.update_beta(m_dot=0.5, temp=20)
         self.assertAlmostEqual(bh.calc_total_internal_bh_resistance(flow_rate, temperature), 0.17456, delta=tolerance)
         self.assertAlmostEqual(bh.calc_grout_resistance(flow_rate, temperature), 0.03373, delta=tolerance)
 
@@ -53,3 +55,14 @@ class TestSingleUBorehole(TestCase):
         bh = SingleUBorehole(**self.inputs)
         tolerance = 1e-3
         self.assertAlmostEqual(bh.calc_effective_bh_resistance_ubwt(m_dot=0.5, temp=20), 0.20435, delta=tolerance)
+
+    def test_calc_effective_bh_resistance_array(self):
+        bh = SingleUBorehole(**self.inputs)
+        m_dot = np.array([0.05, 0.1, 0.2, 0.5, 1.0])
+        temp = np.array([5, 10, 20, 30, 40])
+
+        expected = [bh.calc_effective_bh_resistance_uhf(m, t) for m, t in zip(m_dot, temp)]
+        np.testing.assert_allclose(bh.calc_effective_bh_resistance_uhf_array(m_dot, temp), expected, rtol=1e-12)
+
+        expected = [bh.calc_effective_bh_resistance_ubwt(m, t) for m, t in zip(m_dot, temp)]
+        np.testing.assert_allclose(bh.calc_effective_bh_resistance_ubwt_array(m_dot, temp), expected, rtol=1e-12)
@@ -0,0 +1,126 @@
+import unittest
+
+import numpy as np
+
+from bhr.borehole import Borehole
+from bhr.solvers import _illinois
+
+BASE = {
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 200,
+    "borehole_diameter": 0.14,
+}
+CONFIGS = [
+    {
+        "borehole_type": "single_u_tube",
+        "single_u_tube": {
+            "pipe_outer_diameter": 0.032,
+            "pipe_dimension_ratio": 11,
+            "pipe_conductivity": 0.4,
+            "shank_space": 0.032,
+        },
+    },
+    {
+        "borehole_type": "double_u_tube",
+        "double_u_tube": {
+            "pipe_outer_diameter": 0.032,
+            "pipe_dimension_ratio": 11,
+            "pipe_conductivity": 0.4,
+            "shank_space": 0.032,
+            "pipe_inlet_arrangement": "ADJACENT",
+        },
+    },
+    {
+        "borehole_type": "coaxial",
+        "coaxial": {
+            "outer_pipe_outer_diameter": 0.1,
+            "outer_pipe_dimension_ratio": 11,
+            "outer_pipe_conductivity": 0.4,
+            "inner_pipe_outer_diameter": 0.05,
+            "inner_pipe_dimension_ratio": 11,
+            "inner_pipe_conductivity": 0.4,
+        },
+    },
+]
+
+
+class TestSolvers(unittest.TestCase):
+    def test_mass_flow_for_resist(self):
+        for config in CONFIGS:
+            for bc in ("UNIFORM_HEAT_FLUX", "UNIFORM_BOREHOLE_WALL_TEMP"):
+                bh = Borehole()
+                bh.init_from_dict({**BASE, **config, "boundary_condition": bc})
+                evaluator = bh.compile()
+
+                for temp in (0.0, 20.0):
+                    # targets spanning laminar, transitional, and turbulent flow
+                    m_dot = np.geomspace(0.01, 5, 25)
+                    targets = bh.calc_bh_resist_array(m_dot, temp) * 1.0001
+                    solved = bh.solve_mass_flow_for_resist(targets, temp, rtol=1e-10)
+                    self.assertEqual(solved.shape, targets.shape)
+
+                    for m, target in zip(solved, targets):
+                        self.assertLessEqual(evaluator.calc_bh_resist(m, temp), target)
+                        self.assertGreater(evaluator.calc_bh_resist(m * (1 - 1e-9), temp), target)
+
+        bh = Borehole()
+        bh.init_from_dict({**BASE, **CONFIGS[0]})
+        m_dot = bh.solve_mass_flow_for_resist(0.2, 10)
+        self.assertIsInstance(m_dot, float)
+        self.assertAlmostEqual(bh.calc_bh_resist(m_dot, 10), 0.2, delta=1e-9)
+
+        # broadcast against temperature
+        solved = bh.solve_mass_flow_for_resist(0.2, [0, 10, 20])
+        self.assertAlmostEqual(solved[1], m_dot, delta=1e-12)
+
+        # not reachable within the search range, or already met at its lower limit
+        self.assertTrue(np.isnan(bh.solve_mass_flow_for_resist(0.01, 10)))
+        self.assertTrue(np.isnan(bh.solve_mass_flow_for_resist(1e6, 10)))
+        self.assertTrue(np.isnan(bh.solve_mass_flow_for_resist(0.2, 10, m_dot_range=(0.001, 0.1))))
+
+        with self.assertRaises(ValueError):
+            bh.solve_mass_flow_for_resist(0.2, 10, m_dot_range=(1, 0.1))
+
+        with self.assertRaises(TypeError):
+            Borehole().solve_mass_flow_for_resist(0.2, 10)
+
+    def test_mass_flow_for_reynolds(self):
+        temp = np.array([0.0, 10.0, 30.0])
+        for config in CONFIGS:
+            bh = Borehole()
+            bh.init_from_dict({**BASE, **config})
+            m_dot = bh.solve_mass_flow_for_reynolds(4000, temp)
+
+            match config["borehole_type"]:
+                case "single_u_tube":
+                    re = bh._bh.mdot_to_re_array(m_dot, temp)
+                case "double_u_tube":
+                    re = bh._bh.mdot_to_re_array(m_dot / 2, temp)
+                case "coaxial":
+                    re = np.minimum(
+                        bh._bh.inner_pipe.mdot_to_re_array(m_dot, temp), bh._bh.re_annulus_array(m_dot, temp)
+                    )
+
+            np.testing.assert_allclose(re, 4000, rtol=1e-12)
+            self.assertIsInstance(bh.solve_mass_flow_for_reynolds(4000, 10), float)
+
+        with self.assertRaises(TypeError):
+            Borehole().solve_mass_flow_for_reynolds(4000, 10)
+
+    def test_illinois(self):
+        calls = []
+
+        def func(x):
+            calls.append(x)
+            return 2 - x**3
+
+        root = _illinois(func, 0.0, 4.0, func(0.0), func(4.0), 1e-12, 100)
+        self.assertAlmostEqual(root, 2 ** (1 / 3), delta=1e-12)
+        self.assertLessEqual(func(root), 0)
+        self.assertLess(len(calls), 30)
+
+        with self.assertRaises(RuntimeError):
+            _illinois(func, 0.0, 4.0, func(0.0), func(4.0), 1e-12, 3)
@@ -0,0 +1,172 @@
+import csv
+import importlib.util
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from bhr.borehole import Borehole
+from bhr.streaming import BREAKDOWN_COLUMNS, ChunkWriter, build_boreholes, evaluate_chunk, process_file, read_chunks
+
+SINGLE = {
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 200,
+    "borehole_diameter": 0.115,
+    "borehole_type": "single_u_tube",
+    "single_u_tube": {
+        "pipe_outer_diameter": 0.032,
+        "pipe_dimension_ratio": 11,
+        "pipe_conductivity": 0.4,
+        "shank_space": 0.02,
+    },
+}
+
+COAXIAL = {
+    "fluid_type": "WATER",
+    "fluid_concentration": 0,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 150,
+    "borehole_diameter": 0.115,
+    "borehole_type": "coaxial",
+    "coaxial": {
+        "outer_pipe_outer_diameter": 0.064,
+        "outer_pipe_dimension_ratio": 11,
+        "outer_pipe_conductivity": 0.389,
+        "inner_pipe_outer_diameter": 0.032,
+        "inner_pipe_dimension_ratio": 11,
+        "inner_pipe_conductivity": 0.389,
+    },
+}
+
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp_dir.name)
+
+        self.num_rows = 25
+        self.ids = ["bh-1", "bh-2"] * 12 + ["bh-1"]
+        self.m_dot = np.linspace(0.1, 1.0, self.num_rows)
+        self.temp = np.linspace(5, 30, self.num_rows)
+
+        self.input_csv = self.dir / "input.csv"
+        with open(self.input_csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["timestamp", "borehole", "m_dot", "temp"])
+            for i in range(self.num_rows):
+                writer.writerow([f"2024-01-01 {i:02d}:00", self.ids[i], self.m_dot[i], self.temp[i]])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_read_chunks(self):
+        chunks = list(read_chunks(self.input_csv, chunk_size=10))
+        self.assertEqual([len(chunk["m_dot"]) for chunk in chunks], [10, 10, 5])
+        self.assertEqual(chunks[2]["borehole"][-1], "bh-1")
+
+        with self.assertRaises(ValueError):
+            list(read_chunks(self.input_csv, chunk_size=0))
+        with self.assertRaises(ValueError):
+            list(read_chunks(self.dir / "input.txt"))
+
+    def test_process_file_single_config(self):
+        output = self.dir / "output.csv"
+        rows = process_file(self.input_csv, output, SINGLE, chunk_size=7)
+        self.assertEqual(rows, self.num_rows)
+
+        bh = Borehole()
+        bh.init_from_dict(SINGLE)
+
+        with open(output, newline="") as f:
+            result = list(csv.DictReader(f))
+
+        self.assertEqual(list(result[0]), ["timestamp", "borehole", "m_dot", "temp", "bh_resist"])
+        self.assertEqual(result[4]["timestamp"], "2024-01-01 04:00")
+        actual = [float(row["bh_resist"]) for row in result]
+        np.testing.assert_allclose(actual, bh.calc_bh_resist_array(self.m_dot, self.temp), rtol=1e-12)
+
+    def test_process_file_borehole_ids(self):
+        output = self.dir / "output.csv"
+        configs = {"bh-1": SINGLE, "bh-2": COAXIAL}
+        process_file(self.input_csv, output, configs, borehole_id_column="borehole", chunk_size=4, breakdown=True)
+
+        with open(output, newline="") as f:
+            result = list(csv.DictReader(f))
+
+        self.assertEqual(list(result[0])[5:], list(BREAKDOWN_COLUMNS))
+        for i, row in enumerate(result):
+            bh = Borehole()
+            bh.init_from_dict(configs[self.ids[i]])
+            self.assertAlmostEqual(float(row["bh_resist"]), bh.calc_bh_resist(self.m_dot[i], self.temp[i]), delta=1e-12)
+            res = bh.calc_resistances(self.m_dot[i], self.temp[i])
+            self.assertAlmostEqual(float(row["local_bh_resist"]), res.local_bh_resist, delta=1e-12)
+            self.assertEqual(row["flow_regime"], res.flow_regime.name)
+
+        with self.assertRaises(LookupError):
+            process_file(self.input_csv, output, {"bh-1": SINGLE}, borehole_id_column="borehole")
+        with self.assertRaises(ValueError):
+            process_file(self.input_csv, output, configs)
+        with self.assertRaises(ValueError):
+            process_file(self.input_csv, output, SINGLE, borehole_id_column="borehole")
+
+    def test_process_file_empty(self):
+        empty_csv = self.dir / "empty.csv"
+        with open(empty_csv, "w", newline="") as f:
+            csv.writer(f).writerow(["timestamp", "m_dot", "temp"])
+
+        output = self.dir / "output.csv"
+        self.assertEqual(process_file(empty_csv, output, SINGLE, breakdown=True), 0)
+        with open(output, newline="") as f:
+            self.assertEqual(list(csv.reader(f)), [["timestamp", "m_dot", "temp", "bh_resist", *BREAKDOWN_COLUMNS]])
+
+        output = self.dir / "output.json"
+        self.assertEqual(process_file(empty_csv, output, SINGLE), 0)
+        with open(output) as f:
+            self.assertEqual(json.load(f), [])
+
+    def test_evaluate_chunk_groups(self):
+        configs = {"bh-1": SINGLE, "bh-2": COAXIAL}
+        boreholes = build_boreholes(configs)
+        chunk = {"borehole": self.ids, "m_dot": self.m_dot, "temp": self.temp}
+        result = evaluate_chunk(chunk, boreholes, "m_dot", "temp", "borehole", breakdown=True)
+
+        for bh_id, bh in boreholes.items():
+            rows = np.array(self.ids) == bh_id
+            np.testing.assert_allclose(
+                result["bh_resist"][rows], bh.calc_bh_resist_array(self.m_dot[rows], self.temp[rows]), rtol=1e-12
+            )
+            expected = bh.calc_resistances_array(self.m_dot[rows], self.temp[rows])
+            np.testing.assert_allclose(result["nusselt"][rows], expected["nusselt"], rtol=1e-12)
+            self.assertEqual(
+                [regime for regime, row in zip(result["flow_regime"], rows) if row],
+                [regime.name for regime in expected["flow_regime"]],
+            )
+
+        empty = evaluate_chunk({"borehole": [], "m_dot": [], "temp": []}, boreholes, "m_dot", "temp", "borehole")
+        self.assertEqual(empty["bh_resist"].size, 0)
+
+    def test_chunk_writer_columns(self):
+        with ChunkWriter(self.dir / "output.csv") as writer:
+            writer.write({"a": [1, 2], "b": [3, 4]})
+            with self.assertRaises(ValueError):
+                writer.write({"a": [1, 2]})
+        self.assertEqual(writer.rows_written, 2)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_process_file_parquet(self):
+        output_parquet = self.dir / "output.parquet"
+        process_file(self.input_csv, output_parquet, SINGLE, chunk_size=10)
+
+        output_csv = self.dir / "output.csv"
+        process_file(output_parquet, output_csv, SINGLE, chunk_size=10)
+
+        chunks = list(read_chunks(output_parquet, chunk_size=100))
+        bh = Borehole()
+        bh.init_from_dict(SINGLE)
+        np.testing.assert_allclose(chunks[0]["bh_resist"], bh.calc_bh_resist_array(self.m_dot, self.temp), rtol=1e-12)
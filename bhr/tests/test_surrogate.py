@@ -0,0 +1,100 @@
+import unittest
+
+import numpy as np
+
+from bhr.borehole import Borehole
+from bhr.surrogate import BoreholeSurrogate
+
+BASE = {
+    "fluid_type": "PROPYLENEGLYCOL",
+    "fluid_concentration": 0.2,
+    "grout_conductivity": 1.5,
+    "soil_conductivity": 3,
+    "length": 200,
+    "borehole_diameter": 0.115,
+}
+CONFIGS = [
+    {
+        "borehole_type": "single_u_tube",
+        "single_u_tube": {
+            "pipe_outer_diameter": 0.032,
+            "pipe_dimension_ratio": 11,
+            "pipe_conductivity": 0.4,
+            "shank_space": 0.02,
+        },
+    },
+    {
+        "borehole_type": "double_u_tube",
+        "double_u_tube": {
+            "pipe_outer_diameter": 0.032,
+            "pipe_dimension_ratio": 18.9,
+            "pipe_conductivity": 0.389,
+            "shank_space": 0.02263,
+            "pipe_inlet_arrangement": "ADJACENT",
+        },
+    },
+    {
+        "borehole_type": "coaxial",
+        "coaxial": {
+            "outer_pipe_outer_diameter": 0.064,
+            "outer_pipe_dimension_ratio": 11,
+            "outer_pipe_conductivity": 0.389,
+            "inner_pipe_outer_diameter": 0.032,
+            "inner_pipe_dimension_ratio": 11,
+            "inner_pipe_conductivity": 0.389,
+        },
+    },
+]
+
+
+class TestBoreholeSurrogate(unittest.TestCase):
+    def test_error_bound(self):
+        # envelope spans laminar, transitional, and turbulent flow
+        rng = np.random.default_rng(0)
+        m_dot = rng.uniform(0.05, 2.0, 2000)
+        temp = rng.uniform(0, 40, 2000)
+
+        for config in CONFIGS:
+            for bc in ("UNIFORM_HEAT_FLUX", "UNIFORM_BOREHOLE_WALL_TEMP"):
+                bh = Borehole()
+                bh.init_from_dict({**BASE, **config, "boundary_condition": bc})
+                surrogate = bh.build_surrogate((0.05, 2.0), (0, 40), rtol=1e-3)
+                self.assertLessEqual(surrogate.max_error, 1e-3)
+
+                expected = bh.calc_bh_resist_array(m_dot, temp)
+                actual = surrogate.calc_bh_resist_array(m_dot, temp)
+                np.testing.assert_allclose(actual, expected, rtol=1e-3)
+
+                for m, t, a in zip(m_dot[:50], temp[:50], actual[:50]):
+                    self.assertAlmostEqual(surrogate.calc_bh_resist(m, t), a, delta=1e-12)
+
+    def test_out_of_range(self):
+        bh = Borehole()
+        bh.init_from_dict({**BASE, **CONFIGS[0]})
+
+        surrogate = bh.build_surrogate((0.2, 1.0), (10, 30))
+        self.assertEqual(surrogate.calc_bh_resist(1.5, 20), bh.calc_bh_resist(1.5, 20))
+        np.testing.assert_allclose(
+            surrogate.calc_bh_resist_array([0.5, 1.5], [40, 20]),
+            [bh.calc_bh_resist(0.5, 40), bh.calc_bh_resist(1.5, 20)],
+            rtol=1e-12,
+        )
+
+        surrogate = bh.build_surrogate((0.2, 1.0), (10, 30), out_of_range="raise")
+        with self.assertRaises(ValueError):
+            surrogate.calc_bh_resist(1.5, 20)
+        with self.assertRaises(ValueError):
+            surrogate.calc_bh_resist_array([0.5, 0.5], [20, 40])
+
+    def test_invalid_inputs(self):
+        bh = Borehole()
+        bh.init_from_dict({**BASE, **CONFIGS[0]})
+
+        with self.assertRaises(ValueError):
+            BoreholeSurrogate(bh, (0, 1.0), (10, 30))
+        with self.assertRaises(ValueError):
+            BoreholeSurrogate(bh, (0.2, 1.0), (30, 10))
+        with self.assertRaises(ValueError):
+            BoreholeSurrogate(bh, (0.2, 1.0), (10, 30), out_of_range="clip")
+        with self.assertRaises(TypeError):
+            Borehole().build_surrogate((0.2, 1.0), (10, 30))
@@ -2,6 +2,8 @@ from bhr.pipe import Pipe
 
 
 class UTube(Pipe):
+    __slots__ = ("length", "shank_space")
+
     def __init__(
         self,
         pipe_outer_diameter: float,
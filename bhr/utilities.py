@@ -1,5 +1,7 @@
 from math import cosh, exp, sinh
 
+import numpy as np
+
 from bhr.enums import BoundaryCondition
 
 
@@ -56,5 +58,49 @@ def smoothing_function(x, x_low_limit, x_high_limit, y_low_limit, y_high_limit)
     return s_y * (y_high_limit - y_low_limit) + y_low_limit
 
 
+def smoothing_function_array(x, x_low_limit, x_high_limit, y_low_limit, y_high_limit) -> np.ndarray:
+    """
+    Vectorized version of the sigmoid smoothing function
+
+    :param x: independent variable, array_like
+    :param x_low_limit: lower limit on x range
+    :param x_high_limit: upper limit on x range
+    :param y_low_limit: lower limit on y range, scalar or array_like broadcastable with x
+    :param y_high_limit: upper limit on y range, scalar or array_like broadcastable with x
+    :return: smoothed values between x_low_limit and x_high_limit. returns y_low_limit and y_high_limit
+    below and above the x_low_limit and x_high_limit, respectively.
+    """
+
+    x = np.asarray(x, dtype=float)
+
+    s_x_max = 5
+    s_x_min = -5
+    s_x = (x - x_low_limit) / (x_high_limit - x_low_limit) * (s_x_max - s_x_min) + s_x_min
+    s_y = 1 / (1 + np.exp(-s_x))
+    y = s_y * (y_high_limit - y_low_limit) + y_low_limit
+
+    # apply lower and upper bounds
+    y = np.where(x < x_low_limit, y_low_limit, y)
+    return np.where(x > x_high_limit, y_high_limit, y)
+
+
 def coth(x):
     return cosh(x) / sinh(x)
+
+
+def coth_array(x) -> np.ndarray:
+    x = np.asarray(x, dtype=float)
+    return np.cosh(x) / np.sinh(x)
+
+
+def broadcast_inputs(m_dot, temp) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Converts mass flow rate and temperature inputs to float arrays of a common shape
+
+    :param m_dot: mass flow rate, kg/s. scalar or array_like
+    :param temp: temperature, C. scalar or array_like
+    :return: tuple of float arrays broadcast to a common shape
+    """
+
+    m_dot_arr, temp_arr = np.broadcast_arrays(np.asarray(m_dot, dtype=float), np.asarray(temp, dtype=float))
+    return m_dot_arr, temp_arr